@@ -0,0 +1,95 @@
+"""Startup-time budget of the lampe CLI commands.
+
+Runs ``lampe <command> --help`` (``lampe version`` for version) in a fresh interpreter with ``python -X importtime``
+and sums the cumulative import time of the top-level imports: the time a command pays before its body runs.
+Fails when a command exceeds its budget or imports one of the heavy dependencies only workflows need.
+
+Usage:
+    python benchmarks/cli_startup.py [--repeat 3] [--json results.json]
+
+Budgets can be scaled on slow machines with LAMPE_STARTUP_BUDGET_SCALE (e.g. 2 doubles them).
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+# Import-time budget of each command, in milliseconds
+COMMAND_BUDGETS_MS = {
+    "version": 800,
+    "check-reviewed": 1000,
+    "healthcheck": 1000,
+    "describe": 1000,
+    "review": 1000,
+    "review-batch": 1000,
+    "serve": 1000,
+    "submit": 1000,
+}
+# Modules only needed once a workflow runs
+HEAVY_MODULES = ("llama_index.core", "litellm", "github", "langfuse", "openinference", "tiktoken")
+
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+_PROBE = """
+import runpy, sys
+sys.argv = ["lampe", *{args!r}]
+try:
+    runpy.run_module("lampe.cli.entrypoint", run_name="__main__")
+except SystemExit:
+    pass
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print("HEAVY=" + ",".join(heavy), file=sys.stderr)
+"""
+
+
+def measure(command: str) -> tuple[float, list[str]]:
+    """Import time in milliseconds of a command, and the heavy modules it imported."""
+    args = [command] if command == "version" else [command, "--help"]
+    env = {**os.environ, "TELEMETRY_ENABLED": "false"}
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(args=args, heavy=HEAVY_MODULES)],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=False,
+    )
+    total_us = 0
+    heavy: list[str] = []
+    for line in completed.stderr.splitlines():
+        if line.startswith("HEAVY="):
+            heavy = [m for m in line.removeprefix("HEAVY=").split(",") if m]
+        elif (match := _IMPORT_LINE.match(line)) and not match.group(3):
+            # Top-level imports only: their cumulative time includes nested imports
+            total_us += int(match.group(2))
+    return total_us / 1000, heavy
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per command, the fastest is kept")
+    parser.add_argument("--json", dest="json_path", help="Write the results to this JSON file")
+    args = parser.parse_args()
+    scale = float(os.getenv("LAMPE_STARTUP_BUDGET_SCALE", "1"))
+
+    results = {}
+    failed = False
+    for command, budget_ms in COMMAND_BUDGETS_MS.items():
+        runs = [measure(command) for _ in range(max(args.repeat, 1))]
+        import_ms = min(ms for ms, _ in runs)
+        heavy = sorted({m for _, modules in runs for m in modules})
+        ok = import_ms <= budget_ms * scale and not heavy
+        failed |= not ok
+        results[command] = {"import_ms": round(import_ms, 1), "budget_ms": budget_ms * scale, "heavy_modules": heavy}
+        status = "ok" if ok else "OVER BUDGET"
+        print(f"{command:<16} {import_ms:8.1f} ms / {budget_ms * scale:.0f} ms  {status} {' '.join(heavy)}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,444 @@
+"""Orchestration overhead of the review and description workflows against a scripted fake LLM.
+
+Runs ``AgenticReviewWorkflow``, ``QuickReviewWorkflow``, ``PRDescriptionWorkflow`` and
+``PRDescriptionFnAgentWorkflow`` on synthetic pull requests of growing size (see ``repository_tools.py``)
+with every model replaced by a LiteLLM custom provider answering from a script: agents issue a fixed sequence of
+tool calls (diff of the files they were given, a search and a file read, then their answer), structured output
+programs get fixed intent and task plans, aggregation agents mute the first issue. Model calls take no time, or
+``--latency-ms``, so what remains is the cost of the workflows, tools and LLM client themselves.
+
+Each run happens in a fresh interpreter and reports:
+
+- wall time, LLM calls, tool and git time, and the per-step totals from the performance events;
+- overhead: wall time minus the simulated model latency;
+- event loop blocking: lag of a heartbeat task, summed over the stalls longer than ``--stall-ms``;
+- peak RSS of the process.
+
+Usage:
+    python benchmarks/orchestration_overhead.py [--changed-files 5,50,200] [--latency-ms 0] [--json results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from repository_tools import SyntheticRepoSpec, _git, _lampe_commit, generate_repository
+
+WORKFLOWS = ("agentic_review", "quick_review", "describe", "describe_agent")
+DEFAULT_CHANGED_FILES = (5, 50, 200)
+
+FAKE_PROVIDER = "lampe-fake"
+# Model environment variables and the role the fake LLM plays for them
+MODEL_ROLES = {
+    "LAMPE_MODEL_DESCRIBE": "describe",
+    "LAMPE_MODEL_DESCRIBE_CHUNK_SUMMARY": "describe_chunk_summary",
+    "LAMPE_MODEL_QUICK_REVIEW": "quick_review",
+    "LAMPE_MODEL_QUICK_REVIEW_HALLUCINATION_FILTER": "hallucination_filter",
+    "LAMPE_MODEL_REVIEW_AGGREGATION": "aggregation",
+    "LAMPE_MODEL_REVIEW_INTENT": "intent",
+    "LAMPE_MODEL_REVIEW_VALIDATION": "validation",
+}
+# Model of PRDescriptionFnAgentWorkflow, which has no environment variable
+DESCRIBE_AGENT_ROLE = "describe_agent"
+# Roles answering with validation findings as JSON
+FINDING_ROLES = ("quick_review", "validation")
+# Changed files an agent asks the diff of in its first tool call
+DIFF_FILES_PER_CALL = 5
+SEARCH_PATTERN = "lampe_benchmark_needle"
+DESCRIPTION = (
+    "### What change is being made?\n\nBenchmark change.\n\n### Why are these changes being made?\n\nBenchmark."
+)
+
+# ru_maxrss is in kilobytes on Linux, bytes on macOS
+_RSS_UNIT = 1024 * 1024 if sys.platform == "darwin" else 1024
+_ISSUE_ID = re.compile(r"### Issue `([^`]+)`")
+
+
+def _fake_llm_class() -> type:
+    from litellm import CustomLLM, ModelResponse
+
+    class ScriptedLLM(CustomLLM):
+        """LiteLLM provider answering with predetermined tool calls, then a final answer, per role.
+
+        The round of an agent is the number of assistant tool-call messages already in the conversation.
+        """
+
+        def __init__(self, changed_paths: list[str], tasks: int, latency_ms: float) -> None:
+            super().__init__()
+            self.changed_paths = changed_paths
+            self.tasks = tasks
+            self.latency_ms = latency_ms
+            self.calls = 0
+
+        async def acompletion(self, model: str, messages: list, optional_params: dict, **kwargs: Any) -> Any:
+            self.calls += 1
+            if self.latency_ms:
+                await asyncio.sleep(self.latency_ms / 1000)
+            tools = [tool["function"]["name"] for tool in optional_params.get("tools") or []]
+            prompt = "\n".join(str(message.get("content") or "") for message in messages if message["role"] == "user")
+            rounds = sum(1 for message in messages if message["role"] == "assistant" and message.get("tool_calls"))
+            calls = self.tool_calls(tools, prompt, rounds)
+            if calls:
+                message = {
+                    "role": "assistant",
+                    "content": None,
+                    "tool_calls": [
+                        {
+                            "id": f"call-{self.calls}-{i}",
+                            "type": "function",
+                            "function": {"name": name, "arguments": json.dumps(arguments)},
+                        }
+                        for i, (name, arguments) in enumerate(calls)
+                    ],
+                }
+                finish_reason = "tool_calls"
+            else:
+                message = {"role": "assistant", "content": self.answer(model, prompt)}
+                finish_reason = "stop"
+            return ModelResponse(
+                model=f"{FAKE_PROVIDER}/{model}",
+                choices=[{"index": 0, "message": message, "finish_reason": finish_reason}],
+                usage={
+                    "prompt_tokens": len(prompt) // 4,
+                    "completion_tokens": 50,
+                    "total_tokens": len(prompt) // 4 + 50,
+                },
+            )
+
+        def mentioned_paths(self, prompt: str) -> list[str]:
+            return [path for path in self.changed_paths if path in prompt] or self.changed_paths[:1]
+
+        def tool_calls(self, tools: list[str], prompt: str, rounds: int) -> list[tuple[str, dict[str, Any]]]:
+            if len(tools) == 1 and tools[0] in STRUCTURED_OUTPUTS:
+                return [(tools[0], STRUCTURED_OUTPUTS[tools[0]](self))]
+            if "mute_issue" in tools:
+                issue_ids = _ISSUE_ID.findall(prompt)
+                return (
+                    [("mute_issue", {"issue_id": issue_ids[0], "reason": "Duplicate"})]
+                    if rounds == 0 and issue_ids
+                    else []
+                )
+            paths = self.mentioned_paths(prompt)
+            script = [
+                [("get_diff_for_files", {"file_paths": paths[:DIFF_FILES_PER_CALL]})],
+                [
+                    ("search_in_files", {"pattern": SEARCH_PATTERN, "relative_dir_path": "src"}),
+                    ("get_file_content_at_commit", {"file_path": paths[0], "line_start": 1, "line_end": 40}),
+                ],
+            ]
+            if rounds >= len(script):
+                return []
+            return [(name, arguments) for name, arguments in script[rounds] if name in tools]
+
+        def answer(self, role: str, prompt: str) -> str:
+            if role in FINDING_ROLES:
+                finding = {
+                    "file_path": self.mentioned_paths(prompt)[0],
+                    "line_number": 1,
+                    "action": "fix",
+                    "problem_summary": "Benchmark finding",
+                    "severity": "low",
+                    "category": "correctness",
+                }
+                return json.dumps({"no_issue": False, "findings": [finding]})
+            if role in ("describe", DESCRIBE_AGENT_ROLE):
+                return DESCRIPTION
+            return "Done."
+
+    return ScriptedLLM
+
+
+def _tasks(llm: Any) -> list[dict[str, Any]]:
+    per_task = max(1, -(-len(llm.changed_paths) // llm.tasks))
+    return [
+        {
+            "task_id": f"task-{i}",
+            "description": "Check the changed code for regressions",
+            "file_paths": llm.changed_paths[start : start + per_task],
+        }
+        for i, start in enumerate(range(0, len(llm.changed_paths), per_task))
+    ]
+
+
+_INTENT = {"summary": "Benchmark pull request", "areas_touched": ["api"], "suggested_validation_tasks": []}
+# Arguments of the single tool offered by the structured output programs, by output class name
+STRUCTURED_OUTPUTS = {
+    "PRIntent": lambda llm: _INTENT,
+    "TaskPlanningOutput": lambda llm: {"tasks": _tasks(llm), "note": ""},
+    "PRIntentAndTaskPlan": lambda llm: {**_INTENT, "tasks": _tasks(llm)},
+    "SkillSelectionOutput": lambda llm: {"selected_skill_paths": [], "note": ""},
+}
+
+
+def install_fake_llm(changed_paths: list[str], tasks: int, latency_ms: float) -> Any:
+    """Route every ``LAMPE_MODEL_*`` model to the scripted provider and return its handler."""
+    import litellm
+
+    handler = _fake_llm_class()(changed_paths, tasks, latency_ms)
+    litellm.custom_provider_map = [{"provider": FAKE_PROVIDER, "custom_handler": handler}]
+    roles = [*MODEL_ROLES.values(), DESCRIBE_AGENT_ROLE]
+    litellm.register_model(
+        {
+            f"{FAKE_PROVIDER}/{role}": {
+                "litellm_provider": FAKE_PROVIDER,
+                "mode": "chat",
+                "supports_function_calling": True,
+                "max_input_tokens": 400_000,
+                "max_output_tokens": 128_000,
+            }
+            for role in roles
+        }
+    )
+    for env_var, role in MODEL_ROLES.items():
+        os.environ[env_var] = f"{FAKE_PROVIDER}/{role}"
+    return handler
+
+
+class LoopMonitor:
+    """Heartbeat task measuring how long the event loop is blocked."""
+
+    def __init__(self, interval_ms: float = 5.0, stall_ms: float = 20.0) -> None:
+        self.interval = interval_ms / 1000
+        self.stall = stall_ms / 1000
+        self.blocked = 0.0
+        self.max_lag = 0.0
+        self.stalls = 0
+        self._task: asyncio.Task | None = None
+
+    async def _beat(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - start - self.interval
+            self.max_lag = max(self.max_lag, lag)
+            if lag > self.stall:
+                self.blocked += lag
+                self.stalls += 1
+
+    async def __aenter__(self) -> "LoopMonitor":
+        self._task = asyncio.create_task(self._beat())
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "blocked_ms": round(self.blocked * 1000, 3),
+            "max_lag_ms": round(self.max_lag * 1000, 3),
+            "stalls": self.stalls,
+        }
+
+
+def load_workflow(name: str) -> Callable[[Any, Any], Awaitable[Any]]:
+    """Import a workflow, outside of the measured run, and return a function running it on a pull request."""
+    if name == "agentic_review":
+        from lampe.review.workflows.agentic_review.agentic_review_workflow import generate_agentic_pr_review
+
+        return generate_agentic_pr_review
+    if name == "quick_review":
+        from lampe.review.workflows.quick_review.quick_review_workflow import generate_quick_pr_review
+
+        return generate_quick_pr_review
+    if name == "describe":
+        from lampe.describe.workflows.pr_description.generation import generate_pr_description
+
+        return generate_pr_description
+
+    from llama_index.llms.litellm import LiteLLM
+
+    from lampe.describe.workflows.pr_description.data_models import PRDescriptionInput
+    from lampe.describe.workflows.pr_description.generation_multi_file import PRDescriptionFnAgentWorkflow
+
+    async def describe_agent(repository: Any, pull_request: Any) -> Any:
+        workflow = PRDescriptionFnAgentWorkflow(llm=LiteLLM(model=f"{FAKE_PROVIDER}/{DESCRIBE_AGENT_ROLE}"))
+        return await workflow.execute(PRDescriptionInput(repository=repository, pull_request=pull_request))
+
+    return describe_agent
+
+
+def run_child(args: argparse.Namespace) -> dict[str, Any]:
+    """Run one workflow in this interpreter and measure it."""
+    # Use the bundled model cost map: fetching it would add network time to the imports
+    os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+    from lampe.core.data_models import PullRequest, Repository
+    from lampe.core.performance import performance_report
+
+    logging.getLogger("lampe_sdk").setLevel(logging.ERROR)
+    logging.getLogger("LiteLLM").setLevel(logging.ERROR)
+    changed_paths = json.loads(Path(args.changed_paths).read_text())
+    fake_llm = install_fake_llm(changed_paths, args.tasks, args.latency_ms)
+    run_workflow = load_workflow(args.child)
+    repository = Repository(local_path=args.repo, full_name="bench/synthetic")
+    pull_request = PullRequest(
+        number=1,
+        title="Benchmark pull request",
+        base_commit_hash=args.base,
+        base_branch_name="main",
+        head_commit_hash=args.head,
+        head_branch_name="feature",
+    )
+    rss_before_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    async def measured() -> tuple[float, dict[str, Any]]:
+        async with LoopMonitor(stall_ms=args.stall_ms) as monitor:
+            start = time.perf_counter()
+            await run_workflow(repository, pull_request)
+            wall_ms = (time.perf_counter() - start) * 1000
+        return wall_ms, monitor.summary()
+
+    with performance_report(args.perf_report) as report:
+        wall_ms, loop = asyncio.run(measured())
+        summary = report.summary()
+
+    kinds = summary["kinds"]
+    latency_ms = fake_llm.calls * args.latency_ms
+    return {
+        "wall_ms": round(wall_ms, 3),
+        "overhead_ms": round(wall_ms - latency_ms, 3),
+        "llm_calls": fake_llm.calls,
+        "simulated_latency_ms": round(latency_ms, 3),
+        "tool_calls": kinds.get("tool", {}).get("count", 0),
+        "tool_ms": kinds.get("tool", {}).get("total_ms", 0.0),
+        "git_calls": kinds.get("git", {}).get("count", 0),
+        "git_ms": kinds.get("git", {}).get("total_ms", 0.0),
+        "steps": {
+            step: {"count": stats["count"], "total_ms": stats["total_ms"], "max_ms": stats["max_ms"]}
+            for step, stats in kinds.get("step", {}).get("by_name", {}).items()
+        },
+        "event_loop": loop,
+        "rss_before_mb": round(rss_before_kb / _RSS_UNIT, 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / _RSS_UNIT, 1),
+    }
+
+
+def run_in_subprocess(args: argparse.Namespace, workflow: str, target: dict[str, Any], workdir: Path) -> dict[str, Any]:
+    output = workdir / f"{workflow}-{target['changed_files']}.json"
+    command = [
+        sys.executable,
+        __file__,
+        "--child",
+        workflow,
+        "--repo",
+        target["repo"],
+        "--base",
+        target["base"],
+        "--head",
+        target["head"],
+        "--changed-paths",
+        target["changed_paths"],
+        "--tasks",
+        str(args.tasks),
+        "--latency-ms",
+        str(args.latency_ms),
+        "--stall-ms",
+        str(args.stall_ms),
+        "--perf-report",
+        str(workdir / f"{workflow}-{target['changed_files']}.perf.json"),
+        "--child-output",
+        str(output),
+    ]
+    subprocess.run(command, check=True)
+    return json.loads(output.read_text())
+
+
+def generate_target(workdir: Path, changed_files: int, seed: int) -> dict[str, Any]:
+    """Generate the repository of a pull request changing ``changed_files`` files."""
+    spec = SyntheticRepoSpec(
+        files=max(200, 4 * changed_files),
+        lines_per_file=200,
+        history_depth=5,
+        changed_files=changed_files,
+        changed_lines=40,
+        seed=seed,
+    )
+    repo = workdir / f"repo-{changed_files}"
+    base, head = generate_repository(repo, spec)
+    # Files the agents read: the ones the pull request modifies or adds
+    paths = _git(repo, "diff", "--name-only", "--diff-filter=AM", base, head).splitlines()
+    changed_paths = workdir / f"repo-{changed_files}.paths.json"
+    changed_paths.write_text(json.dumps(paths))
+    return {
+        "changed_files": changed_files,
+        "spec": spec,
+        "repo": str(repo),
+        "base": base,
+        "head": head,
+        "changed_paths": str(changed_paths),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workflows", default=",".join(WORKFLOWS), help="Comma separated workflows to run")
+    parser.add_argument(
+        "--changed-files",
+        default=",".join(map(str, DEFAULT_CHANGED_FILES)),
+        help="Comma separated pull request sizes, in changed files",
+    )
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated latency of every model call")
+    parser.add_argument("--tasks", type=int, default=4, help="Validation tasks planned by the agentic review")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per workflow and size, the median is reported")
+    parser.add_argument("--stall-ms", type=float, default=20.0, help="Event loop lag counted as blocking")
+    parser.add_argument("--json", dest="json_path", help="Write the results to this JSON file")
+    # Internal: run a single workflow in this interpreter
+    parser.add_argument("--child", choices=WORKFLOWS, help=argparse.SUPPRESS)
+    for internal in ("--repo", "--base", "--head", "--changed-paths", "--perf-report", "--child-output"):
+        parser.add_argument(internal, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        Path(args.child_output).write_text(json.dumps(run_child(args)))
+        return 0
+
+    workflows = [workflow.strip() for workflow in args.workflows.split(",") if workflow.strip()]
+    unknown = set(workflows) - set(WORKFLOWS)
+    if unknown:
+        parser.error(f"unknown workflows: {', '.join(sorted(unknown))}")
+    sizes = [int(size) for size in args.changed_files.split(",")]
+
+    results: dict[str, dict[str, Any]] = {workflow: {} for workflow in workflows}
+    with tempfile.TemporaryDirectory(prefix="lampe-bench-") as tmp:
+        workdir = Path(tmp)
+        for seed, size in enumerate(sizes):
+            target = generate_target(workdir, size, seed)
+            for workflow in workflows:
+                runs = [run_in_subprocess(args, workflow, target, workdir) for _ in range(max(args.repeat, 1))]
+                median = sorted(runs, key=lambda run: run["wall_ms"])[len(runs) // 2]
+                median["wall_ms_runs"] = [run["wall_ms"] for run in runs]
+                median["wall_ms_stdev"] = round(statistics.pstdev(median["wall_ms_runs"]), 3)
+                results[workflow][str(size)] = median
+                print(
+                    f"{workflow:<16} {size:>5} files  wall {median['wall_ms']:9.1f} ms  "
+                    f"overhead {median['overhead_ms']:9.1f} ms  llm calls {median['llm_calls']:4d}  "
+                    f"loop blocked {median['event_loop']['blocked_ms']:8.1f} ms  "
+                    f"peak rss {median['peak_rss_mb']:7.1f} MB"
+                )
+
+    if args.json_path:
+        Path(args.json_path).parent.mkdir(parents=True, exist_ok=True)
+        current = {
+            "latency_ms": args.latency_ms,
+            "tasks": args.tasks,
+            "environment": {"commit": _lampe_commit(), "python": sys.version.split()[0]},
+            "results": results,
+        }
+        Path(args.json_path).write_text(json.dumps(current, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("GIT_TERMINAL_PROMPT", "0")
+    sys.exit(main())
@@ -0,0 +1,314 @@
+"""Microbenchmarks of the repository tools on synthetic git repositories.
+
+Generates a local repository of configurable size (files, file size, history depth, diff size), then times
+``list_changed_files``, ``get_diff_between_commits``, ``get_file_content_at_commit``, ``search_in_files``,
+``find_files_by_pattern`` between a base and a head commit, on the full repository and on a partial
+(``--filter=blob:none --sparse``) clone of it over ``file://``, and ``LocalCommitsAvailability`` fetching
+the base commit into that clone.
+
+Results are written as JSON, and ``--compare`` checks them against the results of another commit.
+
+Usage:
+    python benchmarks/repository_tools.py [--preset medium] [--json results.json] [--compare baseline.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import statistics
+import string
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any, Callable
+
+from lampe.core.gitconfig import valid_git_version_available
+from lampe.core.tools.repository import (
+    LocalCommitsAvailability,
+    clone_repo,
+    find_files_by_pattern,
+    get_diff_between_commits,
+    get_file_content_at_commit,
+    list_changed_files,
+    search_in_files,
+)
+
+
+@dataclass(frozen=True)
+class SyntheticRepoSpec:
+    """Shape of a generated repository."""
+
+    files: int
+    lines_per_file: int
+    history_depth: int
+    changed_files: int
+    changed_lines: int
+    files_per_directory: int = 50
+    seed: int = 0
+
+
+PRESETS = {
+    "small": SyntheticRepoSpec(files=100, lines_per_file=100, history_depth=10, changed_files=5, changed_lines=20),
+    "medium": SyntheticRepoSpec(files=1_000, lines_per_file=200, history_depth=50, changed_files=50, changed_lines=40),
+    "large": SyntheticRepoSpec(
+        files=10_000, lines_per_file=300, history_depth=200, changed_files=500, changed_lines=60
+    ),
+}
+# Searched by search_in_files, present in one line out of 50
+NEEDLE = "lampe_benchmark_needle"
+# Ratio of the fastest run over the baseline one above which --compare reports a regression
+DEFAULT_MAX_REGRESSION = 1.25
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def _line(rng: random.Random, index: int) -> str:
+    if index % 50 == 0:
+        return f"    {NEEDLE}({index})"
+    words = ("".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))) for _ in range(rng.randint(3, 9)))
+    return f"    value_{index} = {' '.join(words)!r}"
+
+
+def _file_path(spec: SyntheticRepoSpec, index: int) -> str:
+    return f"src/pkg_{index // spec.files_per_directory:04d}/module_{index:05d}.py"
+
+
+def _write(repo: Path, relative_path: str, lines: list[str]) -> None:
+    path = repo / relative_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines) + "\n")
+
+
+def generate_repository(path: Path, spec: SyntheticRepoSpec) -> tuple[str, str]:
+    """Create a repository following ``spec``.
+
+    Returns
+    -------
+    :
+        Base and head commits: ``history_depth`` commits build the base, the head then changes ``changed_files``
+        files (``changed_lines`` lines each), one file in ten of them being added and one in ten deleted
+    """
+    rng = random.Random(spec.seed)
+    path.mkdir(parents=True)
+    _git(path, "init", "--quiet", "--initial-branch=main")
+    _git(path, "config", "user.email", "bench@example.com")
+    _git(path, "config", "user.name", "bench")
+    # Serve partial clones and fetches of any commit over file://
+    _git(path, "config", "uploadpack.allowFilter", "true")
+    _git(path, "config", "uploadpack.allowAnySHA1InWant", "true")
+
+    contents = {_file_path(spec, i): [_line(rng, j) for j in range(spec.lines_per_file)] for i in range(spec.files)}
+    for relative_path, lines in contents.items():
+        _write(path, relative_path, lines)
+    _git(path, "add", "-A")
+    _git(path, "commit", "--quiet", "-m", "Initial commit")
+    paths = list(contents)
+    for depth in range(1, spec.history_depth):
+        for relative_path in rng.sample(paths, k=min(3, len(paths))):
+            lines = contents[relative_path]
+            lines[rng.randrange(len(lines))] = _line(rng, depth)
+            _write(path, relative_path, lines)
+        _git(path, "commit", "--quiet", "-am", f"History commit {depth}")
+    base = _git(path, "rev-parse", "HEAD")
+
+    changed = rng.sample(paths, k=min(spec.changed_files, len(paths)))
+    for i, relative_path in enumerate(changed):
+        if i % 10 == 1:
+            (path / relative_path).unlink()
+            continue
+        if i % 10 == 2:
+            relative_path = relative_path.replace(".py", "_added.py")
+            contents[relative_path] = []
+        lines = contents[relative_path]
+        for _ in range(spec.changed_lines):
+            lines.insert(rng.randint(0, len(lines)), _line(rng, rng.randrange(1_000_000)))
+        _write(path, relative_path, lines)
+    _git(path, "add", "-A")
+    _git(path, "commit", "--quiet", "-m", "Pull request")
+    return base, _git(path, "rev-parse", "HEAD")
+
+
+def partial_clone(source: Path, head: str, use_clone_repo: bool) -> str:
+    """Partial clone of ``source`` at ``head`` over file://, with ``clone_repo`` if ``use_clone_repo``."""
+    if use_clone_repo:
+        return clone_repo(f"file://{source}", head_ref=head)
+    # Before git 2.49 (no clone --revision), the head is the tip of the default branch of the source
+    destination = tempfile.mkdtemp(prefix="lampe-bench-clone-")
+    subprocess.run(
+        [
+            "git",
+            "clone",
+            "--quiet",
+            "--depth",
+            "1",
+            "--sparse",
+            "--filter",
+            "blob:none",
+            f"file://{source}",
+            destination,
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return destination
+
+
+def measure(function: Callable[[], Any], repeat: int, setup: Callable[[], Any] | None = None) -> dict[str, float]:
+    """Run ``function`` ``repeat`` times, after ``setup`` each time if set, and return its timings in ms."""
+    durations = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - start) * 1000)
+    return {
+        "first_ms": round(durations[0], 3),
+        "min_ms": round(min(durations), 3),
+        "median_ms": round(statistics.median(durations), 3),
+        "runs": repeat,
+    }
+
+
+def tool_benchmarks(repo_path: str, base: str, head: str, content_path: str) -> dict[str, Callable[[], Any]]:
+    return {
+        "list_changed_files": lambda: list_changed_files(base, head, repo_path=repo_path),
+        "get_diff_between_commits": lambda: get_diff_between_commits(base, head, repo_path=repo_path),
+        "get_file_content_at_commit": lambda: get_file_content_at_commit(head, content_path, repo_path=repo_path),
+        "search_in_files": lambda: search_in_files(NEEDLE, "src", head, repo_path=repo_path),
+        "find_files_by_pattern": lambda: find_files_by_pattern("*_added.py", repo_path=repo_path),
+    }
+
+
+def run(spec: SyntheticRepoSpec, repeat: int, workdir: Path) -> dict[str, Any]:
+    source = workdir / "source"
+    start = time.perf_counter()
+    base, head = generate_repository(source, spec)
+    generation_ms = (time.perf_counter() - start) * 1000
+    results: dict[str, dict[str, Any]] = {"full": {}, "partial": {}}
+    # A file the pull request leaves untouched, read at the head commit
+    changed = set(_git(source, "diff", "--name-only", base, head).splitlines())
+    content_path = next(path for path in (_file_path(spec, i) for i in range(spec.files)) if path not in changed)
+
+    for name, function in tool_benchmarks(str(source), base, head, content_path).items():
+        results["full"][name] = measure(function, repeat)
+
+    clones: list[str] = []
+    use_clone_repo = valid_git_version_available()
+
+    def fresh_clone() -> None:
+        clones.append(partial_clone(source, head, use_clone_repo))
+
+    results["partial"]["clone"] = measure(fresh_clone, repeat)
+    # The first run includes fetching the base commit, trees and blobs on demand
+    results["partial"]["LocalCommitsAvailability.fetch"] = measure(
+        lambda: LocalCommitsAvailability(clones[-1], [base, head]).__enter__(), repeat, setup=fresh_clone
+    )
+    clone_path = clones[-1]
+    results["partial"]["LocalCommitsAvailability.available"] = measure(
+        lambda: LocalCommitsAvailability(clone_path, [base, head]).__enter__(), repeat
+    )
+    for name, function in tool_benchmarks(clone_path, base, head, content_path).items():
+        results["partial"][name] = measure(function, repeat)
+    for path in clones:
+        shutil.rmtree(path, ignore_errors=True)
+
+    return {
+        "spec": asdict(spec),
+        "generation_ms": round(generation_ms, 3),
+        "environment": {
+            "commit": _lampe_commit(),
+            "git": _git(source, "--version"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def _lampe_commit() -> str | None:
+    try:
+        return _git(Path(__file__).resolve().parent, "rev-parse", "HEAD")
+    except subprocess.CalledProcessError:
+        return None
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], max_regression: float) -> list[str]:
+    """Print the ratios of the fastest runs to ``baseline`` and return the benchmarks slower than ``max_regression``.
+
+    The fastest run is compared rather than the median: it is the least affected by the noise of the machine.
+    """
+    regressions = []
+    for kind, benchmarks in current["results"].items():
+        for name, timing in benchmarks.items():
+            previous = baseline["results"].get(kind, {}).get(name)
+            if not previous or not previous["min_ms"]:
+                continue
+            ratio = timing["min_ms"] / previous["min_ms"]
+            flag = "REGRESSION" if ratio > max_regression else ""
+            print(
+                f"{kind:<8} {name:<36} {previous['min_ms']:10.1f} -> {timing['min_ms']:10.1f} ms  x{ratio:.2f} {flag}"
+            )
+            if ratio > max_regression:
+                regressions.append(f"{kind}/{name}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="medium", help="Repository size")
+    parser.add_argument("--files", type=int, help="Number of files, overrides the preset")
+    parser.add_argument("--lines-per-file", type=int, help="Lines per file, overrides the preset")
+    parser.add_argument("--history-depth", type=int, help="Commits before the base commit, overrides the preset")
+    parser.add_argument("--changed-files", type=int, help="Files changed by the head commit, overrides the preset")
+    parser.add_argument("--changed-lines", type=int, help="Lines added per changed file, overrides the preset")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark")
+    parser.add_argument("--json", dest="json_path", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare with")
+    parser.add_argument("--max-regression", type=float, default=DEFAULT_MAX_REGRESSION)
+    args = parser.parse_args()
+
+    overrides = {
+        field: value
+        for field in ("files", "lines_per_file", "history_depth", "changed_files", "changed_lines")
+        if (value := getattr(args, field)) is not None
+    }
+    spec = replace(PRESETS[args.preset], **overrides)
+    # Keep the tools' warnings (e.g. the full repository not being a sparse clone) out of the timings output
+    logging.getLogger("lampe_sdk").setLevel(logging.ERROR)
+
+    with tempfile.TemporaryDirectory(prefix="lampe-bench-") as workdir:
+        current = run(spec, max(args.repeat, 1), Path(workdir))
+    current["preset"] = args.preset
+
+    for kind, benchmarks in current["results"].items():
+        for name, timing in benchmarks.items():
+            print(f"{kind:<8} {name:<36} median {timing['median_ms']:10.1f} ms  first {timing['first_ms']:10.1f} ms")
+    if args.json_path:
+        Path(args.json_path).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json_path).write_text(json.dumps(current, indent=2))
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        if baseline.get("spec") != current["spec"]:
+            print("Baseline was generated with a different repository spec", file=sys.stderr)
+            return 2
+        regressions = compare(current, baseline, args.max_regression)
+        if regressions:
+            print(f"Regressions over x{args.max_regression}: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("GIT_TERMINAL_PROMPT", "0")
+    sys.exit(main())
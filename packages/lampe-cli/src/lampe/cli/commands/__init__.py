@@ -2,5 +2,7 @@ from lampe.cli.commands.check_reviewed import check_reviewed
 from lampe.cli.commands.describe import describe
 from lampe.cli.commands.healthcheck import healthcheck
 from lampe.cli.commands.review import review
+from lampe.cli.commands.review_batch import review_batch
+from lampe.cli.commands.serve import serve, submit
 
-__all__ = ["check_reviewed", "describe", "healthcheck", "review"]
+__all__ = ["check_reviewed", "describe", "healthcheck", "review", "review_batch", "serve", "submit"]
@@ -2,20 +2,36 @@ from __future__ import annotations
 
 import asyncio
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import typer
 
-from lampe.cli.orchestrators.pr_description import (
-    AgenticGeneratorAdapter,
-    DefaultGeneratorAdapter,
-    PRDescriptionConfig,
-    PRDescriptionOrchestratorWorkflow,
-    PRDescriptionStart,
-)
 from lampe.cli.providers.base import Provider
 from lampe.core import initialize
 from lampe.core.data_models import PullRequest, Repository
-from lampe.describe.workflows.pr_description.generation import MAX_TOKENS as DEFAULT_MAX_TOKENS
+from lampe.core.performance import performance_report
+from lampe.describe.workflows.pr_description.constants import MAX_CONCURRENT_CHUNK_SUMMARIES
+from lampe.describe.workflows.pr_description.constants import MAX_TOKENS as DEFAULT_MAX_TOKENS
+
+if TYPE_CHECKING:
+    from lampe.cli.orchestrators.pr_description import PRDescriptionGenerator
+
+
+def create_description_generator(
+    variant: str, concurrency: int = MAX_CONCURRENT_CHUNK_SUMMARIES
+) -> PRDescriptionGenerator:
+    """Create the description generator of a ``--variant``, unknown variants use the agentic generator."""
+    from lampe.cli.orchestrators.pr_description import (
+        AgenticGeneratorAdapter,
+        DefaultGeneratorAdapter,
+        MapReduceGeneratorAdapter,
+    )
+
+    if variant == "default":
+        return DefaultGeneratorAdapter()
+    if variant == "map-reduce":
+        return MapReduceGeneratorAdapter(max_concurrency=concurrency)
+    return AgenticGeneratorAdapter()
 
 
 def describe(
@@ -25,14 +41,37 @@ def describe(
     head: str = typer.Option(..., help="Head commit SHA"),
     title: str = typer.Option("Pull Request", help="PR title (local runs)"),
     output: str = typer.Option("auto", help="Output provider (auto|console|github|gitlab|bitbucket)"),
-    variant: str = typer.Option("default", help="default|agentic"),
+    variant: str = typer.Option("default", help="default|agentic|map-reduce"),
     files_exclude: list[str] | None = typer.Option(None, "--exclude"),
     files_reinclude: list[str] | None = typer.Option(None, "--reinclude"),
     truncation_tokens: int = typer.Option(DEFAULT_MAX_TOKENS, "--max-tokens"),
     timeout: int | None = typer.Option(None, "--timeout-seconds"),
     verbose: bool = typer.Option(False, "--verbose/--no-verbose"),
+    stream: bool = typer.Option(
+        True, "--stream/--no-stream", help="Print the description while it is generated (console output)"
+    ),
+    concurrency: int = typer.Option(
+        MAX_CONCURRENT_CHUNK_SUMMARIES, "--concurrency", help="Concurrent chunk summaries (map-reduce variant)"
+    ),
+    max_llm_calls: int | None = typer.Option(
+        None, "--max-llm-calls", help="Maximum LLM calls of the run, optional work is skipped as it gets close"
+    ),
+    max_input_tokens: int | None = typer.Option(None, "--max-input-tokens", help="Maximum prompt tokens of the run"),
+    max_output_tokens: int | None = typer.Option(
+        None, "--max-output-tokens", help="Maximum completion tokens of the run"
+    ),
+    perf_report: Path | None = typer.Option(
+        None, "--perf-report", dir_okay=False, help="Write a JSON summary of the step, tool, git and LLM timings"
+    ),
 ):
     """Generate a PR description and deliver it to the specified output provider."""
+    # Workflow imports are deferred to keep the CLI startup fast
+    from lampe.cli.orchestrators.pr_description import (
+        PRDescriptionConfig,
+        PRDescriptionOrchestratorWorkflow,
+        PRDescriptionStart,
+    )
+
     initialize()
     repo_model = Repository(local_path=str(repo), full_name=repo_full_name)
     pr_model = PullRequest(
@@ -47,13 +86,17 @@ def describe(
 
     provider = Provider.create_provider(provider_name=output, repository=repo_model, pull_request=pr_model)
 
-    generator = DefaultGeneratorAdapter() if variant == "default" else AgenticGeneratorAdapter()
+    generator = create_description_generator(variant, concurrency=concurrency)
     pr_cfg = PRDescriptionConfig(
         files_exclude_patterns=list(files_exclude) if files_exclude else None,
         files_reinclude_patterns=list(files_reinclude) if files_reinclude else None,
         truncation_tokens=truncation_tokens,
         timeout=timeout,
         verbose=verbose,
+        stream=stream,
+        max_llm_calls=max_llm_calls,
+        max_input_tokens=max_input_tokens,
+        max_output_tokens=max_output_tokens,
     )
 
     async def _run():
@@ -64,4 +107,5 @@ def describe(
             start_event=PRDescriptionStart(repository=repo_model, pull_request=pr_model, config=pr_cfg)
         )
 
-    asyncio.run(_run())
+    with performance_report(perf_report):
+        asyncio.run(_run())
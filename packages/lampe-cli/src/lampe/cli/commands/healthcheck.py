@@ -15,6 +15,7 @@ logger = logging.getLogger(name=LAMPE_LOGGER_NAME)
 
 LAMPE_MODEL_ENV_VARS = (
     "LAMPE_MODEL_DESCRIBE",
+    "LAMPE_MODEL_DESCRIBE_CHUNK_SUMMARY",
     "LAMPE_MODEL_QUICK_REVIEW",
     "LAMPE_MODEL_QUICK_REVIEW_HALLUCINATION_FILTER",
     "LAMPE_MODEL_REVIEW_AGGREGATION",
@@ -2,20 +2,29 @@ from __future__ import annotations
 
 import asyncio
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import typer
 
-from lampe.cli.orchestrators.pr_review import (
-    AgenticOrchestratorAdapter,
-    PRReviewConfig,
-    PRReviewOrchestratorWorkflow,
-    PRReviewStart,
-    QuickOrchestratorAdapter,
-)
 from lampe.cli.providers.base import Provider
 from lampe.core import initialize
 from lampe.core.data_models import PullRequest, Repository
-from lampe.review.workflows.pr_review.data_models import ReviewDepth
+from lampe.core.performance import performance_report
+from lampe.review.workflows.pr_review.review_depth import ReviewDepth
+
+if TYPE_CHECKING:
+    from lampe.cli.orchestrators.pr_review import PRReviewGenerator
+
+
+def create_review_generator(variant: str) -> PRReviewGenerator:
+    """Create the review generator of a ``--variant``, falling back to agentic for unknown variants."""
+    from lampe.cli.orchestrators.pr_review import REVIEW_GENERATORS, AgenticOrchestratorAdapter
+
+    factory = REVIEW_GENERATORS.get(variant)
+    if factory is None:
+        typer.echo(f"Unknown review variant '{variant}'; using agentic.", err=True)
+        factory = AgenticOrchestratorAdapter
+    return factory()
 
 
 def review(
@@ -28,12 +37,30 @@ def review(
     review_depth: ReviewDepth = typer.Option(ReviewDepth.STANDARD, help="Review depth (basic|standard|comprehensive)"),
     variant: str = typer.Option(
         "agentic",
-        help="Review variant: agentic (full) or quick (only critical and high issues)",
+        help=(
+            "Review variant: agentic (full), quick (only critical and high issues) "
+            "or quick-sharded (quick, large PRs split across parallel agents)"
+        ),
     ),
     guidelines: list[str] | None = typer.Option(None, "--guideline", help="Custom review guidelines (can be repeated)"),
     files_exclude: list[str] | None = typer.Option(None, "--exclude"),
     timeout: int | None = typer.Option(None, "--timeout-seconds"),
     verbose: bool = typer.Option(False, "--verbose/--no-verbose"),
+    review_state: Path | None = typer.Option(
+        None,
+        "--review-state",
+        help="SQLite file keeping the last reviewed head per PR. Follow-up pushes only review the new commits",
+    ),
+    max_llm_calls: int | None = typer.Option(
+        None, "--max-llm-calls", help="Maximum LLM calls of the run, optional work is skipped as it gets close"
+    ),
+    max_input_tokens: int | None = typer.Option(None, "--max-input-tokens", help="Maximum prompt tokens of the run"),
+    max_output_tokens: int | None = typer.Option(
+        None, "--max-output-tokens", help="Maximum completion tokens of the run"
+    ),
+    perf_report: Path | None = typer.Option(
+        None, "--perf-report", dir_okay=False, help="Write a JSON summary of the step, tool, git and LLM timings"
+    ),
 ):
     """Generate a PR code review and deliver it to the specified output provider.
 
@@ -42,6 +69,9 @@ def review(
     - standard: gpt-5
     - comprehensive: gpt-5.1
     """
+    # Workflow imports are deferred to keep the CLI startup fast
+    from lampe.cli.orchestrators.pr_review import PRReviewConfig, PRReviewOrchestratorWorkflow, PRReviewStart
+
     initialize()
     repo_model = Repository(local_path=str(repo), full_name=repo_full_name)
     pr_model = PullRequest(
@@ -56,19 +86,17 @@ def review(
 
     provider = Provider.create_provider(provider_name=output, repository=repo_model, pull_request=pr_model)
 
-    if variant == "agentic":
-        generator = AgenticOrchestratorAdapter()
-    elif variant == "quick":
-        generator = QuickOrchestratorAdapter()
-    else:
-        typer.echo(f"Unknown review variant '{variant}'; using agentic.", err=True)
-        generator = AgenticOrchestratorAdapter()
+    generator = create_review_generator(variant)
     pr_cfg = PRReviewConfig(
         review_depth=review_depth,
         custom_guidelines=guidelines,
         files_exclude_patterns=files_exclude,
         timeout=timeout,
         verbose=verbose,
+        review_state_path=str(review_state) if review_state else None,
+        max_llm_calls=max_llm_calls,
+        max_input_tokens=max_input_tokens,
+        max_output_tokens=max_output_tokens,
     )
 
     async def _run():
@@ -77,4 +105,5 @@ def review(
         )
         await workflow_task.run(start_event=PRReviewStart(repository=repo_model, pull_request=pr_model, config=pr_cfg))
 
-    asyncio.run(_run())
+    with performance_report(perf_report):
+        asyncio.run(_run())
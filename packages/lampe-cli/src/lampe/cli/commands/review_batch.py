@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import typer
+
+from lampe.cli.commands.review import create_review_generator
+from lampe.core import initialize
+from lampe.core.performance import performance_report
+from lampe.review.workflows.pr_review.review_depth import ReviewDepth
+
+
+def review_batch(
+    input: Path = typer.Option(..., "--input", exists=True, dir_okay=False, readable=True, help="JSONL of PRs"),
+    results: Path = typer.Option(..., "--results", dir_okay=False, help="NDJSON file the results are written to"),
+    output: str = typer.Option("auto", help="Output provider (auto|console|github|gitlab|bitbucket)"),
+    review_depth: ReviewDepth = typer.Option(ReviewDepth.STANDARD, help="Review depth (basic|standard|comprehensive)"),
+    variant: str = typer.Option("agentic", help="Review variant: agentic, quick or quick-sharded"),
+    guidelines: list[str] | None = typer.Option(None, "--guideline", help="Custom review guidelines (can be repeated)"),
+    files_exclude: list[str] | None = typer.Option(None, "--exclude"),
+    concurrency: int | None = typer.Option(
+        None, help="PRs reviewed concurrently (default: LAMPE_REVIEW_BATCH_CONCURRENCY or 4)"
+    ),
+    max_cost: float | None = typer.Option(
+        None, "--max-cost", help="Global LLM budget in USD, remaining PRs are skipped once it is spent"
+    ),
+    max_llm_calls: int | None = typer.Option(
+        None, "--max-llm-calls", help="Maximum LLM calls of each review, optional work is skipped as it gets close"
+    ),
+    max_input_tokens: int | None = typer.Option(
+        None, "--max-input-tokens", help="Maximum prompt tokens of each review"
+    ),
+    max_output_tokens: int | None = typer.Option(
+        None, "--max-output-tokens", help="Maximum completion tokens of each review"
+    ),
+    timeout: int | None = typer.Option(None, "--timeout-seconds"),
+    verbose: bool = typer.Option(False, "--verbose/--no-verbose"),
+    review_state: Path | None = typer.Option(
+        None, "--review-state", help="SQLite file keeping the last reviewed head per PR, as for review"
+    ),
+    perf_report: Path | None = typer.Option(
+        None, "--perf-report", dir_okay=False, help="Write a JSON summary of the step, tool, git and LLM timings"
+    ),
+):
+    """Review a batch of PRs in a single process and write one NDJSON result per PR.
+
+    Each input line is a JSON object with the PR commits (base, head), the repository as a local clone (repo)
+    or URL (repo_url, cloned once for all its PRs), and optional metadata (id, repo_full_name, number, title,
+    body, base_branch, head_branch).
+    """
+    # Workflow imports are deferred to keep the CLI startup fast
+    from lampe.cli.orchestrators.pr_review import PRReviewConfig
+    from lampe.cli.orchestrators.pr_review_batch import REVIEW_BATCH_CONCURRENCY, LLMCostBudget, run_review_batch
+
+    initialize()
+    config = PRReviewConfig(
+        review_depth=review_depth,
+        custom_guidelines=guidelines,
+        files_exclude_patterns=files_exclude,
+        timeout=timeout,
+        verbose=verbose,
+        review_state_path=str(review_state) if review_state else None,
+        max_llm_calls=max_llm_calls,
+        max_input_tokens=max_input_tokens,
+        max_output_tokens=max_output_tokens,
+    )
+    generator = create_review_generator(variant)
+    lines = input.read_text().splitlines()
+    with results.open("w") as results_file, performance_report(perf_report):
+        completed = asyncio.run(
+            run_review_batch(
+                lines,
+                results_file,
+                generator=generator,
+                output=output,
+                config=config,
+                concurrency=concurrency if concurrency is not None else REVIEW_BATCH_CONCURRENCY,
+                budget=LLMCostBudget(max_cost) if max_cost is not None else None,
+            )
+        )
+    statuses = ", ".join(
+        f"{status}={sum(r.status == status for r in completed)}" for status in ("ok", "error", "skipped")
+    )
+    typer.echo(f"Reviewed {len(completed)} PRs: {statuses}", err=True)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+import typer
+
+from lampe.cli.server.http import DEFAULT_HOST, DEFAULT_PORT, SERVE_CONCURRENCY, JobServer
+from lampe.cli.server.jobs import JobKind, JobRequest
+from lampe.core import initialize
+from lampe.review.workflows.pr_review.review_depth import ReviewDepth
+
+
+def serve(
+    host: str = typer.Option(DEFAULT_HOST, help="TCP host to listen on"),
+    port: int = typer.Option(DEFAULT_PORT, help="TCP port to listen on"),
+    socket: Path | None = typer.Option(None, "--socket", help="Unix socket to listen on instead of TCP"),
+    concurrency: int = typer.Option(SERVE_CONCURRENCY, help="Jobs run concurrently"),
+):
+    """Run a long-lived server executing review and describe jobs with warm imports and caches.
+
+    Jobs are queued in memory and scheduled fairly across repositories. SIGINT, SIGTERM or
+    ``lampe submit --drain`` stop accepting jobs, finish the queued and running ones, then exit.
+    """
+    initialize()
+    # Warm the tokenizer used by the workflows before the first job
+    from lampe.core.utils.token import encoder
+
+    encoder.encode("warm up")
+    asyncio.run(
+        JobServer(concurrency=concurrency).serve(host=host, port=port, socket_path=str(socket) if socket else None)
+    )
+
+
+def submit(
+    kind: JobKind = typer.Argument(JobKind.REVIEW, help="Job kind (review|describe)"),
+    repo: Path | None = typer.Option(None, exists=True, file_okay=False, dir_okay=True, readable=True),
+    repo_full_name: str | None = typer.Option(None, help="Repository full name (e.g. owner/repo)"),
+    base: str | None = typer.Option(None, help="Base commit SHA"),
+    head: str | None = typer.Option(None, help="Head commit SHA"),
+    title: str = typer.Option("Pull Request", help="PR title"),
+    output: str = typer.Option("auto", help="Output provider (auto|console|github|gitlab|bitbucket)"),
+    variant: str | None = typer.Option(None, help="Workflow variant, as for review and describe"),
+    review_depth: ReviewDepth = typer.Option(ReviewDepth.STANDARD, help="Review depth (basic|standard|comprehensive)"),
+    guidelines: list[str] | None = typer.Option(None, "--guideline", help="Custom review guidelines (can be repeated)"),
+    files_exclude: list[str] | None = typer.Option(None, "--exclude"),
+    timeout: int | None = typer.Option(None, "--timeout-seconds"),
+    server: str = typer.Option(f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", help="Server URL"),
+    socket: Path | None = typer.Option(None, "--socket", help="Unix socket of the server"),
+    wait: bool = typer.Option(True, "--wait/--no-wait", help="Wait for the job and print its result"),
+    drain: bool = typer.Option(False, "--drain", help="Ask the server to finish its jobs and stop, then exit"),
+):
+    """Submit a job to a running ``lampe serve`` and print it as JSON."""
+    from lampe.cli.server.client import JobClient
+
+    with JobClient(url=server, socket_path=str(socket) if socket else None) as client:
+        if drain:
+            typer.echo(json.dumps(client.drain()))
+            return
+        if repo is None or base is None or head is None:
+            raise typer.BadParameter("--repo, --base and --head are required to submit a job")
+        job = client.submit(
+            JobRequest(
+                kind=kind,
+                repo=str(repo.resolve()),
+                repo_full_name=repo_full_name,
+                base=base,
+                head=head,
+                title=title,
+                output=output,
+                variant=variant,
+                review_depth=review_depth,
+                guidelines=guidelines,
+                files_exclude=files_exclude,
+                timeout=timeout,
+            )
+        )
+        if wait:
+            job = client.wait(job["id"])
+        typer.echo(json.dumps(job))
+        if job["status"] == "failed":
+            raise typer.Exit(code=1)
@@ -8,6 +8,8 @@ from lampe.cli.commands.check_reviewed import check_reviewed
 from lampe.cli.commands.describe import describe
 from lampe.cli.commands.healthcheck import healthcheck
 from lampe.cli.commands.review import review
+from lampe.cli.commands.review_batch import review_batch
+from lampe.cli.commands.serve import serve, submit
 from lampe.core.loggingconfig import LAMPE_LOGGER_NAME
 
 logger = logging.getLogger(name=LAMPE_LOGGER_NAME)
@@ -30,6 +32,9 @@ def main():
     app.command("describe")(describe)
     app.command("healthcheck")(healthcheck)
     app.command("review")(review)
+    app.command("review-batch")(review_batch)
+    app.command("serve")(serve)
+    app.command("submit")(submit)
     app()
 
 
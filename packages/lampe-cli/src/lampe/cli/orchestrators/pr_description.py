@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import logging
+from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Protocol
 
@@ -7,8 +9,14 @@ from llama_index.core.workflow import Event, StartEvent, StopEvent, Workflow, st
 
 from lampe.cli.providers.base import PRDescriptionPayload, Provider
 from lampe.core.data_models import PullRequest, Repository
+from lampe.core.llmbudget import LLMBudget
+from lampe.core.loggingconfig import LAMPE_LOGGER_NAME
 from lampe.describe.workflows.pr_description.generation import MAX_TOKENS as DEFAULT_MAX_TOKENS
 from lampe.describe.workflows.pr_description.generation import generate_pr_description as generate_default_description
+from lampe.describe.workflows.pr_description.generation_map_reduce import MAX_CONCURRENT_CHUNK_SUMMARIES
+from lampe.describe.workflows.pr_description.generation_map_reduce import (
+    generate_pr_description as generate_map_reduce_description,
+)
 from lampe.describe.workflows.pr_description.generation_multi_file import (
     generate_pr_description as generate_agentic_description,
 )
@@ -25,6 +33,8 @@ class PRDescriptionGenerator(Protocol):
         timeout: int | None = None,
         verbose: bool = False,
         metadata: dict | None = None,
+        on_token: Callable[[str], None] | None = None,
+        budget: LLMBudget | None = None,
     ) -> object:  # expects .description
         ...
 
@@ -36,6 +46,19 @@ class PRDescriptionConfig:
     truncation_tokens: int = DEFAULT_MAX_TOKENS
     timeout: int | None = None
     verbose: bool = False
+    # Stream the description to providers that render it while it is generated
+    stream: bool = False
+    # Limits of a single description run, skipped work is logged. None means unlimited
+    max_llm_calls: int | None = None
+    max_input_tokens: int | None = None
+    max_output_tokens: int | None = None
+
+    def create_budget(self) -> LLMBudget:
+        return LLMBudget(
+            max_input_tokens=self.max_input_tokens,
+            max_output_tokens=self.max_output_tokens,
+            max_llm_calls=self.max_llm_calls,
+        )
 
 
 class DefaultGeneratorAdapter:
@@ -49,7 +72,12 @@ class DefaultGeneratorAdapter:
         timeout: int | None = None,
         verbose: bool = False,
         metadata: dict | None = None,
+        on_token: Callable[[str], None] | None = None,
+        budget: LLMBudget | None = None,
     ) -> object:
+        kwargs: dict = {"on_token": on_token} if on_token is not None else {}
+        if budget is not None:
+            kwargs["budget"] = budget
         return await generate_default_description(
             repository=repository,
             pull_request=pull_request,
@@ -59,6 +87,7 @@ class DefaultGeneratorAdapter:
             timeout=timeout,
             verbose=verbose,
             metadata=metadata,
+            **kwargs,
         )
 
 
@@ -73,14 +102,52 @@ class AgenticGeneratorAdapter:
         timeout: int | None = None,
         verbose: bool = False,
         metadata: dict | None = None,
+        on_token: Callable[[str], None] | None = None,
+        budget: LLMBudget | None = None,
     ) -> object:
-        # agentic path currently ignores reinclude/truncation/metadata
+        # agentic path currently ignores reinclude/truncation/metadata/streaming
+        kwargs = {"budget": budget} if budget is not None else {}
         return await generate_agentic_description(
             repository=repository,
             pull_request=pull_request,
             files_exclude_patterns=files_exclude_patterns,
             timeout=timeout,
             verbose=verbose,
+            **kwargs,
+        )
+
+
+class MapReduceGeneratorAdapter:
+    """Summarizes token-bounded diff chunks concurrently, then reduces the summaries (large PRs)."""
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENT_CHUNK_SUMMARIES) -> None:
+        self.max_concurrency = max_concurrency
+
+    async def generate(
+        self,
+        repository: Repository,
+        pull_request: PullRequest,
+        files_exclude_patterns: list[str] | None = None,
+        files_reinclude_patterns: list[str] | None = None,
+        truncation_tokens: int = DEFAULT_MAX_TOKENS,
+        timeout: int | None = None,
+        verbose: bool = False,
+        metadata: dict | None = None,
+        on_token: Callable[[str], None] | None = None,
+        budget: LLMBudget | None = None,
+    ) -> object:
+        # streaming is not supported: the description is only generated after all chunk summaries
+        return await generate_map_reduce_description(
+            repository=repository,
+            pull_request=pull_request,
+            files_exclude_patterns=files_exclude_patterns,
+            files_reinclude_patterns=files_reinclude_patterns,
+            truncation_tokens=truncation_tokens,
+            timeout=timeout,
+            verbose=verbose,
+            metadata=metadata,
+            max_concurrency=self.max_concurrency,
+            budget=budget,
         )
 
 
@@ -98,6 +165,12 @@ class PRDescriptionOrchestratorWorkflow(Workflow):
 
     @step
     async def run_generation(self, ev: PRDescriptionStart) -> Event:
+        kwargs = {}
+        if ev.config.stream and self.provider.supports_description_streaming:
+            kwargs["on_token"] = self.provider.stream_pr_description
+        budget = ev.config.create_budget()
+        if budget.limited:
+            kwargs["budget"] = budget
         res = await self.generator.generate(
             repository=ev.repository,
             pull_request=ev.pull_request,
@@ -106,11 +179,15 @@ class PRDescriptionOrchestratorWorkflow(Workflow):
             truncation_tokens=ev.config.truncation_tokens,
             timeout=ev.config.timeout,
             verbose=ev.config.verbose,
+            **kwargs,
         )
+        report = getattr(res, "budget", None)
+        if budget.limited and report is not None:
+            logging.getLogger(LAMPE_LOGGER_NAME).info(report.format_summary())
         return Event(result={"description": getattr(res, "description", "")})
 
     @step
     async def deliver(self, ev: Event) -> StopEvent:
         desc = ev.result["description"]
-        self.provider.deliver_pr_description(PRDescriptionPayload(description=desc))
+        await self.provider.adeliver_pr_description(PRDescriptionPayload(description=desc))
         return StopEvent(result={"description": desc})
@@ -1,14 +1,24 @@
 from __future__ import annotations
 
+import logging
 from dataclasses import dataclass
-from typing import Protocol
+from functools import partial
+from typing import Callable, Protocol
 
 from llama_index.core.workflow import Event, StartEvent, StopEvent, Workflow, step
 
 from lampe.cli.providers.base import Provider, PRReviewPayload
 from lampe.core.data_models import PullRequest, Repository
+from lampe.core.llmbudget import LLMBudget, SharedSpendLimit
+from lampe.core.loggingconfig import LAMPE_LOGGER_NAME
 from lampe.review.workflows.agentic_review import AgenticReviewComplete, generate_agentic_pr_review
 from lampe.review.workflows.pr_review.data_models import AgentReviewOutput, ReviewDepth
+from lampe.review.workflows.pr_review.incremental_review import (
+    ReviewState,
+    ReviewStateStore,
+    prepare_incremental_review,
+    review_state_key,
+)
 from lampe.review.workflows.quick_review import QuickReviewComplete, generate_quick_pr_review
 
 
@@ -22,6 +32,7 @@ class PRReviewGenerator(Protocol):
         files_exclude_patterns: list[str] | None = None,
         timeout: int | None = None,
         verbose: bool = False,
+        budget: LLMBudget | None = None,
     ) -> AgenticReviewComplete | QuickReviewComplete: ...
 
 
@@ -32,6 +43,22 @@ class PRReviewConfig:
     files_exclude_patterns: list[str] | None = None
     timeout: int | None = None
     verbose: bool = False
+    # SQLite review state store. When set, follow-up pushes only review the delta since the last reviewed head
+    review_state_path: str | None = None
+    # Limits of a single review run, skipped work is logged. None means unlimited
+    max_llm_calls: int | None = None
+    max_input_tokens: int | None = None
+    max_output_tokens: int | None = None
+    # Limit shared with other reviews, e.g. the global cost budget of a batch
+    shared_limit: SharedSpendLimit | None = None
+
+    def create_budget(self) -> LLMBudget:
+        return LLMBudget(
+            max_input_tokens=self.max_input_tokens,
+            max_output_tokens=self.max_output_tokens,
+            max_llm_calls=self.max_llm_calls,
+            shared_limit=self.shared_limit,
+        )
 
 
 class AgenticOrchestratorAdapter:
@@ -46,6 +73,7 @@ class AgenticOrchestratorAdapter:
         files_exclude_patterns: list[str] | None = None,
         timeout: int | None = None,
         verbose: bool = False,
+        budget: LLMBudget | None = None,
     ) -> AgenticReviewComplete:
         result = await generate_agentic_pr_review(
             repository=repository,
@@ -55,12 +83,19 @@ class AgenticOrchestratorAdapter:
             files_exclude_patterns=files_exclude_patterns,
             timeout=timeout,
             verbose=verbose,
+            budget=budget,
         )
         return result
 
 
 class QuickOrchestratorAdapter:
-    """Uses the quick review workflow (single agent, grep-first, Claude 4.5 with thinking)."""
+    """Uses the quick review workflow (single agent, grep-first, Claude 4.5 with thinking).
+
+    With ``sharded``, large PRs are split across concurrent quick review agents.
+    """
+
+    def __init__(self, sharded: bool = False) -> None:
+        self.sharded = sharded
 
     async def generate(
         self,
@@ -71,16 +106,27 @@ class QuickOrchestratorAdapter:
         files_exclude_patterns: list[str] | None = None,
         timeout: int | None = None,
         verbose: bool = False,
+        budget: LLMBudget | None = None,
     ) -> QuickReviewComplete:
         result = await generate_quick_pr_review(
             repository=repository,
             pull_request=pull_request,
             timeout=timeout,
             verbose=verbose,
+            sharded=self.sharded,
+            budget=budget,
         )
         return result
 
 
+# Review generators by CLI variant name
+REVIEW_GENERATORS: dict[str, Callable[[], PRReviewGenerator]] = {
+    "agentic": AgenticOrchestratorAdapter,
+    "quick": QuickOrchestratorAdapter,
+    "quick-sharded": partial(QuickOrchestratorAdapter, sharded=True),
+}
+
+
 class PRReviewStart(StartEvent):
     repository: Repository
     pull_request: PullRequest
@@ -89,6 +135,11 @@ class PRReviewStart(StartEvent):
 
 class PRReviewResult(Event):
     result: list[AgentReviewOutput]
+    # Findings of previous runs still valid at the reviewed head (incremental review), already delivered
+    carried_forward: list[AgentReviewOutput] = []
+    repository: Repository | None = None
+    pull_request: PullRequest | None = None
+    review_state_path: str | None = None
 
 
 class PRReviewOrchestratorWorkflow(Workflow):
@@ -99,19 +150,61 @@ class PRReviewOrchestratorWorkflow(Workflow):
 
     @step
     async def run_generation(self, ev: PRReviewStart) -> PRReviewResult:
+        pull_request = ev.pull_request
+        carried_forward: list[AgentReviewOutput] = []
+        if ev.config.review_state_path:
+            state = ReviewStateStore(ev.config.review_state_path).get(
+                review_state_key(ev.repository), ev.pull_request.number
+            )
+            incremental = prepare_incremental_review(state, ev.repository, ev.pull_request)
+            if incremental is not None:
+                pull_request, carried_forward = incremental
+                if pull_request.base_commit_hash == pull_request.head_commit_hash:
+                    # Head already reviewed: nothing new to review or deliver
+                    return PRReviewResult(
+                        result=[],
+                        carried_forward=carried_forward,
+                        repository=ev.repository,
+                        pull_request=ev.pull_request,
+                    )
+
+        budget = ev.config.create_budget()
+        # Generators without budget support are only given one when limits are set
+        kwargs = {"budget": budget} if budget.limited else {}
         res = await self.generator.generate(
             repository=ev.repository,
-            pull_request=ev.pull_request,
+            pull_request=pull_request,
             review_depth=ev.config.review_depth,
             custom_guidelines=ev.config.custom_guidelines,
             files_exclude_patterns=ev.config.files_exclude_patterns,
             timeout=ev.config.timeout,
             verbose=ev.config.verbose,
+            **kwargs,
         )
+        report = getattr(res, "budget", None)
+        if budget.limited and report is not None:
+            logging.getLogger(LAMPE_LOGGER_NAME).info(report.format_summary())
 
-        return PRReviewResult(result=res.output)
+        return PRReviewResult(
+            result=res.output,
+            carried_forward=carried_forward,
+            repository=ev.repository,
+            pull_request=ev.pull_request,
+            review_state_path=ev.config.review_state_path,
+        )
 
     @step
     async def deliver(self, ev: PRReviewResult) -> StopEvent:
-        self.provider.deliver_pr_review(PRReviewPayload(reviews=ev.result))
-        return StopEvent(result=ev.result)
+        if ev.result or not ev.carried_forward:
+            await self.provider.adeliver_pr_review(PRReviewPayload(reviews=ev.result))
+        reviews = ev.carried_forward + ev.result
+        if ev.review_state_path and ev.repository and ev.pull_request:
+            ReviewStateStore(ev.review_state_path).save(
+                ReviewState(
+                    repository=review_state_key(ev.repository),
+                    pr_number=ev.pull_request.number,
+                    head_commit_hash=ev.pull_request.head_commit_hash,
+                    reviews=reviews,
+                )
+            )
+        return StopEvent(result=reviews)
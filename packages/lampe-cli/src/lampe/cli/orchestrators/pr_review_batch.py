@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import shutil
+import time
+from dataclasses import replace
+from typing import IO, Any
+
+import litellm
+from litellm.integrations.custom_logger import CustomLogger
+from pydantic import BaseModel, Field, ValidationError, model_validator
+
+from lampe.cli.orchestrators.pr_review import (
+    PRReviewConfig,
+    PRReviewGenerator,
+    PRReviewOrchestratorWorkflow,
+    PRReviewStart,
+)
+from lampe.cli.providers.base import Provider
+from lampe.core.data_models import PullRequest, Repository
+from lampe.core.loggingconfig import LAMPE_LOGGER_NAME
+from lampe.core.tools.repository.management import clone_repo, fetch_commit_ref
+
+logger = logging.getLogger(name=LAMPE_LOGGER_NAME)
+
+# NOTE: Number of PRs reviewed concurrently by review-batch, by default 4
+REVIEW_BATCH_CONCURRENCY = int(os.getenv("LAMPE_REVIEW_BATCH_CONCURRENCY", 4))
+
+
+class BatchReviewItem(BaseModel):
+    """A PR to review, one JSON object per line of the review-batch input."""
+
+    id: str | None = Field(default=None, description="Caller identifier echoed in the result")
+    repo: str | None = Field(default=None, description="Path of a local clone of the repository")
+    repo_url: str | None = Field(default=None, description="Repository URL, cloned once per batch")
+    repo_full_name: str | None = Field(default=None, description="Repository full name (e.g. owner/repo)")
+    base: str = Field(..., description="Base commit SHA")
+    head: str = Field(..., description="Head commit SHA")
+    number: int = Field(default=0, description="PR number")
+    title: str = Field(default="Pull Request", description="PR title")
+    body: str | None = Field(default=None, description="PR body")
+    base_branch: str = Field(default="", description="Base branch name")
+    head_branch: str = Field(default="", description="Head branch name")
+
+    @model_validator(mode="after")
+    def _check_repository(self) -> BatchReviewItem:
+        if not self.repo and not self.repo_url:
+            raise ValueError("one of 'repo' or 'repo_url' is required")
+        return self
+
+    def pull_request(self) -> PullRequest:
+        return PullRequest(
+            number=self.number,
+            title=self.title,
+            body=self.body,
+            base_commit_hash=self.base,
+            base_branch_name=self.base_branch,
+            head_commit_hash=self.head,
+            head_branch_name=self.head_branch,
+        )
+
+
+class BatchReviewResult(BaseModel):
+    """Outcome of a PR review, one JSON object per line of the review-batch results."""
+
+    line: int = Field(..., description="Line number of the PR in the input")
+    id: str | None = None
+    repo_full_name: str | None = None
+    number: int | None = None
+    head: str | None = None
+    status: str = Field(..., description="ok, error or skipped")
+    duration_seconds: float = 0.0
+    reviews: list[dict[str, Any]] = Field(default_factory=list, description="Delivered AgentReviewOutput dumps")
+    error: str | None = None
+
+
+class RepositoryClones:
+    """Clones shared by the PRs of a batch: one partial clone per repository URL.
+
+    The first PR of a repository clones it, later PRs only fetch their base and head commits into the
+    same clone. Clones are removed by ``cleanup``.
+    """
+
+    def __init__(self) -> None:
+        self._paths: dict[str, str] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def checkout(self, repo_url: str, base: str, head: str) -> str:
+        """Return the path of the clone of ``repo_url`` with both commits available locally."""
+        async with self._locks.setdefault(repo_url, asyncio.Lock()):
+            path = self._paths.get(repo_url)
+            if path is None:
+                path = await asyncio.to_thread(clone_repo, repo_url, head_ref=head, base_ref=base)
+                self._paths[repo_url] = path
+            else:
+                for commit in (base, head):
+                    await asyncio.to_thread(fetch_commit_ref, path, commit)
+            return path
+
+    def cleanup(self) -> None:
+        for path in self._paths.values():
+            shutil.rmtree(path, ignore_errors=True)
+        self._paths.clear()
+
+
+class LLMCostBudget(CustomLogger):
+    """Global LLM spend of a batch, tracked from the cost LiteLLM reports for each successful call.
+
+    The budget is the shared limit of the budgets of the reviews in progress: they read the global spend on
+    every check, skip optional work as it gets close and stop their agents once it is spent.
+
+    Parameters
+    ----------
+    max_cost
+        Spend in USD after which no new review is started and running reviews stop spending, None for no limit
+    """
+
+    def __init__(self, max_cost: float | None = None) -> None:
+        super().__init__()
+        self.max_cost = max_cost
+        self.spent = 0.0
+
+    @property
+    def exhausted(self) -> bool:
+        return self.max_cost is not None and self.spent >= self.max_cost
+
+    def used_fraction(self) -> float:
+        if self.max_cost is None:
+            return 0.0
+        return self.spent / self.max_cost if self.max_cost > 0 else 1.0
+
+    def log_success_event(self, kwargs, response_obj, start_time, end_time) -> None:
+        self.spent += kwargs.get("response_cost") or 0.0
+
+    async def async_log_success_event(self, kwargs, response_obj, start_time, end_time) -> None:
+        self.log_success_event(kwargs, response_obj, start_time, end_time)
+
+
+async def run_review_batch(
+    lines: list[str],
+    results: IO[str],
+    generator: PRReviewGenerator,
+    output: str,
+    config: PRReviewConfig,
+    concurrency: int = REVIEW_BATCH_CONCURRENCY,
+    budget: LLMCostBudget | None = None,
+) -> list[BatchReviewResult]:
+    """Review the PRs of a JSONL batch concurrently and write one NDJSON result per PR as it completes.
+
+    Parameters
+    ----------
+    lines
+        Lines of the JSONL input, each a ``BatchReviewItem``. Blank lines are ignored
+    results
+        Text stream the NDJSON results are written to
+    generator
+        Review generator shared by all the reviews
+    output
+        Provider name the reviews are delivered to, as for ``lampe review``
+    config
+        Review configuration shared by all the reviews
+    concurrency
+        Maximum number of PRs reviewed at the same time, by default REVIEW_BATCH_CONCURRENCY
+    budget
+        Global LLM spend budget, shared with the reviews in progress. Once exhausted, running reviews stop
+        spending and remaining PRs are skipped, by default no budget
+
+    Returns
+    -------
+    :
+        Results in completion order
+    """
+    if budget is not None:
+        config = replace(config, shared_limit=budget)
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    clones = RepositoryClones()
+    completed: list[BatchReviewResult] = []
+
+    def write(result: BatchReviewResult) -> None:
+        completed.append(result)
+        results.write(result.model_dump_json() + "\n")
+        results.flush()
+
+    async def review_line(line_number: int, line: str) -> None:
+        try:
+            item = BatchReviewItem.model_validate_json(line)
+        except ValidationError as e:
+            write(BatchReviewResult(line=line_number, status="error", error=f"Invalid batch item: {e}"))
+            return
+        result = BatchReviewResult(
+            line=line_number,
+            id=item.id,
+            repo_full_name=item.repo_full_name,
+            number=item.number,
+            head=item.head,
+            status="ok",
+        )
+        async with semaphore:
+            if budget is not None and budget.exhausted:
+                result.status = "skipped"
+                result.error = f"LLM budget exhausted (${budget.spent:.2f} of ${budget.max_cost:.2f})"
+                write(result)
+                return
+            start = time.perf_counter()
+            try:
+                repo_path = item.repo or await clones.checkout(item.repo_url or "", item.base, item.head)
+                repository = Repository(local_path=repo_path, full_name=item.repo_full_name)
+                pull_request = item.pull_request()
+                provider = Provider.create_provider(
+                    provider_name=output, repository=repository, pull_request=pull_request
+                )
+                workflow = PRReviewOrchestratorWorkflow(
+                    provider=provider, generator=generator, timeout=config.timeout, verbose=config.verbose
+                )
+                reviews = await workflow.run(
+                    start_event=PRReviewStart(repository=repository, pull_request=pull_request, config=config)
+                )
+                result.reviews = [review.model_dump(mode="json") for review in reviews or []]
+            except Exception as e:
+                logger.exception(f"Batch review of line {line_number} failed: {e}")
+                result.status = "error"
+                result.error = str(e)
+            result.duration_seconds = round(time.perf_counter() - start, 3)
+            write(result)
+
+    if budget is not None:
+        litellm.callbacks.append(budget)
+    try:
+        await asyncio.gather(*(review_line(number, line) for number, line in enumerate(lines, start=1) if line.strip()))
+    finally:
+        if budget is not None and budget in litellm.callbacks:
+            litellm.callbacks.remove(budget)
+        clones.cleanup()
+    return completed
@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 import re
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import StrEnum
+from typing import TYPE_CHECKING
 
 from lampe.core.data_models import PullRequest, Repository
-from lampe.review.workflows.pr_review.data_models import AgentReviewOutput
+
+if TYPE_CHECKING:
+    from lampe.review.workflows.pr_review.data_models import AgentReviewOutput
 
 
 @dataclass
@@ -80,10 +84,21 @@ class ProviderType(StrEnum):
 class Provider(ABC):
     """Abstract provider for delivering workflow outputs."""
 
+    # Whether the provider renders the PR description while it is generated (see stream_pr_description)
+    supports_description_streaming: bool = False
+
     def __init__(self, repository: Repository, pull_request: PullRequest) -> None:
         self.repository = repository
         self.pull_request = pull_request
 
+    def stream_pr_description(self, delta: str) -> None:
+        """Receive raw text of the PR description as it is generated.
+
+        Only called on providers with ``supports_description_streaming``, before ``deliver_pr_description``
+        which still receives the final parsed description. Ignored by default.
+        """
+        return None
+
     @abstractmethod
     def deliver_pr_description(self, payload: PRDescriptionPayload) -> None:
         """Deliver a PR description to the configured destination."""
@@ -94,6 +109,22 @@ class Provider(ABC):
         """Deliver a PR review to the configured destination."""
         ...
 
+    async def adeliver_pr_description(self, payload: PRDescriptionPayload) -> None:
+        """Deliver a PR description without blocking the event loop.
+
+        Runs ``deliver_pr_description`` in a worker thread by default. Providers doing HTTP I/O override it with
+        a native implementation on the shared async client, their ``deliver_pr_description`` wrapping it.
+        """
+        await asyncio.to_thread(self.deliver_pr_description, payload)
+
+    async def adeliver_pr_review(self, payload: PRReviewPayload) -> None:
+        """Deliver a PR review without blocking the event loop.
+
+        Runs ``deliver_pr_review`` in a worker thread by default. Providers doing HTTP I/O override it with
+        a native implementation on the shared async client, their ``deliver_pr_review`` wrapping it.
+        """
+        await asyncio.to_thread(self.deliver_pr_review, payload)
+
     @abstractmethod
     def healthcheck(self) -> None:
         """Check if the provider is healthy and can connect to the service."""
@@ -155,6 +186,15 @@ class Provider(ABC):
             raise ValueError(f"Provider type {provider_name} not yet implemented")
 
 
+# Hidden marker of the comments posted by Lampe (an empty markdown link is not rendered)
+REVIEW_MARKER = "[](lampe-sdk-review)"
+
+
+def add_review_marker(body: str) -> str:
+    """Append the hidden Lampe marker to a comment body, so that ``has_reviewed`` recognizes it."""
+    return f"{body}\n\n{REVIEW_MARKER}"
+
+
 def update_or_add_text_between_tags(text: str, new_text: str, feature: str) -> str:
     """
     Update the text between the tags [](lampe-sdk-{feature}-start) and [](lampe-sdk-{feature}-end)
@@ -1,18 +1,86 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from functools import cached_property
+from typing import Any
 
+import httpx
 import requests
 
-from lampe.cli.providers.base import PRDescriptionPayload, Provider, PRReviewPayload, update_or_add_text_between_tags
+from lampe.cli.providers.base import (
+    REVIEW_MARKER,
+    PRDescriptionPayload,
+    Provider,
+    PRReviewPayload,
+    add_review_marker,
+    update_or_add_text_between_tags,
+)
+from lampe.cli.providers.etag_cache import ETagCache
+from lampe.cli.providers.http_client import get_async_client, run_sync
 from lampe.core.data_models.pull_request import PullRequest
 from lampe.core.data_models.repository import Repository
 from lampe.core.loggingconfig import LAMPE_LOGGER_NAME
 
 logger = logging.getLogger(name=LAMPE_LOGGER_NAME)
 
+# NOTE: Bitbucket Cloud API URL, can be overridden e.g. to point to a local mock server
+BITBUCKET_API_URL = os.getenv("LAMPE_BITBUCKET_API_URL", "https://api.bitbucket.org")
+# NOTE: Maximum number of inline comments posted concurrently, by default 4
+BITBUCKET_MAX_CONCURRENT_COMMENTS = int(os.getenv("LAMPE_BITBUCKET_MAX_CONCURRENT_COMMENTS", 4))
+# NOTE: Maximum number of retries of a request rate limited (429) or refused as unavailable (503), by default 5
+BITBUCKET_MAX_RETRIES = int(os.getenv("LAMPE_BITBUCKET_MAX_RETRIES", 5))
+# NOTE: Initial backoff when the response has no Retry-After header, doubled on each retry, by default 1 second
+BITBUCKET_RETRY_BACKOFF_SECONDS = float(os.getenv("LAMPE_BITBUCKET_RETRY_BACKOFF_SECONDS", 1.0))
+# Upper bound of a single wait, whatever Retry-After asks for
+BITBUCKET_MAX_RETRY_WAIT_SECONDS = 60.0
+# Timeout of a single request
+BITBUCKET_REQUEST_TIMEOUT_SECONDS = 30
+_RETRY_STATUS_CODES = {429, 503}
+# Comments per page when scanning comments in has_reviewed (maximum allowed by the API)
+BITBUCKET_PAGE_SIZE = 100
+# Comments posted before the review marker existed: agent name header, focus areas, line comment marker
+_LEGACY_REVIEW_PATTERNS = [r"^##\s+\w+", r"\*\*Focus Areas:\*\*", r"##\s*🔦🐛"]
+
+
+def _retry_after_seconds(response: requests.Response | httpx.Response) -> float | None:
+    """Seconds to wait from the Retry-After header (delay in seconds or HTTP date), None when absent or invalid."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _inline_anchor(path: str, line_number: int) -> dict[str, Any]:
+    return {
+        "from": line_number - 1 if line_number != 0 else 0,
+        "to": line_number,
+        "start_from": line_number - 1 if line_number != 0 else 0,
+        "start_to": line_number,
+        "path": path,
+    }
+
+
+def _line_number(line: str) -> int:
+    """Line number of a line comment key, e.g. "12" or "L12", 0 when it has none."""
+    try:
+        return int(line)
+    except ValueError:
+        match = re.match(r"\D*(\d+)", str(line))
+        return int(match.group(1)) if match else 0
+
 
 class BitbucketProvider(Provider):
     """Bitbucket provider for delivering PR descriptions to Bitbucket Cloud API."""
@@ -36,8 +104,15 @@ class BitbucketProvider(Provider):
                 "BITBUCKET_WORKSPACE and BITBUCKET_REPO_SLUG environment variables are required for Bitbucket provider"
             )
 
+        # Keep-alive session of the synchronous requests (has_reviewed, healthcheck), deliveries use the async client
+        self.session = requests.Session()
+        # Requests (synchronous and async) wait until this time (time.monotonic) once the API asked to slow down
+        self._retry_not_before = 0.0
+        self._retry_lock = threading.Lock()
+
         # Initialize Bitbucket client with appropriate authentication
         self.base_url, self.auth_headers = self._initialize_bitbucket_client()
+        self.session.headers.update(self.auth_headers)
 
     def _initialize_bitbucket_client(self) -> tuple[str, dict]:
         """Initialize Bitbucket client with appropriate authentication method."""
@@ -61,7 +136,7 @@ class BitbucketProvider(Provider):
     def _create_token_auth(self, token: str) -> tuple[str, dict]:
         """Create Bitbucket client using repository/workspace access token."""
         try:
-            base_url = "https://api.bitbucket.org"
+            base_url = BITBUCKET_API_URL
             auth_headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
             return base_url, auth_headers
         except Exception as e:
@@ -70,7 +145,7 @@ class BitbucketProvider(Provider):
     def _create_app_auth(self, app_key: str, app_secret: str) -> tuple[str, dict]:
         """Create Bitbucket client using Bitbucket App authentication."""
         try:
-            base_url = "https://api.bitbucket.org"
+            base_url = BITBUCKET_API_URL
 
             # Get access token using OAuth 2.0 client credentials flow
             token_url = f"{base_url}/site/oauth2/access_token"
@@ -80,7 +155,7 @@ class BitbucketProvider(Provider):
                 "client_secret": app_secret,
             }
 
-            token_response = requests.post(token_url, data=token_data)
+            token_response = self._request("POST", token_url, data=token_data)
             token_response.raise_for_status()
             token_info = token_response.json()
             access_token = token_info["access_token"]
@@ -93,6 +168,82 @@ class BitbucketProvider(Provider):
         except Exception as e:
             raise ValueError(f"Failed to authenticate with Bitbucket App: {e}")
 
+    def _request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send a request on the pooled session, waiting and retrying while the API rate limits it.
+
+        A 429 or 503 response is retried after its Retry-After delay, or an exponential backoff without one,
+        up to ``BITBUCKET_MAX_RETRIES`` times. The wait applies to all the concurrent requests of the provider,
+        since they share the rate limit.
+
+        Parameters
+        ----------
+        method
+            HTTP method
+        url
+            Request URL
+        kwargs
+            Passed to ``requests.Session.request``
+
+        Returns
+        -------
+        :
+            The last response, whose status is left to the caller to check
+        """
+        kwargs.setdefault("timeout", BITBUCKET_REQUEST_TIMEOUT_SECONDS)
+        for attempt in range(BITBUCKET_MAX_RETRIES + 1):
+            if (wait := self._retry_wait()) > 0:
+                time.sleep(wait)
+            response = self.session.request(method, url, **kwargs)
+            if response.status_code not in _RETRY_STATUS_CODES or attempt == BITBUCKET_MAX_RETRIES:
+                return response
+            self._delay_retries(response, attempt)
+        return response
+
+    async def _arequest(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a request on the shared async client, waiting and retrying while the API rate limits it.
+
+        Async counterpart of ``_request``, sharing its rate limit wait.
+
+        Parameters
+        ----------
+        method
+            HTTP method
+        url
+            Request URL
+        kwargs
+            Passed to ``httpx.AsyncClient.request``
+
+        Returns
+        -------
+        :
+            The last response, whose status is left to the caller to check
+        """
+        kwargs.setdefault("timeout", BITBUCKET_REQUEST_TIMEOUT_SECONDS)
+        headers = {**self.auth_headers, **kwargs.pop("headers", {})}
+        for attempt in range(BITBUCKET_MAX_RETRIES + 1):
+            if (wait := self._retry_wait()) > 0:
+                await asyncio.sleep(wait)
+            response = await get_async_client().request(method, url, headers=headers, **kwargs)
+            if response.status_code not in _RETRY_STATUS_CODES or attempt == BITBUCKET_MAX_RETRIES:
+                return response
+            self._delay_retries(response, attempt)
+        return response
+
+    def _retry_wait(self) -> float:
+        """Seconds left before requests may be sent again."""
+        with self._retry_lock:
+            return self._retry_not_before - time.monotonic()
+
+    def _delay_retries(self, response: requests.Response | httpx.Response, attempt: int) -> None:
+        """Delay all the requests of the provider after a rate limited response, they share the rate limit."""
+        delay = _retry_after_seconds(response)
+        if delay is None:
+            delay = BITBUCKET_RETRY_BACKOFF_SECONDS * 2**attempt
+        delay = min(delay, BITBUCKET_MAX_RETRY_WAIT_SECONDS)
+        logger.warning(f"Bitbucket API returned {response.status_code}, retrying in {delay:.1f}s")
+        with self._retry_lock:
+            self._retry_not_before = max(self._retry_not_before, time.monotonic() + delay)
+
     def healthcheck(self) -> None:
         """Check if the Bitbucket provider is healthy and can connect to Bitbucket."""
         logger.info("🔍 Checking Bitbucket provider health...")
@@ -134,7 +285,7 @@ class BitbucketProvider(Provider):
         try:
             # Test API access by getting repository info
             repo_url = f"{self.base_url}/2.0/repositories/{workspace}/{repo_slug}"
-            response = requests.get(repo_url, headers=self.auth_headers)
+            response = self._request("GET", repo_url)
             response.raise_for_status()
             repo_data = response.json()
 
@@ -158,6 +309,14 @@ class BitbucketProvider(Provider):
             raise
 
     def deliver_pr_description(self, payload: PRDescriptionPayload) -> None:
+        """Update the PR description on Bitbucket (synchronous wrapper of ``adeliver_pr_description``)."""
+        run_sync(self.adeliver_pr_description(payload))
+
+    def deliver_pr_review(self, payload: PRReviewPayload) -> None:
+        """Post PR review comments on Bitbucket (synchronous wrapper of ``adeliver_pr_review``)."""
+        run_sync(self.adeliver_pr_review(payload))
+
+    async def adeliver_pr_description(self, payload: PRDescriptionPayload) -> None:
         """Update the PR description on Bitbucket."""
         if self.pull_request.number == 0:
             raise ValueError("Cannot update Bitbucket PR description for local run")
@@ -170,7 +329,7 @@ class BitbucketProvider(Provider):
             )
 
             # Fetch current PR to get existing description
-            response = requests.get(pr_url, headers=self.auth_headers)
+            response = await self._arequest("GET", pr_url)
             response.raise_for_status()
             pr_data = response.json()
 
@@ -182,11 +341,11 @@ class BitbucketProvider(Provider):
 
             # Update the PR
             update_data = {"description": new_description}
-            update_response = requests.put(pr_url, json=update_data, headers=self.auth_headers)
+            update_response = await self._arequest("PUT", pr_url, json=update_data)
             update_response.raise_for_status()
 
             logger.info(f"✅ Successfully updated PR #{self.pull_request.number} description on Bitbucket")
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"❌ Failed to update Bitbucket PR: {e}")
             # Fallback to console output
             logger.info("Description:")
@@ -197,115 +356,94 @@ class BitbucketProvider(Provider):
             logger.info("Description:")
             logger.info(payload.description)
 
-    def deliver_pr_review(self, payload: PRReviewPayload) -> None:
-        """Post PR review comments on Bitbucket."""
+    async def adeliver_pr_review(self, payload: PRReviewPayload) -> None:
+        """Post PR review comments on Bitbucket.
+
+        General comments (agent summaries, then summaries of the files without inline comments) are posted first,
+        one after another in review order. Inline comments are then posted concurrently, at most
+        ``BITBUCKET_MAX_CONCURRENT_COMMENTS`` at a time, since they are anchored to their line.
+        """
         if self.pull_request.number == 0:
             raise ValueError("Cannot post Bitbucket PR review for local run")
 
-        try:
-            # Post review comments for each agent review
-            for agent_review in payload.reviews:
-                # Post agent summary comment
-                if agent_review.summary:
-                    try:
-                        comment_url = (
-                            f"{self.base_url}/2.0/repositories/{self.workspace}/"
-                            f"{self.repo_slug}/pullrequests/{self.pull_request.number}/comments"
-                        )
-                        comment_data = {
+        comment_url = (
+            f"{self.base_url}/2.0/repositories/{self.workspace}/"
+            f"{self.repo_slug}/pullrequests/{self.pull_request.number}/comments"
+        )
+        general_comments: list[tuple[str, dict]] = []
+        inline_comments: list[tuple[str, dict]] = []
+        for agent_review in payload.reviews:
+            if agent_review.summary:
+                general_comments.append(
+                    (
+                        f"agent summary for {agent_review.agent_name}",
+                        {
                             "content": {
                                 "raw": f"## {agent_review.agent_name}\n\n"
                                 f"**Focus Areas:** {', '.join(agent_review.focus_areas)}\n\n"
                                 f"{agent_review.summary}"
                             }
-                        }
-                        response = requests.post(comment_url, json=comment_data, headers=self.auth_headers)
-                        response.raise_for_status()
-                    except Exception as e:
-                        logger.warning(f"Failed to post agent summary for {agent_review.agent_name}: {e}")
-
-                # Post file-specific comments
-                for file_review in agent_review.reviews:
-                    if file_review.line_comments:
-                        # Create review comments for specific lines
-                        for line, comment in file_review.line_comments.items():
-                            try:
-                                line_number = int(line)
-                            except ValueError:
-                                match = re.match(r"\D*(\d+)", str(line))
-                                if match:
-                                    line_number = int(match.group(1))
-                                else:
-                                    line_number = 0
-                            try:
-                                # Post a comment on the PR
-                                comment_url = (
-                                    f"{self.base_url}/2.0/repositories/{self.workspace}/"
-                                    f"{self.repo_slug}/pullrequests/{self.pull_request.number}/comments"
-                                )
-                                comment_data = {
-                                    "content": {"raw": f"## 🔦🐛\n{comment}"},
-                                    "inline": {
-                                        "from": line_number - 1 if line_number != 0 else 0,
-                                        "to": line_number,
-                                        "start_from": line_number - 1 if line_number != 0 else 0,
-                                        "start_to": line_number,
-                                        "path": file_review.file_path,
-                                    },
-                                }
-                                response = requests.post(comment_url, json=comment_data, headers=self.auth_headers)
-                                response.raise_for_status()
-                            except Exception as e:
-                                logger.warning(f"Failed to post comment for {file_review.file_path}:{line}: {e}")
-
-                    # Post structured comments (e.g. from agentic review) as inline comments
-                    if file_review.structured_comments:
-                        comment_url = (
-                            f"{self.base_url}/2.0/repositories/{self.workspace}/"
-                            f"{self.repo_slug}/pullrequests/{self.pull_request.number}/comments"
+                        },
+                    )
+                )
+            for file_review in agent_review.reviews:
+                path = file_review.file_path
+                for line, comment in file_review.line_comments.items():
+                    inline_comments.append(
+                        (
+                            f"comment for {path}:{line}",
+                            {
+                                "content": {"raw": f"## 🔦🐛\n{comment}"},
+                                "inline": _inline_anchor(path, _line_number(line)),
+                            },
                         )
-                        for sc in file_review.structured_comments:
-                            if getattr(sc, "muted", False):
-                                continue
-                            line_number = sc.line_number
-                            try:
-                                comment_data = {
-                                    "content": {"raw": f"## 🔦🐛 [{sc.severity}] {sc.comment}"},
-                                    "inline": {
-                                        "from": line_number - 1 if line_number != 0 else 0,
-                                        "to": line_number,
-                                        "start_from": line_number - 1 if line_number != 0 else 0,
-                                        "start_to": line_number,
-                                        "path": file_review.file_path,
-                                    },
-                                }
-                                response = requests.post(comment_url, json=comment_data, headers=self.auth_headers)
-                                response.raise_for_status()
-                            except Exception as e:
-                                logger.warning(f"Failed to post comment for {file_review.file_path}:{line_number}: {e}")
-
-                    # Post file summary comment if no inline comments were posted
-                    has_inline = bool(file_review.line_comments) or any(
-                        not getattr(sc, "muted", False) for sc in file_review.structured_comments
                     )
-                    if not has_inline and file_review.summary:
-                        try:
-                            comment_url = (
-                                f"{self.base_url}/2.0/repositories/{self.workspace}/"
-                                f"{self.repo_slug}/pullrequests/{self.pull_request.number}/comments"
-                            )
-                            comment_data = {"content": {"raw": f"**{file_review.file_path}:** {file_review.summary}"}}
-                            response = requests.post(comment_url, json=comment_data, headers=self.auth_headers)
-                            response.raise_for_status()
-                        except Exception as e:
-                            logger.warning(f"Failed to post summary for {file_review.file_path}: {e}")
-
-            logger.info(f"✅ Successfully posted PR #{self.pull_request.number} review comments on Bitbucket")
-        except requests.exceptions.RequestException as e:
-            logger.error(f"❌ Failed to post Bitbucket PR review: {e}")
-            # Fallback to console output
-            logger.info("Review:")
-            logger.info(payload.review_markdown)
+                # Structured comments (e.g. from agentic review) as inline comments
+                for sc in file_review.structured_comments:
+                    if getattr(sc, "muted", False):
+                        continue
+                    inline_comments.append(
+                        (
+                            f"comment for {path}:{sc.line_number}",
+                            {
+                                "content": {"raw": f"## 🔦🐛 [{sc.severity}] {sc.comment}"},
+                                "inline": _inline_anchor(path, sc.line_number),
+                            },
+                        )
+                    )
+                # File summary comment if no inline comments are posted
+                has_inline = bool(file_review.line_comments) or any(
+                    not getattr(sc, "muted", False) for sc in file_review.structured_comments
+                )
+                if not has_inline and file_review.summary:
+                    general_comments.append(
+                        (f"summary for {path}", {"content": {"raw": f"**{path}:** {file_review.summary}"}})
+                    )
+
+        async def post(comment: tuple[str, dict]) -> bool:
+            description, comment_data = comment
+            comment_data = {**comment_data, "content": {"raw": add_review_marker(comment_data["content"]["raw"])}}
+            try:
+                (await self._arequest("POST", comment_url, json=comment_data)).raise_for_status()
+                return True
+            except Exception as e:
+                logger.warning(f"Failed to post {description}: {e}")
+                return False
+
+        semaphore = asyncio.Semaphore(max(BITBUCKET_MAX_CONCURRENT_COMMENTS, 1))
+
+        async def post_inline(comment: tuple[str, dict]) -> bool:
+            async with semaphore:
+                return await post(comment)
+
+        try:
+            posted = [await post(comment) for comment in general_comments]
+            posted += await asyncio.gather(*(post_inline(comment) for comment in inline_comments))
+
+            logger.info(
+                f"✅ Successfully posted PR #{self.pull_request.number} review comments on Bitbucket "
+                f"({sum(posted)} of {len(posted)} comments)"
+            )
         except Exception as e:
             logger.error(f"❌ Unexpected error posting Bitbucket PR review: {e}")
             # Fallback to console output
@@ -313,68 +451,28 @@ class BitbucketProvider(Provider):
             logger.info(payload.review_markdown)
 
     def has_reviewed(self) -> bool:
-        """Check if the token user has already reviewed this PR."""
+        """Check if Lampe (or the token user) has already reviewed this PR.
+
+        Comments are scanned newest first, page by page, stopping at the first comment carrying the Lampe marker,
+        written by the token user or looking like a review posted before the marker existed. Pages are requested
+        with their cached ETag, unchanged pages are answered with 304 and not scanned again.
+        """
         if self.pull_request.number == 0:
             return False
 
+        cache = ETagCache()
         try:
-            # Get PR comments
-            comments_url = (
+            url: str | None = (
                 f"{self.base_url}/2.0/repositories/{self.workspace}/"
                 f"{self.repo_slug}/pullrequests/{self.pull_request.number}/comments"
             )
-            comments_response = requests.get(comments_url, headers=self.auth_headers)
-            comments_response.raise_for_status()
-            comments_data = comments_response.json()
-
-            # Try to get the current authenticated user (token owner)
-            # This works for user tokens but may fail for repository/workspace tokens
-            token_user_uuid = None
-            token_username = None
-            try:
-                user_info_response = requests.get(f"{self.base_url}/2.0/user", headers=self.auth_headers)
-                user_info_response.raise_for_status()
-                user_info = user_info_response.json()
-                token_user_uuid = user_info.get("uuid") or user_info.get("account_id")
-                if not token_user_uuid:
-                    token_username = user_info.get("username") or user_info.get("nickname")
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 401:
-                    # Repository/workspace tokens can't access /2.0/user
-                    # Fall back to pattern-based detection
-                    logger.debug("Token doesn't have access to /2.0/user endpoint, using pattern-based detection")
-                else:
-                    raise
-
-            # Check for comments by the token user (if we have user identity)
-            if token_user_uuid or token_username:
-                for comment in comments_data.get("values", []):
-                    user = comment.get("user", {})
-                    if token_user_uuid:
-                        if user.get("uuid") == token_user_uuid or user.get("account_id") == token_user_uuid:
-                            return True
-                    elif token_username:
-                        if user.get("username") == token_username or user.get("nickname") == token_username:
-                            return True
-
-            # Fallback: Check for review comments by pattern (for repository/workspace tokens)
-            # Look for comments that match Lampe review format:
-            # - Comments starting with "## " (agent name headers)
-            # - Comments containing "Focus Areas:"
-            # - Comments containing "🔦🐛" (line comment marker)
-            review_patterns = [
-                r"^##\s+\w+",  # Agent name header (e.g., "## SecurityAgent")
-                r"\*\*Focus Areas:\*\*",  # Focus areas marker
-                r"##\s*🔦🐛",  # Line comment marker
-            ]
-
-            for comment in comments_data.get("values", []):
-                content = comment.get("content", {}).get("raw", "") or comment.get("content", {}).get("markup", "")
-                if content:
-                    for pattern in review_patterns:
-                        if re.search(pattern, content, re.IGNORECASE | re.MULTILINE):
-                            return True
-
+            params: dict[str, Any] | None = {"sort": "-created_on", "pagelen": BITBUCKET_PAGE_SIZE}
+            while url:
+                found, url = self._scan_comments_page(url, params, cache)
+                if found:
+                    return True
+                # The next page URL already carries the query parameters
+                params = None
             return False
         except requests.exceptions.RequestException as e:
             logger.warning(f"Failed to check if PR has been reviewed: {e}")
@@ -382,3 +480,53 @@ class BitbucketProvider(Provider):
         except Exception as e:
             logger.warning(f"Unexpected error checking if PR has been reviewed: {e}")
             return False
+        finally:
+            cache.save()
+
+    @cached_property
+    def _token_user(self) -> tuple[str | None, str | None]:
+        """UUID and username of the token user, resolved once. None for repository/workspace tokens."""
+        try:
+            response = self._request("GET", f"{self.base_url}/2.0/user")
+            response.raise_for_status()
+        except requests.exceptions.HTTPError as e:
+            if e.response.status_code == 401:
+                # Repository/workspace tokens can't access /2.0/user, the marker and patterns are used instead
+                logger.debug("Token doesn't have access to /2.0/user endpoint, using marker-based detection")
+                return None, None
+            raise
+        user_info = response.json()
+        uuid = user_info.get("uuid") or user_info.get("account_id")
+        return uuid, user_info.get("username") or user_info.get("nickname")
+
+    def _scan_comments_page(self, url: str, params: dict[str, Any] | None, cache: ETagCache) -> tuple[bool, str | None]:
+        """Scan a page of comments with a conditional request.
+
+        Returns
+        -------
+        :
+            Whether the page has a Lampe comment, and the URL of the next page
+        """
+        token_uuid, token_username = self._token_user
+        key = f"bitbucket:{token_uuid or token_username}:{url}?{params}"
+        response = self._request("GET", url, params=params, headers=cache.request_headers(key))
+        if response.status_code == 304 and (cached := cache.get(key)) is not None:
+            return cached["found"], cached["next"]
+        response.raise_for_status()
+        data = response.json()
+
+        def is_lampe_comment(comment: dict) -> bool:
+            content = comment.get("content", {}).get("raw", "") or comment.get("content", {}).get("markup", "")
+            if REVIEW_MARKER in content:
+                return True
+            user = comment.get("user", {})
+            if token_uuid and token_uuid in (user.get("uuid"), user.get("account_id")):
+                return True
+            if token_username and token_username in (user.get("username"), user.get("nickname")):
+                return True
+            return any(re.search(pattern, content, re.IGNORECASE | re.MULTILINE) for pattern in _LEGACY_REVIEW_PATTERNS)
+
+        found = any(is_lampe_comment(comment) for comment in data.get("values", []))
+        next_url = data.get("next")
+        cache.put(key, response.headers.get("ETag"), {"found": found, "next": next_url})
+        return found, next_url
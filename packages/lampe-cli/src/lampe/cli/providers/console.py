@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import sys
 
 from lampe.cli.providers.base import PRDescriptionPayload, Provider, PRReviewPayload
 from lampe.core.data_models.pull_request import PullRequest
@@ -10,20 +11,84 @@ from lampe.core.loggingconfig import LAMPE_LOGGER_NAME
 logger = logging.getLogger(name=LAMPE_LOGGER_NAME)
 
 
+_MARKDOWN_FENCES = ("```", "```md", "```markdown")
+
+
 class ConsoleProvider(Provider):
     """Console provider for delivering PR descriptions to stdout."""
 
+    supports_description_streaming = True
+
     def __init__(self, repository: Repository, pull_request: PullRequest) -> None:
         super().__init__(repository, pull_request)
+        self._streamed = False
+        self._stream_buffer = ""
+        self._pending_fence: str | None = None
+        self._last_line = ""
+
+    def stream_pr_description(self, delta: str) -> None:
+        """Print the PR description line by line as it is generated.
+
+        The markdown fence wrapping the whole description (removed from the final description) is not printed.
+        """
+        self._stream_buffer += delta
+        *lines, self._stream_buffer = self._stream_buffer.split("\n")
+        for line in lines:
+            self._write_stream_line(line)
+
+    def _write_stream_line(self, line: str) -> None:
+        if not self._streamed:
+            if not line.strip():
+                return
+            self._streamed = True
+            if line.strip() in _MARKDOWN_FENCES:
+                return
+        if self._pending_fence is not None:
+            self._write_pending_fence()
+        if line.strip() == "```":
+            # May be the closing fence of the description: only printed if more text follows
+            self._pending_fence = line
+            return
+        sys.stdout.write(line + "\n")
+        sys.stdout.flush()
+        self._last_line = line
+
+    def _write_pending_fence(self) -> None:
+        sys.stdout.write(self._pending_fence + "\n")
+        self._last_line = self._pending_fence
+        self._pending_fence = None
 
     def deliver_pr_description(self, payload: PRDescriptionPayload) -> None:
-        """Print the PR description to console."""
-        print(payload.description)
+        """Print the PR description to console, unless it was already streamed.
+
+        After streaming, the parsed description tells whether a held back fence closes a code block ending the
+        description, or is the closing fence of the wrapping markdown block.
+        """
+        if not self._streamed:
+            print(payload.description)
+            return
+        remainder = self._stream_buffer
+        self._stream_buffer = ""
+        if remainder.strip():
+            self._write_stream_line(remainder)
+        if self._pending_fence is not None:
+            if payload.description.rstrip().endswith("```") and self._last_line.strip() != "```":
+                self._write_pending_fence()
+            self._pending_fence = None
+        sys.stdout.flush()
 
     def deliver_pr_review(self, payload: PRReviewPayload) -> None:
         """Print the PR review to console."""
         print(payload.review_markdown)
 
+    async def adeliver_pr_description(self, payload: PRDescriptionPayload) -> None:
+        """Print the PR description on the event loop thread, like the streamed description."""
+        self.deliver_pr_description(payload)
+
+    async def adeliver_pr_review(self, payload: PRReviewPayload) -> None:
+        """Print the PR review to console, printing does not need a worker thread."""
+        self.deliver_pr_review(payload)
+
     def healthcheck(self) -> None:
         """Check if the console provider is healthy and can connect to the service."""
         logger.info("✅ Console provider is healthy")
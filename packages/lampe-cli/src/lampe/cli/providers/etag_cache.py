@@ -0,0 +1,76 @@
+"""ETag cache of the API pages scanned by ``has_reviewed``.
+
+A page is requested again with ``If-None-Match``: an unchanged page is answered with 304 (which does not count
+against the GitHub rate limit) and its cached result is reused. The cache is a JSON file, so that successive
+``lampe check-reviewed`` runs share it.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+from lampe.core.loggingconfig import LAMPE_LOGGER_NAME
+
+logger = logging.getLogger(name=LAMPE_LOGGER_NAME)
+
+# NOTE: JSON file caching the ETags of the scanned pages, by default ~/.cache/lampe/etags.json. Empty disables it
+ETAG_CACHE_PATH = os.getenv("LAMPE_ETAG_CACHE_PATH", str(Path.home() / ".cache" / "lampe" / "etags.json"))
+# Maximum number of cached pages, the oldest entries are dropped first
+ETAG_CACHE_MAX_ENTRIES = 1000
+
+
+class ETagCache:
+    """ETags and derived results of API pages, loaded from and saved to a JSON file.
+
+    Parameters
+    ----------
+    path
+        JSON file of the cache, by default ETAG_CACHE_PATH. None or empty keeps the cache in memory
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        path = ETAG_CACHE_PATH if path is None else path
+        self.path = Path(path) if path else None
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.changed = False
+        if self.path is not None and self.path.is_file():
+            try:
+                self.entries = json.loads(self.path.read_text())
+            except (OSError, ValueError) as e:
+                logger.debug(f"Ignoring unreadable ETag cache {self.path}: {e}")
+
+    def request_headers(self, key: str) -> dict[str, str]:
+        """Conditional request headers of a page, empty when it is not cached."""
+        entry = self.entries.get(key)
+        return {"If-None-Match": entry["etag"]} if entry else {}
+
+    def get(self, key: str) -> Any | None:
+        """Cached result of a page answered with 304."""
+        entry = self.entries.get(key)
+        return entry["value"] if entry else None
+
+    def put(self, key: str, etag: str | None, value: Any) -> None:
+        """Cache the result of a page, pages without ETag are not cached."""
+        if not etag:
+            return
+        self.entries.pop(key, None)
+        self.entries[key] = {"etag": etag, "value": value}
+        self.changed = True
+
+    def save(self) -> None:
+        """Write the cache file atomically, keeping the ``ETAG_CACHE_MAX_ENTRIES`` most recent entries."""
+        if self.path is None or not self.changed:
+            return
+        entries = dict(list(self.entries.items())[-ETAG_CACHE_MAX_ENTRIES:])
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = self.path.with_suffix(".tmp")
+            temporary.write_text(json.dumps(entries))
+            temporary.replace(self.path)
+            self.changed = False
+        except OSError as e:
+            logger.debug(f"Failed to save the ETag cache {self.path}: {e}")
@@ -1,12 +1,27 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
 import os
+import re
+from functools import cached_property
 from urllib.parse import quote
 
-from github import Auth, Github, GithubIntegration
-
-from lampe.cli.providers.base import PRDescriptionPayload, Provider, PRReviewPayload, update_or_add_text_between_tags
+import httpx
+from github import Auth, Github, GithubException, GithubIntegration
+from github.PullRequest import ReviewComment
+
+from lampe.cli.providers.base import (
+    REVIEW_MARKER,
+    PRDescriptionPayload,
+    Provider,
+    PRReviewPayload,
+    add_review_marker,
+    update_or_add_text_between_tags,
+)
+from lampe.cli.providers.etag_cache import ETagCache
+from lampe.cli.providers.http_client import get_async_client, run_sync
 from lampe.core.data_models.pull_request import PullRequest
 from lampe.core.data_models.repository import Repository
 from lampe.core.loggingconfig import LAMPE_LOGGER_NAME
@@ -22,6 +37,17 @@ _SEVERITY_COLORS: dict[str, str] = {
 }
 _CATEGORY_COLOR = "3498db"
 
+# NOTE: Maximum number of inline comments submitted in a single pull request review, by default 50
+GITHUB_REVIEW_COMMENTS_PER_REVIEW = int(os.getenv("LAMPE_GITHUB_REVIEW_COMMENTS_PER_REVIEW", 50))
+# Maximum length of a GitHub comment body
+GITHUB_MAX_COMMENT_LENGTH = 65536
+# Items per page when scanning comments in has_reviewed (maximum allowed by the API)
+GITHUB_PAGE_SIZE = 100
+# API used when GITHUB_API_URL is not set (GitHub Actions sets it, e.g. for GitHub Enterprise Server)
+DEFAULT_GITHUB_API_URL = "https://api.github.com"
+# REST API version requested by the async deliveries
+GITHUB_API_VERSION = "2022-11-28"
+
 
 def _badge_shield(label: str, message: str, color: str) -> str:
     """Build a shields.io-style badge markdown image."""
@@ -40,6 +66,78 @@ def _format_structured_comment_badges(severity: str, category: str) -> str:
     return f"{severity_badge} {category_badge}"
 
 
+def _review_comments(payload: PRReviewPayload) -> tuple[list[ReviewComment], list[str]]:
+    """Collect the inline comments of a review.
+
+    Returns
+    -------
+    :
+        Inline comments, and the findings without a valid line formatted for the summary comment
+    """
+    comments: list[ReviewComment] = []
+    not_inline: list[str] = []
+
+    def add(path: str, line: object, body: str) -> None:
+        try:
+            line_number = int(str(line))
+        except ValueError:
+            line_number = 0
+        if line_number > 0:
+            comments.append({"path": path, "line": line_number, "side": "RIGHT", "body": body})
+        else:
+            not_inline.append(f"**{path} (Line {line}):**\n\n{body}")
+
+    for agent_review in payload.reviews:
+        for file_review in agent_review.reviews:
+            for line, comment in file_review.line_comments.items():
+                add(file_review.file_path, line, f"## 🔦🐛\n{comment}")
+            # Structured comments (e.g. from agentic review)
+            for sc in file_review.structured_comments:
+                if getattr(sc, "muted", False):
+                    continue
+                badges = _format_structured_comment_badges(sc.severity, sc.category)
+                add(file_review.file_path, sc.line_number, f"## 🔦🐛\n\n{badges}\n\n{sc.comment}")
+    return comments, not_inline
+
+
+def _summary_sections(payload: PRReviewPayload) -> list[str]:
+    """Agent summaries, and summaries of the files without inline comments."""
+    sections: list[str] = []
+    for agent_review in payload.reviews:
+        if agent_review.summary:
+            sections.append(
+                f"## {agent_review.agent_name}\n\n"
+                f"**Focus Areas:** {', '.join(agent_review.focus_areas)}\n\n"
+                f"{agent_review.summary}"
+            )
+        for file_review in agent_review.reviews:
+            has_inline = bool(file_review.line_comments) or any(
+                not getattr(sc, "muted", False) for sc in file_review.structured_comments
+            )
+            if not has_inline and file_review.summary:
+                sections.append(f"**{file_review.file_path}:** {file_review.summary}")
+    return sections
+
+
+def _split_comment(sections: list[str], max_length: int) -> list[str]:
+    """Join sections into as few comment bodies of at most ``max_length`` characters as possible.
+
+    A section longer than ``max_length`` is truncated.
+    """
+    separator = "\n\n"
+    bodies: list[str] = []
+    current = ""
+    for section in sections:
+        section = section if len(section) <= max_length else section[: max_length - 1] + "…"
+        if current and len(current) + len(separator) + len(section) > max_length:
+            bodies.append(current)
+            current = ""
+        current = f"{current}{separator}{section}" if current else section
+    if current:
+        bodies.append(current)
+    return bodies
+
+
 class GitHubProvider(Provider):
     """GitHub provider for delivering PR descriptions to GitHub API."""
 
@@ -59,6 +157,7 @@ class GitHubProvider(Provider):
         else:
             raise ValueError("GITHUB_REPOSITORY environment variable is required for GitHub provider")
 
+        self.api_url = os.getenv("GITHUB_API_URL", DEFAULT_GITHUB_API_URL).rstrip("/")
         # Initialize GitHub client with appropriate authentication
         self.github_client = self._initialize_github_client()
 
@@ -85,7 +184,7 @@ class GitHubProvider(Provider):
         """Create GitHub client using GitHub App authentication."""
         try:
             auth = Auth.AppAuth(int(app_id), private_key)
-            gi = GithubIntegration(auth=auth)
+            gi = GithubIntegration(auth=auth, base_url=self.api_url)
             # Use the owner and repo_name from environment variables
             installation = gi.get_repo_installation(self.owner, self.repo_name)
             return installation.get_github_for_installation()
@@ -96,7 +195,7 @@ class GitHubProvider(Provider):
         """Create GitHub client using user token authentication."""
         try:
             auth = Auth.Token(token)
-            return Github(auth=auth)
+            return Github(auth=auth, base_url=self.api_url)
         except Exception as e:
             raise ValueError(f"Failed to authenticate with GitHub token: {e}")
 
@@ -153,17 +252,29 @@ class GitHubProvider(Provider):
             raise
 
     def deliver_pr_description(self, payload: PRDescriptionPayload) -> None:
+        """Update the PR description on GitHub (synchronous wrapper of ``adeliver_pr_description``)."""
+        run_sync(self.adeliver_pr_description(payload))
+
+    def deliver_pr_review(self, payload: PRReviewPayload) -> None:
+        """Post the PR review on GitHub (synchronous wrapper of ``adeliver_pr_review``)."""
+        run_sync(self.adeliver_pr_review(payload))
+
+    async def adeliver_pr_description(self, payload: PRDescriptionPayload) -> None:
         """Update the PR description on GitHub."""
         if self.pull_request.number == 0:
             raise ValueError("Cannot update GitHub PR description for local run")
 
         try:
-            repo = self.github_client.get_repo(f"{self.owner}/{self.repo_name}")
-            pull_request = repo.get_pull(self.pull_request.number)
+            headers = await asyncio.to_thread(self._request_headers)
+            pull_url = f"{self.api_url}/repos/{self.owner}/{self.repo_name}/pulls/{self.pull_request.number}"
+            client = get_async_client()
+            response = await client.get(pull_url, headers=headers)
+            response.raise_for_status()
             new_description = update_or_add_text_between_tags(
-                pull_request.body or "", payload.description_with_title, "description"
+                response.json().get("body") or "", payload.description_with_title, "description"
             )
-            pull_request.edit(body=new_description)
+            response = await client.patch(pull_url, headers=headers, json={"body": new_description})
+            response.raise_for_status()
             logger.info(f"✅ Successfully updated PR #{self.pull_request.number} description on GitHub")
         except Exception as e:
             logger.info(f"❌ Failed to update GitHub PR: {e}")
@@ -171,109 +282,161 @@ class GitHubProvider(Provider):
             logger.info("Description:")
             logger.info(payload.description)
 
-    def deliver_pr_review(self, payload: PRReviewPayload) -> None:
-        """Post PR review comments on GitHub."""
+    async def adeliver_pr_review(self, payload: PRReviewPayload) -> None:
+        """Post the PR review on GitHub.
+
+        Inline comments are submitted as pull request reviews of at most ``GITHUB_REVIEW_COMMENTS_PER_REVIEW``
+        comments each. Agent summaries, file summaries and the findings GitHub rejected as inline comments are
+        posted together as one summary comment (split only when it exceeds the GitHub comment length limit).
+        """
         if self.pull_request.number == 0:
             raise ValueError("Cannot post GitHub PR review for local run")
 
         try:
-            repo = self.github_client.get_repo(f"{self.owner}/{self.repo_name}")
-            pull_request = repo.get_pull(self.pull_request.number)
-
-            # Post review comments for each agent review
-            for agent_review in payload.reviews:
-                # Post agent summary comment
-                if agent_review.summary:
-                    try:
-                        pull_request.create_issue_comment(
-                            f"## {agent_review.agent_name}\n\n"
-                            f"**Focus Areas:** {', '.join(agent_review.focus_areas)}\n\n"
-                            f"{agent_review.summary}"
-                        )
-                    except Exception as e:
-                        logger.warning(f"Failed to post agent summary for {agent_review.agent_name}: {e}")
-
-                # Post file-specific comments
-                for file_review in agent_review.reviews:
-                    if file_review.line_comments:
-                        # Create review comments for specific lines
-                        for line, comment in file_review.line_comments.items():
-                            try:
-                                # Post a review comment
-                                pull_request.create_review_comment(
-                                    body=f"## 🔦🐛\n{comment}",
-                                    commit=pull_request.head.sha,
-                                    path=file_review.file_path,
-                                    line=int(line),
-                                )
-                            except Exception as e:
-                                logger.warning(f"Failed to post comment for {file_review.file_path}:{line}: {e}")
-                                # Fallback: post as general comment
-                                pull_request.create_issue_comment(
-                                    f"**{file_review.file_path} (Line {line}):** {comment}"
-                                )
-
-                    # Post structured comments (e.g. from agentic review) as inline comments
-                    if file_review.structured_comments:
-                        for sc in file_review.structured_comments:
-                            if getattr(sc, "muted", False):
-                                continue
-                            badges = _format_structured_comment_badges(sc.severity, sc.category)
-                            comment_body = f"## 🔦🐛\n\n{badges}\n\n{sc.comment}"
-                            try:
-                                pull_request.create_review_comment(
-                                    body=comment_body,
-                                    commit=pull_request.head.sha,
-                                    path=file_review.file_path,
-                                    line=sc.line_number,
-                                )
-                            except Exception as e:
-                                logger.warning(
-                                    f"Failed to post comment for {file_review.file_path}:{sc.line_number}: {e}"
-                                )
-                                pull_request.create_issue_comment(
-                                    f"**{file_review.file_path} (Line {sc.line_number}):**\n\n" f"{comment_body}"
-                                )
-
-                    # Post summary comment if no inline comments were posted
-                    has_inline = bool(file_review.line_comments) or any(
-                        not getattr(sc, "muted", False) for sc in file_review.structured_comments
-                    )
-                    if not has_inline and file_review.summary:
-                        pull_request.create_issue_comment(f"**{file_review.file_path}:** {file_review.summary}")
-
-            logger.info(f"✅ Successfully posted PR #{self.pull_request.number} review comments on GitHub")
+            headers = await asyncio.to_thread(self._request_headers)
+            comments, not_inline = _review_comments(payload)
+            rejected = await self._submit_review_comments(comments, headers)
+            not_inline += [f"**{c['path']} (Line {c['line']}):**\n\n{c['body']}" for c in rejected]
+
+            comments_url = (
+                f"{self.api_url}/repos/{self.owner}/{self.repo_name}/issues/{self.pull_request.number}/comments"
+            )
+            max_length = GITHUB_MAX_COMMENT_LENGTH - len(add_review_marker(""))
+            for body in _split_comment(_summary_sections(payload) + not_inline, max_length):
+                response = await get_async_client().post(
+                    comments_url, headers=headers, json={"body": add_review_marker(body)}
+                )
+                response.raise_for_status()
+
+            logger.info(
+                f"✅ Successfully posted PR #{self.pull_request.number} review on GitHub "
+                f"({len(comments) - len(rejected)} inline comments)"
+            )
         except Exception as e:
             logger.info(f"❌ Failed to post GitHub PR review: {e}")
             # Fallback to console output
             logger.info("Review:")
             logger.info(payload.review_markdown)
 
+    def _request_headers(self) -> dict[str, str]:
+        """Headers of the API requests, the token of a GitHub App installation being refreshed when expired."""
+        auth = self.github_client.requester.auth
+        return {
+            "Accept": "application/vnd.github+json",
+            "Authorization": f"{auth.token_type} {auth.token}",
+            "X-GitHub-Api-Version": GITHUB_API_VERSION,
+        }
+
+    async def _submit_review_comments(self, comments: list[ReviewComment], headers: dict[str, str]) -> list:
+        """Submit inline comments as reviews of at most ``GITHUB_REVIEW_COMMENTS_PER_REVIEW`` comments.
+
+        GitHub rejects a whole review when one of its comments cannot be placed (e.g. a line outside the diff):
+        a rejected review is split in halves and resubmitted, isolating the comments to post elsewhere.
+
+        Parameters
+        ----------
+        comments
+            Inline comments of the review
+        headers
+            Headers of the API requests
+
+        Returns
+        -------
+        :
+            Comments that could not be posted inline
+        """
+        reviews_url = f"{self.api_url}/repos/{self.owner}/{self.repo_name}/pulls/{self.pull_request.number}/reviews"
+        size = max(GITHUB_REVIEW_COMMENTS_PER_REVIEW, 1)
+        pending = [comments[start : start + size] for start in range(0, len(comments), size)]
+        rejected: list[ReviewComment] = []
+        while pending:
+            chunk = pending.pop(0)
+            try:
+                response = await get_async_client().post(
+                    reviews_url, headers=headers, json={"body": REVIEW_MARKER, "event": "COMMENT", "comments": chunk}
+                )
+                response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 422 and len(chunk) > 1:
+                    middle = len(chunk) // 2
+                    pending[:0] = [chunk[:middle], chunk[middle:]]
+                    continue
+                for comment in chunk:
+                    logger.warning(f"Failed to post comment for {comment['path']}:{comment['line']}: {e}")
+                rejected.extend(chunk)
+        return rejected
+
     def has_reviewed(self) -> bool:
-        """Check if the token user has already reviewed this PR."""
+        """Check if Lampe (or the token user) has already reviewed this PR.
+
+        Issue comments, then reviews, are scanned newest page first, stopping at the first comment carrying the
+        Lampe marker or written by the token user. Pages are requested with their cached ETag, unchanged pages
+        are answered with 304 and not scanned again.
+        """
         if self.pull_request.number == 0:
             return False
 
+        cache = ETagCache()
         try:
-            repo = self.github_client.get_repo(f"{self.owner}/{self.repo_name}")
-            pull_request = repo.get_pull(self.pull_request.number)
-
-            # Get the authenticated user
-            authenticated_user = self.github_client.get_user()
-
-            # Check issue comments (where reviews are posted)
-            comments = pull_request.get_issue_comments()
-            for comment in comments:
-                if comment.user.login == authenticated_user.login:
-                    return True
-
-            # Also check review comments (inline comments)
-            review_comments = pull_request.get_review_comments()
-            for comment in review_comments:
-                if comment.user.login == authenticated_user.login:
-                    return True
-
-            return False
+            base = f"/repos/{self.owner}/{self.repo_name}"
+            return any(
+                self._scan_newest_first(url, cache)
+                for url in (
+                    f"{base}/issues/{self.pull_request.number}/comments",
+                    f"{base}/pulls/{self.pull_request.number}/reviews",
+                )
+            )
         except Exception as e:
             logger.warning(f"Failed to check if PR has been reviewed: {e}")
             return False
+        finally:
+            cache.save()
+
+    @cached_property
+    def _token_login(self) -> str | None:
+        """Login of the token user, resolved once. None for GitHub App installations, which have no user."""
+        try:
+            return self.github_client.get_user().login
+        except Exception as e:
+            logger.debug(f"Could not resolve the GitHub token user: {e}")
+            return None
+
+    def _scan_newest_first(self, url: str, cache: ETagCache) -> bool:
+        """Whether a page of ``url`` has a Lampe comment, the first page being fetched to find the last one."""
+        found, last_page = self._scan_page(url, 1, cache)
+        if found:
+            return True
+        return any(self._scan_page(url, page, cache)[0] for page in range(last_page, 1, -1))
+
+    def _scan_page(self, url: str, page: int, cache: ETagCache) -> tuple[bool, int]:
+        """Scan a page of comments or reviews with a conditional request.
+
+        Returns
+        -------
+        :
+            Whether the page has a Lampe comment, and the number of pages
+        """
+        login = self._token_login
+        key = f"github:{login}:{url}?page={page}"
+        # The first page is always fetched in full: its ETag does not change when new items spill onto a new
+        # page, only its Link header tells the current number of pages
+        cacheable = page > 1
+        status, headers, output = self.github_client.requester.requestJson(
+            "GET",
+            url,
+            parameters={"per_page": GITHUB_PAGE_SIZE, "page": page},
+            headers=cache.request_headers(key) if cacheable else {},
+        )
+        if status == 304 and (cached := cache.get(key)) is not None:
+            return cached["found"], cached["last_page"]
+        if status >= 400:
+            raise GithubException(status, output, headers)
+        found = any(
+            REVIEW_MARKER in (item.get("body") or "") or (login and (item.get("user") or {}).get("login") == login)
+            for item in json.loads(output)
+        )
+        match = re.search(r'[?&]page=(\d+)[^>]*>; rel="last"', headers.get("link", ""))
+        last_page = int(match.group(1)) if match else page
+        if cacheable:
+            cache.put(key, headers.get("etag"), {"found": found, "last_page": last_page})
+        return found, last_page
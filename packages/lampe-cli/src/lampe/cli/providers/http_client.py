@@ -0,0 +1,75 @@
+"""Async HTTP client shared by the providers.
+
+Providers deliver reviews and descriptions with ``httpx.AsyncClient``, so that the HTTP I/O does not block the
+event loop running the workflows. A single client, and so a single connection pool, is shared by all the providers
+running on an event loop: concurrent reviews of the same process reuse its keep-alive connections.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import weakref
+from collections.abc import Coroutine
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+import httpx
+
+T = TypeVar("T")
+
+# NOTE: Maximum number of connections of the shared provider client, over all hosts, by default 20
+PROVIDER_MAX_CONNECTIONS = int(os.getenv("LAMPE_PROVIDER_MAX_CONNECTIONS", 20))
+# Timeout of a single provider request
+PROVIDER_REQUEST_TIMEOUT_SECONDS = 30.0
+
+# A client is bound to the event loop its connections were opened on
+_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Client shared by the providers running on the current event loop, created on first use."""
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        client = _clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=PROVIDER_MAX_CONNECTIONS, max_keepalive_connections=PROVIDER_MAX_CONNECTIONS
+                ),
+                timeout=PROVIDER_REQUEST_TIMEOUT_SECONDS,
+            )
+            _clients[loop] = client
+        return client
+
+
+async def aclose_async_client() -> None:
+    """Close the client of the current event loop, e.g. before the loop is closed."""
+    with _clients_lock:
+        client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def run_sync(coroutine: Coroutine[Any, Any, T]) -> T:
+    """Run a provider coroutine from synchronous code, for the synchronous wrappers of the async methods.
+
+    The coroutine runs on a new event loop, whose client is closed before returning. When the calling thread
+    already runs an event loop (a synchronous method called from async code), the loop is run in a worker thread.
+    """
+
+    async def main() -> T:
+        try:
+            return await coroutine
+        finally:
+            await aclose_async_client()
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(main())
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="lampe-provider-sync") as executor:
+        return executor.submit(asyncio.run, main()).result()
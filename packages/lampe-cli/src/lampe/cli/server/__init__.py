@@ -0,0 +1,19 @@
+from typing import TYPE_CHECKING, Any
+
+from lampe.cli.server.http import JobServer
+from lampe.cli.server.jobs import Job, JobKind, JobQueue, JobRequest, JobStatus, QueueClosedError
+
+if TYPE_CHECKING:
+    from lampe.cli.server.client import JobClient
+
+
+def __getattr__(name: str) -> Any:
+    # The client pulls in httpx, which ``lampe serve`` itself does not need
+    if name == "JobClient":
+        from lampe.cli.server.client import JobClient
+
+        return JobClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["Job", "JobClient", "JobKind", "JobQueue", "JobRequest", "JobServer", "JobStatus", "QueueClosedError"]
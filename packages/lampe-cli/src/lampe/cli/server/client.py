@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import httpx
+
+from lampe.cli.server.http import DEFAULT_HOST, DEFAULT_PORT
+from lampe.cli.server.jobs import JobRequest, JobStatus
+
+_FINAL_STATUSES = {JobStatus.SUCCEEDED.value, JobStatus.FAILED.value}
+
+
+class JobClient:
+    """Thin client of the ``lampe serve`` API.
+
+    Parameters
+    ----------
+    url
+        Server URL, by default ``http://DEFAULT_HOST:DEFAULT_PORT``
+    socket_path
+        Unix socket of the server, takes precedence over the URL host
+    timeout
+        Timeout of each HTTP request in seconds
+    """
+
+    def __init__(self, url: str | None = None, socket_path: str | None = None, timeout: float = 30.0) -> None:
+        transport = httpx.HTTPTransport(uds=socket_path) if socket_path else None
+        self._client = httpx.Client(
+            base_url=url or f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", transport=transport, timeout=timeout
+        )
+
+    def close(self) -> None:
+        self._client.close()
+
+    def __enter__(self) -> JobClient:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _request(self, method: str, path: str, **kwargs: Any) -> dict[str, Any]:
+        response = self._client.request(method, path, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    def submit(self, request: JobRequest) -> dict[str, Any]:
+        """Submit a job, returns the queued job."""
+        return self._request("POST", "/jobs", content=request.model_dump_json())
+
+    def get(self, job_id: str) -> dict[str, Any]:
+        """Return the job status and result."""
+        return self._request("GET", f"/jobs/{job_id}")
+
+    def wait(self, job_id: str, poll_interval: float = 1.0, timeout: float | None = None) -> dict[str, Any]:
+        """Poll a job until it succeeds or fails.
+
+        Raises
+        ------
+        TimeoutError
+            If the job is not finished after ``timeout`` seconds
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while (job := self.get(job_id))["status"] not in _FINAL_STATUSES:
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Job {job_id} still {job['status']} after {timeout}s")
+            time.sleep(poll_interval)
+        return job
+
+    def health(self) -> dict[str, Any]:
+        return self._request("GET", "/health")
+
+    def drain(self) -> dict[str, Any]:
+        """Ask the server to finish its jobs and stop."""
+        return self._request("POST", "/drain")
@@ -0,0 +1,160 @@
+"""Minimal HTTP/1.1 JSON API of the job server, on a TCP port or a Unix socket.
+
+Routes
+------
+POST /jobs
+    Submit a ``JobRequest``, 202 with the queued ``Job``. 503 while draining
+GET /jobs/<id>
+    ``Job`` status and result
+GET /health
+    Server status and number of jobs per status
+POST /drain
+    Stop accepting jobs, finish the queued and running ones, then stop the server
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import signal
+from http import HTTPStatus
+from typing import Any
+
+from pydantic import ValidationError
+
+from lampe.cli.server.jobs import JobQueue, JobRequest, JobRunner, QueueClosedError, run_job, run_workers
+from lampe.core.loggingconfig import LAMPE_LOGGER_NAME
+
+logger = logging.getLogger(name=LAMPE_LOGGER_NAME)
+
+# NOTE: Jobs run concurrently by the server, by default 4
+SERVE_CONCURRENCY = int(os.getenv("LAMPE_SERVE_CONCURRENCY", 4))
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_REQUEST_BYTES = 1024 * 1024
+
+
+class JobServer:
+    """Job queue, workers and HTTP API of ``lampe serve``.
+
+    Parameters
+    ----------
+    runner
+        Coroutine running a job, by default ``run_job``
+    concurrency
+        Number of jobs run concurrently, by default SERVE_CONCURRENCY
+    """
+
+    def __init__(self, runner: JobRunner = run_job, concurrency: int = SERVE_CONCURRENCY) -> None:
+        self.queue = JobQueue()
+        self.runner = runner
+        self.concurrency = concurrency
+        self._drain_requested = asyncio.Event()
+
+    def drain(self) -> None:
+        """Request a graceful shutdown."""
+        self._drain_requested.set()
+
+    async def serve(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        socket_path: str | None = None,
+        ready: asyncio.Event | None = None,
+    ) -> None:
+        """Serve the API until drained, on ``socket_path`` if set, otherwise on ``host:port``.
+
+        Parameters
+        ----------
+        host
+            TCP host, by default DEFAULT_HOST
+        port
+            TCP port, by default DEFAULT_PORT
+        socket_path
+            Unix socket path, takes precedence over the TCP address
+        ready
+            Event set once the server accepts connections
+        """
+        if socket_path:
+            server = await asyncio.start_unix_server(self._handle, path=socket_path)
+            address = socket_path
+        else:
+            server = await asyncio.start_server(self._handle, host=host, port=port)
+            address = f"http://{host}:{port}"
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.drain)
+            except (NotImplementedError, RuntimeError):
+                # Not on the main thread (e.g. tests) or unsupported platform
+                pass
+
+        workers = asyncio.create_task(run_workers(self.queue, self.runner, self.concurrency))
+        logger.info(f"Lampe server listening on {address} with {self.concurrency} workers")
+        if ready is not None:
+            ready.set()
+        try:
+            await self._drain_requested.wait()
+            logger.info(f"Draining: {self.queue.counts()}")
+            await self.queue.close()
+            # Status requests are still served while the remaining jobs complete
+            await workers
+        finally:
+            server.close()
+            await server.wait_closed()
+            if socket_path and os.path.exists(socket_path):
+                os.unlink(socket_path)
+        logger.info("Lampe server stopped")
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            status, payload = await self._dispatch(reader)
+        except Exception as e:
+            logger.exception(f"Unable to handle request: {e}")
+            status, payload = HTTPStatus.BAD_REQUEST, {"error": str(e)}
+        body = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+            + body
+        )
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def _dispatch(self, reader: asyncio.StreamReader) -> tuple[HTTPStatus, Any]:
+        request_line = (await reader.readline()).decode().strip()
+        method, path, _ = request_line.split(" ", 2)
+        content_length = 0
+        while (header := (await reader.readline()).decode().strip()) != "":
+            name, _, value = header.partition(":")
+            if name.strip().lower() == "content-length":
+                content_length = int(value.strip())
+        if content_length > MAX_REQUEST_BYTES:
+            return HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Request too large"}
+        body = await reader.readexactly(content_length) if content_length else b""
+
+        if method == "POST" and path == "/jobs":
+            try:
+                request = JobRequest.model_validate_json(body)
+            except ValidationError as e:
+                return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+            try:
+                job = await self.queue.submit(request)
+            except QueueClosedError as e:
+                return HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(e)}
+            return HTTPStatus.ACCEPTED, job.model_dump(mode="json")
+        if method == "GET" and path.startswith("/jobs/"):
+            job = self.queue.get(path.removeprefix("/jobs/"))
+            if job is None:
+                return HTTPStatus.NOT_FOUND, {"error": f"Unknown job {path.removeprefix('/jobs/')}"}
+            return HTTPStatus.OK, job.model_dump(mode="json")
+        if method == "GET" and path == "/health":
+            return HTTPStatus.OK, {"status": "draining" if self.queue.closed else "ok", "jobs": self.queue.counts()}
+        if method == "POST" and path == "/drain":
+            self.drain()
+            return HTTPStatus.ACCEPTED, {"status": "draining", "jobs": self.queue.counts()}
+        return HTTPStatus.NOT_FOUND, {"error": f"No route for {method} {path}"}
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict, deque
+from enum import StrEnum
+from typing import Any, Awaitable, Callable
+
+from pydantic import BaseModel, Field
+
+from lampe.core.loggingconfig import LAMPE_LOGGER_NAME
+from lampe.review.workflows.pr_review.review_depth import ReviewDepth
+
+logger = logging.getLogger(name=LAMPE_LOGGER_NAME)
+
+# NOTE: Seconds a finished job is kept for its result to be fetched, by default 1 hour
+FINISHED_JOB_TTL_SECONDS = float(os.getenv("LAMPE_SERVE_FINISHED_JOB_TTL_SECONDS", 3600))
+# NOTE: Maximum number of finished jobs kept, the oldest are evicted first, by default 1000
+MAX_FINISHED_JOBS = int(os.getenv("LAMPE_SERVE_MAX_FINISHED_JOBS", 1000))
+
+
+class JobKind(StrEnum):
+    """Workflows a job can run."""
+
+    REVIEW = "review"
+    DESCRIBE = "describe"
+
+
+class JobStatus(StrEnum):
+    """Lifecycle of a job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobRequest(BaseModel):
+    """A review or describe job, with the same options as the ``review`` and ``describe`` commands."""
+
+    kind: JobKind = Field(..., description="review or describe")
+    repo: str = Field(..., description="Path of the local clone of the repository")
+    repo_full_name: str | None = Field(default=None, description="Repository full name (e.g. owner/repo)")
+    base: str = Field(..., description="Base commit SHA")
+    head: str = Field(..., description="Head commit SHA")
+    number: int = Field(default=0, description="PR number")
+    title: str = Field(default="Pull Request", description="PR title")
+    body: str | None = Field(default=None, description="PR body")
+    output: str = Field(default="auto", description="Output provider (auto|console|github|gitlab|bitbucket)")
+    variant: str | None = Field(default=None, description="Workflow variant, the command default when None")
+    review_depth: ReviewDepth = Field(default=ReviewDepth.STANDARD, description="Review depth (review jobs)")
+    guidelines: list[str] | None = Field(default=None, description="Custom review guidelines (review jobs)")
+    files_exclude: list[str] | None = Field(default=None, description="Glob patterns excluded from the diff")
+    timeout: int | None = Field(default=None, description="Workflow timeout in seconds")
+
+    @property
+    def repo_key(self) -> str:
+        """Key jobs are scheduled fairly across."""
+        return self.repo_full_name or self.repo
+
+
+class Job(BaseModel):
+    """A submitted job and its outcome."""
+
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex)
+    request: JobRequest
+    status: JobStatus = JobStatus.QUEUED
+    submitted_at: float = Field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: Any = None
+    error: str | None = None
+
+
+JobRunner = Callable[[JobRequest], Awaitable[Any]]
+
+
+class QueueClosedError(Exception):
+    """Raised when a job is submitted to a draining queue."""
+
+
+class JobQueue:
+    """In-memory job queue, fair across repositories.
+
+    Jobs of a repository run in submission order, and repositories take turns: a repository with many
+    queued jobs cannot delay the jobs of other repositories by more than one job each. Finished jobs are
+    kept for their result to be fetched, until they expire or more recent jobs push them out.
+
+    Parameters
+    ----------
+    finished_job_ttl
+        Seconds a finished job is kept, by default FINISHED_JOB_TTL_SECONDS
+    max_finished_jobs
+        Maximum number of finished jobs kept, by default MAX_FINISHED_JOBS
+    """
+
+    def __init__(
+        self, finished_job_ttl: float = FINISHED_JOB_TTL_SECONDS, max_finished_jobs: int = MAX_FINISHED_JOBS
+    ) -> None:
+        self.finished_job_ttl = finished_job_ttl
+        self.max_finished_jobs = max_finished_jobs
+        self._pending: OrderedDict[str, deque[Job]] = OrderedDict()
+        self._jobs: dict[str, Job] = {}
+        # Finished jobs in finishing order, the next to be evicted first
+        self._finished: deque[Job] = deque()
+        self._condition = asyncio.Condition()
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def get(self, job_id: str) -> Job | None:
+        self._evict_finished()
+        return self._jobs.get(job_id)
+
+    def counts(self) -> dict[str, int]:
+        """Number of jobs per status."""
+        self._evict_finished()
+        counts = {status.value: 0 for status in JobStatus}
+        for job in self._jobs.values():
+            counts[job.status.value] += 1
+        return counts
+
+    async def submit(self, request: JobRequest) -> Job:
+        """Queue a job.
+
+        Raises
+        ------
+        QueueClosedError
+            If the queue is draining
+        """
+        async with self._condition:
+            if self._closed:
+                raise QueueClosedError("The server is draining and does not accept new jobs")
+            self._evict_finished()
+            job = Job(request=request)
+            self._jobs[job.id] = job
+            self._pending.setdefault(request.repo_key, deque()).append(job)
+            self._condition.notify()
+        return job
+
+    async def next_job(self) -> Job | None:
+        """Wait for the next job, None once the queue is closed and empty."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._pending or self._closed)
+            if not self._pending:
+                return None
+            repo_key, jobs = next(iter(self._pending.items()))
+            job = jobs.popleft()
+            if jobs:
+                # Round-robin: the repository goes back at the end of the line
+                self._pending.move_to_end(repo_key)
+            else:
+                del self._pending[repo_key]
+            return job
+
+    def finish(self, job: Job) -> None:
+        """Record the end of a job, whose status and outcome are already set."""
+        job.finished_at = time.time()
+        self._finished.append(job)
+        self._evict_finished()
+
+    def _evict_finished(self) -> None:
+        """Drop the finished jobs past their TTL, and the oldest ones beyond the maximum count."""
+        expired_before = time.time() - self.finished_job_ttl
+        while self._finished and (
+            len(self._finished) > self.max_finished_jobs or (self._finished[0].finished_at or 0) <= expired_before
+        ):
+            del self._jobs[self._finished.popleft().id]
+
+    async def close(self) -> None:
+        """Stop accepting jobs. Queued jobs are still handed out to the workers."""
+        async with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+async def run_workers(queue: JobQueue, runner: JobRunner, concurrency: int) -> None:
+    """Run jobs of the queue on ``concurrency`` workers until the queue is closed and empty."""
+
+    async def worker() -> None:
+        while (job := await queue.next_job()) is not None:
+            job.status = JobStatus.RUNNING
+            job.started_at = time.time()
+            try:
+                job.result = await runner(job.request)
+                job.status = JobStatus.SUCCEEDED
+            except Exception as e:
+                logger.exception(f"Job {job.id} ({job.request.kind} {job.request.repo_key}) failed: {e}")
+                job.error = str(e)
+                job.status = JobStatus.FAILED
+            queue.finish(job)
+
+    await asyncio.gather(*(worker() for _ in range(max(concurrency, 1))))
+
+
+async def run_job(request: JobRequest) -> Any:
+    """Run a job with the CLI orchestrators and deliver it to its output provider.
+
+    Returns
+    -------
+    :
+        Dumps of the delivered reviews for review jobs, the delivered description for describe jobs
+    """
+    # Workflow imports are only needed where jobs run, the client only uses the job models
+    from lampe.cli.commands.describe import create_description_generator
+    from lampe.cli.commands.review import create_review_generator
+    from lampe.cli.orchestrators.pr_description import (
+        PRDescriptionConfig,
+        PRDescriptionOrchestratorWorkflow,
+        PRDescriptionStart,
+    )
+    from lampe.cli.orchestrators.pr_review import PRReviewConfig, PRReviewOrchestratorWorkflow, PRReviewStart
+    from lampe.cli.providers.base import Provider
+    from lampe.core.data_models import PullRequest, Repository
+
+    repository = Repository(local_path=request.repo, full_name=request.repo_full_name)
+    pull_request = PullRequest(
+        number=request.number,
+        title=request.title,
+        body=request.body,
+        base_commit_hash=request.base,
+        base_branch_name="",
+        head_commit_hash=request.head,
+        head_branch_name="",
+    )
+    provider = Provider.create_provider(provider_name=request.output, repository=repository, pull_request=pull_request)
+
+    if request.kind == JobKind.REVIEW:
+        review_workflow = PRReviewOrchestratorWorkflow(
+            provider=provider, generator=create_review_generator(request.variant or "agentic"), timeout=request.timeout
+        )
+        reviews = await review_workflow.run(
+            start_event=PRReviewStart(
+                repository=repository,
+                pull_request=pull_request,
+                config=PRReviewConfig(
+                    review_depth=request.review_depth,
+                    custom_guidelines=request.guidelines,
+                    files_exclude_patterns=request.files_exclude,
+                    timeout=request.timeout,
+                ),
+            )
+        )
+        return [review.model_dump(mode="json") for review in reviews or []]
+
+    description_workflow = PRDescriptionOrchestratorWorkflow(
+        provider=provider, generator=create_description_generator(request.variant or "default"), timeout=request.timeout
+    )
+    result = await description_workflow.run(
+        start_event=PRDescriptionStart(
+            repository=repository,
+            pull_request=pull_request,
+            config=PRDescriptionConfig(files_exclude_patterns=request.files_exclude, timeout=request.timeout),
+        )
+    )
+    return result["description"]
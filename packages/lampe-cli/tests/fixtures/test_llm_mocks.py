@@ -2,7 +2,7 @@
 Test fixtures for LLM mocking in lampe-cli tests.
 """
 
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 
 def create_mock_llm_response(content: str):
@@ -77,5 +77,5 @@ def create_mock_generator_adapter(description: str):
 def create_mock_provider():
     """Create a mock provider for testing."""
     mock_provider = MagicMock()
-    mock_provider.deliver_pr_description = MagicMock()
+    mock_provider.adeliver_pr_description = AsyncMock()
     return mock_provider
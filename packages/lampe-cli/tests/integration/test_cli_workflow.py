@@ -25,15 +25,15 @@ def test_full_workflow_default_variant(sample_repo_path, mock_llm_response, mock
     mock_provider = MagicMock()
 
     # Mock the workflow creation
-    mocker.patch("lampe.cli.commands.describe.PRDescriptionOrchestratorWorkflow")
+    mocker.patch("lampe.cli.orchestrators.pr_description.PRDescriptionOrchestratorWorkflow")
     mocker.patch("lampe.cli.commands.describe.Provider.create_provider", return_value=mock_provider)
-    mocker.patch("lampe.cli.commands.describe.DefaultGeneratorAdapter", return_value=mock_generator)
+    mocker.patch("lampe.cli.orchestrators.pr_description.DefaultGeneratorAdapter", return_value=mock_generator)
     mocker.patch("lampe.cli.commands.describe.initialize")
 
     # Mock the workflow run method
     mock_workflow = MagicMock()
     mock_workflow.run = AsyncMock()
-    mocker.patch("lampe.cli.commands.describe.PRDescriptionOrchestratorWorkflow", return_value=mock_workflow)
+    mocker.patch("lampe.cli.orchestrators.pr_description.PRDescriptionOrchestratorWorkflow", return_value=mock_workflow)
 
     describe(
         repo=sample_repo_path,
@@ -45,6 +45,7 @@ def test_full_workflow_default_variant(sample_repo_path, mock_llm_response, mock
         files_exclude=None,
         files_reinclude=None,
         output="console",
+        perf_report=None,
     )
 
     # Verify the workflow was called
@@ -63,15 +64,15 @@ def test_full_workflow_agentic_variant(sample_repo_path, mock_llm_response, mock
     mock_provider = MagicMock()
 
     # Mock the workflow creation
-    mocker.patch("lampe.cli.commands.describe.PRDescriptionOrchestratorWorkflow")
+    mocker.patch("lampe.cli.orchestrators.pr_description.PRDescriptionOrchestratorWorkflow")
     mocker.patch("lampe.cli.commands.describe.Provider.create_provider", return_value=mock_provider)
-    mocker.patch("lampe.cli.commands.describe.AgenticGeneratorAdapter", return_value=mock_generator)
+    mocker.patch("lampe.cli.orchestrators.pr_description.AgenticGeneratorAdapter", return_value=mock_generator)
     mocker.patch("lampe.cli.commands.describe.initialize")
 
     # Mock the workflow run method
     mock_workflow = MagicMock()
     mock_workflow.run = AsyncMock()
-    mocker.patch("lampe.cli.commands.describe.PRDescriptionOrchestratorWorkflow", return_value=mock_workflow)
+    mocker.patch("lampe.cli.orchestrators.pr_description.PRDescriptionOrchestratorWorkflow", return_value=mock_workflow)
 
     describe(
         repo=sample_repo_path,
@@ -83,6 +84,7 @@ def test_full_workflow_agentic_variant(sample_repo_path, mock_llm_response, mock
         output="console",
         files_exclude=None,
         files_reinclude=None,
+        perf_report=None,
     )
 
     # Verify the workflow was called
@@ -101,15 +103,15 @@ def test_workflow_with_file_exclusions(sample_repo_path, mock_llm_response, mock
     mock_provider = MagicMock()
 
     # Mock the workflow creation
-    mocker.patch("lampe.cli.commands.describe.PRDescriptionOrchestratorWorkflow")
+    mocker.patch("lampe.cli.orchestrators.pr_description.PRDescriptionOrchestratorWorkflow")
     mocker.patch("lampe.cli.commands.describe.Provider.create_provider", return_value=mock_provider)
-    mocker.patch("lampe.cli.commands.describe.DefaultGeneratorAdapter", return_value=mock_generator)
+    mocker.patch("lampe.cli.orchestrators.pr_description.DefaultGeneratorAdapter", return_value=mock_generator)
     mocker.patch("lampe.cli.commands.describe.initialize")
 
     # Mock the workflow run method
     mock_workflow = MagicMock()
     mock_workflow.run = AsyncMock()
-    mocker.patch("lampe.cli.commands.describe.PRDescriptionOrchestratorWorkflow", return_value=mock_workflow)
+    mocker.patch("lampe.cli.orchestrators.pr_description.PRDescriptionOrchestratorWorkflow", return_value=mock_workflow)
 
     describe(
         repo=sample_repo_path,
@@ -120,6 +122,7 @@ def test_workflow_with_file_exclusions(sample_repo_path, mock_llm_response, mock
         files_exclude=["*.md", "*.txt"],
         files_reinclude=["!README.md"],
         output="console",
+        perf_report=None,
     )
 
     # Verify the workflow was called
@@ -138,15 +141,15 @@ def test_workflow_with_custom_parameters(sample_repo_path, mock_llm_response, mo
     mock_provider = MagicMock()
 
     # Mock the workflow creation
-    mocker.patch("lampe.cli.commands.describe.PRDescriptionOrchestratorWorkflow")
+    mocker.patch("lampe.cli.orchestrators.pr_description.PRDescriptionOrchestratorWorkflow")
     mocker.patch("lampe.cli.commands.describe.Provider.create_provider", return_value=mock_provider)
-    mocker.patch("lampe.cli.commands.describe.DefaultGeneratorAdapter", return_value=mock_generator)
+    mocker.patch("lampe.cli.orchestrators.pr_description.DefaultGeneratorAdapter", return_value=mock_generator)
     mocker.patch("lampe.cli.commands.describe.initialize")
 
     # Mock the workflow run method
     mock_workflow = MagicMock()
     mock_workflow.run = AsyncMock()
-    mocker.patch("lampe.cli.commands.describe.PRDescriptionOrchestratorWorkflow", return_value=mock_workflow)
+    mocker.patch("lampe.cli.orchestrators.pr_description.PRDescriptionOrchestratorWorkflow", return_value=mock_workflow)
 
     describe(
         repo=sample_repo_path,
@@ -161,6 +164,7 @@ def test_workflow_with_custom_parameters(sample_repo_path, mock_llm_response, mo
         timeout=30,
         verbose=True,
         output="console",
+        perf_report=None,
     )
 
     # Verify the workflow was called
@@ -176,6 +180,7 @@ async def test_orchestrator_workflow_integration(sample_repository, sample_pull_
 
     # Mock the provider
     mock_provider = MagicMock()
+    mock_provider.adeliver_pr_description = AsyncMock()
 
     # Create the workflow
     workflow = PRDescriptionOrchestratorWorkflow(provider=mock_provider, generator=mock_generator)
@@ -201,7 +206,7 @@ async def test_orchestrator_workflow_integration(sample_repository, sample_pull_
     )
 
     # Verify provider was called
-    mock_provider.deliver_pr_description.assert_called_once()
+    mock_provider.adeliver_pr_description.assert_awaited_once()
 
     # Verify result
     assert result["description"] == "Orchestrator description"
@@ -282,15 +287,15 @@ def test_error_handling_in_workflow(sample_repo_path, mocker):
     mock_provider = MagicMock()
 
     # Mock the workflow creation
-    mocker.patch("lampe.cli.commands.describe.PRDescriptionOrchestratorWorkflow")
+    mocker.patch("lampe.cli.orchestrators.pr_description.PRDescriptionOrchestratorWorkflow")
     mocker.patch("lampe.cli.commands.describe.Provider.create_provider", return_value=mock_provider)
-    mocker.patch("lampe.cli.commands.describe.DefaultGeneratorAdapter", return_value=mock_generator)
+    mocker.patch("lampe.cli.orchestrators.pr_description.DefaultGeneratorAdapter", return_value=mock_generator)
     mocker.patch("lampe.cli.commands.describe.initialize")
 
     # Mock the workflow run method to propagate the error
     mock_workflow = MagicMock()
     mock_workflow.run = AsyncMock(side_effect=Exception("LLM error"))
-    mocker.patch("lampe.cli.commands.describe.PRDescriptionOrchestratorWorkflow", return_value=mock_workflow)
+    mocker.patch("lampe.cli.orchestrators.pr_description.PRDescriptionOrchestratorWorkflow", return_value=mock_workflow)
 
     # The function should propagate the error
     with pytest.raises(Exception, match="LLM error"):
@@ -303,6 +308,7 @@ def test_error_handling_in_workflow(sample_repo_path, mocker):
             files_exclude=None,
             files_reinclude=None,
             output="console",
+            perf_report=None,
         )
 
 
@@ -325,15 +331,15 @@ To improve functionality.
     mock_provider = MagicMock()
 
     # Mock the workflow creation
-    mocker.patch("lampe.cli.commands.describe.PRDescriptionOrchestratorWorkflow")
+    mocker.patch("lampe.cli.orchestrators.pr_description.PRDescriptionOrchestratorWorkflow")
     mocker.patch("lampe.cli.commands.describe.Provider.create_provider", return_value=mock_provider)
-    mocker.patch("lampe.cli.commands.describe.DefaultGeneratorAdapter", return_value=mock_generator)
+    mocker.patch("lampe.cli.orchestrators.pr_description.DefaultGeneratorAdapter", return_value=mock_generator)
     mocker.patch("lampe.cli.commands.describe.initialize")
 
     # Mock the workflow run method
     mock_workflow = MagicMock()
     mock_workflow.run = AsyncMock()
-    mocker.patch("lampe.cli.commands.describe.PRDescriptionOrchestratorWorkflow", return_value=mock_workflow)
+    mocker.patch("lampe.cli.orchestrators.pr_description.PRDescriptionOrchestratorWorkflow", return_value=mock_workflow)
 
     describe(
         repo=sample_repo_path,
@@ -345,6 +351,7 @@ To improve functionality.
         files_exclude=None,
         files_reinclude=None,
         output="console",
+        perf_report=None,
     )
 
     # Verify the workflow was called
@@ -1,10 +1,11 @@
 from lampe.cli.commands.describe import describe
+from lampe.cli.orchestrators.pr_description import MapReduceGeneratorAdapter
 
 
 def test_run_describe_agentic_variant(sample_repo_path, mocker):
     """Test run_describe with agentic variant."""
     mocker.patch("lampe.cli.commands.describe.initialize")
-    mock_workflow = mocker.patch("lampe.cli.commands.describe.PRDescriptionOrchestratorWorkflow")
+    mock_workflow = mocker.patch("lampe.cli.orchestrators.pr_description.PRDescriptionOrchestratorWorkflow")
 
     mock_workflow_instance = mocker.MagicMock()
     mock_workflow.return_value = mock_workflow_instance
@@ -26,6 +27,7 @@ def test_run_describe_agentic_variant(sample_repo_path, mocker):
         files_exclude=None,
         files_reinclude=None,
         output="console",
+        perf_report=None,
     )
 
     # Verify workflow was created
@@ -35,7 +37,7 @@ def test_run_describe_agentic_variant(sample_repo_path, mocker):
 def test_run_describe_with_exclude_patterns(sample_repo_path, mocker):
     """Test run_describe with file exclusion patterns."""
     mocker.patch("lampe.cli.commands.describe.initialize")
-    mock_workflow = mocker.patch("lampe.cli.commands.describe.PRDescriptionOrchestratorWorkflow")
+    mock_workflow = mocker.patch("lampe.cli.orchestrators.pr_description.PRDescriptionOrchestratorWorkflow")
 
     mock_workflow_instance = mocker.MagicMock()
     mock_workflow.return_value = mock_workflow_instance
@@ -59,6 +61,7 @@ def test_run_describe_with_exclude_patterns(sample_repo_path, mocker):
         timeout=30,
         verbose=True,
         output="console",
+        perf_report=None,
     )
 
     # Verify workflow was created
@@ -68,7 +71,7 @@ def test_run_describe_with_exclude_patterns(sample_repo_path, mocker):
 def test_run_describe_initializes_core(sample_repo_path, mocker):
     """Test that run_describe calls initialize."""
     mock_init = mocker.patch("lampe.cli.commands.describe.initialize")
-    mock_workflow = mocker.patch("lampe.cli.commands.describe.PRDescriptionOrchestratorWorkflow")
+    mock_workflow = mocker.patch("lampe.cli.orchestrators.pr_description.PRDescriptionOrchestratorWorkflow")
 
     mock_workflow_instance = mocker.MagicMock()
     mock_workflow.return_value = mock_workflow_instance
@@ -88,6 +91,7 @@ def test_run_describe_initializes_core(sample_repo_path, mocker):
         title="Test PR",
         files_exclude=None,
         files_reinclude=None,
+        perf_report=None,
     )
 
     # Verify initialize was called
@@ -97,7 +101,7 @@ def test_run_describe_initializes_core(sample_repo_path, mocker):
 def test_run_describe_creates_correct_models(sample_repo_path, mocker):
     """Test that run_describe creates correct Repository and PullRequest models."""
     mocker.patch("lampe.cli.commands.describe.initialize")
-    mock_workflow = mocker.patch("lampe.cli.commands.describe.PRDescriptionOrchestratorWorkflow")
+    mock_workflow = mocker.patch("lampe.cli.orchestrators.pr_description.PRDescriptionOrchestratorWorkflow")
 
     mock_workflow_instance = mocker.MagicMock()
     mock_workflow.return_value = mock_workflow_instance
@@ -122,7 +126,39 @@ def test_run_describe_creates_correct_models(sample_repo_path, mocker):
         files_exclude=None,
         files_reinclude=None,
         output="console",
+        perf_report=None,
     )
 
     # Verify workflow was called
     mock_workflow.assert_called_once()
+
+
+def test_run_describe_map_reduce_variant(sample_repo_path, mocker):
+    """Test run_describe selects the map-reduce generator with the requested concurrency."""
+    mocker.patch("lampe.cli.commands.describe.initialize")
+    mock_workflow = mocker.patch("lampe.cli.orchestrators.pr_description.PRDescriptionOrchestratorWorkflow")
+    mock_workflow_instance = mocker.MagicMock()
+    mock_workflow.return_value = mock_workflow_instance
+
+    async def mock_run(start_event):
+        return mocker.MagicMock()
+
+    mock_workflow_instance.run = mock_run
+
+    describe(
+        repo=sample_repo_path,
+        repo_full_name="owner/repo",
+        base="abc123",
+        head="def456",
+        title="Test PR",
+        variant="map-reduce",
+        files_exclude=None,
+        files_reinclude=None,
+        output="console",
+        concurrency=3,
+        perf_report=None,
+    )
+
+    generator = mock_workflow.call_args.kwargs["generator"]
+    assert isinstance(generator, MapReduceGeneratorAdapter)
+    assert generator.max_concurrency == 3
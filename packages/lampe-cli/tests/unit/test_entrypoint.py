@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Dependencies only workflows need: loading them costs seconds of CLI startup
+HEAVY_MODULES = ("llama_index.core", "litellm", "github", "langfuse", "lampe.review.workflows.agentic_review")
+
+_PROBE = """
+import sys
+from lampe.cli.entrypoint import main
+sys.argv = ["lampe", *{args!r}]
+try:
+    main()
+except SystemExit:
+    pass
+print("HEAVY=" + ",".join(m for m in {heavy!r} if m in sys.modules), file=sys.stderr)
+"""
+
+
+@pytest.mark.parametrize(
+    "args",
+    [["version"], ["check-reviewed", "--help"], ["describe", "--help"], ["review", "--help"], ["serve", "--help"]],
+)
+def test_cli_startup_does_not_import_workflow_dependencies(args):
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(args=args, heavy=HEAVY_MODULES)],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "TELEMETRY_ENABLED": "false"},
+    )
+    assert completed.stderr.strip().splitlines()[-1] == "HEAVY="
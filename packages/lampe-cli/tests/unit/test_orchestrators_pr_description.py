@@ -190,6 +190,7 @@ async def test_orchestrator_workflow_run_generation_step(sample_repository, samp
 async def test_orchestrator_workflow_deliver_step(sample_repository, sample_pull_request):
     """Test the deliver step."""
     mock_provider = MagicMock()
+    mock_provider.adeliver_pr_description = AsyncMock()
     mock_generator = MagicMock()
 
     workflow = PRDescriptionOrchestratorWorkflow(provider=mock_provider, generator=mock_generator)
@@ -202,8 +203,8 @@ async def test_orchestrator_workflow_deliver_step(sample_repository, sample_pull
     result = await workflow.deliver(event)
 
     # Verify provider was called
-    mock_provider.deliver_pr_description.assert_called_once()
-    call_args = mock_provider.deliver_pr_description.call_args[0][0]
+    mock_provider.adeliver_pr_description.assert_awaited_once()
+    call_args = mock_provider.adeliver_pr_description.call_args[0][0]
     assert call_args.description == "Test description"
 
     # Verify result
@@ -214,6 +215,7 @@ async def test_orchestrator_workflow_deliver_step(sample_repository, sample_pull
 async def test_orchestrator_workflow_full_run(sample_repository, sample_pull_request):
     """Test the full workflow execution."""
     mock_provider = MagicMock()
+    mock_provider.adeliver_pr_description = AsyncMock()
     mock_generator = MagicMock()
     mock_generator.generate = AsyncMock(return_value=MagicMock(description="Test description"))
 
@@ -229,7 +231,7 @@ async def test_orchestrator_workflow_full_run(sample_repository, sample_pull_req
     mock_generator.generate.assert_called_once()
 
     # Verify provider was called
-    mock_provider.deliver_pr_description.assert_called_once()
+    mock_provider.adeliver_pr_description.assert_awaited_once()
 
     # Verify final result
     assert result["description"] == "Test description"
@@ -244,3 +246,24 @@ def test_pr_description_start_event_creation(sample_repository, sample_pull_requ
     assert start_event.repository == sample_repository
     assert start_event.pull_request == sample_pull_request
     assert start_event.config == config
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_workflow_streams_to_streaming_provider(sample_repository, sample_pull_request):
+    """With stream enabled, tokens are forwarded to providers supporting description streaming only."""
+    mock_generator = MagicMock()
+    mock_generator.generate = AsyncMock(return_value=MagicMock(description="Test description"))
+    config = PRDescriptionConfig(stream=True)
+    start_event = PRDescriptionStart(repository=sample_repository, pull_request=sample_pull_request, config=config)
+
+    streaming_provider = MagicMock(supports_description_streaming=True)
+    await PRDescriptionOrchestratorWorkflow(provider=streaming_provider, generator=mock_generator).run_generation(
+        start_event
+    )
+    assert mock_generator.generate.call_args.kwargs["on_token"] == streaming_provider.stream_pr_description
+
+    mock_generator.generate.reset_mock()
+    await PRDescriptionOrchestratorWorkflow(
+        provider=MagicMock(supports_description_streaming=False), generator=mock_generator
+    ).run_generation(start_event)
+    assert "on_token" not in mock_generator.generate.call_args.kwargs
@@ -0,0 +1,133 @@
+import asyncio
+import io
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from lampe.cli.orchestrators.pr_review import PRReviewConfig
+from lampe.cli.orchestrators.pr_review_batch import LLMCostBudget, RepositoryClones, run_review_batch
+from lampe.review.workflows.pr_review.data_models import AgentReviewOutput
+
+
+class FakeGenerator:
+    """Review generator recording the reviewed heads and the maximum number of reviews in flight."""
+
+    def __init__(self, fail_heads: tuple[str, ...] = ()) -> None:
+        self.fail_heads = fail_heads
+        self.heads: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate(self, repository, pull_request, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        self.heads.append(pull_request.head_commit_hash)
+        if pull_request.head_commit_hash in self.fail_heads:
+            raise RuntimeError("review failed")
+        return MagicMock(
+            output=[AgentReviewOutput(agent_name="quick", focus_areas=[], reviews=[], sources=[], summary="ok")]
+        )
+
+
+def _line(repo: str, head: str, **extra) -> str:
+    return json.dumps({"repo": repo, "base": "base", "head": head, **extra})
+
+
+@pytest.mark.asyncio
+async def test_run_review_batch_writes_one_result_per_pr(tmp_path, capsys):
+    lines = [_line(str(tmp_path), f"head{i}", id=f"pr-{i}", number=i) for i in range(5)]
+    lines += ["", '{"base": "base", "head": "head"}']
+    generator = FakeGenerator(fail_heads=("head3",))
+    results = io.StringIO()
+
+    completed = await run_review_batch(
+        lines, results, generator=generator, output="console", config=PRReviewConfig(), concurrency=2
+    )
+
+    written = [json.loads(line) for line in results.getvalue().splitlines()]
+    assert [r.model_dump(mode="json") for r in completed] == written
+    assert generator.max_in_flight == 2
+    by_line = {r["line"]: r for r in written}
+    assert sorted(by_line) == [1, 2, 3, 4, 5, 7]
+    assert by_line[1]["status"] == "ok" and by_line[1]["id"] == "pr-0"
+    assert by_line[1]["reviews"][0]["agent_name"] == "quick"
+    assert by_line[4]["status"] == "error" and by_line[4]["error"] == "review failed"
+    assert by_line[7]["status"] == "error" and "'repo' or 'repo_url'" in by_line[7]["error"]
+    assert "Code Review" in capsys.readouterr().out
+
+
+@pytest.mark.asyncio
+async def test_run_review_batch_skips_prs_once_budget_is_spent(tmp_path):
+    budget = LLMCostBudget(max_cost=1.0)
+
+    class SpendingGenerator(FakeGenerator):
+        async def generate(self, repository, pull_request, **kwargs):
+            budget.log_success_event({"response_cost": 0.6}, None, None, None)
+            return await super().generate(repository, pull_request, **kwargs)
+
+    generator = SpendingGenerator()
+    lines = [_line(str(tmp_path), f"head{i}") for i in range(4)]
+
+    completed = await run_review_batch(
+        lines,
+        io.StringIO(),
+        generator=generator,
+        output="console",
+        config=PRReviewConfig(),
+        concurrency=1,
+        budget=budget,
+    )
+
+    assert [r.status for r in sorted(completed, key=lambda r: r.line)] == ["ok", "ok", "skipped", "skipped"]
+    assert generator.heads == ["head0", "head1"]
+
+
+@pytest.mark.asyncio
+async def test_running_reviews_stop_spending_once_the_global_budget_is_spent(tmp_path):
+    budget = LLMCostBudget(max_cost=1.0)
+    calls_left: dict[str, list[int | None]] = {}
+
+    class SpendingGenerator(FakeGenerator):
+        async def generate(self, repository, pull_request, **kwargs):
+            review_budget = kwargs["budget"]
+            head = pull_request.head_commit_hash
+            calls_left[head] = [review_budget.remaining_calls()]
+            budget.log_success_event({"response_cost": 0.6}, None, None, None)
+            result = await super().generate(repository, pull_request, **kwargs)
+            # Both reviews have spent by now: the shared budget is over for each of them
+            calls_left[head].append(review_budget.remaining_calls())
+            return result
+
+    completed = await run_review_batch(
+        [_line(str(tmp_path), f"head{i}") for i in range(2)],
+        io.StringIO(),
+        generator=SpendingGenerator(),
+        output="console",
+        config=PRReviewConfig(max_llm_calls=50),
+        concurrency=2,
+        budget=budget,
+    )
+
+    assert [r.status for r in completed] == ["ok", "ok"]
+    assert calls_left == {"head0": [50, 0], "head1": [50, 0]}
+
+
+@pytest.mark.asyncio
+async def test_repository_clones_clone_each_url_once(mocker, tmp_path):
+    clone = mocker.patch("lampe.cli.orchestrators.pr_review_batch.clone_repo", return_value=str(tmp_path))
+    fetch = mocker.patch("lampe.cli.orchestrators.pr_review_batch.fetch_commit_ref")
+    clones = RepositoryClones()
+
+    paths = await asyncio.gather(
+        clones.checkout("https://example.com/repo.git", "b1", "h1"),
+        clones.checkout("https://example.com/repo.git", "b2", "h2"),
+    )
+
+    assert paths == [str(tmp_path), str(tmp_path)]
+    clone.assert_called_once_with("https://example.com/repo.git", head_ref="h1", base_ref="b1")
+    assert [c.args for c in fetch.call_args_list] == [(str(tmp_path), "b2"), (str(tmp_path), "h2")]
+    clones.cleanup()
+    assert not tmp_path.exists()
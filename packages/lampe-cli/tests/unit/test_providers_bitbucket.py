@@ -0,0 +1,216 @@
+"""BitbucketProvider review delivery against a local mock of the Bitbucket Cloud API."""
+
+import hashlib
+import json
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+from lampe.cli.providers import bitbucket as bitbucket_provider
+from lampe.cli.providers import etag_cache
+from lampe.cli.providers.base import REVIEW_MARKER, PRReviewPayload
+from lampe.cli.providers.bitbucket import BitbucketProvider, _retry_after_seconds
+from lampe.core.data_models import PullRequest, Repository
+from lampe.review.workflows.pr_review.data_models import AgentReviewOutput, FileReview, ReviewComment
+
+COMMENTS_PATH = "/2.0/repositories/acme/api/pullrequests/7/comments"
+# Time the mock takes to create a comment
+COMMENT_LATENCY_SECONDS = 0.05
+
+
+class BitbucketMock(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately: without it, each response waits for the delayed ACK of the client
+    disable_nagle_algorithm = True
+    lock = threading.Lock()
+    comments: list[dict] = []
+    connections: set[int] = set()
+    in_flight = 0
+    max_in_flight = 0
+    # Number of the next requests answered with 429
+    rate_limited = 0
+    # Path and status of the answered GET requests
+    gets: list[tuple[str, int]] = []
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _reply(self, status: int, data: dict | None, headers: dict[str, str] | None = None) -> None:
+        body = b"" if data is None else json.dumps(data).encode()
+        self.send_response(status)
+        for name, value in {"Content-Type": "application/json", **(headers or {})}.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        if url.path == "/2.0/user":
+            # Like a repository access token
+            status, data, headers = 401, {"error": "Unauthorized"}, {}
+        elif url.path == COMMENTS_PATH:
+            query = parse_qs(url.query)
+            assert query["sort"] == ["-created_on"]
+            pagelen, page = int(query["pagelen"][0]), int(query.get("page", ["1"])[0])
+            with self.lock:
+                newest_first = self.comments[::-1]
+            data = {"values": newest_first[(page - 1) * pagelen : page * pagelen]}
+            if page * pagelen < len(newest_first):
+                data["next"] = (
+                    f"http://{self.headers['Host']}{url.path}?sort=-created_on&pagelen={pagelen}&page={page + 1}"
+                )
+            etag = f'"{hashlib.sha1(json.dumps(data).encode()).hexdigest()}"'
+            status, headers = 200, {"ETag": etag}
+            if self.headers.get("If-None-Match") == etag:
+                status, data = 304, None
+        else:
+            status, data, headers = 404, {"error": "Not Found"}, {}
+        with self.lock:
+            self.gets.append((self.path, status))
+        self._reply(status, data, headers)
+
+    def do_POST(self) -> None:
+        data = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        cls = type(self)
+        with cls.lock:
+            cls.connections.add(self.client_address[1])
+            if cls.rate_limited > 0:
+                cls.rate_limited -= 1
+                self._reply(429, {"error": "Rate limit"}, {"Retry-After": "0"})
+                return
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        time.sleep(COMMENT_LATENCY_SECONDS)
+        with cls.lock:
+            cls.in_flight -= 1
+            cls.comments.append(data)
+        self._reply(201 if self.path == COMMENTS_PATH else 404, {"id": len(cls.comments)})
+
+
+@pytest.fixture
+def bitbucket_api(monkeypatch, tmp_path):
+    BitbucketMock.comments, BitbucketMock.connections, BitbucketMock.gets = [], set(), []
+    BitbucketMock.in_flight = BitbucketMock.max_in_flight = BitbucketMock.rate_limited = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), BitbucketMock)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(bitbucket_provider, "BITBUCKET_API_URL", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setattr(bitbucket_provider, "BITBUCKET_RETRY_BACKOFF_SECONDS", 0.01)
+    monkeypatch.setattr(etag_cache, "ETAG_CACHE_PATH", str(tmp_path / "etags.json"))
+    monkeypatch.setenv("BITBUCKET_WORKSPACE", "acme")
+    monkeypatch.setenv("BITBUCKET_REPO_SLUG", "api")
+    monkeypatch.setenv("BITBUCKET_PR_ID", "7")
+    monkeypatch.setenv("LAMPE_BITBUCKET_TOKEN", "token")
+    yield BitbucketMock
+    server.shutdown()
+    server.server_close()
+
+
+def _provider() -> BitbucketProvider:
+    pull_request = PullRequest(
+        number=0,
+        title="Add feature",
+        base_commit_hash="abc123",
+        base_branch_name="main",
+        head_commit_hash="def456",
+        head_branch_name="feature",
+    )
+    return BitbucketProvider(repository=Repository(local_path="/repo"), pull_request=pull_request)
+
+
+def _payload(inline_count: int) -> PRReviewPayload:
+    comments = [
+        ReviewComment(line_number=line, comment=f"Issue {line}", severity="high", category="bug", agent_name="a")
+        for line in range(1, inline_count + 1)
+    ]
+    return PRReviewPayload(
+        reviews=[
+            AgentReviewOutput(
+                agent_name="Security",
+                focus_areas=["auth"],
+                summary="Auth issues.",
+                reviews=[
+                    FileReview(file_path="api/views.py", structured_comments=comments, summary="Views"),
+                    FileReview(file_path="api/urls.py", summary="Looks fine."),
+                ],
+            ),
+            AgentReviewOutput(agent_name="Quality", focus_areas=["naming"], summary="Naming is consistent."),
+        ]
+    )
+
+
+def test_comments_are_posted_concurrently_on_pooled_connections(bitbucket_api, monkeypatch):
+    monkeypatch.setattr(bitbucket_provider, "BITBUCKET_MAX_CONCURRENT_COMMENTS", 4)
+    provider = _provider()
+
+    provider.deliver_pr_review(_payload(inline_count=24))
+
+    comments = bitbucket_api.comments
+    assert len(comments) == 27
+    # General comments come first, in review order, before any inline comment
+    assert [c["content"]["raw"].split("\n")[0] for c in comments[:3]] == [
+        "## Security",
+        "**api/urls.py:** Looks fine.",
+        "## Quality",
+    ]
+    assert all("inline" in c for c in comments[3:])
+    assert all(c["content"]["raw"].endswith(REVIEW_MARKER) for c in comments)
+    assert sorted(c["inline"]["to"] for c in comments[3:]) == list(range(1, 25))
+    # Inline comments overlap, within the concurrency limit (a wall-clock bound is unreliable under coverage)
+    assert 1 < bitbucket_api.max_in_flight <= 4
+    assert len(bitbucket_api.connections) <= 4
+
+
+def test_rate_limited_comments_are_retried(bitbucket_api):
+    bitbucket_api.rate_limited = 5
+
+    _provider().deliver_pr_review(_payload(inline_count=6))
+
+    assert len(bitbucket_api.comments) == 9
+    assert bitbucket_api.rate_limited == 0
+
+
+def test_has_reviewed_scans_newest_comments_first_and_reuses_etags(bitbucket_api, monkeypatch):
+    monkeypatch.setattr(bitbucket_provider, "BITBUCKET_PAGE_SIZE", 2)
+    provider = _provider()
+    provider.deliver_pr_review(_payload(inline_count=0))
+    bitbucket_api.comments += [{"content": {"raw": f"Thanks {i}"}, "user": {"uuid": "{dev}"}} for i in range(4)]
+
+    assert provider.has_reviewed()
+    # Two pages of newer comments, then the page with the latest Lampe comment: the last page is not read
+    assert [(parse_qs(urlparse(path).query).get("page", ["1"])[0], status) for path, status in bitbucket_api.gets] == [
+        ("1", 401),
+        ("1", 200),
+        ("2", 200),
+        ("3", 200),
+    ]
+
+    bitbucket_api.gets.clear()
+    assert provider.has_reviewed()
+    # The token user is not requested again, unchanged pages are answered with 304
+    assert [status for _, status in bitbucket_api.gets] == [304, 304, 304]
+
+
+def test_has_reviewed_is_false_without_lampe_comments(bitbucket_api):
+    bitbucket_api.comments = [{"content": {"raw": "Looks good to me"}, "user": {"uuid": "{dev}"}}]
+
+    assert not _provider().has_reviewed()
+
+
+def test_retry_after_accepts_seconds_and_http_dates():
+    def response(retry_after: str | None) -> requests.Response:
+        result = requests.Response()
+        if retry_after is not None:
+            result.headers["Retry-After"] = retry_after
+        return result
+
+    assert _retry_after_seconds(response("3")) == 3.0
+    assert 8 < _retry_after_seconds(response(formatdate(time.time() + 10, usegmt=True))) <= 10
+    assert _retry_after_seconds(response(None)) is None
+    assert _retry_after_seconds(response("soon")) is None
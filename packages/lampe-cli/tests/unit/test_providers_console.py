@@ -1,5 +1,7 @@
 from unittest.mock import patch
 
+import pytest
+
 from lampe.cli.providers.base import PRDescriptionPayload
 from lampe.cli.providers.console import ConsoleProvider
 
@@ -22,3 +24,41 @@ def test_console_provider_deliver_pr_description_text_format(mock_print, sample_
 
     # Verify print was called with the description
     mock_print.assert_called_once_with("Test PR description")
+
+
+def test_console_provider_streams_description_without_fences(capsys, sample_repository, sample_pull_request):
+    """Streamed text is printed line by line, without the wrapping markdown fence, and not printed twice."""
+    provider = ConsoleProvider(repository=sample_repository, pull_request=sample_pull_request)
+
+    for delta in ["```mark", "down\n### What", " change?\n\nAdd X.\n```python\nx = 1\n", "```\nDone.\n", "```"]:
+        provider.stream_pr_description(delta)
+    provider.deliver_pr_description(PRDescriptionPayload(description="ignored, already streamed"))
+
+    assert capsys.readouterr().out == "### What change?\n\nAdd X.\n```python\nx = 1\n```\nDone.\n"
+
+
+@pytest.mark.parametrize(
+    "deltas",
+    [
+        ["```md\nAdd X.\n```python\nx = 1\n", "```\n", "```"],
+        ["Add X.\n```python\nx = 1\n", "```"],
+        ["Add X.\n```python\nx = 1\n```\n"],
+    ],
+)
+def test_console_provider_streams_description_ending_with_code_block(
+    capsys, sample_repository, sample_pull_request, deltas
+):
+    """The closing fence of a code block ending the description is printed once, the wrapping fence is not."""
+    provider = ConsoleProvider(repository=sample_repository, pull_request=sample_pull_request)
+
+    for delta in deltas:
+        provider.stream_pr_description(delta)
+    provider.deliver_pr_description(PRDescriptionPayload(description="Add X.\n```python\nx = 1\n```"))
+
+    assert capsys.readouterr().out == "Add X.\n```python\nx = 1\n```\n"
+
+
+def test_console_provider_prints_description_when_not_streamed(capsys, sample_repository, sample_pull_request):
+    provider = ConsoleProvider(repository=sample_repository, pull_request=sample_pull_request)
+    provider.deliver_pr_description(PRDescriptionPayload(description="Test PR description"))
+    assert capsys.readouterr().out == "Test PR description\n"
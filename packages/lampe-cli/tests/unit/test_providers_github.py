@@ -0,0 +1,297 @@
+"""GitHubProvider review delivery against a local stand-in of the GitHub REST API."""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from github import Github
+
+from lampe.cli.providers import etag_cache
+from lampe.cli.providers import github as github_provider
+from lampe.cli.providers.base import REVIEW_MARKER, PRDescriptionPayload, PRReviewPayload
+from lampe.cli.providers.github import GitHubProvider, _split_comment
+from lampe.cli.providers.http_client import aclose_async_client
+from lampe.core.data_models import PullRequest, Repository
+from lampe.review.workflows.pr_review.data_models import AgentReviewOutput, FileReview, ReviewComment
+
+# Lines the stand-in refuses as inline comments, like GitHub does for lines outside the diff
+LINES_OUTSIDE_DIFF = {999}
+# Login of the token user
+TOKEN_LOGIN = "lampe-bot"
+
+
+class GitHubStandIn(BaseHTTPRequestHandler):
+    # Headers and body are written separately: without it, each response waits for the delayed ACK of the client
+    disable_nagle_algorithm = True
+    requests: list[tuple[str, str, dict]] = []
+    # Issue comments and reviews of the pull request, oldest first
+    issue_comments: list[dict] = []
+    reviews: list[dict] = []
+    # Status of the answered GET requests
+    statuses: list[int] = []
+    # Body of the pull request
+    pull_body = "Existing description"
+    # Time the stand-in takes to create a review or a comment
+    latency = 0.0
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _reply(self, status: int, data: dict | list | None, headers: dict[str, str] | None = None) -> None:
+        self.statuses.append(status)
+        body = b"" if data is None else json.dumps(data).encode()
+        self.send_response(status)
+        for name, value in {"Content-Type": "application/json", **(headers or {})}.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _reply_page(self, items: list[dict]) -> None:
+        """Reply a page of ``items`` with its ETag and Link header, or 304 when the ETag matches."""
+        query = parse_qs(urlparse(self.path).query)
+        per_page, page = int(query["per_page"][0]), int(query["page"][0])
+        data = items[(page - 1) * per_page : page * per_page]
+        etag = f'"{hashlib.sha1(json.dumps(data).encode()).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            self._reply(304, None, {"ETag": etag})
+            return
+        last_page = max(-(-len(items) // per_page), 1)
+        url = f"http://{self.headers['Host']}{urlparse(self.path).path}"
+        link = f'<{url}?per_page={per_page}&page={last_page}>; rel="last"'
+        self._reply(200, data, {"ETag": etag, "Link": link})
+
+    def do_GET(self) -> None:
+        self.requests.append(("GET", self.path, {}))
+        base = f"http://{self.headers['Host']}"
+        path = urlparse(self.path).path
+        if path == "/user":
+            self._reply(200, {"login": TOKEN_LOGIN})
+        elif path == "/repos/acme/api/issues/7/comments":
+            self._reply_page(self.issue_comments)
+        elif path == "/repos/acme/api/pulls/7/reviews":
+            self._reply_page(self.reviews)
+        elif self.path == "/repos/acme/api":
+            self._reply(200, {"full_name": "acme/api", "url": f"{base}/repos/acme/api"})
+        elif self.path == "/repos/acme/api/pulls/7":
+            self._reply(
+                200,
+                {
+                    "number": 7,
+                    "url": f"{base}/repos/acme/api/pulls/7",
+                    "issue_url": f"{base}/repos/acme/api/issues/7",
+                    "head": {"sha": "def456"},
+                    "body": self.pull_body,
+                },
+            )
+        else:
+            self._reply(404, {"message": "Not Found"})
+
+    def do_POST(self) -> None:
+        data = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.requests.append(("POST", self.path, data))
+        time.sleep(self.latency)
+        if self.path == "/repos/acme/api/pulls/7/reviews":
+            if any(comment["line"] in LINES_OUTSIDE_DIFF for comment in data["comments"]):
+                self._reply(422, {"message": "Unprocessable Entity", "errors": ["Line could not be resolved"]})
+            else:
+                self._reply(200, {"id": len(self.requests)})
+        elif self.path == "/repos/acme/api/issues/7/comments":
+            self._reply(201, {"id": len(self.requests), "body": data["body"]})
+        else:
+            self._reply(404, {"message": "Not Found"})
+
+    def do_PATCH(self) -> None:
+        data = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.requests.append(("PATCH", self.path, data))
+        if self.path == "/repos/acme/api/pulls/7":
+            type(self).pull_body = data["body"]
+            self._reply(200, {"number": 7, "body": data["body"]})
+        else:
+            self._reply(404, {"message": "Not Found"})
+
+
+@pytest.fixture
+def github_api(monkeypatch, tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), GitHubStandIn)
+    GitHubStandIn.requests, GitHubStandIn.statuses = [], []
+    GitHubStandIn.issue_comments, GitHubStandIn.reviews = [], []
+    GitHubStandIn.pull_body, GitHubStandIn.latency = "Existing description", 0.0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("GITHUB_API_URL", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setenv("GITHUB_REPOSITORY", "acme/api")
+    monkeypatch.setenv("LAMPE_GITHUB_TOKEN", "token")
+    monkeypatch.setenv("PR_NUMBER", "7")
+    monkeypatch.delenv("LAMPE_GITHUB_APP_ID", raising=False)
+    # PyGithub throttles requests by default
+    throttling = {"seconds_between_requests": None, "seconds_between_writes": None, "retry": None}
+    monkeypatch.setattr(github_provider, "Github", partial(Github, **throttling))
+    monkeypatch.setattr(etag_cache, "ETAG_CACHE_PATH", str(tmp_path / "etags.json"))
+    yield GitHubStandIn.requests
+    server.shutdown()
+    server.server_close()
+
+
+def _provider() -> GitHubProvider:
+    pull_request = PullRequest(
+        number=0,
+        title="Add feature",
+        base_commit_hash="abc123",
+        base_branch_name="main",
+        head_commit_hash="def456",
+        head_branch_name="feature",
+    )
+    return GitHubProvider(repository=Repository(local_path="/repo"), pull_request=pull_request)
+
+
+def _payload(lines: list[int]) -> PRReviewPayload:
+    comments = [
+        ReviewComment(line_number=line, comment=f"Issue {line}", severity="high", category="bug", agent_name="a")
+        for line in lines
+    ]
+    return PRReviewPayload(
+        reviews=[
+            AgentReviewOutput(
+                agent_name="Security",
+                focus_areas=["auth"],
+                summary="Two auth issues.",
+                reviews=[
+                    FileReview(file_path="api/views.py", structured_comments=comments, summary="Views"),
+                    FileReview(file_path="api/urls.py", summary="Looks fine."),
+                ],
+            ),
+            AgentReviewOutput(agent_name="Quality", focus_areas=["naming"], summary="Naming is consistent."),
+        ]
+    )
+
+
+def _posts(requests: list[tuple[str, str, dict]], path: str) -> list[dict]:
+    return [data for method, request_path, data in requests if method == "POST" and request_path.endswith(path)]
+
+
+def test_review_is_submitted_in_chunks_with_one_summary_comment(github_api, monkeypatch):
+    monkeypatch.setattr(github_provider, "GITHUB_REVIEW_COMMENTS_PER_REVIEW", 25)
+
+    _provider().deliver_pr_review(_payload(list(range(1, 61))))
+
+    reviews = _posts(github_api, "/pulls/7/reviews")
+    assert [len(review["comments"]) for review in reviews] == [25, 25, 10]
+    assert reviews[0]["event"] == "COMMENT"
+    first = reviews[0]["comments"][0]
+    assert (first["path"], first["line"], first["side"]) == ("api/views.py", 1, "RIGHT")
+    assert "Issue 1" in first["body"]
+    (summary,) = _posts(github_api, "/issues/7/comments")
+    assert "## Security" in summary["body"] and "## Quality" in summary["body"]
+    assert "**api/urls.py:** Looks fine." in summary["body"]
+    # Both carry the hidden marker has_reviewed looks for
+    assert summary["body"].endswith(REVIEW_MARKER) and reviews[0]["body"] == REVIEW_MARKER
+
+
+def test_comments_rejected_by_github_move_to_the_summary(github_api):
+    _provider().deliver_pr_review(_payload([1, 2, 999, 3]))
+
+    # The rejected review is split in halves until the comment GitHub refuses is isolated
+    reviews = [[comment["line"] for comment in review["comments"]] for review in _posts(github_api, "/pulls/7/reviews")]
+    assert reviews == [[1, 2, 999, 3], [1, 2], [999, 3], [999], [3]]
+    (summary,) = _posts(github_api, "/issues/7/comments")
+    assert "**api/views.py (Line 999):**" in summary["body"] and "Issue 999" in summary["body"]
+    assert "(Line 1)" not in summary["body"]
+
+
+@pytest.mark.asyncio
+async def test_async_deliveries_do_not_block_the_event_loop(github_api):
+    GitHubStandIn.latency = 0.05
+    providers = [_provider(), _provider()]
+    ticks = 0
+
+    async def heartbeat() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    ticker = asyncio.create_task(heartbeat())
+    await asyncio.gather(*(provider.adeliver_pr_review(_payload([1, 2])) for provider in providers))
+    ticker.cancel()
+    await aclose_async_client()
+
+    assert len(_posts(github_api, "/pulls/7/reviews")) == 2 and len(_posts(github_api, "/issues/7/comments")) == 2
+    # The loop kept running other tasks while the requests were in flight
+    assert ticks >= 5
+
+
+def test_description_is_updated_between_tags(github_api):
+    _provider().deliver_pr_description(PRDescriptionPayload(description="Adds a feature."))
+
+    assert GitHubStandIn.pull_body.startswith("Existing description\n\n[](lampe-sdk-description-start)")
+    assert "Adds a feature." in GitHubStandIn.pull_body
+
+
+def test_split_comment_keeps_bodies_under_the_limit():
+    bodies = _split_comment(["a" * 40, "b" * 40, "c" * 150], max_length=100)
+
+    assert bodies == ["a" * 40 + "\n\n" + "b" * 40, "c" * 99 + "…"]
+
+
+def _pages(requests: list[tuple[str, str, dict]], path: str) -> list[int]:
+    """Pages requested from ``path``, in request order."""
+    return [
+        int(parse_qs(urlparse(request_path).query).get("page", ["1"])[0])
+        for method, request_path, _ in requests
+        if method == "GET" and urlparse(request_path).path.endswith(path)
+    ]
+
+
+def test_has_reviewed_scans_newest_pages_first_and_reuses_etags(github_api, monkeypatch):
+    monkeypatch.setattr(github_provider, "GITHUB_PAGE_SIZE", 2)
+    GitHubStandIn.issue_comments = [{"body": f"Comment {i}", "user": {"login": "dev"}} for i in range(4)]
+    GitHubStandIn.issue_comments.append({"body": f"## Security\n\n{REVIEW_MARKER}", "user": {"login": "ci"}})
+    provider = _provider()
+
+    assert provider.has_reviewed()
+    # Page 1 gives the last page, where the newest comment is found: the middle page and the reviews are not read
+    assert _pages(github_api, "/issues/7/comments") == [1, 3]
+    assert _pages(github_api, "/pulls/7/reviews") == []
+
+    GitHubStandIn.statuses.clear()
+    assert provider.has_reviewed()
+    # Page 1 is fetched again for the number of pages, the unchanged last page is answered with 304
+    assert GitHubStandIn.statuses == [200, 304]
+    assert len(_pages(github_api, "/user")) == 1
+
+
+def test_has_reviewed_scans_a_page_added_since_the_last_check(github_api, monkeypatch):
+    monkeypatch.setattr(github_provider, "GITHUB_PAGE_SIZE", 2)
+    GitHubStandIn.issue_comments = [{"body": f"Comment {i}", "user": {"login": "dev"}} for i in range(4)]
+    provider = _provider()
+
+    assert not provider.has_reviewed()
+    assert _pages(github_api, "/issues/7/comments") == [1, 2]
+
+    # The new comments fill a third page, the first page and its ETag are unchanged
+    GitHubStandIn.issue_comments.append({"body": "Comment 4", "user": {"login": "dev"}})
+    GitHubStandIn.issue_comments.append({"body": f"## Security\n\n{REVIEW_MARKER}", "user": {"login": "ci"}})
+    github_api.clear()
+    assert provider.has_reviewed()
+    assert _pages(github_api, "/issues/7/comments") == [1, 3]
+
+
+def test_has_reviewed_recognizes_the_token_user_in_reviews(github_api, monkeypatch):
+    monkeypatch.setattr(github_provider, "GITHUB_PAGE_SIZE", 2)
+    GitHubStandIn.issue_comments = [{"body": f"Comment {i}", "user": {"login": "dev"}} for i in range(5)]
+    provider = _provider()
+
+    assert not provider.has_reviewed()
+    assert _pages(github_api, "/issues/7/comments") == [1, 3, 2]
+    assert _pages(github_api, "/pulls/7/reviews") == [1]
+
+    GitHubStandIn.reviews = [{"body": "", "user": {"login": TOKEN_LOGIN}}]
+    assert provider.has_reviewed()
+    assert len(_pages(github_api, "/user")) == 1
@@ -0,0 +1,74 @@
+"""Shared async HTTP client of the providers and the default async delivery."""
+
+import asyncio
+import threading
+
+import pytest
+
+from lampe.cli.providers.base import PRDescriptionPayload, Provider, PRReviewPayload
+from lampe.cli.providers.http_client import aclose_async_client, get_async_client, run_sync
+
+
+class ThreadRecordingProvider(Provider):
+    """Provider with only the synchronous deliveries, recording the thread they run in."""
+
+    def __init__(self, repository, pull_request) -> None:
+        super().__init__(repository, pull_request)
+        self.threads: list[str] = []
+
+    def deliver_pr_description(self, payload: PRDescriptionPayload) -> None:
+        self.threads.append(threading.current_thread().name)
+
+    def deliver_pr_review(self, payload: PRReviewPayload) -> None:
+        self.threads.append(threading.current_thread().name)
+
+    def healthcheck(self) -> None:
+        pass
+
+    def has_reviewed(self) -> bool:
+        return False
+
+
+@pytest.mark.asyncio
+async def test_client_is_shared_on_an_event_loop():
+    client = get_async_client()
+
+    assert get_async_client() is client
+    await aclose_async_client()
+    assert client.is_closed
+    # A new client is created once the previous one is closed
+    assert get_async_client() is not client
+    await aclose_async_client()
+
+
+def test_each_event_loop_has_its_own_client():
+    async def current_client():
+        return get_async_client()
+
+    first = run_sync(current_client())
+    second = run_sync(current_client())
+
+    assert first is not second
+    # The client of the loop run by run_sync is closed with it
+    assert first.is_closed and second.is_closed
+
+
+@pytest.mark.asyncio
+async def test_run_sync_works_from_a_running_event_loop():
+    async def loop_thread() -> str:
+        await asyncio.sleep(0)
+        return threading.current_thread().name
+
+    # A synchronous wrapper called from async code runs the coroutine on a loop of its own
+    assert run_sync(loop_thread()) != threading.current_thread().name
+
+
+@pytest.mark.asyncio
+async def test_default_async_delivery_runs_in_a_worker_thread(sample_repository, sample_pull_request):
+    provider = ThreadRecordingProvider(sample_repository, sample_pull_request)
+
+    await provider.adeliver_pr_description(PRDescriptionPayload(description="Description"))
+    await provider.adeliver_pr_review(PRReviewPayload(reviews=[]))
+
+    main_thread = threading.current_thread().name
+    assert len(provider.threads) == 2 and main_thread not in provider.threads
@@ -0,0 +1,89 @@
+import asyncio
+
+import httpx
+import pytest
+
+from lampe.cli.server import JobClient, JobKind, JobQueue, JobRequest, JobServer, QueueClosedError
+
+
+def _request(repo: str, head: str = "head", **extra) -> JobRequest:
+    return JobRequest(kind=JobKind.REVIEW, repo=repo, base="base", head=head, **extra)
+
+
+@pytest.mark.asyncio
+async def test_job_queue_takes_turns_across_repositories():
+    queue = JobQueue()
+    for i in range(3):
+        await queue.submit(_request("/busy", head=f"busy{i}"))
+    await queue.submit(_request("/other", head="other0"))
+    await queue.submit(_request("/third", repo_full_name="acme/third", head="third0"))
+    await queue.close()
+
+    heads = []
+    while (job := await queue.next_job()) is not None:
+        heads.append(job.request.head)
+
+    assert heads == ["busy0", "other0", "third0", "busy1", "busy2"]
+    with pytest.raises(QueueClosedError):
+        await queue.submit(_request("/late"))
+
+
+@pytest.mark.asyncio
+async def test_job_queue_evicts_finished_jobs(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("lampe.cli.server.jobs.time.time", lambda: now)
+    queue = JobQueue(finished_job_ttl=60, max_finished_jobs=2)
+    jobs = [await queue.submit(_request("/repo", head=f"h{i}")) for i in range(4)]
+    for job in jobs[:3]:
+        queue.finish(await queue.next_job())
+
+    # Beyond the maximum count, the oldest finished job is evicted; queued jobs are never evicted
+    assert [queue.get(job.id) is not None for job in jobs] == [False, True, True, True]
+
+    now += 61
+    assert [queue.get(job.id) is not None for job in jobs] == [False, False, False, True]
+    assert queue.counts()["queued"] == 1
+
+
+@pytest.mark.asyncio
+async def test_server_runs_jobs_and_drains_over_unix_socket(tmp_path):
+    release = asyncio.Event()
+    started: list[str] = []
+
+    async def runner(request: JobRequest):
+        started.append(request.head)
+        await release.wait()
+        if request.head == "broken":
+            raise RuntimeError("review failed")
+        return [{"agent_name": "quick", "head": request.head}]
+
+    socket_path = str(tmp_path / "lampe.sock")
+    server = JobServer(runner=runner, concurrency=1)
+    ready = asyncio.Event()
+    serving = asyncio.create_task(server.serve(socket_path=socket_path, ready=ready))
+    await ready.wait()
+
+    def client_calls():
+        with JobClient(socket_path=socket_path) as client:
+            first = client.submit(_request("/repo", head="h1"))
+            second = client.submit(_request("/repo", head="broken"))
+            assert client.get(first["id"])["status"] in {"queued", "running"}
+            assert client.drain()["status"] == "draining"
+            assert client.health()["status"] == "draining"
+            with pytest.raises(httpx.HTTPStatusError) as error:
+                client.submit(_request("/repo", head="late"))
+            assert error.value.response.status_code == 503
+            return first["id"], second["id"]
+
+    first_id, second_id = await asyncio.to_thread(client_calls)
+    # Draining completes the queued and running jobs before stopping
+    release.set()
+    await asyncio.wait_for(serving, timeout=5)
+
+    first = server.queue.get(first_id).model_dump(mode="json")
+    second = server.queue.get(second_id).model_dump(mode="json")
+    assert first["status"] == "succeeded"
+    assert first["result"] == [{"agent_name": "quick", "head": "h1"}]
+    assert second["status"] == "failed" and second["error"] == "review failed"
+    assert started == ["h1", "broken"]
+    assert not (tmp_path / "lampe.sock").exists()
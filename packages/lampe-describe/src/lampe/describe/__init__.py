@@ -1,9 +1,28 @@
-from lampe.describe.workflows import PRDescriptionWorkflow
-from lampe.describe.workflows.pr_description.generation import (
-    PRDescriptionOutput,
-    PRDescriptionStartEvent,
-    generate_pr_description,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from lampe.describe.workflows.pr_description.generation import (
+        PRDescriptionOutput,
+        PRDescriptionStartEvent,
+        PRDescriptionWorkflow,
+        generate_pr_description,
+    )
+
+# Resolved on first access, ``import lampe.describe`` stays cheap
+_LAZY_ATTRIBUTES = {
+    "PRDescriptionWorkflow": "lampe.describe.workflows.pr_description.generation",
+    "PRDescriptionStartEvent": "lampe.describe.workflows.pr_description.generation",
+    "PRDescriptionOutput": "lampe.describe.workflows.pr_description.generation",
+    "generate_pr_description": "lampe.describe.workflows.pr_description.generation",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        return getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "PRDescriptionWorkflow",
@@ -1,6 +1,22 @@
-from lampe.describe.workflows.pr_description import PRDescriptionWorkflow
-from lampe.describe.workflows.pr_description.generation import (
-    main as generate_pr_description_entrypoint,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from lampe.describe.workflows.pr_description import PRDescriptionWorkflow
+    from lampe.describe.workflows.pr_description.generation import main as generate_pr_description_entrypoint
+
+# Attribute name -> (module, name in module), resolved on first access
+_LAZY_ATTRIBUTES = {
+    "PRDescriptionWorkflow": ("lampe.describe.workflows.pr_description.generation", "PRDescriptionWorkflow"),
+    "generate_pr_description_entrypoint": ("lampe.describe.workflows.pr_description.generation", "main"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        module, attribute = _LAZY_ATTRIBUTES[name]
+        return getattr(importlib.import_module(module), attribute)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["PRDescriptionWorkflow", "generate_pr_description_entrypoint"]
@@ -1,3 +1,15 @@
-from lampe.describe.workflows.pr_description.generation import PRDescriptionWorkflow
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from lampe.describe.workflows.pr_description.generation import PRDescriptionWorkflow
+
+
+def __getattr__(name: str) -> Any:
+    # Lazy: the CLI imports the light ``constants`` submodule without loading the workflow
+    if name == "PRDescriptionWorkflow":
+        return importlib.import_module("lampe.describe.workflows.pr_description.generation").PRDescriptionWorkflow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["PRDescriptionWorkflow"]
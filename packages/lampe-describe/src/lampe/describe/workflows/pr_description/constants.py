@@ -0,0 +1,10 @@
+"""Defaults of the PR description workflows, importable without loading the workflows."""
+
+import os
+
+# NOTE: Max tokens for the diff content, by default 100k to avoid spending too much
+MAX_TOKENS = 100_000
+# NOTE: Max tokens of the diff summarized by a single map call, by default 20k
+CHUNK_TOKENS = int(os.getenv("LAMPE_DESCRIBE_CHUNK_TOKENS", 20_000))
+# NOTE: Max number of chunk summaries generated concurrently, by default 8
+MAX_CONCURRENT_CHUNK_SUMMARIES = int(os.getenv("LAMPE_DESCRIBE_MAX_CONCURRENT_CHUNK_SUMMARIES", 8))
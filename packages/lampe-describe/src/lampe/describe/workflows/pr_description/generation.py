@@ -1,14 +1,17 @@
 import asyncio
+from collections.abc import Callable
 
 from llama_index.core.prompts import ChatMessage, MessageRole
-from llama_index.core.workflow import Event, StartEvent, StopEvent, Workflow, step
+from llama_index.core.workflow import Context, Event, StartEvent, StopEvent, Workflow, step
 from llama_index.llms.litellm import LiteLLM
 
 from lampe.core.data_models import PullRequest, Repository
+from lampe.core.llmbudget import LLMBudget
 from lampe.core.llmconfig import MODELS, get_model
 from lampe.core.parsers.markdown_code_block_remover_output import MarkdownCodeBlockRemoverOutputParser
 from lampe.core.tools.repository import clone_repo, get_diff_between_commits
-from lampe.core.utils.token import truncate_to_token_limit
+from lampe.core.utils.token import count_token_string, truncate_to_token_limit
+from lampe.describe.workflows.pr_description.constants import MAX_TOKENS
 from lampe.describe.workflows.pr_description.data_models import PRDescriptionInput
 from lampe.describe.workflows.pr_description.generation_prompt import (
     SYSTEM_PR_DESCRIPTION_MESSAGE,
@@ -16,8 +19,8 @@ from lampe.describe.workflows.pr_description.generation_prompt import (
     PRDescriptionOutput,
 )
 
-# NOTE: Max tokens for the diff content, by default 100k to avoid spending too much
-MAX_TOKENS = 100_000
+# Stands for the diff when the budget has no input tokens left for it
+DIFF_OMITTED_PLACEHOLDER = "(diff omitted: no input tokens left in the budget)"
 
 
 class PRDescriptionStartEvent(StartEvent):
@@ -32,6 +35,12 @@ class PRDescriptionPromptEvent(Event):
     formatted_prompt: str
 
 
+class PRDescriptionTokenEvent(Event):
+    """Raw text generated since the previous token event (streaming mode)."""
+
+    delta: str
+
+
 class PRDescriptionWorkflow(Workflow):
     """A workflow that generates a PR description.
 
@@ -42,10 +51,18 @@ class PRDescriptionWorkflow(Workflow):
     ----------
     truncation_tokens
         Maximum number of tokens to use for the diff content, by default MAX_TOKENS
+    stream
+        Whether to stream the generated text as PRDescriptionTokenEvent, by default False
+    budget
+        Budget of the run, the diff is truncated to the input tokens it has left, by default None (unlimited)
     """
 
-    def __init__(self, truncation_tokens=MAX_TOKENS, *args, **kwargs):
+    def __init__(
+        self, truncation_tokens=MAX_TOKENS, stream: bool = False, budget: LLMBudget | None = None, *args, **kwargs
+    ):
         super().__init__(*args, **kwargs)
+        self.stream = stream
+        self.budget = budget or LLMBudget()
         self.llm = LiteLLM(model=get_model("LAMPE_MODEL_DESCRIBE", MODELS.GPT_5_NANO_2025_08_07), temperature=1.0)
         self.truncation_tokens = truncation_tokens
         self.output_parser = MarkdownCodeBlockRemoverOutputParser()
@@ -76,7 +93,16 @@ class PRDescriptionWorkflow(Workflow):
         diff = get_diff_between_commits(
             base_hash, head_hash, files_exclude_patterns=ev.files_exclude_patterns, repo_path=repo_path
         )
-        diff = truncate_to_token_limit(diff, self.truncation_tokens)
+        truncation_tokens = self.truncation_tokens
+        remaining_tokens = self.budget.remaining_input_tokens()
+        if remaining_tokens is not None:
+            prompt_tokens = count_token_string(SYSTEM_PR_DESCRIPTION_MESSAGE + USER_PR_DESCRIPTION_MESSAGE)
+            truncation_tokens = min(truncation_tokens, remaining_tokens - prompt_tokens)
+            if truncation_tokens <= 0:
+                self.budget.skip("diff", "pull_request_diff", "no input tokens left, the diff is omitted")
+            elif truncation_tokens < self.truncation_tokens and count_token_string(diff) > truncation_tokens:
+                self.budget.skip("diff", "pull_request_diff", f"diff truncated to {truncation_tokens} tokens")
+        diff = truncate_to_token_limit(diff, truncation_tokens) if truncation_tokens > 0 else DIFF_OMITTED_PLACEHOLDER
         formatted_prompt = USER_PR_DESCRIPTION_MESSAGE.format(
             pr_title=ev.pr_title,
             pull_request_diff=diff,
@@ -84,14 +110,18 @@ class PRDescriptionWorkflow(Workflow):
         return PRDescriptionPromptEvent(formatted_prompt=formatted_prompt)
 
     @step
-    async def generate_description(self, ev: PRDescriptionPromptEvent) -> StopEvent:
+    async def generate_description(self, ctx: Context, ev: PRDescriptionPromptEvent) -> StopEvent:
         """Generate a PR description.
 
         This step generates a PR description using the LLM.
         It uses the truncated diff of all the changes between 2 commits.
+        In streaming mode, the raw text is written to the event stream as it is generated,
+        the returned description is parsed once the generation is complete.
 
         Parameters
         ----------
+        ctx
+            The workflow context, used to write token events in streaming mode.
         ev
             The prompt event containing the prepared diff and prompt.
 
@@ -100,15 +130,26 @@ class PRDescriptionWorkflow(Workflow):
         :
             The stop event containing the generated description.
         """
-        response = await self.llm.achat(
-            messages=[
-                ChatMessage(role=MessageRole.SYSTEM, content=SYSTEM_PR_DESCRIPTION_MESSAGE),
-                ChatMessage(role=MessageRole.USER, content=ev.formatted_prompt),
-            ]
-        )
-
-        description = self.output_parser.parse(response.message.content or "")
-        return StopEvent(result=PRDescriptionOutput(description=description))
+        messages = [
+            ChatMessage(role=MessageRole.SYSTEM, content=SYSTEM_PR_DESCRIPTION_MESSAGE),
+            ChatMessage(role=MessageRole.USER, content=ev.formatted_prompt),
+        ]
+        if self.stream:
+            content = ""
+            async for chunk in await self.llm.astream_chat(messages=messages):
+                if chunk.delta:
+                    content += chunk.delta
+                    ctx.write_event_to_stream(PRDescriptionTokenEvent(delta=chunk.delta))
+            self.budget.record_estimate(SYSTEM_PR_DESCRIPTION_MESSAGE + ev.formatted_prompt, content)
+        else:
+            response = await self.llm.achat(messages=messages)
+            content = response.message.content or ""
+            self.budget.record_response(
+                response, prompt_tokens=count_token_string(SYSTEM_PR_DESCRIPTION_MESSAGE + ev.formatted_prompt)
+            )
+
+        description = self.output_parser.parse(content)
+        return StopEvent(result=PRDescriptionOutput(description=description, budget=self.budget.report()))
 
 
 async def generate_pr_description(
@@ -120,6 +161,8 @@ async def generate_pr_description(
     timeout: int | None = None,
     verbose: bool = False,
     metadata: dict | None = None,
+    on_token: Callable[[str], None] | None = None,
+    budget: LLMBudget | None = None,
 ) -> PRDescriptionOutput:
     """Generate a PR description.
 
@@ -144,6 +187,10 @@ async def generate_pr_description(
         Whether to print verbose output, by default False
     metadata
         The metadata to use for the workflow, by default None
+    on_token
+        Called with each chunk of raw generated text when set (streaming mode), by default None
+    budget
+        Token and LLM call budget of the run, by default None (unlimited)
 
     Returns
     -------
@@ -152,8 +199,14 @@ async def generate_pr_description(
     """
     if files_exclude_patterns is None:
         files_exclude_patterns = []
-    workflow = PRDescriptionWorkflow(truncation_tokens=truncation_tokens, timeout=timeout, verbose=verbose)
-    result = await workflow.run(
+    workflow = PRDescriptionWorkflow(
+        truncation_tokens=truncation_tokens,
+        stream=on_token is not None,
+        budget=budget,
+        timeout=timeout,
+        verbose=verbose,
+    )
+    handler = workflow.run(
         start_event=PRDescriptionStartEvent(
             pr_title=pull_request.title,
             repository=repository,
@@ -161,6 +214,11 @@ async def generate_pr_description(
             files_exclude_patterns=files_exclude_patterns,
         )
     )
+    if on_token is not None:
+        async for event in handler.stream_events():
+            if isinstance(event, PRDescriptionTokenEvent):
+                on_token(event.delta)
+    result = await handler
     return result
 
 
@@ -0,0 +1,322 @@
+import asyncio
+import logging
+
+from llama_index.core.prompts import ChatMessage, MessageRole
+from llama_index.core.workflow import Event, StopEvent, Workflow, step
+from llama_index.llms.litellm import LiteLLM
+
+from lampe.core.data_models import PullRequest, Repository
+from lampe.core.llmbudget import LLMBudget
+from lampe.core.llmconfig import MODELS, get_model
+from lampe.core.loggingconfig import LAMPE_LOGGER_NAME
+from lampe.core.parsers.markdown_code_block_remover_output import MarkdownCodeBlockRemoverOutputParser
+from lampe.core.tools.repository import get_diff_between_commits
+from lampe.core.utils.token import count_token_string, encoder, truncate_to_token_limit
+from lampe.describe.workflows.pr_description.constants import CHUNK_TOKENS, MAX_CONCURRENT_CHUNK_SUMMARIES, MAX_TOKENS
+from lampe.describe.workflows.pr_description.generation import PRDescriptionStartEvent
+from lampe.describe.workflows.pr_description.generation_map_reduce_prompt import (
+    SYSTEM_CHUNK_SUMMARY_MESSAGE,
+    USER_CHUNK_SUMMARY_MESSAGE,
+    USER_PR_DESCRIPTION_FROM_SUMMARIES_MESSAGE,
+)
+from lampe.describe.workflows.pr_description.generation_prompt import (
+    SYSTEM_PR_DESCRIPTION_MESSAGE,
+    USER_PR_DESCRIPTION_MESSAGE,
+    PRDescriptionOutput,
+)
+
+logger = logging.getLogger(name=LAMPE_LOGGER_NAME)
+
+_FILE_DIFF_HEADER = "diff --git "
+
+
+def split_diff_by_file(diff: str) -> list[tuple[str, str]]:
+    """Split a unified git diff into per-file diffs.
+
+    Parameters
+    ----------
+    diff
+        Output of ``git diff``
+
+    Returns
+    -------
+    :
+        List of (file path at head, file diff), in diff order
+    """
+    files: list[tuple[str, str]] = []
+    current: list[str] = []
+    for line in diff.splitlines():
+        if line.startswith(_FILE_DIFF_HEADER) and current:
+            files.append(_file_entry(current))
+            current = []
+        current.append(line)
+    if current:
+        files.append(_file_entry(current))
+    return files
+
+
+def _file_entry(lines: list[str]) -> tuple[str, str]:
+    header = lines[0]
+    path = header.rsplit(" b/", 1)[-1] if header.startswith(_FILE_DIFF_HEADER) else ""
+    return path, "\n".join(lines)
+
+
+def chunk_diff(diff: str, max_chunk_tokens: int) -> list[str]:
+    """Pack per-file diffs into chunks of at most ``max_chunk_tokens`` tokens.
+
+    Files are kept in diff order (sorted by path), so files of a directory end up in the same chunk when they
+    fit. A file whose diff alone exceeds the budget is truncated to its own chunk.
+
+    Parameters
+    ----------
+    diff
+        Filtered diff of the pull request
+    max_chunk_tokens
+        Token budget of a chunk
+
+    Returns
+    -------
+    :
+        Diff chunks, empty if the diff is empty
+    """
+    chunks: list[str] = []
+    current: list[str] = []
+    current_tokens = 0
+    for _, file_diff in split_diff_by_file(diff):
+        tokens = len(encoder.encode(file_diff, disallowed_special=()))
+        if tokens > max_chunk_tokens:
+            file_diff = truncate_to_token_limit(file_diff, max_chunk_tokens)
+            tokens = max_chunk_tokens
+        if current and current_tokens + tokens > max_chunk_tokens:
+            chunks.append("\n".join(current))
+            current, current_tokens = [], 0
+        current.append(file_diff)
+        current_tokens += tokens
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+class DiffChunksEvent(Event):
+    pr_title: str
+    chunks: list[str]
+
+
+class ChunkSummariesEvent(Event):
+    pr_title: str
+    summaries: list[str]
+
+
+class PRDescriptionMapReduceWorkflow(Workflow):
+    """A workflow that generates the description of a large PR with map-reduce.
+
+    The filtered diff is split into token-bounded chunks of whole files, each chunk is summarized
+    concurrently with a cheap model, and the summaries are reduced into the final description.
+    A diff that fits in a single chunk is described directly, like ``PRDescriptionWorkflow``.
+    Chunks the budget cannot afford to summarize are only listed by file in the reduce prompt.
+
+    Parameters
+    ----------
+    chunk_tokens
+        Maximum number of tokens of a diff chunk, by default CHUNK_TOKENS
+    max_concurrency
+        Maximum number of chunk summaries generated concurrently, by default MAX_CONCURRENT_CHUNK_SUMMARIES
+    budget
+        Token and LLM call budget of the run, by default None (unlimited)
+    """
+
+    def __init__(
+        self,
+        chunk_tokens: int = CHUNK_TOKENS,
+        max_concurrency: int = MAX_CONCURRENT_CHUNK_SUMMARIES,
+        budget: LLMBudget | None = None,
+        *args,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.map_llm = LiteLLM(
+            model=get_model("LAMPE_MODEL_DESCRIBE_CHUNK_SUMMARY", MODELS.GPT_5_NANO_2025_08_07), temperature=1.0
+        )
+        self.llm = LiteLLM(model=get_model("LAMPE_MODEL_DESCRIBE", MODELS.GPT_5_NANO_2025_08_07), temperature=1.0)
+        self.chunk_tokens = chunk_tokens
+        self.max_concurrency = max_concurrency
+        self.budget = budget or LLMBudget()
+        self.output_parser = MarkdownCodeBlockRemoverOutputParser()
+
+    @step
+    async def split_diff(self, ev: PRDescriptionStartEvent) -> DiffChunksEvent:
+        """Get the filtered diff and split it into chunks of whole files.
+
+        Parameters
+        ----------
+        ev
+            The start event containing the PR details.
+
+        Returns
+        -------
+        :
+            The event containing the diff chunks.
+        """
+        diff = get_diff_between_commits(
+            ev.pull_request.base_commit_hash,
+            ev.pull_request.head_commit_hash,
+            files_exclude_patterns=ev.files_exclude_patterns,
+            files_reinclude_patterns=ev.files_reinclude_patterns,
+            repo_path=ev.repository.local_path,
+        )
+        chunks = chunk_diff(diff, self.chunk_tokens)
+        logger.info(f"PR description map-reduce: {len(chunks)} diff chunks of at most {self.chunk_tokens} tokens")
+        return DiffChunksEvent(pr_title=ev.pr_title, chunks=chunks)
+
+    @step
+    async def summarize_chunks(self, ev: DiffChunksEvent) -> ChunkSummariesEvent | StopEvent:
+        """Summarize the diff chunks concurrently (map).
+
+        A diff that fits in a single chunk is described directly, without summarizing it first.
+
+        Parameters
+        ----------
+        ev
+            The event containing the diff chunks.
+
+        Returns
+        -------
+        :
+            The chunk summaries, or the stop event containing the description for a single chunk.
+        """
+        if len(ev.chunks) <= 1:
+            prompt = USER_PR_DESCRIPTION_MESSAGE.format(
+                pr_title=ev.pr_title, pull_request_diff=ev.chunks[0] if ev.chunks else ""
+            )
+            return StopEvent(result=await self._describe(prompt))
+
+        semaphore = asyncio.Semaphore(max(self.max_concurrency, 1))
+        # One call is kept for the reduce step
+        remaining_calls = self.budget.remaining_calls()
+        affordable = len(ev.chunks) if remaining_calls is None else max(remaining_calls - 1, 0)
+
+        async def summarize(index: int, chunk: str) -> str:
+            files = ", ".join(path for path, _ in split_diff_by_file(chunk))
+            if index >= affordable:
+                self.budget.skip("chunk", f"chunk {index + 1}", "summary replaced by its file list")
+                return f"- Changes to: {files}"
+            async with semaphore:
+                try:
+                    messages = [
+                        ChatMessage(role=MessageRole.SYSTEM, content=SYSTEM_CHUNK_SUMMARY_MESSAGE),
+                        ChatMessage(
+                            role=MessageRole.USER,
+                            content=USER_CHUNK_SUMMARY_MESSAGE.format(
+                                pr_title=ev.pr_title,
+                                chunk_index=index + 1,
+                                chunk_count=len(ev.chunks),
+                                chunk_diff=chunk,
+                            ),
+                        ),
+                    ]
+                    response = await self.map_llm.achat(messages=messages)
+                    self.budget.record_response(
+                        response, prompt_tokens=count_token_string("".join(m.content or "" for m in messages))
+                    )
+                    return (response.message.content or "").strip()
+                except Exception as e:
+                    logger.exception(f"Failed to summarize diff chunk {index + 1}: {e}")
+                    return f"- Changes to: {files}"
+
+        summaries = await asyncio.gather(*(summarize(i, chunk) for i, chunk in enumerate(ev.chunks)))
+        return ChunkSummariesEvent(pr_title=ev.pr_title, summaries=list(summaries))
+
+    @step
+    async def reduce_summaries(self, ev: ChunkSummariesEvent) -> StopEvent:
+        """Reduce the chunk summaries into the PR description.
+
+        Parameters
+        ----------
+        ev
+            The event containing the chunk summaries.
+
+        Returns
+        -------
+        :
+            The stop event containing the generated description.
+        """
+        chunk_summaries = "\n\n".join(
+            f"Part {i + 1} of {len(ev.summaries)}:\n{summary}" for i, summary in enumerate(ev.summaries)
+        )
+        prompt = USER_PR_DESCRIPTION_FROM_SUMMARIES_MESSAGE.format(
+            pr_title=ev.pr_title, chunk_summaries=chunk_summaries
+        )
+        return StopEvent(result=await self._describe(prompt))
+
+    async def _describe(self, prompt: str) -> PRDescriptionOutput:
+        response = await self.llm.achat(
+            messages=[
+                ChatMessage(role=MessageRole.SYSTEM, content=SYSTEM_PR_DESCRIPTION_MESSAGE),
+                ChatMessage(role=MessageRole.USER, content=prompt),
+            ]
+        )
+        self.budget.record_response(response, prompt_tokens=count_token_string(SYSTEM_PR_DESCRIPTION_MESSAGE + prompt))
+        return PRDescriptionOutput(
+            description=self.output_parser.parse(response.message.content or ""), budget=self.budget.report()
+        )
+
+
+async def generate_pr_description(
+    repository: Repository,
+    pull_request: PullRequest,
+    files_exclude_patterns: list[str] | None = None,
+    files_reinclude_patterns: list[str] | None = None,
+    truncation_tokens: int = MAX_TOKENS,
+    timeout: int | None = None,
+    verbose: bool = False,
+    metadata: dict | None = None,
+    max_concurrency: int = MAX_CONCURRENT_CHUNK_SUMMARIES,
+    budget: LLMBudget | None = None,
+) -> PRDescriptionOutput:
+    """Generate a PR description with map-reduce over the diff chunks.
+
+    Parameters
+    ----------
+    repository
+        The repository to generate the PR description for.
+    pull_request
+        The pull request to generate the PR description for.
+    files_exclude_patterns
+        The glob matching patterns to exclude from the diff, by default None
+    files_reinclude_patterns
+        The glob matching patterns to re-include in the diff, by default None
+    truncation_tokens
+        The maximum number of tokens of a single diff chunk (capped at CHUNK_TOKENS), by default MAX_TOKENS
+    timeout
+        The timeout for the workflow, by default None
+    verbose
+        Whether to print verbose output, by default False
+    metadata
+        The metadata to use for the workflow, by default None
+    max_concurrency
+        Maximum number of chunk summaries generated concurrently, by default MAX_CONCURRENT_CHUNK_SUMMARIES
+    budget
+        Token and LLM call budget of the run, by default None (unlimited)
+
+    Returns
+    -------
+    :
+        The output containing the generated description.
+    """
+    workflow = PRDescriptionMapReduceWorkflow(
+        chunk_tokens=min(truncation_tokens, CHUNK_TOKENS),
+        max_concurrency=max_concurrency,
+        budget=budget,
+        timeout=timeout,
+        verbose=verbose,
+    )
+    result = await workflow.run(
+        start_event=PRDescriptionStartEvent(
+            pr_title=pull_request.title,
+            repository=repository,
+            pull_request=pull_request,
+            files_exclude_patterns=files_exclude_patterns or [],
+            files_reinclude_patterns=files_reinclude_patterns,
+        )
+    )
+    return result
@@ -0,0 +1,45 @@
+SYSTEM_CHUNK_SUMMARY_MESSAGE = """
+You are an expert software engineer summarizing one part of a large pull request.
+
+<instructions>
+You receive the diff of a subset of the files changed by the pull request. Other parts are summarized separately
+and all summaries are combined afterwards into the pull request description.
+
+- Focus on additions (lines starting with `+`) and removals (lines starting with `-`)
+- Describe what changed and, when the code makes it clear, why
+- Mention new or removed public functions, classes, endpoints, configuration and dependencies
+- Group related files together, do not describe files one line at a time
+- Use at most 5 short bullet points, no headers, no preamble
+</instructions>
+"""  # noqa: E501
+
+USER_CHUNK_SUMMARY_MESSAGE = """
+<context>
+PR Title: {pr_title}
+Part {chunk_index} of {chunk_count}
+</context>
+
+<code_changes>
+{chunk_diff}
+</code_changes>
+"""
+
+USER_PR_DESCRIPTION_FROM_SUMMARIES_MESSAGE = """
+<task>
+Generate a pull request description for the following changes. The pull request is too large to show its diff:
+each part below is a summary of the changes made to a subset of its files.
+</task>
+
+<context>
+PR Title: {pr_title}
+</context>
+
+<change_summaries>
+{chunk_summaries}
+</change_summaries>
+
+<instructions>
+Combine the summaries into a single structured PR description following the format specified in the system message.
+Describe the pull request as a whole, not each part.
+</instructions>
+"""
@@ -1,13 +1,15 @@
 import asyncio
 from typing import Any
 
-from workflows.context import Context
+from llama_index.core.workflow import Context, StartEvent, step
 
 from lampe.core.data_models import PullRequest, Repository
+from lampe.core.llmbudget import LLMBudget
 from lampe.core.tools import clone_repo
 from lampe.core.tools.llm_integration import git_tools_gpt_5_nano_agent_prompt
 from lampe.core.tools.repository.diff import list_changed_files
-from lampe.core.workflows.function_calling_agent import FunctionCallingAgent
+from lampe.core.tools.repository.pagination import DEFAULT_TOOL_OUTPUT_TOKEN_BUDGET
+from lampe.core.workflows.function_calling_agent import AgentCompleteEvent, FunctionCallingAgent, UserInputEvent
 from lampe.describe.workflows.pr_description.data_models import PRDescriptionInput
 from lampe.describe.workflows.pr_description.generation_multi_file_prompt import (
     PR_DESCRIPTION_SYSTEM_PROMPT,
@@ -16,6 +18,12 @@ from lampe.describe.workflows.pr_description.generation_multi_file_prompt import
 )
 
 
+class PRDescriptionAgentStart(StartEvent):
+    """Start event for the PR description agent."""
+
+    input: PRDescriptionInput
+
+
 class PRDescriptionFnAgentWorkflow(FunctionCallingAgent):
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         # NOTE: this could be dependency injection of the tools to allow caller to customize them.
@@ -27,33 +35,31 @@ class PRDescriptionFnAgentWorkflow(FunctionCallingAgent):
             **kwargs,
         )
 
-    def update_tools(self, partial_params: dict[str, Any] | None = None) -> None:
-        for tool in self.tools:
-            if hasattr(tool, "partial_params"):
-                if partial_params is not None:
-                    tool.partial_params = partial_params
-                else:
-                    tool.partial_params = {}
-
-    async def execute(self, input: PRDescriptionInput) -> Any:
+    @step
+    async def setup_query_and_tools(self, ctx: Context, ev: PRDescriptionAgentStart) -> UserInputEvent:
+        """List the changed files, format the query and pre-fill tool params."""
+        input = ev.input
         files_changed = list_changed_files(
             base_reference=input.pull_request.base_commit_hash,
             head_reference=input.pull_request.head_commit_hash,
             repo_path=input.repository.local_path,
         )
         query = PR_DESCRIPTION_USER_PROMPT.format(pull_request=input.pull_request, files_changed=files_changed)
-
-        self.update_tools(
+        await self.bind_tools(
+            ctx,
             partial_params={
                 "repo_path": input.repository.local_path,
                 "base_reference": input.pull_request.base_commit_hash,
                 "head_reference": input.pull_request.head_commit_hash,
                 "commit_hash": input.pull_request.head_commit_hash,
                 "commit_reference": input.pull_request.head_commit_hash,
-            }
+            },
         )
-        response = await super().run(input=query, ctx=Context(self))
-        return PRDescriptionOutput(description=response.result["response"].message.content)
+        return UserInputEvent(input=query)
+
+    async def execute(self, input: PRDescriptionInput) -> PRDescriptionOutput:
+        result: AgentCompleteEvent = await self.run(start_event=PRDescriptionAgentStart(input=input))
+        return PRDescriptionOutput(description=result.output or "", budget=self.budget.report())
 
 
 async def generate_pr_description(
@@ -62,10 +68,14 @@ async def generate_pr_description(
     files_exclude_patterns: list[str] | None = None,
     timeout: int | None = None,
     verbose: bool = False,
+    tool_output_token_budget: int | None = DEFAULT_TOOL_OUTPUT_TOKEN_BUDGET,
+    budget: LLMBudget | None = None,
 ):
     if files_exclude_patterns is None:
         files_exclude_patterns = []
-    workflow = PRDescriptionFnAgentWorkflow(timeout=timeout, verbose=verbose)
+    workflow = PRDescriptionFnAgentWorkflow(
+        timeout=timeout, verbose=verbose, tool_output_token_budget=tool_output_token_budget, budget=budget
+    )
     result = await workflow.execute(
         input=PRDescriptionInput(
             repository=repository,
@@ -1,8 +1,11 @@
 from pydantic import BaseModel, Field
 
+from lampe.core.llmbudget import BudgetReport
+
 
 class PRDescriptionOutput(BaseModel):
     description: str = Field(..., description="Markdown-formatted PR description")
+    budget: BudgetReport | None = Field(default=None, description="LLM usage and work skipped to stay in budget")
 
 
 PR_DESCRIPTION_SYSTEM_PROMPT = """
@@ -196,11 +199,10 @@ PR_DESCRIPTION_USER_PROMPT = """
 <pr>
 <number>{pull_request.number}</number>
 <title>{pull_request.title}</title>
-<author>{pull_request.author}</author>
 <base>{pull_request.base_commit_hash}</base>
+<base_branch>{pull_request.base_branch_name}</base_branch>
 <head>{pull_request.head_commit_hash}</head>
-<additions>{pull_request.additions}</additions>
-<deletions>{pull_request.deletions}</deletions>
+<head_branch>{pull_request.head_branch_name}</head_branch>
 <working_dir>./</working_dir>
 <files_changed>{files_changed}</files_changed>
 </pr>
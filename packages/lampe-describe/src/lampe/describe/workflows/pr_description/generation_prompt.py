@@ -1,8 +1,11 @@
 from pydantic import BaseModel, Field
 
+from lampe.core.llmbudget import BudgetReport
+
 
 class PRDescriptionOutput(BaseModel):
     description: str = Field(..., description="Markdown-formatted PR description")
+    budget: BudgetReport | None = Field(default=None, description="LLM usage and work skipped to stay in budget")
 
 
 SYSTEM_PR_DESCRIPTION_MESSAGE = """
@@ -4,9 +4,12 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from lampe.core.data_models import PullRequest, Repository
+from lampe.core.llmbudget import LLMBudget
 from lampe.describe.workflows.pr_description.generation import (
+    DIFF_OMITTED_PLACEHOLDER,
     PRDescriptionStartEvent,
     PRDescriptionWorkflow,
+    generate_pr_description,
 )
 from lampe.describe.workflows.pr_description.generation_prompt import PRDescriptionOutput
 
@@ -130,7 +133,7 @@ async def test_pr_description_workflow_step_by_step(mocker, mock_llm_response, s
     assert "+ new code\n- old code" in prompt_event.formatted_prompt
 
     with patch("llama_index.llms.litellm.LiteLLM.achat", return_value=mock_llm_response):
-        result = await workflow.generate_description(ev=prompt_event)
+        result = await workflow.generate_description(ctx=MagicMock(), ev=prompt_event)
         assert isinstance(result.result, PRDescriptionOutput)
         assert "What change is being made?" in result.result.description
         assert "Why are these changes being made?" in result.result.description
@@ -158,7 +161,60 @@ async def test_pr_description_workflow_step_by_step_with_truncation(
     assert "<code_changes>\n+" in prompt_event.formatted_prompt
 
     with patch("llama_index.llms.litellm.LiteLLM.achat", return_value=mock_llm_response):
-        result = await workflow.generate_description(ev=prompt_event)
+        result = await workflow.generate_description(ctx=MagicMock(), ev=prompt_event)
         assert isinstance(result.result, PRDescriptionOutput)
         assert "What change is being made?" in result.result.description
         assert "Why are these changes being made?" in result.result.description
+
+
+@pytest.mark.asyncio
+async def test_pr_description_workflow_omits_the_diff_without_input_tokens_left(
+    mocker, sample_repository, sample_pull_request
+):
+    mocker.patch(
+        "lampe.describe.workflows.pr_description.generation.get_diff_between_commits",
+        return_value="+ new code <|endoftext|>\n- old code",
+    )
+    budget = LLMBudget(max_input_tokens=10)
+    workflow = PRDescriptionWorkflow(budget=budget, timeout=None, verbose=False)
+
+    prompt_event = await workflow.prepare_diff_and_prompt(
+        ev=PRDescriptionStartEvent(
+            pr_title=sample_pull_request.title, repository=sample_repository, pull_request=sample_pull_request
+        )
+    )
+
+    assert DIFF_OMITTED_PLACEHOLDER in prompt_event.formatted_prompt
+    assert "new code" not in prompt_event.formatted_prompt
+    assert [(skip.kind, skip.name) for skip in budget.skipped] == [("diff", "pull_request_diff")]
+
+
+@pytest.mark.asyncio
+async def test_generate_pr_description_streams_tokens(mocker, sample_repository, sample_pull_request):
+    mocker.patch(
+        "lampe.describe.workflows.pr_description.generation.get_diff_between_commits",
+        return_value="+ new code\n- old code",
+    )
+    deltas = ["```md\n### What change", " is being made?\n\nAdded a new feature.\n", "```"]
+
+    async def astream_chat(messages):
+        async def gen():
+            for delta in deltas:
+                chunk = MagicMock()
+                chunk.delta = delta
+                yield chunk
+
+        return gen()
+
+    received: list[str] = []
+    with (
+        patch("llama_index.llms.litellm.LiteLLM.astream_chat", side_effect=astream_chat),
+        patch("llama_index.llms.litellm.LiteLLM.achat") as mock_achat,
+    ):
+        result = await generate_pr_description(
+            repository=sample_repository, pull_request=sample_pull_request, on_token=received.append
+        )
+
+    assert received == deltas
+    mock_achat.assert_not_called()
+    assert result.description == "### What change is being made?\n\nAdded a new feature."
@@ -0,0 +1,126 @@
+import asyncio
+import tempfile
+from unittest.mock import MagicMock
+
+import pytest
+
+from lampe.core.data_models import PullRequest, Repository
+from lampe.describe.workflows.pr_description.generation import PRDescriptionStartEvent
+from lampe.describe.workflows.pr_description.generation_map_reduce import (
+    PRDescriptionMapReduceWorkflow,
+    chunk_diff,
+    split_diff_by_file,
+)
+from lampe.describe.workflows.pr_description.generation_prompt import PRDescriptionOutput
+
+DESCRIPTION = """```markdown
+### What change is being made?
+
+Add a new feature.
+
+### Why are these changes being made?
+
+To improve the product.
+```"""
+
+
+def _file_diff(path: str, lines: int) -> str:
+    body = "\n".join(f"+added line {i} of {path}" for i in range(lines))
+    return f"diff --git a/{path} b/{path}\n--- a/{path}\n+++ b/{path}\n@@ -0,0 +1,{lines} @@\n{body}"
+
+
+@pytest.fixture
+def start_event():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield PRDescriptionStartEvent(
+            pr_title="Add new feature",
+            repository=Repository(local_path=temp_dir),
+            pull_request=PullRequest(
+                number=1,
+                title="Add new feature",
+                base_commit_hash="abc123",
+                base_branch_name="main",
+                head_commit_hash="def456",
+                head_branch_name="feature/new-feature",
+            ),
+        )
+
+
+def test_split_diff_by_file():
+    diff = "\n".join([_file_diff("a/x.py", 2), _file_diff("b/y.py", 3)])
+    files = split_diff_by_file(diff)
+    assert [path for path, _ in files] == ["a/x.py", "b/y.py"]
+    assert "\n".join(file_diff for _, file_diff in files) == diff
+    assert split_diff_by_file("") == []
+
+
+def test_chunk_diff_packs_whole_files_under_budget():
+    diff = "\n".join([_file_diff("a.py", 50), _file_diff("b.py", 50), _file_diff("c.py", 50), _file_diff("d.py", 2000)])
+
+    chunks = chunk_diff(diff, max_chunk_tokens=1000)
+
+    assert [[path for path, _ in split_diff_by_file(c)] for c in chunks] == [["a.py", "b.py"], ["c.py"], ["d.py"]]
+    assert chunks[0] == "\n".join([_file_diff("a.py", 50), _file_diff("b.py", 50)])
+    # The oversized file is truncated to the budget
+    assert len(chunks[-1]) < len(_file_diff("d.py", 2000))
+
+
+@pytest.mark.asyncio
+async def test_map_reduce_summarizes_chunks_concurrently(mocker, start_event):
+    diff = "\n".join(_file_diff(f"f{i}.py", 50) for i in range(4))
+    mocker.patch(
+        "lampe.describe.workflows.pr_description.generation_map_reduce.get_diff_between_commits", return_value=diff
+    )
+    in_flight = 0
+    max_in_flight = 0
+
+    async def map_achat(messages):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        response = MagicMock()
+        response.message.content = f"- summary of {messages[-1].content.count('diff --git')} files"
+        return response
+
+    reduce_response = MagicMock()
+    reduce_response.message.content = DESCRIPTION
+
+    workflow = PRDescriptionMapReduceWorkflow(chunk_tokens=700, max_concurrency=2, timeout=None)
+    workflow.map_llm = MagicMock()
+    workflow.map_llm.achat = mocker.AsyncMock(side_effect=map_achat)
+    workflow.llm = MagicMock()
+    workflow.llm.achat = mocker.AsyncMock(return_value=reduce_response)
+
+    result = await workflow.run(start_event=start_event)
+
+    assert isinstance(result, PRDescriptionOutput)
+    assert result.description.startswith("### What change is being made?")
+    assert workflow.map_llm.achat.call_count == 4
+    assert max_in_flight == 2
+    reduce_prompt = workflow.llm.achat.call_args.kwargs["messages"][-1].content
+    assert "Part 4 of 4:\n- summary of 1 files" in reduce_prompt
+    assert "diff --git" not in reduce_prompt
+
+
+@pytest.mark.asyncio
+async def test_map_reduce_describes_small_diff_directly(mocker, start_event):
+    mocker.patch(
+        "lampe.describe.workflows.pr_description.generation_map_reduce.get_diff_between_commits",
+        return_value=_file_diff("a.py", 3),
+    )
+    response = MagicMock()
+    response.message.content = DESCRIPTION
+
+    workflow = PRDescriptionMapReduceWorkflow(timeout=None)
+    workflow.map_llm = MagicMock()
+    workflow.map_llm.achat = mocker.AsyncMock()
+    workflow.llm = MagicMock()
+    workflow.llm.achat = mocker.AsyncMock(return_value=response)
+
+    result = await workflow.run(start_event=start_event)
+
+    assert "Add a new feature." in result.description
+    workflow.map_llm.achat.assert_not_called()
+    assert "+added line 0 of a.py" in workflow.llm.achat.call_args.kwargs["messages"][-1].content
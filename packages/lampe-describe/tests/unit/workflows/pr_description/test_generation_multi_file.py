@@ -0,0 +1,45 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from llama_index.core.llms import ChatMessage
+
+from lampe.core.data_models import PullRequest, Repository
+from lampe.describe.workflows.pr_description.data_models import PRDescriptionInput
+from lampe.describe.workflows.pr_description.generation_multi_file import PRDescriptionFnAgentWorkflow
+
+
+@pytest.mark.asyncio
+async def test_pr_description_agent_runs_from_its_input(mocker):
+    mocker.patch(
+        "lampe.describe.workflows.pr_description.generation_multi_file.list_changed_files",
+        return_value="[M] src/app.py | +3 -1",
+    )
+    prompts = []
+
+    async def mock_achat_with_tools(tools, chat_history):
+        prompts.append(chat_history[-1].content)
+        response = MagicMock()
+        response.message = ChatMessage(role="assistant", content="### What change is being made?\n\nA change.")
+        return response
+
+    llm = MagicMock()
+    llm.achat_with_tools = AsyncMock(side_effect=mock_achat_with_tools)
+    llm.get_tool_calls_from_response = MagicMock(return_value=[])
+    llm.metadata.is_function_calling_model = True
+    llm.metadata.context_window = 1_000_000
+    pull_request = PullRequest(
+        number=7,
+        title="Add feature",
+        base_commit_hash="abc123",
+        base_branch_name="main",
+        head_commit_hash="def456",
+        head_branch_name="feature",
+    )
+
+    workflow = PRDescriptionFnAgentWorkflow(llm=llm, timeout=None)
+    result = await workflow.execute(
+        PRDescriptionInput(repository=Repository(local_path="/repo"), pull_request=pull_request)
+    )
+
+    assert result.description == "### What change is being made?\n\nA change."
+    assert "<number>7</number>" in prompts[0] and "src/app.py" in prompts[0]
@@ -1,8 +1,26 @@
-from lampe.review.workflows import (
-    AgenticReviewComplete,
-    AgenticReviewStart,
-    generate_agentic_pr_review,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from lampe.review.workflows.agentic_review import (
+        AgenticReviewComplete,
+        AgenticReviewStart,
+        generate_agentic_pr_review,
+    )
+
+# Imported on first access: importing a submodule (e.g. data models) does not load the agentic workflow
+_LAZY_ATTRIBUTES = {
+    "AgenticReviewComplete": "lampe.review.workflows.agentic_review",
+    "AgenticReviewStart": "lampe.review.workflows.agentic_review",
+    "generate_agentic_pr_review": "lampe.review.workflows.agentic_review",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        return getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "AgenticReviewComplete",
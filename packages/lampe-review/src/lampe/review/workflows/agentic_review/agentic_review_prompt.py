@@ -39,8 +39,10 @@ Do NOT include skill tasks - those are added separately. Output only basic tasks
 Each task must have:
 - task_id: unique id (e.g. "basic-1", "basic-2")
 - description: the concrete validation question (one per task; combine related checks into one)
+- file_paths: the changed files the task needs to inspect, copied from the changed files list (empty list if the task spans the whole PR)
 - skill_content: always empty string for basic tasks
 - applicable_skill_paths: always empty list for basic tasks
+- priority: "high" for likely bugs, security or data issues, "medium" by default, "low" for style and nice-to-have checks
 """
 
 TASK_PLANNING_USER_PROMPT = """
@@ -55,3 +57,33 @@ Changed files:
 Produce the list of BASIC validation tasks (orchestrator-formulated).
 Group similar tasks and avoid duplicates; output only distinct, non-overlapping tasks. Use the structured output.
 """
+
+INTENT_AND_TASK_PLANNING_SYSTEM_PROMPT = """
+You are an intent extraction and task planning agent for code review. Given a pull request's title, description, and list of changed files, in a single structured output:
+1. Extract the PR intent: a brief summary of what the PR does, the areas touched (e.g. data, api, tests, security, auth, documentation) and suggested validation tasks.
+2. Produce ONLY the BASIC validation tasks the orchestrator should send to validation agents.
+
+IMPORTANT - Validation constraints: Validation agents can ONLY verify facts through static code investigation. They have access to: reading files, searching the codebase, and web search. They CANNOT execute code, run tests, compile, or run any commands.
+
+Do NOT include skill tasks - those are added separately.
+
+**Deduplication and grouping:** Group similar or overlapping tasks into one. No duplicate or near-duplicate tasks. Prefer fewer distinct tasks over a long redundant list.
+
+Each task must have:
+- task_id: unique id (e.g. "basic-1", "basic-2")
+- description: the concrete validation question (one per task; combine related checks into one)
+- file_paths: the changed files the task needs to inspect, copied from the changed files list (empty list if the task spans the whole PR)
+- skill_content: always empty string for basic tasks
+- applicable_skill_paths: always empty list for basic tasks
+- priority: "high" for likely bugs, security or data issues, "medium" by default, "low" for style and nice-to-have checks
+"""
+
+INTENT_AND_TASK_PLANNING_USER_PROMPT = """
+PR Title: {pr_title}
+PR Description: {pr_description}
+
+Changed files:
+{files_changed}
+
+Extract the PR intent and produce the list of BASIC validation tasks using the structured output.
+"""
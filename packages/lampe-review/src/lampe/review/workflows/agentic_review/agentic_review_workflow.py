@@ -2,6 +2,8 @@
 
 import asyncio
 import logging
+import time
+from pathlib import PurePosixPath
 from typing import Any
 
 from llama_index.core.program import FunctionCallingProgram
@@ -10,10 +12,15 @@ from workflows import Context, Workflow, step
 from workflows.events import Event, StartEvent, StopEvent
 
 from lampe.core.data_models import PullRequest, Repository
+from lampe.core.llmbudget import BudgetReport, LLMBudget
 from lampe.core.llmconfig import MODELS, get_model
 from lampe.core.loggingconfig import LAMPE_LOGGER_NAME
 from lampe.core.tools.repository.diff import list_changed_files
+from lampe.core.tools.repository.management import prefetch_blobs
+from lampe.core.tools.repository.pagination import DEFAULT_TOOL_OUTPUT_TOKEN_BUDGET
 from lampe.review.workflows.agentic_review.agentic_review_prompt import (
+    INTENT_AND_TASK_PLANNING_SYSTEM_PROMPT,
+    INTENT_AND_TASK_PLANNING_USER_PROMPT,
     INTENT_EXTRACTION_SYSTEM_PROMPT,
     INTENT_EXTRACTION_USER_PROMPT,
     TASK_PLANNING_SYSTEM_PROMPT,
@@ -21,15 +28,23 @@ from lampe.review.workflows.agentic_review.agentic_review_prompt import (
 )
 from lampe.review.workflows.agentic_review.data_models import (
     PRIntent,
+    PRIntentAndTaskPlan,
     TaskPlanningOutput,
     ValidationAgentInput,
     ValidationResult,
     ValidationTask,
 )
 from lampe.review.workflows.agentic_review.skill_selector import (
+    SkillInfo,
     discover_skills,
     select_applicable_skills,
 )
+from lampe.review.workflows.agentic_review.task_coalescing import (
+    MAX_VALIDATION_AGENTS,
+    changed_file_paths,
+    coalesce_tasks,
+    select_task_groups,
+)
 from lampe.review.workflows.agentic_review.validation.basic_validation_agent import (
     BasicValidationAgent,
 )
@@ -60,13 +75,50 @@ class AgenticReviewStart(StartEvent):
     input: PRReviewInput
 
 
+class ChangedFilesListedEvent(Event):
+    """Event after listing the files changed by the PR."""
+
+    files_changed: str
+
+
+class DiscoverSkillsEvent(Event):
+    """Event requesting skill discovery in the reviewed repository."""
+
+    repo_path: str
+    commit_hash: str
+
+
+class SkillsDiscoveredEvent(Event):
+    """Event after skill discovery."""
+
+    skills: list[SkillInfo]
+
+
+class ContentPrefetchedEvent(Event):
+    """Event after prefetching the content around changed files."""
+
+    prefetched_blobs: int
+
+
 class IntentExtractedEvent(Event):
     """Event after intent extraction."""
 
     pr_intent: PRIntent
     files_changed: str
-    skills: list
-    selected_skills: list
+    # Set in fused mode, where basic tasks are planned by the intent call
+    basic_tasks: list[ValidationTask] | None = None
+
+
+class SkillsSelectedEvent(Event):
+    """Event after skill selection."""
+
+    selected_skills: list[SkillInfo]
+
+
+class BasicTasksPlannedEvent(Event):
+    """Event after basic task planning."""
+
+    tasks: list[ValidationTask]
 
 
 class TasksPlannedEvent(Event):
@@ -90,6 +142,8 @@ class AgenticReviewComplete(StopEvent):
     """Complete event for agentic review workflow."""
 
     output: list[AgentReviewOutput]
+    # Usage of the review and work skipped to stay within its budget
+    budget: BudgetReport | None = None
 
 
 def _validation_results_to_agent_review_output(
@@ -143,118 +197,280 @@ def _validation_results_to_agent_review_output(
     return agent_outputs
 
 
+def _planning_llm() -> LiteLLM:
+    return LiteLLM(model=get_model("LAMPE_MODEL_REVIEW_INTENT", MODELS.GPT_5_2_CODEX), temperature=1)
+
+
+async def _record_step_timing(ctx: Context, name: str, started: float) -> None:
+    await ctx.store.set(f"step_timings.{name}", time.perf_counter() - started)
+
+
+def _prefetch_paths(files_changed: str) -> list[str]:
+    """Directories of changed files (validation agents grep and read around them), root files as-is."""
+    paths: set[str] = set()
+    for file_path in changed_file_paths(files_changed):
+        parent = str(PurePosixPath(file_path).parent)
+        paths.add(file_path if parent == "." else parent)
+    return sorted(paths)
+
+
+def _fallback_intent(pull_request: PullRequest) -> PRIntent:
+    return PRIntent(summary=pull_request.title, areas_touched=[], suggested_validation_tasks=[])
+
+
+async def _extract_intent(
+    llm: LiteLLM, inp: PRReviewInput, files_changed: str, logger: logging.Logger, budget: LLMBudget
+) -> PRIntent:
+    """Intent extraction (FunctionCallingProgram for structured output)."""
+    intent_prompt = f"{INTENT_EXTRACTION_SYSTEM_PROMPT}\n\n{INTENT_EXTRACTION_USER_PROMPT}"
+    try:
+        intent_program = FunctionCallingProgram.from_defaults(
+            output_cls=PRIntent,
+            llm=llm,
+            prompt_template_str=intent_prompt,
+            tool_required=True,
+        )
+        prompt_args = {
+            "pr_title": inp.pull_request.title,
+            "pr_description": inp.pull_request.body or "(no description)",
+            "files_changed": files_changed,
+        }
+        pr_intent = await intent_program.acall(**prompt_args)
+        budget.record_estimate(intent_prompt + "\n".join(prompt_args.values()), pr_intent)
+        if pr_intent is None:
+            logger.warning("Intent extraction returned None (LLM may not have invoked structured output)")
+            return _fallback_intent(inp.pull_request)
+        if isinstance(pr_intent, list) and pr_intent:
+            pr_intent = pr_intent[0]
+        if not isinstance(pr_intent, PRIntent):
+            logger.warning(f"Intent extraction returned unexpected type: {type(pr_intent)}")
+            return _fallback_intent(inp.pull_request)
+        return pr_intent
+    except Exception as e:
+        logger.warning(f"Intent extraction failed: {e}", exc_info=True)
+        return _fallback_intent(inp.pull_request)
+
+
+async def _plan_basic_tasks(
+    llm: LiteLLM, pr_intent: PRIntent, files_changed: str, logger: logging.Logger, budget: LLMBudget
+) -> list[ValidationTask]:
+    """Task planning (basic tasks only; skill tasks added separately)."""
+    task_prompt = f"{TASK_PLANNING_SYSTEM_PROMPT}\n\n{TASK_PLANNING_USER_PROMPT}"
+    try:
+        task_program = FunctionCallingProgram.from_defaults(
+            output_cls=TaskPlanningOutput,
+            llm=llm,
+            prompt_template_str=task_prompt,
+            tool_required=True,
+        )
+        prompt_args = {
+            "pr_intent_summary": pr_intent.summary,
+            "areas_touched": ", ".join(pr_intent.areas_touched) or "unknown",
+            "suggested_tasks": "\n".join(f"- {t}" for t in pr_intent.suggested_validation_tasks),
+            "files_changed": files_changed,
+        }
+        task_result = await task_program.acall(**prompt_args)
+        budget.record_estimate(task_prompt + "\n".join(prompt_args.values()), task_result)
+        if task_result is None:
+            logger.warning("Task planning returned None (LLM may not have invoked structured output)")
+        elif isinstance(task_result, list) and task_result:
+            task_result = task_result[0]
+        if isinstance(task_result, TaskPlanningOutput):
+            return task_result.tasks
+        logger.warning(
+            "Task planning returned unexpected type: %s",
+            type(task_result).__name__ if task_result is not None else "None",
+        )
+    except Exception as e:
+        logger.warning(f"Task planning failed: {e}", exc_info=True)
+    return []
+
+
+async def _extract_intent_and_plan(
+    llm: LiteLLM, inp: PRReviewInput, files_changed: str, logger: logging.Logger, budget: LLMBudget
+) -> tuple[PRIntent, list[ValidationTask]]:
+    """Fused mode: extract intent and plan basic tasks with a single structured output call."""
+    prompt = f"{INTENT_AND_TASK_PLANNING_SYSTEM_PROMPT}\n\n{INTENT_AND_TASK_PLANNING_USER_PROMPT}"
+    try:
+        program = FunctionCallingProgram.from_defaults(
+            output_cls=PRIntentAndTaskPlan,
+            llm=llm,
+            prompt_template_str=prompt,
+            tool_required=True,
+        )
+        prompt_args = {
+            "pr_title": inp.pull_request.title,
+            "pr_description": inp.pull_request.body or "(no description)",
+            "files_changed": files_changed,
+        }
+        result = await program.acall(**prompt_args)
+        budget.record_estimate(prompt + "\n".join(prompt_args.values()), result)
+        if isinstance(result, list) and result:
+            result = result[0]
+        if isinstance(result, PRIntentAndTaskPlan):
+            pr_intent = PRIntent(
+                summary=result.summary,
+                areas_touched=result.areas_touched,
+                suggested_validation_tasks=result.suggested_validation_tasks,
+            )
+            return pr_intent, result.tasks
+        logger.warning(
+            "Fused intent and task planning returned unexpected type: %s",
+            type(result).__name__ if result is not None else "None",
+        )
+    except Exception as e:
+        logger.warning(f"Fused intent and task planning failed: {e}", exc_info=True)
+    return _fallback_intent(inp.pull_request), []
+
+
 class AgenticReviewWorkflow(Workflow):
-    """Orchestrator workflow for agentic review."""
+    """Orchestrator workflow for agentic review.
+
+    Planning is split in concurrent steps: skill discovery starts immediately, content prefetch and intent
+    extraction start once changed files are listed, skill selection and task planning run in parallel once
+    the intent is known. With ``fused_intent_planning``, intent and basic tasks come from a single LLM call.
+    With a limited ``budget``, validation agents only run for the task groups the budget affords (low priority
+    tasks first dropped once it is tight) and the optional LLM passes are skipped once it is tight.
+    """
 
     def __init__(
         self,
         timeout: int | None = None,
         verbose: bool = False,
+        tool_output_token_budget: int | None = DEFAULT_TOOL_OUTPUT_TOKEN_BUDGET,
+        fused_intent_planning: bool = False,
+        max_validation_agents: int = MAX_VALIDATION_AGENTS,
+        budget: LLMBudget | None = None,
         *args: Any,
         **kwargs: Any,
     ):
         super().__init__(*args, timeout=timeout, verbose=verbose, **kwargs)
         self.verbose = verbose
         self.timeout = timeout
+        self.tool_output_token_budget = tool_output_token_budget
+        self.fused_intent_planning = fused_intent_planning
+        self.max_validation_agents = max_validation_agents
         self.logger = logging.getLogger(LAMPE_LOGGER_NAME)
-        self.aggregation_workflow = LLMAggregationWorkflow(timeout=timeout, verbose=verbose)
+        self.budget = budget or LLMBudget()
+        self.aggregation_workflow = LLMAggregationWorkflow(timeout=timeout, verbose=verbose, budget=self.budget)
 
     @step
-    async def extract_intent_and_select_skills(self, ctx: Context, ev: AgenticReviewStart) -> TasksPlannedEvent:
-        """Extract PR intent, discover/select skills, plan tasks."""
-        inp = ev.input
-        repo_path = inp.repository.local_path
-        base_commit = inp.pull_request.base_commit_hash
-        head_commit = inp.pull_request.head_commit_hash
-
-        files_changed = list_changed_files(
-            base_reference=base_commit,
-            head_reference=head_commit,
+    async def list_changed_files_and_discover_skills(
+        self, ctx: Context, ev: AgenticReviewStart
+    ) -> ChangedFilesListedEvent | DiscoverSkillsEvent:
+        """List changed files and kick off skill discovery, which does not depend on them."""
+        await ctx.store.set("step_timings", {})
+        await ctx.store.set("planning_started_at", time.perf_counter())
+        await ctx.store.set("input", ev.input)
+        repo_path = ev.input.repository.local_path
+        ctx.send_event(DiscoverSkillsEvent(repo_path=repo_path, commit_hash=ev.input.pull_request.head_commit_hash))
+
+        started = time.perf_counter()
+        files_changed = await asyncio.to_thread(
+            list_changed_files,
+            base_reference=ev.input.pull_request.base_commit_hash,
+            head_reference=ev.input.pull_request.head_commit_hash,
             repo_path=repo_path,
         )
+        await _record_step_timing(ctx, "list_changed_files", started)
+        return ChangedFilesListedEvent(files_changed=files_changed)
 
-        # Intent extraction (FunctionCallingProgram for structured output)
-        llm = LiteLLM(model=get_model("LAMPE_MODEL_REVIEW_INTENT", MODELS.GPT_5_2_CODEX), temperature=1)
-        intent_prompt = f"{INTENT_EXTRACTION_SYSTEM_PROMPT}\n\n{INTENT_EXTRACTION_USER_PROMPT}"
+    @step
+    async def discover_repository_skills(self, ctx: Context, ev: DiscoverSkillsEvent) -> SkillsDiscoveredEvent:
+        """Read SKILL.md files from the head commit tree."""
+        started = time.perf_counter()
+        skills = await asyncio.to_thread(discover_skills, ev.repo_path, ev.commit_hash)
+        await _record_step_timing(ctx, "discover_skills", started)
+        return SkillsDiscoveredEvent(skills=skills)
+
+    @step
+    async def prefetch_changed_content(self, ctx: Context, ev: ChangedFilesListedEvent) -> ContentPrefetchedEvent:
+        """Fetch the head blobs around changed files while the planning LLM calls run."""
+        inp: PRReviewInput = await ctx.store.get("input")
+        started = time.perf_counter()
         try:
-            intent_program = FunctionCallingProgram.from_defaults(
-                output_cls=PRIntent,
-                llm=llm,
-                prompt_template_str=intent_prompt,
-                tool_required=True,
-            )
-            pr_intent = await intent_program.acall(
-                pr_title=inp.pull_request.title,
-                pr_description=inp.pull_request.body or "(no description)",
-                files_changed=files_changed,
+            prefetched = await asyncio.to_thread(
+                prefetch_blobs,
+                repo_path=inp.repository.local_path,
+                commit_ref=inp.pull_request.head_commit_hash,
+                paths=_prefetch_paths(ev.files_changed),
             )
-            if pr_intent is None:
-                self.logger.warning("Intent extraction returned None (LLM may not have invoked structured output)")
-                pr_intent = PRIntent(
-                    summary=inp.pull_request.title,
-                    areas_touched=[],
-                    suggested_validation_tasks=[],
-                )
-            elif isinstance(pr_intent, list) and pr_intent:
-                pr_intent = pr_intent[0]
-            if not isinstance(pr_intent, PRIntent):
-                self.logger.warning(f"Intent extraction returned unexpected type: {type(pr_intent)}")
-                pr_intent = PRIntent(
-                    summary=inp.pull_request.title,
-                    areas_touched=[],
-                    suggested_validation_tasks=[],
-                )
         except Exception as e:
-            self.logger.warning(f"Intent extraction failed: {e}", exc_info=True)
-            pr_intent = PRIntent(
-                summary=inp.pull_request.title,
-                areas_touched=[],
-                suggested_validation_tasks=[],
-            )
+            self.logger.warning(f"Content prefetch failed: {e}", exc_info=True)
+            prefetched = 0
+        await _record_step_timing(ctx, "prefetch_changed_content", started)
+        return ContentPrefetchedEvent(prefetched_blobs=prefetched)
 
-        # Skill discovery and selection
-        skills = discover_skills(repo_path)
-        selected_skills = []
-        if skills:
-            selected_skills = await select_applicable_skills(
-                pr_intent=pr_intent,
-                files_changed=files_changed,
-                skills=skills,
-                llm=llm,
+    @step
+    async def extract_intent(self, ctx: Context, ev: ChangedFilesListedEvent) -> IntentExtractedEvent:
+        """Extract PR intent, or intent and basic tasks in a single call in fused mode."""
+        inp: PRReviewInput = await ctx.store.get("input")
+        started = time.perf_counter()
+        llm = _planning_llm()
+        if self.fused_intent_planning:
+            pr_intent, basic_tasks = await _extract_intent_and_plan(
+                llm, inp, ev.files_changed, self.logger, self.budget
             )
+        else:
+            pr_intent = await _extract_intent(llm, inp, ev.files_changed, self.logger, self.budget)
+            basic_tasks = None
+        await _record_step_timing(ctx, "intent_and_plan" if self.fused_intent_planning else "intent", started)
+        return IntentExtractedEvent(pr_intent=pr_intent, files_changed=ev.files_changed, basic_tasks=basic_tasks)
 
-        # Task planning (basic tasks only; skill tasks added separately)
-        task_prompt = f"{TASK_PLANNING_SYSTEM_PROMPT}\n\n{TASK_PLANNING_USER_PROMPT}"
-        tasks: list[ValidationTask] = []
-        try:
-            task_program = FunctionCallingProgram.from_defaults(
-                output_cls=TaskPlanningOutput,
-                llm=llm,
-                prompt_template_str=task_prompt,
-                tool_required=True,
-            )
-            task_result = await task_program.acall(
-                pr_intent_summary=pr_intent.summary,
-                areas_touched=", ".join(pr_intent.areas_touched) or "unknown",
-                suggested_tasks="\n".join(f"- {t}" for t in pr_intent.suggested_validation_tasks),
-                files_changed=files_changed,
-            )
-            if task_result is None:
-                self.logger.warning("Task planning returned None (LLM may not have invoked structured output)")
-            elif isinstance(task_result, list) and task_result:
-                task_result = task_result[0]
-            if isinstance(task_result, TaskPlanningOutput):
-                tasks = task_result.tasks
-            else:
-                self.logger.warning(
-                    "Task planning returned unexpected type: %s",
-                    type(task_result).__name__ if task_result is not None else "None",
-                )
-        except Exception as e:
-            self.logger.warning(f"Task planning failed: {e}", exc_info=True)
+    @step
+    async def select_skills(
+        self, ctx: Context, ev: IntentExtractedEvent | SkillsDiscoveredEvent
+    ) -> SkillsSelectedEvent | None:
+        """Select applicable skills once both the intent and the discovered skills are available."""
+        collected = ctx.collect_events(ev, [IntentExtractedEvent, SkillsDiscoveredEvent])
+        if collected is None:
+            return None
+        intent_ev, skills_ev = collected
+        if not skills_ev.skills:
+            return SkillsSelectedEvent(selected_skills=[])
+        if self.budget.is_tight():
+            self.budget.skip("skills", f"{len(skills_ev.skills)} skills", "not selected, the budget is tight")
+            return SkillsSelectedEvent(selected_skills=[])
+
+        started = time.perf_counter()
+        selected_skills = await select_applicable_skills(
+            pr_intent=intent_ev.pr_intent,
+            files_changed=intent_ev.files_changed,
+            skills=skills_ev.skills,
+            llm=_planning_llm(),
+            budget=self.budget,
+        )
+        await _record_step_timing(ctx, "select_skills", started)
+        return SkillsSelectedEvent(selected_skills=selected_skills)
 
+    @step
+    async def plan_tasks(self, ctx: Context, ev: IntentExtractedEvent) -> BasicTasksPlannedEvent:
+        """Plan basic validation tasks, concurrently with skill selection."""
+        if ev.basic_tasks is not None:
+            return BasicTasksPlannedEvent(tasks=ev.basic_tasks)
+        started = time.perf_counter()
+        tasks = await _plan_basic_tasks(_planning_llm(), ev.pr_intent, ev.files_changed, self.logger, self.budget)
+        await _record_step_timing(ctx, "plan_tasks", started)
+        return BasicTasksPlannedEvent(tasks=tasks)
+
+    @step
+    async def join_planning(
+        self,
+        ctx: Context,
+        ev: ChangedFilesListedEvent | BasicTasksPlannedEvent | SkillsSelectedEvent | ContentPrefetchedEvent,
+    ) -> TasksPlannedEvent | None:
+        """Merge basic tasks and skill tasks once every planning branch completed."""
+        collected = ctx.collect_events(
+            ev, [ChangedFilesListedEvent, BasicTasksPlannedEvent, SkillsSelectedEvent, ContentPrefetchedEvent]
+        )
+        if collected is None:
+            return None
+        files_ev, basic_ev, skills_ev, _ = collected
+        inp: PRReviewInput = await ctx.store.get("input")
+
+        tasks = list(basic_ev.tasks)
         # Add skill tasks for selected skills
-        for i, skill in enumerate(selected_skills):
+        for i, skill in enumerate(skills_ev.selected_skills):
             tasks.append(
                 ValidationTask(
                     task_id=f"skill-{skill.name}-{i}",
@@ -270,47 +486,77 @@ class AgenticReviewWorkflow(Workflow):
                 "Skipping validation (no fallback to basic validation)."
             )
 
+        timings: dict[str, float] = await ctx.store.get("step_timings")
+        planning_started_at: float = await ctx.store.get("planning_started_at")
+        self.logger.info(
+            "Agentic review planning took %.2fs (%s)",
+            time.perf_counter() - planning_started_at,
+            ", ".join(f"{name}={seconds:.2f}s" for name, seconds in timings.items()),
+        )
+
         return TasksPlannedEvent(
             tasks=tasks,
-            files_changed=files_changed,
-            repo_path=repo_path,
-            base_commit=base_commit,
-            head_commit=head_commit,
+            files_changed=files_ev.files_changed,
+            repo_path=inp.repository.local_path,
+            base_commit=inp.pull_request.base_commit_hash,
+            head_commit=inp.pull_request.head_commit_hash,
         )
 
     @step
     async def run_validations(self, ctx: Context, ev: TasksPlannedEvent) -> ValidationsCompleteEvent:
-        """Run all validation agents (parallel)."""
-        results: list[ValidationResult] = []
+        """Run all validation agents (parallel).
+
+        Basic tasks with overlapping file footprints are coalesced into at most ``max_validation_agents``
+        grouped agents; skill tasks keep one agent each since their skill is part of the system prompt.
+        Only the most important groups the budget affords are run, the dropped tasks are reported as skipped.
+        """
+        basic_tasks = [t for t in ev.tasks if not t.skill_content]
+        skill_tasks = [t for t in ev.tasks if t.skill_content]
+        task_groups = coalesce_tasks(basic_tasks, ev.files_changed, max_groups=self.max_validation_agents)
+        task_groups += [[t] for t in skill_tasks]
+        if len(task_groups) < len(ev.tasks):
+            self.logger.info(f"Coalesced {len(ev.tasks)} validation tasks into {len(task_groups)} agents")
+        task_groups, dropped = select_task_groups(
+            task_groups, self.budget.affordable_agents(len(task_groups)), drop_low_priority=self.budget.is_tight()
+        )
+        for task in dropped:
+            self.budget.skip("task", task.task_id, f"{task.priority} priority task dropped to stay within the budget")
 
-        async def run_one(task: ValidationTask) -> ValidationResult:
+        async def run_group(tasks: list[ValidationTask]) -> list[ValidationResult]:
+            task = tasks[0]
             agent_input = ValidationAgentInput(
                 task=task,
                 repo_path=ev.repo_path,
                 base_commit=ev.base_commit,
                 head_commit=ev.head_commit,
                 files_changed=ev.files_changed,
+                grouped_tasks=tasks if len(tasks) > 1 else [],
             )
             if task.skill_content:
-                agent = SkillAugmentedValidationAgent(skill_content=task.skill_content)
+                agent = SkillAugmentedValidationAgent(
+                    skill_content=task.skill_content,
+                    tool_output_token_budget=self.tool_output_token_budget,
+                    budget=self.budget,
+                )
             else:
-                agent = BasicValidationAgent()
+                agent = BasicValidationAgent(tool_output_token_budget=self.tool_output_token_budget, budget=self.budget)
             try:
                 complete: ValidationAgentComplete = await agent.run(start_event=ValidationAgentStart(input=agent_input))
-                return complete.validation_result
+                return complete.validation_results or [complete.validation_result]
             except Exception as e:
-                self.logger.exception(f"Validation agent failed for {task.task_id}: {e}")
-                return ValidationResult(task_id=task.task_id, findings=[], no_issue=True, sources=[])
+                self.logger.exception(f"Validation agent failed for {', '.join(t.task_id for t in tasks)}: {e}")
+                return [ValidationResult(task_id=t.task_id, findings=[], no_issue=True, sources=[]) for t in tasks]
 
-        results = await asyncio.gather(*[run_one(t) for t in ev.tasks])
-        return ValidationsCompleteEvent(results=list(results), files_changed=ev.files_changed)
+        grouped_results = await asyncio.gather(*[run_group(group) for group in task_groups])
+        results = [result for group_results in grouped_results for result in group_results]
+        return ValidationsCompleteEvent(results=results, files_changed=ev.files_changed)
 
     @step
     async def aggregate_and_deliver(self, ctx: Context, ev: ValidationsCompleteEvent) -> AgenticReviewComplete:
         """Convert to AgentReviewOutput, run QA, deliver."""
         agent_reviews = _validation_results_to_agent_review_output(ev.results)
         if not agent_reviews:
-            return AgenticReviewComplete(output=[])
+            return AgenticReviewComplete(output=[], budget=self.budget.report())
 
         aggregation_result: LLMAggregationCompleteEvent = await self.aggregation_workflow.run(
             start_event=LLMAggregationStartEvent(
@@ -318,7 +564,7 @@ class AgenticReviewWorkflow(Workflow):
                 files_changed=ev.files_changed,
             )
         )
-        return AgenticReviewComplete(output=aggregation_result.aggregated_reviews)
+        return AgenticReviewComplete(output=aggregation_result.aggregated_reviews, budget=self.budget.report())
 
 
 async def generate_agentic_pr_review(
@@ -329,8 +575,12 @@ async def generate_agentic_pr_review(
     files_exclude_patterns: list[str] | None = None,
     timeout: int | None = None,
     verbose: bool = False,
+    tool_output_token_budget: int | None = DEFAULT_TOOL_OUTPUT_TOKEN_BUDGET,
+    fused_intent_planning: bool = False,
+    max_validation_agents: int = MAX_VALIDATION_AGENTS,
+    budget: LLMBudget | None = None,
 ) -> AgenticReviewComplete:
-    """Generate a PR review using the agentic orchestrator workflow."""
+    """Generate a PR review using the agentic orchestrator workflow, within ``budget`` when set."""
     if files_exclude_patterns is None:
         files_exclude_patterns = []
 
@@ -341,6 +591,13 @@ async def generate_agentic_pr_review(
         custom_guidelines=custom_guidelines,
         files_exclude_patterns=files_exclude_patterns,
     )
-    workflow = AgenticReviewWorkflow(timeout=timeout, verbose=verbose)
+    workflow = AgenticReviewWorkflow(
+        timeout=timeout,
+        verbose=verbose,
+        tool_output_token_budget=tool_output_token_budget,
+        fused_intent_planning=fused_intent_planning,
+        max_validation_agents=max_validation_agents,
+        budget=budget,
+    )
     result: AgenticReviewComplete = await workflow.run(start_event=AgenticReviewStart(input=input_data))
     return result
@@ -31,10 +31,18 @@ class ValidationTask(BaseModel):
         default_factory=list,
         description="Paths to SKILL.md content that applies",
     )
+    file_paths: list[str] = Field(
+        default_factory=list,
+        description="Changed files the task needs to inspect (empty when the task spans the whole PR)",
+    )
     skill_content: str = Field(
         default="",
         description="Resolved SKILL.md content to inject into prompt (empty for basic agent)",
     )
+    priority: str = Field(
+        default="medium",
+        description="Priority of the task: high, medium or low. Low priority tasks are dropped first on a tight budget",
+    )
 
 
 class TaskPlanningOutput(BaseModel):
@@ -49,6 +57,15 @@ class TaskPlanningOutput(BaseModel):
     note: str = Field(default="", description="Optional brief note. Can be empty.")
 
 
+class PRIntentAndTaskPlan(PRIntent):
+    """Structured output of the fused intent extraction and task planning call."""
+
+    tasks: list[ValidationTask] = Field(
+        default_factory=list,
+        description="List of basic validation tasks (orchestrator-formulated)",
+    )
+
+
 class ValidationAgentInput(BaseModel):
     """Input for the validation agent."""
 
@@ -57,6 +74,10 @@ class ValidationAgentInput(BaseModel):
     base_commit: str = Field(..., description="Base commit reference")
     head_commit: str = Field(..., description="Head commit reference")
     files_changed: str = Field(..., description="Formatted list of changed files")
+    grouped_tasks: list[ValidationTask] = Field(
+        default_factory=list,
+        description="All tasks executed by a grouped agent, including task (empty for a single task)",
+    )
 
 
 class ValidationFinding(BaseModel):
@@ -68,6 +89,7 @@ class ValidationFinding(BaseModel):
     problem_summary: str = Field(..., description="Summary of the problem found")
     severity: str = Field(..., description="Severity: critical, high, medium, low")
     category: str = Field(..., description="Category: security, data, api, etc.")
+    task_id: str = Field(default="", description="Task the finding answers (set by grouped agents)")
     sources: list[ToolSource] = Field(
         default_factory=list,
         description="Tools used to find this issue (populated from agent run)",
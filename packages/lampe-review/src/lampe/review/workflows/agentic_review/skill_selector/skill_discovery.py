@@ -1,12 +1,28 @@
 """Discover SKILL.md files within the reviewed repository."""
 
+import logging
 import re
 from pathlib import Path
 
+from git import BadName, InvalidGitRepositoryError, NoSuchPathError, Repo, Tree
 from pydantic import BaseModel, Field
 
+from lampe.core.loggingconfig import LAMPE_LOGGER_NAME
+
+logger = logging.getLogger(name=LAMPE_LOGGER_NAME)
+
 # Directories to skip when scanning for skills (e.g. deps, build artifacts)
 _SKIP_DIRS = frozenset({".git", "node_modules", "__pycache__", ".venv", "venv", ".tox", "dist", "build"})
+_SKILL_FILE_NAME = "SKILL.md"
+
+# Git objects are content-addressed, so both caches are valid across commits and repositories:
+# - tree SHA -> relative paths of the SKILL.md files below it, with the SHA of their containing tree
+# - containing tree SHA -> parsed skill (path relative to the repository root)
+# NOTE: caches are cleared when they reach _MAX_CACHED_TREES entries
+_MAX_CACHED_TREES = 100_000
+_skill_paths_by_tree: dict[str, list[tuple[str, str]]] = {}
+# Keyed by (tree SHA, directory name): a skill without frontmatter name is named after its directory
+_skill_by_dir_tree: dict[tuple[str, str], "SkillInfo"] = {}
 
 
 def _should_skip(path: Path, repo_root: Path) -> bool:
@@ -50,23 +66,100 @@ def _parse_frontmatter(content: str) -> tuple[dict[str, str], str]:
     return metadata, body.strip()
 
 
-def discover_skills(repo_path: str) -> list[SkillInfo]:
+def _skill_from_content(path: str, content: str) -> SkillInfo:
+    metadata, _ = _parse_frontmatter(content)
+    return SkillInfo(
+        path=path,
+        name=metadata.get("name", Path(path).parent.name),
+        description=metadata.get("description", ""),
+        content=content,
+    )
+
+
+def _skill_paths_in_tree(tree: Tree) -> list[tuple[str, str]]:
+    """Return (relative SKILL.md path, containing tree SHA) pairs below a tree, memoized by tree SHA.
+
+    Unchanged directories keep their tree SHA between commits, so only the directories along changed
+    paths are listed again. Tree objects are read through GitPython's persistent cat-file process.
+    """
+    cached = _skill_paths_by_tree.get(tree.hexsha)
+    if cached is not None:
+        return cached
+
+    found: list[tuple[str, str]] = []
+    for blob in tree.blobs:
+        if blob.name == _SKILL_FILE_NAME:
+            found.append((_SKILL_FILE_NAME, tree.hexsha))
+    for subtree in tree.trees:
+        if subtree.name in _SKIP_DIRS:
+            continue
+        found.extend((f"{subtree.name}/{path}", sha) for path, sha in _skill_paths_in_tree(subtree))
+
+    if len(_skill_paths_by_tree) >= _MAX_CACHED_TREES:
+        _skill_paths_by_tree.clear()
+    _skill_paths_by_tree[tree.hexsha] = found
+    return found
+
+
+def _discover_skills_at_commit(repo: Repo, commit_hash: str, base: Path) -> list[SkillInfo]:
+    """Read SKILL.md paths and contents from the tree of a commit."""
+    root = repo.commit(commit_hash).tree
+    skills: list[SkillInfo] = []
+    for rel_path, dir_tree_sha in _skill_paths_in_tree(root):
+        cache_key = (dir_tree_sha, (base / rel_path).parent.name)
+        skill = _skill_by_dir_tree.get(cache_key)
+        if skill is None:
+            try:
+                content = (root / rel_path).data_stream.read().decode("utf-8")
+            except Exception:
+                continue
+            skill = _skill_from_content(str(base / rel_path), content)
+            if len(_skill_by_dir_tree) >= _MAX_CACHED_TREES:
+                _skill_by_dir_tree.clear()
+            _skill_by_dir_tree[cache_key] = skill
+        # The same directory content can live at different paths, the cached path is only a hint
+        skills.append(skill.model_copy(update={"path": str(base / rel_path)}))
+    return skills
+
+
+def discover_skills(repo_path: str, commit_hash: str | None = None) -> list[SkillInfo]:
     """Find all SKILL.md files in the repository.
 
-    Scans for any SKILL.md file under the repo root.
+    When ``repo_path`` is a git repository, SKILL.md files are read from the tree of ``commit_hash``
+    (HEAD by default), which works for sparse and partial clones and never walks the working copy.
+    Parsed skills are cached by the tree SHAs of their containing directories, so unchanged
+    directories are not scanned again. Paths that are not git repositories are scanned on disk.
     Skips directories: .git, node_modules, __pycache__, .venv, venv, .tox, dist, build.
 
+    Args:
+        repo_path: Path to the repository
+        commit_hash: Commit to read skills from. Defaults to HEAD.
+
     Returns:
         List of SkillInfo with path, name, description, and full content.
     """
     base = Path(repo_path).resolve()
+    try:
+        repo = Repo(path=base)
+    except (InvalidGitRepositoryError, NoSuchPathError):
+        repo = None
+    if repo is not None:
+        try:
+            return _discover_skills_at_commit(repo, commit_hash or "HEAD", base)
+        except (BadName, ValueError) as e:
+            logger.warning(f"Unable to read skills from commit {commit_hash or 'HEAD'} ({e}), scanning working tree")
+    return _discover_skills_in_working_tree(base)
+
+
+def _discover_skills_in_working_tree(base: Path) -> list[SkillInfo]:
+    """Scan the working tree for SKILL.md files (fallback when the path is not a git repository)."""
     if not base.exists() or not base.is_dir():
         return []
 
     skills: list[SkillInfo] = []
     seen_paths: set[Path] = set()
 
-    for skill_file in base.rglob("SKILL.md"):
+    for skill_file in base.rglob(_SKILL_FILE_NAME):
         if not skill_file.is_file():
             continue
         if skill_file in seen_paths:
@@ -81,17 +174,5 @@ def discover_skills(repo_path: str) -> list[SkillInfo]:
         except Exception:
             continue
 
-        metadata, _ = _parse_frontmatter(content)
-        skill_dir = skill_file.parent
-        name = metadata.get("name", skill_dir.name)
-        description = metadata.get("description", "")
-
-        skills.append(
-            SkillInfo(
-                path=str(skill_file),
-                name=name,
-                description=description,
-                content=content,
-            )
-        )
+        skills.append(_skill_from_content(str(skill_file), content))
     return skills
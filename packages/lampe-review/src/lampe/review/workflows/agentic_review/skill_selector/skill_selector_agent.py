@@ -6,6 +6,7 @@ from llama_index.core.program import FunctionCallingProgram
 from llama_index.llms.litellm import LiteLLM
 from pydantic import BaseModel, Field
 
+from lampe.core.llmbudget import LLMBudget
 from lampe.core.llmconfig import MODELS, get_model
 from lampe.core.loggingconfig import LAMPE_LOGGER_NAME
 from lampe.review.workflows.agentic_review.data_models import PRIntent
@@ -33,6 +34,7 @@ async def select_applicable_skills(
     files_changed: str,
     skills: list[SkillInfo],
     llm: LiteLLM | None = None,
+    budget: LLMBudget | None = None,
 ) -> list[SkillInfo]:
     """Select which skills from the repo apply to this PR.
 
@@ -43,6 +45,7 @@ async def select_applicable_skills(
         files_changed: List of changed files
         skills: List of discovered skills (must be non-empty)
         llm: Optional LLM instance
+        budget: Optional budget recording the usage of the selection call
 
     Returns:
         List of SkillInfo that apply to this PR
@@ -64,13 +67,16 @@ async def select_applicable_skills(
             prompt_template_str=prompt_template,
             tool_required=True,
         )
-        result = await program.acall(
-            pr_intent_summary=pr_intent.summary,
-            areas_touched=", ".join(pr_intent.areas_touched) or "unknown",
-            suggested_tasks=", ".join(pr_intent.suggested_validation_tasks) or "general review",
-            files_changed=files_changed,
-            skills_list=skills_list,
-        )
+        prompt_args = {
+            "pr_intent_summary": pr_intent.summary,
+            "areas_touched": ", ".join(pr_intent.areas_touched) or "unknown",
+            "suggested_tasks": ", ".join(pr_intent.suggested_validation_tasks) or "general review",
+            "files_changed": files_changed,
+            "skills_list": skills_list,
+        }
+        result = await program.acall(**prompt_args)
+        if budget is not None:
+            budget.record_estimate(prompt_template + "\n".join(prompt_args.values()), result)
         if result is None:
             logger.warning("Skill selector returned None (LLM may not have invoked structured output)")
             selected_paths = []
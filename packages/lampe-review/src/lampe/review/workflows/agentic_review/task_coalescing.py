@@ -0,0 +1,148 @@
+"""Coalesce validation tasks that target the same files into a bounded number of agents."""
+
+import os
+import re
+
+from lampe.review.workflows.agentic_review.data_models import ValidationTask
+
+# NOTE: Upper bound on the number of agents running basic validation tasks, by default 8
+MAX_VALIDATION_AGENTS = int(os.getenv("LAMPE_MAX_VALIDATION_AGENTS", 8))
+# NOTE: Tasks carried by a single grouped agent before opening a new group (the agent bound wins)
+MAX_TASKS_PER_VALIDATION_AGENT = int(os.getenv("LAMPE_MAX_TASKS_PER_VALIDATION_AGENT", 4))
+# Rank of the task priorities set by the planner, lower ranks are dropped last on a tight budget
+TASK_PRIORITY_RANKS = {"high": 0, "medium": 1, "low": 2}
+
+
+def changed_file_paths(files_changed: str) -> list[str]:
+    """Extract file paths from the output of ``list_changed_files``.
+
+    Parameters
+    ----------
+    files_changed
+        Lines formatted as "[STATUS] filepath | +additions -deletions | sizeKB"
+
+    Returns
+    -------
+    :
+        Changed file paths, in listing order
+    """
+    paths = []
+    for line in files_changed.splitlines():
+        if "] " in line:
+            paths.append(line.split("] ", 1)[1].rsplit(" | ", 2)[0])
+    return paths
+
+
+def task_footprint(task: ValidationTask, changed_paths: list[str]) -> frozenset[str]:
+    """Changed files a task is expected to inspect.
+
+    Uses the planned ``file_paths`` restricted to changed files, falling back to changed files mentioned
+    in the task description (full path or file name). A task without footprint is PR-wide and covers
+    every changed file.
+    """
+    changed = set(changed_paths)
+    footprint = {path for path in task.file_paths if path in changed}
+    if not footprint:
+        for path in changed_paths:
+            name = path.rsplit("/", 1)[-1]
+            if path in task.description or re.search(rf"(?<![\w./-]){re.escape(name)}(?![\w-])", task.description):
+                footprint.add(path)
+    return frozenset(footprint or changed)
+
+
+def coalesce_tasks(
+    tasks: list[ValidationTask],
+    files_changed: str,
+    max_groups: int = MAX_VALIDATION_AGENTS,
+    max_tasks_per_group: int = MAX_TASKS_PER_VALIDATION_AGENT,
+) -> list[list[ValidationTask]]:
+    """Group tasks with overlapping file footprints so that one agent reads the shared files once.
+
+    Tasks are assigned greedily, largest footprint first, to the open group they overlap the most.
+    When more than ``max_groups`` groups remain, the two smallest groups are merged until the bound holds.
+    Grouping is deterministic and tasks keep their planning order within and across groups.
+
+    Parameters
+    ----------
+    tasks
+        Tasks to group. Tasks carrying skill content should not be coalesced (their skill is part of the
+        agent system prompt).
+    files_changed
+        Output of ``list_changed_files`` for the PR
+    max_groups
+        Maximum number of groups (agents), by default MAX_VALIDATION_AGENTS
+    max_tasks_per_group
+        Soft cap of tasks per group, by default MAX_TASKS_PER_VALIDATION_AGENT
+
+    Returns
+    -------
+    :
+        Groups of tasks, each executed by a single agent
+    """
+    if not tasks:
+        return []
+    changed_paths = changed_file_paths(files_changed)
+    order = {id(task): i for i, task in enumerate(tasks)}
+    footprints = {id(task): task_footprint(task, changed_paths) for task in tasks}
+
+    groups: list[tuple[list[ValidationTask], set[str]]] = []
+    for task in sorted(tasks, key=lambda t: (-len(footprints[id(t)]), order[id(t)])):
+        footprint = footprints[id(task)]
+        best, best_overlap = None, 0
+        for group in groups:
+            overlap = len(footprint & group[1])
+            if len(group[0]) < max_tasks_per_group and overlap > best_overlap:
+                best, best_overlap = group, overlap
+        if best is None:
+            groups.append(([task], set(footprint)))
+        else:
+            best[0].append(task)
+            best[1].update(footprint)
+
+    while len(groups) > max(max_groups, 1):
+        groups.sort(key=lambda g: (len(g[0]), len(g[1]), min(order[id(t)] for t in g[0])))
+        smallest, second = groups.pop(0), groups.pop(0)
+        groups.append((smallest[0] + second[0], smallest[1] | second[1]))
+
+    result = [sorted(group_tasks, key=lambda t: order[id(t)]) for group_tasks, _ in groups]
+    return sorted(result, key=lambda g: order[id(g[0])])
+
+
+def task_priority_rank(task: ValidationTask) -> int:
+    """Rank of a task priority, 0 being the most important. Unknown priorities rank as medium."""
+    return TASK_PRIORITY_RANKS.get(task.priority.strip().lower(), TASK_PRIORITY_RANKS["medium"])
+
+
+def select_task_groups(
+    groups: list[list[ValidationTask]], max_groups: int, drop_low_priority: bool = False
+) -> tuple[list[list[ValidationTask]], list[ValidationTask]]:
+    """Keep the task groups worth running within a budget.
+
+    With ``drop_low_priority``, low priority tasks are removed first. Then only the ``max_groups`` most
+    important groups are kept: a group ranks as its highest priority task, ties keep the planning order.
+
+    Parameters
+    ----------
+    groups
+        Task groups, in planning order
+    max_groups
+        Maximum number of groups the budget affords
+    drop_low_priority
+        Whether to drop the low priority tasks, e.g. when the budget is tight
+
+    Returns
+    -------
+    :
+        Kept groups in planning order, and the dropped tasks
+    """
+    dropped: list[ValidationTask] = []
+    if drop_low_priority:
+        low_rank = TASK_PRIORITY_RANKS["low"]
+        dropped = [task for group in groups for task in group if task_priority_rank(task) >= low_rank]
+        groups = [[task for task in group if task_priority_rank(task) < low_rank] for group in groups]
+        groups = [group for group in groups if group]
+
+    ranked = sorted(range(len(groups)), key=lambda i: (min(task_priority_rank(t) for t in groups[i]), i))
+    kept = set(ranked[: max(max_groups, 0)])
+    dropped += [task for i in ranked if i not in kept for task in groups[i]]
+    return [group for i, group in enumerate(groups) if i in kept], dropped
@@ -18,10 +18,12 @@ from lampe.review.workflows.agentic_review.data_models import (
     ValidationAgentInput,
     ValidationFinding,
     ValidationResult,
+    ValidationTask,
 )
 from lampe.review.workflows.agentic_review.response_parse import parse_validation_response
 from lampe.review.workflows.agentic_review.validation.validation_agent_prompt import (
     VALIDATION_AGENT_BASE_SYSTEM_PROMPT,
+    VALIDATION_AGENT_GROUPED_USER_PROMPT,
     VALIDATION_AGENT_USER_PROMPT,
 )
 
@@ -36,10 +38,12 @@ class ValidationAgentComplete(StopEvent):
     """Stop event for validation agent."""
 
     validation_result: ValidationResult
+    # One result per task for grouped agents, in the order of grouped_tasks
+    validation_results: list[ValidationResult] = []
 
 
 class ValidationAgent(FunctionCallingAgent):
-    """Base validation agent that executes a single verification task."""
+    """Base validation agent that executes a single verification task, or a group of tasks sharing files."""
 
     def __init__(self, skill_content: str = "", llm: LiteLLM | None = None, *args: Any, **kwargs: Any) -> None:
         system_prompt = VALIDATION_AGENT_BASE_SYSTEM_PROMPT
@@ -71,15 +75,26 @@ class ValidationAgent(FunctionCallingAgent):
         inp = ev.input
         await ctx.store.set("validation_input", inp)
 
-        query = VALIDATION_AGENT_USER_PROMPT.format(
-            task_description=inp.task.description,
-            repo_path=inp.repo_path,
-            base_commit=inp.base_commit,
-            head_commit=inp.head_commit,
-            files_changed=inp.files_changed,
-        )
+        if inp.grouped_tasks:
+            query = VALIDATION_AGENT_GROUPED_USER_PROMPT.format(
+                tasks_list="\n".join(f"- [{task.task_id}] {task.description}" for task in inp.grouped_tasks),
+                example_task_id=inp.grouped_tasks[0].task_id,
+                repo_path=inp.repo_path,
+                base_commit=inp.base_commit,
+                head_commit=inp.head_commit,
+                files_changed=inp.files_changed,
+            )
+        else:
+            query = VALIDATION_AGENT_USER_PROMPT.format(
+                task_description=inp.task.description,
+                repo_path=inp.repo_path,
+                base_commit=inp.base_commit,
+                head_commit=inp.head_commit,
+                files_changed=inp.files_changed,
+            )
 
-        self.update_tools(
+        await self.bind_tools(
+            ctx,
             partial_params={
                 "repo_path": inp.repo_path,
                 "base_reference": inp.base_commit,
@@ -87,7 +102,7 @@ class ValidationAgent(FunctionCallingAgent):
                 "commit_hash": inp.head_commit,
                 "commit_reference": inp.head_commit,
                 "include_line_numbers": True,
-            }
+            },
         )
         return UserInputEvent(input=query)
 
@@ -99,13 +114,17 @@ class ValidationAgent(FunctionCallingAgent):
         task_id = input_event.task.task_id if input_event else "unknown"
 
         findings, no_issue = self._parse_response(ev.output or "", ev.sources)
+        if input_event and input_event.grouped_tasks:
+            results = _attribute_findings(input_event.grouped_tasks, findings, ev.sources)
+            return ValidationAgentComplete(validation_result=results[0], validation_results=results)
+
         result = ValidationResult(
             task_id=task_id,
             findings=findings,
             no_issue=no_issue,
             sources=ev.sources,
         )
-        return ValidationAgentComplete(validation_result=result)
+        return ValidationAgentComplete(validation_result=result, validation_results=[result])
 
     def _parse_response(self, content: str, sources: list) -> tuple[list[ValidationFinding], bool]:
         """Parse agent response into ValidationFinding list. Gracefully handles malformed/truncated JSON."""
@@ -125,9 +144,37 @@ class ValidationAgent(FunctionCallingAgent):
                         problem_summary=str(item.get("problem_summary", "")),
                         severity=str(item.get("severity", "medium")),
                         category=str(item.get("category", "general")),
+                        task_id=str(item.get("task_id", "")),
                         sources=sources,
                     )
                 )
 
         no_issue = parsed.no_issue if hasattr(parsed, "no_issue") else len(findings) == 0
         return findings, no_issue
+
+
+def _attribute_findings(
+    tasks: list[ValidationTask], findings: list[ValidationFinding], sources: list
+) -> list[ValidationResult]:
+    """Split the findings of a grouped agent into one ValidationResult per task.
+
+    Findings with a missing or unknown task_id go to the first task whose planned files include the
+    finding file, or to the first task of the group.
+    """
+    findings_by_task: dict[str, list[ValidationFinding]] = {task.task_id: [] for task in tasks}
+    for finding in findings:
+        task_id = finding.task_id
+        if task_id not in findings_by_task:
+            task_id = next((t.task_id for t in tasks if finding.file_path in t.file_paths), tasks[0].task_id)
+            finding = finding.model_copy(update={"task_id": task_id})
+        findings_by_task[task_id].append(finding)
+
+    return [
+        ValidationResult(
+            task_id=task.task_id,
+            findings=findings_by_task[task.task_id],
+            no_issue=not findings_by_task[task.task_id],
+            sources=sources,
+        )
+        for task in tasks
+    ]
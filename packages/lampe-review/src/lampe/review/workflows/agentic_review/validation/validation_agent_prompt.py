@@ -78,6 +78,26 @@ Head commit: {head_commit}
 Use get_diff_for_files to fetch diffs when you need to see changes. Execute the validation task. Output JSON only.
 """
 
+VALIDATION_AGENT_GROUPED_USER_PROMPT = """
+# Validation Tasks
+You are executing several validation tasks that target the same files. Read each shared diff or file once and
+reuse it across tasks. Execute every task below.
+
+{tasks_list}
+
+# Context
+Repository: {repo_path}
+Base commit: {base_commit}
+Head commit: {head_commit}
+
+# Files Changed
+{files_changed}
+
+Use get_diff_for_files to fetch diffs when you need to see changes. Output a single JSON object with the findings
+of all tasks. Every finding MUST include a "task_id" field with the id of the task it answers (e.g. "{example_task_id}").
+Output JSON only.
+"""
+
 SKILL_CONTENT_SECTION = """
 
 # Domain Guidelines (from project skill)
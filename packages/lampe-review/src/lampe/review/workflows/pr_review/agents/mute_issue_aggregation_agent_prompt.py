@@ -63,6 +63,7 @@ Each agent reviewed one specific file's diff to find bugs.
 {files_changed}
 
 {tools_used}**Issues to Review (with IDs for muting):**
+Exact and near-duplicate issues on nearby lines were already merged: only one issue per group is listed.
 {issues_with_ids}
 
 **Instructions:**
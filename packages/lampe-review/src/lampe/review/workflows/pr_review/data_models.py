@@ -1,10 +1,10 @@
-from enum import Enum
 from typing import Any, Optional
 
 from pydantic import BaseModel, Field, field_serializer
 
 from lampe.core.data_models import PullRequest, Repository
 from lampe.core.workflows.function_calling_agent import ToolSource
+from lampe.review.workflows.pr_review.review_depth import ReviewDepth
 
 ISSUE_BLOCK_TEMPLATE = """### Issue `{issue_id}`
 - **Agent:** {agent}
@@ -23,14 +23,6 @@ class LightweightToolSource(BaseModel):
     tool_kwargs: dict[str, Any] = Field(..., description="Arguments passed to the tool")
 
 
-class ReviewDepth(str, Enum):
-    """Review depth levels for PR reviews."""
-
-    BASIC = "basic"
-    STANDARD = "standard"
-    COMPREHENSIVE = "comprehensive"
-
-
 class ReviewComment(BaseModel):
     """Structured comment with metadata."""
 
@@ -0,0 +1,267 @@
+"""Incremental re-review: persist reviewed heads and carry findings forward across pushes."""
+
+import json
+import logging
+import re
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
+
+from git import GitCommandError, Repo
+from pydantic import BaseModel, Field
+
+from lampe.core.data_models import PullRequest, Repository
+from lampe.core.loggingconfig import LAMPE_LOGGER_NAME
+from lampe.core.tools.repository.management import LocalCommitsAvailability
+from lampe.review.workflows.pr_review.data_models import AgentReviewOutput, FileReview
+
+logger = logging.getLogger(name=LAMPE_LOGGER_NAME)
+
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class ReviewState(BaseModel):
+    """Last reviewed head of a pull request and the findings reported up to that head."""
+
+    repository: str = Field(..., description="Repository key (full name, or local path for local runs)")
+    pr_number: int = Field(..., description="Pull request number")
+    head_commit_hash: str = Field(..., description="Last reviewed head commit")
+    reviews: list[AgentReviewOutput] = Field(default_factory=list, description="Findings valid at that head")
+
+
+class ReviewStateStore:
+    """SQLite store of review states, keyed by repository and PR number.
+
+    Attributes
+    ----------
+    path
+        Path to the SQLite database file, created on first use
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS review_state ("
+                "repository TEXT NOT NULL, "
+                "pr_number INTEGER NOT NULL, "
+                "head_commit_hash TEXT NOT NULL, "
+                "reviews_json TEXT NOT NULL, "
+                "updated_at TEXT NOT NULL, "
+                "PRIMARY KEY (repository, pr_number))"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection, used with ``closing`` and as a transaction: committed and closed after each call."""
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, repository: str, pr_number: int) -> ReviewState | None:
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT head_commit_hash, reviews_json FROM review_state WHERE repository = ? AND pr_number = ?",
+                (repository, pr_number),
+            ).fetchone()
+        if row is None:
+            return None
+        head_commit_hash, reviews_json = row
+        return ReviewState(
+            repository=repository,
+            pr_number=pr_number,
+            head_commit_hash=head_commit_hash,
+            reviews=json.loads(reviews_json),
+        )
+
+    def save(self, state: ReviewState) -> None:
+        # Tool outputs are only needed while aggregating, do not persist them
+        reviews_json = json.dumps([review.model_dump(mode="json", exclude={"sources"}) for review in state.reviews])
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO review_state (repository, pr_number, head_commit_hash, reviews_json, updated_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (repository, pr_number) DO UPDATE SET "
+                "head_commit_hash = excluded.head_commit_hash, "
+                "reviews_json = excluded.reviews_json, "
+                "updated_at = excluded.updated_at",
+                (
+                    state.repository,
+                    state.pr_number,
+                    state.head_commit_hash,
+                    reviews_json,
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+
+
+def review_state_key(repository: Repository) -> str:
+    """Key of a repository in the review state store."""
+    return repository.full_name or str(Path(repository.local_path).resolve())
+
+
+class FileLineMap(BaseModel):
+    """Maps line numbers of a file at the old head to the new head."""
+
+    new_path: str | None = Field(..., description="Path at the new head, None if the file was deleted")
+    # (old_start, old_count, new_start, new_count) of each hunk, from a zero context diff
+    hunks: list[tuple[int, int, int, int]] = Field(default_factory=list)
+
+    def map_line(self, line: int) -> int | None:
+        """Return the line number at the new head, or None if the line was changed or removed."""
+        if self.new_path is None:
+            return None
+        shift = 0
+        for old_start, old_count, new_start, new_count in self.hunks:
+            if old_count == 0:
+                # Pure insertion after old_start
+                if line > old_start:
+                    shift += new_count
+                continue
+            if old_start <= line < old_start + old_count:
+                return None
+            if line >= old_start + old_count:
+                shift += new_count - old_count
+        return line + shift
+
+
+def changed_line_maps(old_head: str, new_head: str, repo_path: str) -> dict[str, FileLineMap]:
+    """Compute line maps of the files changed between two heads (renames are followed).
+
+    Parameters
+    ----------
+    old_head
+        Previously reviewed head commit
+    new_head
+        New head commit
+    repo_path
+        Path to the git repository
+
+    Returns
+    -------
+    :
+        Line map per path at the old head. Files absent from the mapping are unchanged.
+    """
+    repo = Repo(path=repo_path)
+    diff = repo.git.diff(old_head, new_head, "-U0", "-M", "--no-color", "--no-ext-diff")
+
+    maps: dict[str, FileLineMap] = {}
+    current: FileLineMap | None = None
+    for line in diff.splitlines():
+        if line.startswith("diff --git "):
+            a_path, _, b_path = line[len("diff --git a/") :].partition(" b/")
+            current = FileLineMap(new_path=b_path)
+            maps[a_path] = current
+        elif current is None:
+            continue
+        elif line.startswith("deleted file mode"):
+            current.new_path = None
+        elif line.startswith("rename to "):
+            current.new_path = line[len("rename to ") :]
+        elif match := _HUNK_HEADER.match(line):
+            old_start, old_count, new_start, new_count = match.groups()
+            current.hunks.append(
+                (
+                    int(old_start),
+                    int(old_count) if old_count is not None else 1,
+                    int(new_start),
+                    int(new_count) if new_count is not None else 1,
+                )
+            )
+    return maps
+
+
+def carry_forward_findings(
+    reviews: list[AgentReviewOutput], line_maps: dict[str, FileLineMap]
+) -> list[AgentReviewOutput]:
+    """Keep prior findings whose lines are unchanged since the old head, with updated line numbers.
+
+    Findings on changed or removed lines are dropped: the delta review re-examines those lines.
+    """
+    carried: list[AgentReviewOutput] = []
+    for agent_review in reviews:
+        file_reviews: list[FileReview] = []
+        for file_review in agent_review.reviews:
+            line_map = line_maps.get(file_review.file_path)
+            if line_map is None:
+                file_reviews.append(file_review)
+                continue
+            if line_map.new_path is None:
+                continue
+
+            structured_comments = []
+            for comment in file_review.structured_comments:
+                new_line = line_map.map_line(comment.line_number)
+                if new_line is not None:
+                    structured_comments.append(comment.model_copy(update={"line_number": new_line}))
+            line_comments: dict[str, str] = {}
+            muted_line_numbers: set[str] = set()
+            muted_line_reasons: dict[str, str] = {}
+            for line, text in file_review.line_comments.items():
+                new_line = line_map.map_line(int(line)) if line.isdigit() else None
+                if new_line is None:
+                    continue
+                line_comments[str(new_line)] = text
+                if line in file_review.muted_line_numbers:
+                    muted_line_numbers.add(str(new_line))
+                if line in file_review.muted_line_reasons:
+                    muted_line_reasons[str(new_line)] = file_review.muted_line_reasons[line]
+            if structured_comments or line_comments:
+                file_reviews.append(
+                    file_review.model_copy(
+                        update={
+                            "file_path": line_map.new_path,
+                            "structured_comments": structured_comments,
+                            "line_comments": line_comments,
+                            "muted_line_numbers": muted_line_numbers,
+                            "muted_line_reasons": muted_line_reasons,
+                        }
+                    )
+                )
+        if file_reviews:
+            carried.append(agent_review.model_copy(update={"reviews": file_reviews, "sources": []}))
+    return carried
+
+
+def prepare_incremental_review(
+    state: ReviewState | None, repository: Repository, pull_request: PullRequest
+) -> tuple[PullRequest, list[AgentReviewOutput]] | None:
+    """Decide whether a PR can be reviewed incrementally from its last reviewed head.
+
+    Parameters
+    ----------
+    state
+        Stored review state of the PR, if any
+    repository
+        Reviewed repository
+    pull_request
+        Pull request at its new head
+
+    Returns
+    -------
+    :
+        None when a full review is needed (no state, or the old head is not an ancestor of the new head,
+        e.g. after a force push). Otherwise the pull request restricted to the ``old_head..new_head`` delta
+        and the prior findings carried forward to the new head.
+    """
+    if state is None:
+        return None
+    old_head, new_head = state.head_commit_hash, pull_request.head_commit_hash
+    delta_pull_request = pull_request.model_copy(update={"base_commit_hash": old_head})
+    if old_head == new_head:
+        return delta_pull_request, state.reviews
+
+    repo_path = repository.local_path
+    try:
+        with LocalCommitsAvailability(repo_path, [old_head, new_head]):
+            Repo(path=repo_path).git.merge_base("--is-ancestor", old_head, new_head)
+            line_maps = changed_line_maps(old_head, new_head, repo_path)
+    except GitCommandError as e:
+        logger.info(f"Last reviewed head {old_head} is not an ancestor of {new_head} ({e}), running a full review")
+        return None
+
+    carried = carry_forward_findings(state.reviews, line_maps)
+    logger.info(
+        f"Incremental review of {old_head[:12]}..{new_head[:12]}: {len(line_maps)} files changed, "
+        f"{sum(len(r.reviews) for r in carried)} prior file reviews carried forward"
+    )
+    return delta_pull_request, carried
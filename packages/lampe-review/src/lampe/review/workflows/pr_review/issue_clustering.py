@@ -0,0 +1,174 @@
+"""Deterministic near-duplicate clustering of review issues before LLM aggregation.
+
+Parallel agents often report the same finding several times. Issues on the same file within a small line
+window whose comments are near-identical (MinHash estimate of the Jaccard similarity of word shingles)
+are clustered locally. Only one representative per cluster is sent to the aggregation LLM, the other
+members are muted as duplicates without spending tokens.
+"""
+
+import hashlib
+import os
+import random
+import re
+from functools import lru_cache
+
+from pydantic import BaseModel, Field
+
+from lampe.review.workflows.pr_review.data_models import IssueWithId
+
+# NOTE: Two issues of the same file can only be duplicates when their lines are at most this far apart
+DUPLICATE_LINE_WINDOW = int(os.getenv("LAMPE_DUPLICATE_LINE_WINDOW", 3))
+# NOTE: Minimum estimated Jaccard similarity of two comments to consider them duplicates, by default 0.6
+DUPLICATE_SIMILARITY_THRESHOLD = float(os.getenv("LAMPE_DUPLICATE_SIMILARITY_THRESHOLD", 0.6))
+SHINGLE_SIZE = 3
+MINHASH_NUM_PERM = 64
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WORD = re.compile(r"[a-z0-9_]+")
+_NUMBER = re.compile(r"\d+")
+_SEVERITY_RANK = {"critical": 4, "high": 3, "medium": 2, "low": 1}
+
+
+@lru_cache(maxsize=8)
+def _permutations(num_perm: int) -> tuple[tuple[int, int], ...]:
+    # Fixed seed: signatures (and therefore clusters) must not change across runs
+    rng = random.Random(num_perm)
+    return tuple((rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1)) for _ in range(num_perm))
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set[str]:
+    """Word shingles of a comment, after lowercasing and dropping punctuation.
+
+    Comments shorter than ``size`` words yield a single shingle with all their words.
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)}
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash_signature(tokens: set[str], num_perm: int = MINHASH_NUM_PERM) -> tuple[int, ...]:
+    """MinHash signature of a set of shingles.
+
+    Parameters
+    ----------
+    tokens
+        Shingles of a comment
+    num_perm
+        Number of hash permutations, by default MINHASH_NUM_PERM
+
+    Returns
+    -------
+    :
+        Minimum permuted hash for each permutation. The fraction of equal positions between two signatures
+        estimates the Jaccard similarity of the shingle sets.
+    """
+    hashes = [int.from_bytes(hashlib.blake2b(t.encode(), digest_size=4).digest(), "little") for t in tokens]
+    if not hashes:
+        return (_MAX_HASH,) * num_perm
+    return tuple(min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes) for a, b in _permutations(num_perm))
+
+
+def estimated_similarity(left: tuple[int, ...], right: tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    return sum(a == b for a, b in zip(left, right)) / len(left)
+
+
+class IssueCluster(BaseModel):
+    """Near-duplicate issues, represented by a single issue."""
+
+    representative: IssueWithId = Field(..., description="Issue sent to the aggregation LLM")
+    duplicates: list[IssueWithId] = Field(default_factory=list, description="Issues muted as duplicates")
+
+
+def _line(issue: IssueWithId) -> int | None:
+    # Ranges such as "10-12" are located at their first line, file-level findings have no line
+    match = _NUMBER.search(str(issue.line))
+    return int(match.group()) if match else None
+
+
+def _representative_key(issue: IssueWithId, order: int) -> tuple[int, int, int]:
+    # Most severe first, then most detailed, then first reported
+    return (-_SEVERITY_RANK.get(issue.severity.lower(), 0), -len(issue.comment), order)
+
+
+def cluster_issues(
+    issues: list[IssueWithId],
+    line_window: int = DUPLICATE_LINE_WINDOW,
+    similarity_threshold: float = DUPLICATE_SIMILARITY_THRESHOLD,
+) -> list[IssueCluster]:
+    """Cluster exact and near-duplicate issues.
+
+    Two issues are linked when they are on the same file, at most ``line_window`` lines apart, and their
+    comments have an estimated similarity of at least ``similarity_threshold``. Line ranges are located at
+    their first line. Issues without any line number are compared by comment similarity alone with every
+    issue of their file. Clusters are the connected components of that relation. The result only depends on
+    the issues, not on hashing randomization.
+
+    Parameters
+    ----------
+    issues
+        Issues of all agents, as built by ``IssueWithId.build_from_agent_reviews``
+    line_window
+        Maximum line distance between duplicates, by default DUPLICATE_LINE_WINDOW
+    similarity_threshold
+        Minimum estimated comment similarity, by default DUPLICATE_SIMILARITY_THRESHOLD
+
+    Returns
+    -------
+    :
+        Clusters ordered by their first reported issue. Singletons are clusters without duplicates.
+    """
+    parent = list(range(len(issues)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    signatures = [minhash_signature(shingles(issue.comment)) for issue in issues]
+    by_file: dict[str, list[int]] = {}
+    for i, issue in enumerate(issues):
+        by_file.setdefault(issue.file, []).append(i)
+
+    for indices in by_file.values():
+        # Sorting by line bounds the comparisons to the line window
+        located = sorted((line, i) for i in indices if (line := _line(issues[i])) is not None)
+        for pos, (line, i) in enumerate(located):
+            for other_line, j in located[pos + 1 :]:
+                if other_line - line > line_window:
+                    break
+                if estimated_similarity(signatures[i], signatures[j]) >= similarity_threshold:
+                    parent[find(j)] = find(i)
+        for i in indices:
+            if _line(issues[i]) is not None:
+                continue
+            for j in indices:
+                if j != i and estimated_similarity(signatures[i], signatures[j]) >= similarity_threshold:
+                    parent[find(j)] = find(i)
+
+    members: dict[int, list[int]] = {}
+    for i in range(len(issues)):
+        members.setdefault(find(i), []).append(i)
+
+    clusters = []
+    for component in sorted(members.values(), key=min):
+        ranked = sorted(component, key=lambda i: _representative_key(issues[i], i))
+        clusters.append(
+            IssueCluster(
+                representative=issues[ranked[0]],
+                duplicates=[issues[i] for i in sorted(ranked[1:])],
+            )
+        )
+    return clusters
+
+
+def duplicate_mute_reasons(clusters: list[IssueCluster]) -> dict[str, str]:
+    """Mute reasons of the non-representative issues of each cluster, keyed by issue ID."""
+    return {
+        duplicate.issue_id: f"duplicate of {cluster.representative.issue_id}"
+        for cluster in clusters
+        for duplicate in cluster.duplicates
+    }
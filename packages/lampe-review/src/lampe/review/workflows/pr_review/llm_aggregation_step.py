@@ -1,10 +1,15 @@
 """LLM-based aggregation workflow for cleaning and deduplicating review comments.
 
 Uses a tool-based approach: the LLM calls mute_issue(issue_id) for each issue
-to mute. Original reviews are kept with muted flags applied.
+to mute. Original reviews are kept with muted flags applied. Exact and near-duplicate
+issues are clustered locally first and only cluster representatives reach the LLM.
+Large issue sets are sharded by file into parallel aggregation agents. Shards the review budget cannot
+afford keep their issues unmuted.
 """
 
+import asyncio
 import logging
+import os
 from typing import Any
 
 from llama_index.llms.litellm import LiteLLM
@@ -12,6 +17,7 @@ from workflows import Context as WorkflowContext
 from workflows import Workflow, step
 from workflows.events import StartEvent, StopEvent
 
+from lampe.core.llmbudget import LLMBudget
 from lampe.core.llmconfig import MODELS, get_model
 from lampe.core.loggingconfig import LAMPE_LOGGER_NAME
 from lampe.review.workflows.pr_review.agents.mute_issue_aggregation_agent import (
@@ -27,6 +33,19 @@ from lampe.review.workflows.pr_review.data_models import (
     IssueWithId,
     ReviewComment,
 )
+from lampe.review.workflows.pr_review.issue_clustering import (
+    DUPLICATE_LINE_WINDOW,
+    DUPLICATE_SIMILARITY_THRESHOLD,
+    cluster_issues,
+    duplicate_mute_reasons,
+)
+
+# NOTE: Maximum number of issues listed in a single aggregation prompt, by default 40
+MAX_ISSUES_PER_AGGREGATION_SHARD = int(os.getenv("LAMPE_MAX_ISSUES_PER_AGGREGATION_SHARD", 40))
+# NOTE: Maximum number of aggregation shards sent to the LLM concurrently, by default 8
+MAX_CONCURRENT_AGGREGATION_SHARDS = int(os.getenv("LAMPE_MAX_CONCURRENT_AGGREGATION_SHARDS", 8))
+# NOTE: LLM calls reserved per aggregation shard when checking the review budget, by default 2
+CALLS_PER_AGGREGATION_SHARD = int(os.getenv("LAMPE_CALLS_PER_AGGREGATION_SHARD", 2))
 
 
 class LLMAggregationStartEvent(StartEvent):
@@ -65,6 +84,40 @@ def _build_issues_with_ids(reviews: list[AgentReviewOutput]) -> str:
     return IssueWithId.format_list_for_prompt(issues)
 
 
+def _shard_issues(issues: list[IssueWithId], max_issues_per_shard: int) -> list[list[IssueWithId]]:
+    """Split issues into shards of at most ``max_issues_per_shard`` issues.
+
+    All the issues of a file stay in the same shard, since the LLM finds duplicates within a file: a file
+    with more issues than the bound gets a shard of its own, larger than the bound. Files are packed in path
+    order so that files of a directory share a shard.
+    """
+    by_file: dict[str, list[IssueWithId]] = {}
+    for issue in issues:
+        by_file.setdefault(issue.file, []).append(issue)
+
+    max_issues_per_shard = max(max_issues_per_shard, 1)
+    shards: list[list[IssueWithId]] = []
+    current: list[IssueWithId] = []
+    for file_path in sorted(by_file):
+        file_issues = by_file[file_path]
+        if current and len(current) + len(file_issues) > max_issues_per_shard:
+            shards.append(current)
+            current = []
+        current.extend(file_issues)
+    if current:
+        shards.append(current)
+    return shards
+
+
+def _merge_shard_mutes(shards: list[list[IssueWithId]], shard_mutes: list[dict[str, str]]) -> dict[str, str]:
+    """Merge mute reasons of all shards, ignoring IDs a shard muted without having been given them."""
+    merged: dict[str, str] = {}
+    for shard, muted_reasons in zip(shards, shard_mutes):
+        shard_ids = {issue.issue_id for issue in shard}
+        merged.update({issue_id: reason for issue_id, reason in muted_reasons.items() if issue_id in shard_ids})
+    return merged
+
+
 def _apply_muted_flags(reviews: list[AgentReviewOutput], muted_reasons: dict[str, str]) -> list[AgentReviewOutput]:
     """Apply muted flags and reasons to reviews based on muted issue IDs. Returns deep copies."""
     result: list[AgentReviewOutput] = []
@@ -140,6 +193,11 @@ class LLMAggregationWorkflow(Workflow):
         verbose: bool = False,
         max_tool_iterations: int = 5,
         llm: Any | None = None,
+        duplicate_line_window: int = DUPLICATE_LINE_WINDOW,
+        duplicate_similarity_threshold: float = DUPLICATE_SIMILARITY_THRESHOLD,
+        max_issues_per_shard: int = MAX_ISSUES_PER_AGGREGATION_SHARD,
+        max_concurrent_shards: int = MAX_CONCURRENT_AGGREGATION_SHARDS,
+        budget: LLMBudget | None = None,
         *args: Any,
         **kwargs: Any,
     ):
@@ -152,10 +210,16 @@ class LLMAggregationWorkflow(Workflow):
             reasoning_effort="low",
         )
         self.max_tool_iterations = max_tool_iterations
+        self.duplicate_line_window = duplicate_line_window
+        self.duplicate_similarity_threshold = duplicate_similarity_threshold
+        self.max_issues_per_shard = max_issues_per_shard
+        self.max_concurrent_shards = max_concurrent_shards
+        self.budget = budget or LLMBudget()
         self._agent = MuteIssueAggregationAgent(
             llm=self.llm,
             max_iterations=self.max_tool_iterations,
             timeout=timeout,
+            budget=self.budget,
         )
 
     @step
@@ -171,14 +235,58 @@ class LLMAggregationWorkflow(Workflow):
         if self.verbose:
             self.logger.debug(f"Aggregating {len(ev.agent_reviews)} agent reviews via mute_issue tool...")
 
-        issues_with_ids = _build_issues_with_ids(ev.agent_reviews)
-        tools_used = _format_sources_for_display(ev.agent_reviews)
-        user_prompt = MUTE_ISSUE_AGGREGATION_USER_PROMPT.format(
-            files_changed=ev.files_changed,
-            issues_with_ids=issues_with_ids,
-            tools_used=tools_used,
+        clusters = cluster_issues(
+            IssueWithId.build_from_agent_reviews(ev.agent_reviews),
+            line_window=self.duplicate_line_window,
+            similarity_threshold=self.duplicate_similarity_threshold,
         )
+        duplicate_reasons = duplicate_mute_reasons(clusters)
+        self.logger.info(
+            f"Aggregation pre-pass: {len(clusters) + len(duplicate_reasons)} issues, "
+            f"{len(duplicate_reasons)} muted as duplicates, {len(clusters)} sent to the LLM"
+        )
+
+        if not clusters:
+            return LLMAggregationCompleteEvent(aggregated_reviews=_apply_muted_flags(ev.agent_reviews, {}))
+
+        shards = _shard_issues([cluster.representative for cluster in clusters], self.max_issues_per_shard)
+        # The LLM pass is optional: no shard runs once the budget is tight
+        affordable = self.budget.affordable_agents(len(shards), CALLS_PER_AGGREGATION_SHARD)
+        affordable = 0 if self.budget.is_tight() else affordable
+        for index, shard in enumerate(shards[affordable:], start=affordable + 1):
+            self.budget.skip("aggregation", f"shard {index}", f"{len(shard)} issues left to stay within the budget")
+        shards = shards[:affordable]
+        semaphore = asyncio.Semaphore(max(self.max_concurrent_shards, 1))
+
+        async def run_shard(shard: list[IssueWithId]) -> dict[str, str]:
+            async with semaphore:
+                return await self._aggregate_shard(shard, ev.agent_reviews, ev.files_changed)
 
+        shard_mutes = await asyncio.gather(*(run_shard(shard) for shard in shards))
+        muted_reasons = {**duplicate_reasons, **_merge_shard_mutes(shards, shard_mutes)}
+        aggregated_reviews = _apply_muted_flags(ev.agent_reviews, muted_reasons)
+
+        if self.verbose:
+            self.logger.debug(
+                f"Aggregation complete: muted {len(muted_reasons)} issues over {len(shards)} shards, "
+                f"{len(aggregated_reviews)} reviews with muted flags"
+            )
+
+        return LLMAggregationCompleteEvent(aggregated_reviews=aggregated_reviews)
+
+    async def _aggregate_shard(
+        self, issues: list[IssueWithId], agent_reviews: list[AgentReviewOutput], files_changed: str
+    ) -> dict[str, str]:
+        """Run the mute-issue agent on a shard of issues and return its mute reasons by issue ID.
+
+        On failure the shard falls back to muting nothing, the other shards are unaffected.
+        """
+        agent_indices = sorted({int(issue.issue_id.split("|", 1)[0]) for issue in issues})
+        user_prompt = MUTE_ISSUE_AGGREGATION_USER_PROMPT.format(
+            files_changed=files_changed,
+            issues_with_ids=IssueWithId.format_list_for_prompt(issues),
+            tools_used=_format_sources_for_display([agent_reviews[i] for i in agent_indices]),
+        )
         try:
             agent_ctx = WorkflowContext(self._agent)
             await agent_ctx.store.set("muted_reasons", {})
@@ -187,19 +295,9 @@ class LLMAggregationWorkflow(Workflow):
                 ctx=agent_ctx,
             )
             muted_reasons = await agent_ctx.store.get("muted_reasons", default={})
-            muted_reasons = dict(muted_reasons) if muted_reasons else {}
-            aggregated_reviews = _apply_muted_flags(ev.agent_reviews, muted_reasons)
-
-            if self.verbose:
-                self.logger.debug(f"Aggregation complete: muted {len(muted_reasons)} issues")
-
+            return dict(muted_reasons) if muted_reasons else {}
         except Exception as e:
             self.logger.exception(f"Failed to aggregate reviews: {e}")
             if self.verbose:
-                self.logger.debug("Falling back to original reviews")
-            aggregated_reviews = ev.agent_reviews
-
-        if self.verbose:
-            self.logger.debug(f"Aggregation complete: {len(aggregated_reviews)} reviews with muted flags")
-
-        return LLMAggregationCompleteEvent(aggregated_reviews=aggregated_reviews)
+                self.logger.debug(f"Falling back to original reviews for {len(issues)} issues")
+            return {}
@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+# NOTE: Kept apart from the data models so the CLI can build its options without importing the workflows
+class ReviewDepth(str, Enum):
+    """Review depth levels for PR reviews."""
+
+    BASIC = "basic"
+    STANDARD = "standard"
+    COMPREHENSIVE = "comprehensive"
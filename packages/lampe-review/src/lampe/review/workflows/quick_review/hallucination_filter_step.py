@@ -1,4 +1,8 @@
-"""Hallucination filter step — uses cheap LLM with mute_issue tool to remove investigation-request comments."""
+"""Hallucination filter step — mutes investigation-request comments.
+
+Obvious cases are handled by local rules, only ambiguous comments go to a cheap LLM with the mute_issue tool.
+The LLM pass is optional: it is skipped once the review budget is tight.
+"""
 
 import logging
 from typing import Any
@@ -8,21 +12,20 @@ from workflows import Context as WorkflowContext
 from workflows import Workflow, step
 from workflows.events import StartEvent, StopEvent
 
+from lampe.core.llmbudget import LLMBudget
 from lampe.core.llmconfig import MODELS, get_model
 from lampe.core.loggingconfig import LAMPE_LOGGER_NAME
 from lampe.review.workflows.pr_review.agents.mute_issue_aggregation_agent import (
     MuteIssueAggregationAgent,
     MuteIssueStart,
 )
-from lampe.review.workflows.pr_review.data_models import AgentReviewOutput
-from lampe.review.workflows.pr_review.llm_aggregation_step import (
-    _apply_muted_flags,
-    _build_issues_with_ids,
-)
+from lampe.review.workflows.pr_review.data_models import AgentReviewOutput, IssueWithId
+from lampe.review.workflows.pr_review.llm_aggregation_step import _apply_muted_flags
 from lampe.review.workflows.quick_review.hallucination_filter_prompt import (
     HALLUCINATION_FILTER_SYSTEM_PROMPT,
     HALLUCINATION_FILTER_USER_PROMPT,
 )
+from lampe.review.workflows.quick_review.hallucination_rules import prefilter_issues
 
 
 class HallucinationFilterStartEvent(StartEvent):
@@ -36,10 +39,14 @@ class HallucinationFilterCompleteEvent(StopEvent):
     """Complete event for hallucination filter."""
 
     filtered_reviews: list[AgentReviewOutput]
+    rule_hits: dict[str, int] = {}
 
 
 class HallucinationFilterWorkflow(Workflow):
-    """Workflow to mute investigation-request comments using a cheap LLM and mute_issue tool."""
+    """Workflow to mute investigation-request comments using local rules, then a cheap LLM and mute_issue tool.
+
+    With ``rule_prefilter`` disabled, every issue is sent to the LLM.
+    """
 
     def __init__(
         self,
@@ -47,6 +54,8 @@ class HallucinationFilterWorkflow(Workflow):
         verbose: bool = False,
         max_tool_iterations: int = 5,
         llm: Any | None = None,
+        rule_prefilter: bool = True,
+        budget: LLMBudget | None = None,
         *args: Any,
         **kwargs: Any,
     ):
@@ -58,11 +67,14 @@ class HallucinationFilterWorkflow(Workflow):
             temperature=1,
         )
         self.max_tool_iterations = max_tool_iterations
+        self.rule_prefilter = rule_prefilter
+        self.budget = budget or LLMBudget()
         self._agent = MuteIssueAggregationAgent(
             llm=self.llm,
             max_iterations=self.max_tool_iterations,
             timeout=timeout,
             system_prompt=HALLUCINATION_FILTER_SYSTEM_PROMPT,
+            budget=self.budget,
         )
 
     @step
@@ -74,16 +86,34 @@ class HallucinationFilterWorkflow(Workflow):
             return HallucinationFilterCompleteEvent(filtered_reviews=[])
 
         # Skip if no findings to filter
-        issues_with_ids = _build_issues_with_ids(ev.agent_reviews)
-        if "_No issues to review._" in issues_with_ids:
+        issues = IssueWithId.build_from_agent_reviews(ev.agent_reviews)
+        if not issues:
             return HallucinationFilterCompleteEvent(filtered_reviews=ev.agent_reviews)
 
+        if self.rule_prefilter:
+            prefilter = prefilter_issues(issues)
+            rule_muted, ambiguous, rule_hits = prefilter.muted_reasons, prefilter.ambiguous, prefilter.rule_hits
+            self.logger.info(f"Hallucination filter rules: {prefilter.format_hit_rates()}")
+        else:
+            rule_muted, ambiguous, rule_hits = {}, issues, {}
+
+        if not ambiguous:
+            return HallucinationFilterCompleteEvent(
+                filtered_reviews=_apply_muted_flags(ev.agent_reviews, rule_muted), rule_hits=rule_hits
+            )
+
+        if self.budget.is_tight() or self.budget.affordable_agents(1, 2) == 0:
+            self.budget.skip("filter", "hallucination_filter", f"{len(ambiguous)} issues left unfiltered")
+            return HallucinationFilterCompleteEvent(
+                filtered_reviews=_apply_muted_flags(ev.agent_reviews, rule_muted), rule_hits=rule_hits
+            )
+
         if self.verbose:
-            self.logger.debug("Running hallucination filter via mute_issue tool...")
+            self.logger.debug(f"Running hallucination filter via mute_issue tool on {len(ambiguous)} issues...")
 
         user_prompt = HALLUCINATION_FILTER_USER_PROMPT.format(
             files_changed=ev.files_changed,
-            issues_with_ids=issues_with_ids,
+            issues_with_ids=IssueWithId.format_list_for_prompt(ambiguous),
         )
 
         try:
@@ -93,8 +123,11 @@ class HallucinationFilterWorkflow(Workflow):
                 start_event=MuteIssueStart(user_prompt=user_prompt),
                 ctx=agent_ctx,
             )
-            muted_reasons = await agent_ctx.store.get("muted_reasons", default={})
-            muted_reasons = dict(muted_reasons) if muted_reasons else {}
+            llm_muted = await agent_ctx.store.get("muted_reasons", default={}) or {}
+            # Only the ambiguous issues were sent: an ID outside of them cannot mute an issue the rules kept
+            ambiguous_ids = {issue.issue_id for issue in ambiguous}
+            llm_muted = {issue_id: reason for issue_id, reason in llm_muted.items() if issue_id in ambiguous_ids}
+            muted_reasons = {**rule_muted, **llm_muted}
             filtered_reviews = _apply_muted_flags(ev.agent_reviews, muted_reasons)
 
             if self.verbose and muted_reasons:
@@ -102,6 +135,6 @@ class HallucinationFilterWorkflow(Workflow):
 
         except Exception as e:
             self.logger.exception(f"Hallucination filter failed: {e}")
-            filtered_reviews = ev.agent_reviews
+            filtered_reviews = _apply_muted_flags(ev.agent_reviews, rule_muted)
 
-        return HallucinationFilterCompleteEvent(filtered_reviews=filtered_reviews)
+        return HallucinationFilterCompleteEvent(filtered_reviews=filtered_reviews, rule_hits=rule_hits)
@@ -0,0 +1,144 @@
+"""Rule-based pre-filter for the hallucination filter.
+
+Most investigation requests ("ensure that...", "consider checking...") are recognizable from their
+phrasing alone. Lexicon rules score each comment: investigation cues raise the score, evidence of a
+verified defect lowers it. Confident verdicts are applied locally, only ambiguous comments are sent to
+the LLM.
+"""
+
+import re
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+from lampe.review.workflows.pr_review.data_models import IssueWithId
+
+INVESTIGATION_REQUEST_REASON = "investigation_request"
+
+# Phrasings delegating verification to the reader (weight 2)
+STRONG_INVESTIGATION_RULES: dict[str, re.Pattern[str]] = {
+    "ensure": re.compile(r"\b(?:ensure|make sure)\b", re.IGNORECASE),
+    "consider_checking": re.compile(
+        r"\bconsider (?:checking|verifying|validating|reviewing|investigating|confirming)\b", re.IGNORECASE
+    ),
+    "verify": re.compile(r"(?:^|[.;:!?]\s+|\bplease )(?:verify|confirm|validate)\b", re.IGNORECASE),
+    "you_may_want": re.compile(
+        r"\byou (?:might|may) want to (?:check|verify|confirm|review|investigate|double-check)\b", re.IGNORECASE
+    ),
+    "double_check": re.compile(r"\b(?:double|cross)[- ]check\b", re.IGNORECASE),
+    "worth_checking": re.compile(r"\b(?:worth|recommend(?:ed)?) (?:checking|verifying|investigating)\b", re.IGNORECASE),
+    "check_whether": re.compile(r"\b(?:check|determine|find out) (?:whether|if)\b", re.IGNORECASE),
+    "investigate": re.compile(r"\binvestigate\b", re.IGNORECASE),
+    "look_into": re.compile(r"\blook(?:ing)? into\b", re.IGNORECASE),
+}
+# Hedged wording, alone it is not enough to mute (weight 1)
+WEAK_INVESTIGATION_RULES: dict[str, re.Pattern[str]] = {
+    "hedge": re.compile(r"\b(?:potential(?:ly)?|possibl[ey]|might|could|may)\b", re.IGNORECASE),
+    "if_unintended": re.compile(r"\bif (?:this is )?(?:not )?(?:intended|intentional|expected)\b", re.IGNORECASE),
+}
+# Evidence of a verified defect (weight -1 each)
+EVIDENCE_RULES: dict[str, re.Pattern[str]] = {
+    "causal": re.compile(r"\b(?:because|since|therefore|so that|which means)\b", re.IGNORECASE),
+    "failure_mode": re.compile(
+        r"\b(?:raises?|throws?|crash(?:es)?|fails?|returns? (?:none|null|undefined)|"
+        r"dereferenc\w*|overflows?|leaks?|deadlocks?|never|always)\b",
+        re.IGNORECASE,
+    ),
+    "code_reference": re.compile(r"`[^`]+`|\b\w+\(\)|\bline \d+\b", re.IGNORECASE),
+    "tool_evidence": re.compile(r"\b(?:as shown in|search_in_files|get_file_content_at_commit|grep)\b", re.IGNORECASE),
+}
+
+
+class RuleDecision(str, Enum):
+    """Outcome of the rule pre-filter for an issue."""
+
+    MUTE = "mute"
+    KEEP = "keep"
+    AMBIGUOUS = "ambiguous"
+
+
+class RuleVerdict(BaseModel):
+    """Rule pre-filter verdict for a single issue."""
+
+    decision: RuleDecision = Field(..., description="Whether the issue is muted, kept or sent to the LLM")
+    score: int = Field(..., description="Investigation score: cue weights minus evidence count")
+    rule_hits: list[str] = Field(default_factory=list, description="Names of the rules that matched")
+
+
+class RulePrefilterResult(BaseModel):
+    """Result of the rule pre-filter over a list of issues."""
+
+    muted_reasons: dict[str, str] = Field(default_factory=dict, description="Issues muted by the rules")
+    ambiguous: list[IssueWithId] = Field(default_factory=list, description="Issues left to the LLM")
+    rule_hits: dict[str, int] = Field(default_factory=dict, description="Number of issues matched per rule")
+    decisions: dict[str, int] = Field(default_factory=dict, description="Number of issues per decision")
+
+    def format_hit_rates(self) -> str:
+        """Format rule hit rates and decision counts for logging."""
+        total = sum(self.decisions.values())
+        if not total:
+            return "no issues"
+        decisions = ", ".join(f"{name}={count}" for name, count in sorted(self.decisions.items()))
+        hits = ", ".join(
+            f"{name}={count}/{total} ({count / total:.0%})"
+            for name, count in sorted(self.rule_hits.items(), key=lambda item: (-item[1], item[0]))
+        )
+        return f"{decisions}; rule hits: {hits or 'none'}"
+
+
+def classify_comment(comment: str) -> RuleVerdict:
+    """Classify a review comment as an investigation request, a verified finding, or ambiguous.
+
+    Parameters
+    ----------
+    comment
+        Review comment text
+
+    Returns
+    -------
+    :
+        MUTE when investigation cues score at least 2 without any evidence, KEEP when evidence brings the
+        score down to 0 or below, AMBIGUOUS otherwise, including comments no rule matched
+    """
+    hits: list[str] = []
+    score = 0
+    evidence = 0
+    for weight, rules in ((2, STRONG_INVESTIGATION_RULES), (1, WEAK_INVESTIGATION_RULES), (-1, EVIDENCE_RULES)):
+        for name, pattern in rules.items():
+            if pattern.search(comment):
+                hits.append(name)
+                score += weight
+                evidence += weight < 0
+    if score >= 2 and not evidence:
+        decision = RuleDecision.MUTE
+    elif evidence and score <= 0:
+        decision = RuleDecision.KEEP
+    else:
+        decision = RuleDecision.AMBIGUOUS
+    return RuleVerdict(decision=decision, score=score, rule_hits=hits)
+
+
+def prefilter_issues(issues: list[IssueWithId]) -> RulePrefilterResult:
+    """Apply the rules to every issue.
+
+    Parameters
+    ----------
+    issues
+        Issues built by ``IssueWithId.build_from_agent_reviews``
+
+    Returns
+    -------
+    :
+        Issues muted by the rules, ambiguous issues, and hit statistics to tune the rules
+    """
+    result = RulePrefilterResult()
+    for issue in issues:
+        verdict = classify_comment(issue.comment)
+        result.decisions[verdict.decision.value] = result.decisions.get(verdict.decision.value, 0) + 1
+        for name in verdict.rule_hits:
+            result.rule_hits[name] = result.rule_hits.get(name, 0) + 1
+        if verdict.decision == RuleDecision.MUTE:
+            result.muted_reasons[issue.issue_id] = INVESTIGATION_REQUEST_REASON
+        elif verdict.decision == RuleDecision.AMBIGUOUS:
+            result.ambiguous.append(issue)
+    return result
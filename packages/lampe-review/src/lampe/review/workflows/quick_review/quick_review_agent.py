@@ -23,6 +23,7 @@ from lampe.review.workflows.agentic_review.validation.validation_agent import (
     ValidationAgentComplete,
 )
 from lampe.review.workflows.quick_review.quick_review_agent_prompt import (
+    QUICK_REVIEW_AGENT_SHARD_NOTE,
     QUICK_REVIEW_AGENT_SYSTEM_PROMPT,
     QUICK_REVIEW_AGENT_USER_PROMPT,
 )
@@ -37,11 +38,14 @@ class QuickReviewInput:
         base_commit: str,
         head_commit: str,
         files_changed: str,
+        other_files_changed: str = "",
     ) -> None:
         self.repo_path = repo_path
         self.base_commit = base_commit
         self.head_commit = head_commit
         self.files_changed = files_changed
+        # Files of the PR assigned to other agents (sharded quick review)
+        self.other_files_changed = other_files_changed
 
 
 class QuickReviewAgentStart(StartEvent):
@@ -82,8 +86,11 @@ class QuickReviewAgent(FunctionCallingAgent):
             head_commit=inp.head_commit,
             files_changed=inp.files_changed,
         )
+        if inp.other_files_changed:
+            query += QUICK_REVIEW_AGENT_SHARD_NOTE.format(other_files_changed=inp.other_files_changed)
 
-        self.update_tools(
+        await self.bind_tools(
+            ctx,
             partial_params={
                 "repo_path": inp.repo_path,
                 "base_reference": inp.base_commit,
@@ -91,7 +98,7 @@ class QuickReviewAgent(FunctionCallingAgent):
                 "commit_reference": inp.head_commit,
                 "commit_hash": inp.head_commit,
                 "include_line_numbers": True,
-            }
+            },
         )
         return UserInputEvent(input=query)
 
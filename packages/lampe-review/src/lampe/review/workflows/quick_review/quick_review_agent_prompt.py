@@ -69,3 +69,11 @@ Head: {head_commit}
 
 Process with the review. You may use list_directory_at_commit to orient yourself. Use get_diff_for_files with ONE file at a time. Use grep and get_file_content to investigate. Find any bugs or issues that may have been introduced.
 """
+
+QUICK_REVIEW_AGENT_SHARD_NOTE = """
+# Other Files Changed (reviewed by other agents)
+This PR is large and split across several agents. Only review the files listed above. The files below are
+reviewed by other agents: read them only when needed to confirm a bug in your files, and do not report findings
+on them.
+{other_files_changed}
+"""
@@ -1,11 +1,18 @@
-"""Quick review workflow — single agent, grep-first, minimal context."""
+"""Quick review workflow — single agent, grep-first, minimal context.
 
+In sharded mode, large PRs are split into token-balanced groups of files reviewed by concurrent agents.
+Shards beyond what the review budget affords are skipped and reported.
+"""
+
+import asyncio
 import logging
 
 from llama_index.core.workflow import Context, StartEvent, StopEvent, Workflow, step
 
 from lampe.core.data_models import PullRequest, Repository
-from lampe.core.tools.repository.diff import list_changed_files
+from lampe.core.llmbudget import BudgetReport, LLMBudget
+from lampe.core.tools.repository.diff import list_changed_files, list_changed_files_as_objects
+from lampe.core.tools.repository.pagination import DEFAULT_TOOL_OUTPUT_TOKEN_BUDGET
 from lampe.review.workflows.agentic_review.agentic_review_workflow import (
     _validation_results_to_agent_review_output,
 )
@@ -26,6 +33,13 @@ from lampe.review.workflows.quick_review.quick_review_agent import (
     QuickReviewAgentStart,
     QuickReviewInput,
 )
+from lampe.review.workflows.quick_review.sharding import (
+    MAX_QUICK_REVIEW_SHARDS,
+    QUICK_REVIEW_SHARD_TOKEN_BUDGET,
+    format_changed_files,
+    merge_validation_results,
+    partition_changed_files,
+)
 
 
 class QuickReviewStart(StartEvent):
@@ -38,20 +52,43 @@ class QuickReviewComplete(StopEvent):
     """Complete event for quick review workflow."""
 
     output: list[AgentReviewOutput]
+    # Usage of the review and work skipped to stay within its budget
+    budget: BudgetReport | None = None
 
 
 class QuickReviewWorkflow(Workflow):
-    """Simple workflow: list files → run quick review agent → convert to AgentReviewOutput."""
-
-    def __init__(self, timeout: int | None = None, verbose: bool = False, *args, **kwargs) -> None:
+    """Simple workflow: list files → run quick review agent → convert to AgentReviewOutput.
+
+    With ``sharded`` enabled, changed files are partitioned into token-balanced shards (directories kept
+    together) and one agent runs per shard concurrently. Their results are merged before the hallucination
+    filter.
+    """
+
+    def __init__(
+        self,
+        timeout: int | None = None,
+        verbose: bool = False,
+        tool_output_token_budget: int | None = DEFAULT_TOOL_OUTPUT_TOKEN_BUDGET,
+        sharded: bool = False,
+        max_shards: int = MAX_QUICK_REVIEW_SHARDS,
+        shard_token_budget: int = QUICK_REVIEW_SHARD_TOKEN_BUDGET,
+        budget: LLMBudget | None = None,
+        *args,
+        **kwargs,
+    ) -> None:
         super().__init__(*args, timeout=timeout, verbose=verbose, **kwargs)
         self.timeout = timeout
         self.verbose = verbose
         self.logger = logging.getLogger("lampe.review.quick_review")
-        self.agent = QuickReviewAgent()
+        self.budget = budget or LLMBudget()
+        self.agent = QuickReviewAgent(tool_output_token_budget=tool_output_token_budget, budget=self.budget)
+        self.sharded = sharded
+        self.max_shards = max_shards
+        self.shard_token_budget = shard_token_budget
         self.hallucination_filter = HallucinationFilterWorkflow(
             timeout=timeout,
             verbose=verbose,
+            budget=self.budget,
         )
 
     @step
@@ -62,35 +99,74 @@ class QuickReviewWorkflow(Workflow):
         base_commit = inp.pull_request.base_commit_hash
         head_commit = inp.pull_request.head_commit_hash
 
-        files_changed = list_changed_files(
-            base_reference=base_commit,
-            head_reference=head_commit,
-            repo_path=repo_path,
+        if self.sharded:
+            changed_files = list_changed_files_as_objects(
+                base_reference=base_commit,
+                head_reference=head_commit,
+                repo_path=repo_path,
+            )
+            files_changed = format_changed_files(changed_files)
+            shards = partition_changed_files(changed_files, self.max_shards, self.shard_token_budget)
+        else:
+            files_changed = list_changed_files(
+                base_reference=base_commit,
+                head_reference=head_commit,
+                repo_path=repo_path,
+            )
+            shards = []
+
+        # At least one agent runs, it wraps up early when the budget is short
+        affordable = max(self.budget.affordable_agents(len(shards)), 1)
+        for index, shard in enumerate(shards[affordable:], start=affordable + 1):
+            self.budget.skip("shard", f"shard {index}", f"{len(shard)} files not reviewed to stay within the budget")
+        shards = shards[:affordable]
+
+        if len(shards) > 1:
+            self.logger.info(f"Sharded quick review: {len(changed_files)} files over {len(shards)} agents")
+            agent_inputs = [
+                QuickReviewInput(
+                    repo_path=repo_path,
+                    base_commit=base_commit,
+                    head_commit=head_commit,
+                    files_changed=format_changed_files(shard),
+                    other_files_changed=format_changed_files([f for f in changed_files if f.file_path not in paths]),
+                )
+                for shard in shards
+                for paths in [{f.file_path for f in shard}]
+            ]
+        else:
+            agent_inputs = [
+                QuickReviewInput(
+                    repo_path=repo_path,
+                    base_commit=base_commit,
+                    head_commit=head_commit,
+                    files_changed=files_changed,
+                )
+            ]
+
+        results = await asyncio.gather(
+            *(self.agent.run(start_event=QuickReviewAgentStart(input=agent_input)) for agent_input in agent_inputs),
+            return_exceptions=True,
         )
-
-        agent_input = QuickReviewInput(
-            repo_path=repo_path,
-            base_commit=base_commit,
-            head_commit=head_commit,
-            files_changed=files_changed,
+        completed: list[ValidationAgentComplete] = []
+        for result in results:
+            if isinstance(result, BaseException):
+                self.logger.error("Quick review agent failed", exc_info=result)
+            else:
+                completed.append(result)
+        if not completed:
+            return QuickReviewComplete(output=[], budget=self.budget.report())
+
+        agent_outputs = _validation_results_to_agent_review_output(
+            [merge_validation_results([c.validation_result for c in completed])]
         )
-
-        try:
-            complete: ValidationAgentComplete = await self.agent.run(
-                start_event=QuickReviewAgentStart(input=agent_input),
-            )
-        except Exception:
-            self.logger.exception("Quick review agent failed")
-            return QuickReviewComplete(output=[])
-
-        agent_outputs = _validation_results_to_agent_review_output([complete.validation_result])
         if not agent_outputs:
-            return QuickReviewComplete(output=[])
+            return QuickReviewComplete(output=[], budget=self.budget.report())
 
         # Skip hallucination filter when no issues to filter (all reviews empty)
         has_issues = any(fr.structured_comments or fr.line_comments for ao in agent_outputs for fr in ao.reviews)
         if not has_issues:
-            return QuickReviewComplete(output=agent_outputs)
+            return QuickReviewComplete(output=agent_outputs, budget=self.budget.report())
 
         filter_result: HallucinationFilterCompleteEvent = await self.hallucination_filter.run(
             start_event=HallucinationFilterStartEvent(
@@ -98,7 +174,7 @@ class QuickReviewWorkflow(Workflow):
                 files_changed=files_changed,
             ),
         )
-        return QuickReviewComplete(output=filter_result.filtered_reviews)
+        return QuickReviewComplete(output=filter_result.filtered_reviews, budget=self.budget.report())
 
 
 async def generate_quick_pr_review(
@@ -106,12 +182,24 @@ async def generate_quick_pr_review(
     pull_request: PullRequest,
     timeout: int | None = None,
     verbose: bool = False,
+    tool_output_token_budget: int | None = DEFAULT_TOOL_OUTPUT_TOKEN_BUDGET,
+    sharded: bool = False,
+    budget: LLMBudget | None = None,
 ) -> QuickReviewComplete:
-    """Generate a quick PR review using the single-agent quick review workflow."""
+    """Generate a quick PR review using the quick review workflow (one agent, or one per shard if sharded).
+
+    With a ``budget``, the review stays within its limits and reports what it skipped.
+    """
     input_data = PRReviewInput(
         repository=repository,
         pull_request=pull_request,
     )
-    workflow = QuickReviewWorkflow(timeout=timeout, verbose=verbose)
+    workflow = QuickReviewWorkflow(
+        timeout=timeout,
+        verbose=verbose,
+        tool_output_token_budget=tool_output_token_budget,
+        sharded=sharded,
+        budget=budget,
+    )
     result: QuickReviewComplete = await workflow.run(start_event=QuickReviewStart(input=input_data))
     return result
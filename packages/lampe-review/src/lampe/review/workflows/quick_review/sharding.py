@@ -0,0 +1,95 @@
+"""Partition the changed files of a PR into token-balanced shards for parallel quick review agents."""
+
+import math
+import os
+import posixpath
+
+from lampe.core.tools.repository.diff import FileDiffInfo
+from lampe.review.workflows.agentic_review.data_models import ValidationResult
+
+# NOTE: Maximum number of quick review agents running on a sharded PR, by default 4
+MAX_QUICK_REVIEW_SHARDS = int(os.getenv("LAMPE_MAX_QUICK_REVIEW_SHARDS", 4))
+# NOTE: Estimated diff tokens a single quick review agent handles well, by default 20k
+QUICK_REVIEW_SHARD_TOKEN_BUDGET = int(os.getenv("LAMPE_QUICK_REVIEW_SHARD_TOKEN_BUDGET", 20_000))
+# Rough diff cost of a changed line (content, +/- marker, hunk context)
+ESTIMATED_TOKENS_PER_CHANGED_LINE = 12
+ESTIMATED_TOKENS_PER_FILE = 50
+
+
+def estimate_file_tokens(file: FileDiffInfo) -> int:
+    """Estimate the tokens an agent spends on the diff of a changed file."""
+    return ESTIMATED_TOKENS_PER_FILE + ESTIMATED_TOKENS_PER_CHANGED_LINE * (file.additions + file.deletions)
+
+
+def format_changed_files(files: list[FileDiffInfo]) -> str:
+    """Format changed files like ``list_changed_files``: "[STATUS] filepath | +additions -deletions | sizeKB"."""
+    return "\n".join(
+        f"[{f.status}] {f.file_path} | +{f.additions} -{f.deletions} | {f.size_kb}KB"
+        for f in sorted(files, key=lambda f: f.file_path)
+    )
+
+
+def partition_changed_files(
+    files: list[FileDiffInfo],
+    max_shards: int = MAX_QUICK_REVIEW_SHARDS,
+    shard_token_budget: int = QUICK_REVIEW_SHARD_TOKEN_BUDGET,
+) -> list[list[FileDiffInfo]]:
+    """Split changed files into token-balanced shards, keeping files of a directory together.
+
+    The number of shards is the estimated diff size divided by ``shard_token_budget``, capped at
+    ``max_shards``. Directories are the unit of assignment unless a directory alone exceeds the average
+    shard size, in which case its files are assigned individually. Units are assigned largest first to the
+    lightest shard, ties broken by path, so partitions are deterministic.
+
+    Parameters
+    ----------
+    files
+        Output of ``list_changed_files_as_objects``
+    max_shards
+        Maximum number of shards, by default MAX_QUICK_REVIEW_SHARDS
+    shard_token_budget
+        Estimated diff tokens per shard, by default QUICK_REVIEW_SHARD_TOKEN_BUDGET
+
+    Returns
+    -------
+    :
+        Non-empty shards of files sorted by path. A single shard when the PR fits the budget.
+    """
+    if not files:
+        return []
+    total_tokens = sum(estimate_file_tokens(f) for f in files)
+    num_shards = max(1, min(max_shards, len(files), math.ceil(total_tokens / max(shard_token_budget, 1))))
+    if num_shards == 1:
+        return [sorted(files, key=lambda f: f.file_path)]
+
+    by_directory: dict[str, list[FileDiffInfo]] = {}
+    for f in files:
+        by_directory.setdefault(posixpath.dirname(f.file_path), []).append(f)
+
+    target_tokens = total_tokens / num_shards
+    units: list[tuple[int, str, list[FileDiffInfo]]] = []
+    for directory, dir_files in by_directory.items():
+        dir_tokens = sum(estimate_file_tokens(f) for f in dir_files)
+        if dir_tokens > target_tokens:
+            units.extend((estimate_file_tokens(f), f.file_path, [f]) for f in dir_files)
+        else:
+            units.append((dir_tokens, directory, dir_files))
+
+    shards: list[tuple[int, list[FileDiffInfo]]] = [(0, []) for _ in range(num_shards)]
+    for tokens, _, unit_files in sorted(units, key=lambda u: (-u[0], u[1])):
+        lightest = min(range(num_shards), key=lambda i: (shards[i][0], i))
+        shards[lightest] = (shards[lightest][0] + tokens, shards[lightest][1] + unit_files)
+
+    result = [sorted(shard_files, key=lambda f: f.file_path) for _, shard_files in shards if shard_files]
+    return sorted(result, key=lambda shard: shard[0].file_path)
+
+
+def merge_validation_results(results: list[ValidationResult], task_id: str = "quick-review") -> ValidationResult:
+    """Merge the results of the shard agents into a single quick review result."""
+    findings = [finding for result in results for finding in result.findings]
+    return ValidationResult(
+        task_id=task_id,
+        findings=findings,
+        no_issue=not findings,
+        sources=[source for result in results for source in result.sources],
+    )
@@ -0,0 +1,131 @@
+"""Unit tests for the concurrent planning steps of the agentic review workflow."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from lampe.core.data_models import PullRequest, Repository
+from lampe.review.workflows.agentic_review import agentic_review_workflow as module
+from lampe.review.workflows.agentic_review.agentic_review_workflow import (
+    AgenticReviewStart,
+    AgenticReviewWorkflow,
+    _prefetch_paths,
+)
+from lampe.review.workflows.agentic_review.data_models import PRIntent, ValidationResult, ValidationTask
+from lampe.review.workflows.agentic_review.skill_selector import SkillInfo
+from lampe.review.workflows.pr_review.data_models import PRReviewInput
+
+FILES_CHANGED = "[M] README.md | +1 -0 | 1KB\n[M] src/app/main.py | +10 -2 | 3KB\n[A] src/app/util.py | +5 -0 | 1KB"
+SKILL = SkillInfo(path="/repo/.skills/security/SKILL.md", name="security", content="check auth")
+
+
+def _review_input() -> PRReviewInput:
+    return PRReviewInput(
+        repository=Repository(local_path="/repo", full_name="org/repo"),
+        pull_request=PullRequest(
+            number=1,
+            title="Add util",
+            body=None,
+            base_commit_hash="base",
+            base_branch_name="main",
+            head_commit_hash="head",
+            head_branch_name="feature",
+        ),
+    )
+
+
+@pytest.fixture
+def planning_mocks(mocker):
+    """Patch git and LLM calls; record start/end times of each planning call."""
+    calls: dict[str, tuple[float, float]] = {}
+
+    def timed(name, result, delay=0.1):
+        async def _call(*args, **kwargs):
+            started = time.perf_counter()
+            await asyncio.sleep(delay)
+            calls[name] = (started, time.perf_counter())
+            return result
+
+        return _call
+
+    def discover(repo_path, commit_hash):
+        calls["discover_skills"] = (time.perf_counter(), time.perf_counter())
+        return [SKILL]
+
+    mocker.patch.object(module, "list_changed_files", return_value=FILES_CHANGED)
+    mocker.patch.object(module, "discover_skills", side_effect=discover)
+    prefetch = mocker.patch.object(module, "prefetch_blobs", return_value=3)
+    mocker.patch.object(module, "_extract_intent", side_effect=timed("intent", PRIntent(summary="Add util")))
+    mocker.patch.object(
+        module,
+        "_plan_basic_tasks",
+        side_effect=timed("plan_tasks", [ValidationTask(task_id="basic-1", description="check util")], 0.2),
+    )
+    mocker.patch.object(module, "select_applicable_skills", side_effect=timed("select_skills", [SKILL], 0.2))
+    mocker.patch.object(
+        module,
+        "_extract_intent_and_plan",
+        side_effect=timed(
+            "intent_and_plan", (PRIntent(summary="Add util"), [ValidationTask(task_id="basic-1", description="x")])
+        ),
+    )
+
+    agent_tasks: list[str] = []
+
+    def fake_agent(*args, **kwargs):
+        async def run(start_event):
+            agent_tasks.append(start_event.input.task.task_id)
+            result = ValidationResult(task_id=start_event.input.task.task_id)
+            return SimpleNamespace(validation_result=result, validation_results=[result])
+
+        return SimpleNamespace(run=run)
+
+    mocker.patch.object(module, "BasicValidationAgent", side_effect=fake_agent)
+    mocker.patch.object(module, "SkillAugmentedValidationAgent", side_effect=fake_agent)
+    return SimpleNamespace(calls=calls, agent_tasks=agent_tasks, prefetch=prefetch)
+
+
+def _workflow(**kwargs) -> AgenticReviewWorkflow:
+    workflow = AgenticReviewWorkflow(timeout=10, **kwargs)
+    workflow.aggregation_workflow = MagicMock()
+    workflow.aggregation_workflow.run = AsyncMock(return_value=SimpleNamespace(aggregated_reviews=[]))
+    return workflow
+
+
+@pytest.mark.asyncio
+async def test_planning_runs_skill_selection_and_task_planning_concurrently(planning_mocks):
+    """Skill discovery does not wait on intent; selection and planning overlap once intent exists."""
+    await _workflow().run(start_event=AgenticReviewStart(input=_review_input()))
+
+    calls = planning_mocks.calls
+    assert "intent_and_plan" not in calls
+    assert calls["discover_skills"][0] < calls["intent"][1]
+    assert calls["select_skills"][0] >= calls["intent"][1]
+    assert calls["plan_tasks"][0] >= calls["intent"][1]
+    # The two 0.2s calls overlap
+    assert calls["select_skills"][0] < calls["plan_tasks"][1]
+    assert calls["plan_tasks"][0] < calls["select_skills"][1]
+
+    assert sorted(planning_mocks.agent_tasks) == ["basic-1", "skill-security-0"]
+    planning_mocks.prefetch.assert_called_once_with(
+        repo_path="/repo", commit_ref="head", paths=["README.md", "src/app"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_fused_intent_planning_uses_a_single_call(planning_mocks):
+    """Fused mode skips the separate task planning call."""
+    await _workflow(fused_intent_planning=True).run(start_event=AgenticReviewStart(input=_review_input()))
+
+    calls = planning_mocks.calls
+    assert "intent_and_plan" in calls
+    assert "intent" not in calls
+    assert "plan_tasks" not in calls
+    assert sorted(planning_mocks.agent_tasks) == ["basic-1", "skill-security-0"]
+
+
+def test_prefetch_paths_uses_parent_directories():
+    assert _prefetch_paths(FILES_CHANGED) == ["README.md", "src/app"]
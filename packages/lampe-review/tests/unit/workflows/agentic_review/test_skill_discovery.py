@@ -1,5 +1,8 @@
 """Unit tests for skill discovery."""
 
+from git import Repo
+
+from lampe.review.workflows.agentic_review.skill_selector import skill_discovery
 from lampe.review.workflows.agentic_review.skill_selector.skill_discovery import (
     discover_skills,
 )
@@ -93,3 +96,70 @@ def test_discover_skills_multiple(tmp_path):
     assert len(result) == 2
     names = {s.name for s in result}
     assert names == {"skill-a", "skill-b"}
+
+
+def _commit_all(repo, message: str) -> str:
+    repo.git.add(".")
+    repo.git.commit("-m", message, author="a <a@b.c>", env={"GIT_COMMITTER_NAME": "a", "GIT_COMMITTER_EMAIL": "a@b.c"})
+    return repo.head.commit.hexsha
+
+
+def test_discover_skills_reads_head_commit_tree(tmp_path):
+    """In a git repository, skills come from the commit tree, not the working copy."""
+    repo = Repo.init(tmp_path)
+    (tmp_path / ".lampe" / "skills" / "api").mkdir(parents=True)
+    (tmp_path / ".lampe" / "skills" / "api" / "SKILL.md").write_text("---\nname: api\ndescription: API\n---\n")
+    (tmp_path / "node_modules" / "dep").mkdir(parents=True)
+    (tmp_path / "node_modules" / "dep" / "SKILL.md").write_text("---\nname: dep\n---\n")
+    first = _commit_all(repo, "first")
+
+    # Uncommitted skills are ignored, deleted working copy files are still read from the commit
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "SKILL.md").write_text("---\nname: uncommitted\n---\n")
+    (tmp_path / ".lampe" / "skills" / "api" / "SKILL.md").unlink()
+
+    result = discover_skills(str(tmp_path), first)
+    assert [s.name for s in result] == ["api"]
+    assert result[0].path == str(tmp_path.resolve() / ".lampe" / "skills" / "api" / "SKILL.md")
+
+    second = _commit_all(repo, "second")
+    assert [s.name for s in discover_skills(str(tmp_path), second)] == ["uncommitted"]
+    assert [s.name for s in discover_skills(str(tmp_path))] == ["uncommitted"]
+
+
+def test_discover_skills_caches_unchanged_directories(tmp_path, mocker):
+    """Skills of unchanged directories are served from the tree SHA cache, without reading blobs."""
+    repo = Repo.init(tmp_path)
+    (tmp_path / "skills" / "a").mkdir(parents=True)
+    (tmp_path / "skills" / "a" / "SKILL.md").write_text("---\nname: a\n---\n")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.py").write_text("print('v1')\n")
+    first = _commit_all(repo, "first")
+    assert [s.name for s in discover_skills(str(tmp_path), first)] == ["a"]
+
+    (tmp_path / "src" / "main.py").write_text("print('v2')\n")
+    second = _commit_all(repo, "second")
+    parse = mocker.spy(skill_discovery, "_skill_from_content")
+    assert [s.name for s in discover_skills(str(tmp_path), second)] == ["a"]
+    parse.assert_not_called()
+
+
+def test_discover_skills_names_cached_skills_after_their_current_directory(tmp_path):
+    """A skill without frontmatter name moved to another directory takes the name of the new directory."""
+    repo = Repo.init(tmp_path)
+    (tmp_path / "skills" / "old").mkdir(parents=True)
+    (tmp_path / "skills" / "old" / "SKILL.md").write_text("Review the migrations.\n")
+    first = _commit_all(repo, "first")
+    assert [s.name for s in discover_skills(str(tmp_path), first)] == ["old"]
+
+    (tmp_path / "skills" / "old").rename(tmp_path / "skills" / "new")
+    second = _commit_all(repo, "second")
+    assert [s.name for s in discover_skills(str(tmp_path), second)] == ["new"]
+
+
+def test_discover_skills_falls_back_to_working_tree_on_unknown_commit(tmp_path):
+    """An unresolvable commit falls back to scanning the working copy."""
+    Repo.init(tmp_path)
+    (tmp_path / "skills").mkdir()
+    (tmp_path / "skills" / "SKILL.md").write_text("---\nname: local\n---\n")
+    assert [s.name for s in discover_skills(str(tmp_path))] == ["local"]
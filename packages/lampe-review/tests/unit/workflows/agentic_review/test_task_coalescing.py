@@ -0,0 +1,145 @@
+"""Unit tests for validation task coalescing."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from llama_index.core.llms import ChatMessage
+
+from lampe.review.workflows.agentic_review.data_models import ValidationAgentInput, ValidationTask
+from lampe.review.workflows.agentic_review.task_coalescing import (
+    changed_file_paths,
+    coalesce_tasks,
+    select_task_groups,
+    task_footprint,
+)
+from lampe.review.workflows.agentic_review.validation.basic_validation_agent import (
+    BasicValidationAgent,
+    ValidationAgentStart,
+)
+
+FILES_CHANGED = "\n".join(
+    [
+        "[M] api/views.py | +10 -2 | 3KB",
+        "[M] api/serializers.py | +4 -1 | 2KB",
+        "[A] web/app.ts | +30 -0 | 5KB",
+        "[M] docs/index.md | +1 -1 | 1KB",
+    ]
+)
+
+
+def _task(task_id: str, description: str, file_paths: list[str] | None = None) -> ValidationTask:
+    return ValidationTask(task_id=task_id, description=description, file_paths=file_paths or [])
+
+
+def _ids(groups: list[list[ValidationTask]]) -> list[list[str]]:
+    return [[t.task_id for t in group] for group in groups]
+
+
+def test_changed_file_paths():
+    assert changed_file_paths(FILES_CHANGED) == ["api/views.py", "api/serializers.py", "web/app.ts", "docs/index.md"]
+
+
+def test_task_footprint_falls_back_to_description_then_whole_pr():
+    paths = changed_file_paths(FILES_CHANGED)
+    assert task_footprint(_task("a", "x", ["api/views.py", "unknown.py"]), paths) == {"api/views.py"}
+    assert task_footprint(_task("b", "Check input validation in views.py"), paths) == {"api/views.py"}
+    assert task_footprint(_task("c", "Check error handling"), paths) == set(paths)
+
+
+def test_coalesce_tasks_groups_overlapping_footprints():
+    """Tasks on the same files share an agent, unrelated tasks keep their own."""
+    tasks = [
+        _task("basic-1", "Validate auth checks", ["api/views.py"]),
+        _task("basic-2", "Validate frontend state", ["web/app.ts"]),
+        _task("basic-3", "Validate serializer fields", ["api/views.py", "api/serializers.py"]),
+    ]
+    assert _ids(coalesce_tasks(tasks, FILES_CHANGED)) == [["basic-1", "basic-3"], ["basic-2"]]
+
+
+def test_coalesce_tasks_respects_bounds():
+    """Per-group cap opens new groups, the agent bound merges the smallest groups."""
+    same_file = [_task(f"basic-{i}", "Check", ["api/views.py"]) for i in range(5)]
+    assert _ids(coalesce_tasks(same_file, FILES_CHANGED, max_tasks_per_group=2)) == [
+        ["basic-0", "basic-1"],
+        ["basic-2", "basic-3"],
+        ["basic-4"],
+    ]
+
+    disjoint = [
+        _task("basic-1", "a", ["api/views.py"]),
+        _task("basic-2", "b", ["web/app.ts"]),
+        _task("basic-3", "c", ["docs/index.md"]),
+    ]
+    groups = coalesce_tasks(disjoint, FILES_CHANGED, max_groups=2)
+    assert len(groups) == 2
+    assert sorted(t.task_id for g in groups for t in g) == ["basic-1", "basic-2", "basic-3"]
+    assert coalesce_tasks([], FILES_CHANGED) == []
+
+
+@pytest.mark.asyncio
+async def test_grouped_validation_agent_attributes_findings_to_tasks():
+    """A grouped agent gets every task in its prompt and returns one result per task."""
+    tasks = [
+        _task("basic-1", "Validate auth checks", ["api/views.py"]),
+        _task("basic-3", "Validate serializer fields", ["api/serializers.py"]),
+    ]
+    response_content = json.dumps(
+        {
+            "no_issue": False,
+            "findings": [
+                {"task_id": "basic-3", "file_path": "api/serializers.py", "line_number": 4, "problem_summary": "x"},
+                {"file_path": "api/serializers.py", "line_number": 9, "problem_summary": "no task id"},
+            ],
+        }
+    )
+    prompts: list[str] = []
+
+    async def mock_achat_with_tools(tools, chat_history):
+        prompts.append(chat_history[-1].content)
+        response = MagicMock()
+        response.message = ChatMessage(role="assistant", content=response_content)
+        return response
+
+    mock_llm = MagicMock()
+    mock_llm.achat_with_tools = AsyncMock(side_effect=mock_achat_with_tools)
+    mock_llm.get_tool_calls_from_response = lambda response, error_on_no_tool_call=False: []
+    mock_llm.metadata.is_function_calling_model = True
+
+    agent = BasicValidationAgent(llm=mock_llm)
+    complete = await agent.run(
+        start_event=ValidationAgentStart(
+            input=ValidationAgentInput(
+                task=tasks[0],
+                repo_path="/repo",
+                base_commit="base",
+                head_commit="head",
+                files_changed=FILES_CHANGED,
+                grouped_tasks=tasks,
+            )
+        )
+    )
+
+    assert "[basic-1] Validate auth checks" in prompts[0]
+    assert "[basic-3] Validate serializer fields" in prompts[0]
+    results = {r.task_id: r for r in complete.validation_results}
+    assert results["basic-1"].no_issue
+    assert [f.line_number for f in results["basic-3"].findings] == [4, 9]
+    assert all(f.task_id == "basic-3" for f in results["basic-3"].findings)
+
+
+def test_select_task_groups_keeps_the_most_important_groups_in_order():
+    groups = [
+        [_task("style", "naming").model_copy(update={"priority": "low"})],
+        [_task("auth", "token check").model_copy(update={"priority": "high"})],
+        [_task("docs", "docs").model_copy(update={"priority": "low"}), _task("api", "api")],
+        [_task("perf", "loop")],
+    ]
+
+    kept, dropped = select_task_groups(groups, max_groups=2)
+    assert _ids(kept) == [["auth"], ["docs", "api"]]
+    assert [t.task_id for t in dropped] == ["perf", "style"]
+
+    kept, dropped = select_task_groups(groups, max_groups=10, drop_low_priority=True)
+    assert _ids(kept) == [["auth"], ["api"], ["perf"]]
+    assert [t.task_id for t in dropped] == ["style", "docs"]
@@ -0,0 +1,166 @@
+"""Unit tests for incremental re-review (review state store and finding carry-forward)."""
+
+import sqlite3
+
+import pytest
+from git import Repo
+
+from lampe.core.data_models import PullRequest, Repository
+from lampe.review.workflows.pr_review.data_models import AgentReviewOutput, FileReview, ReviewComment
+from lampe.review.workflows.pr_review.incremental_review import (
+    FileLineMap,
+    ReviewState,
+    ReviewStateStore,
+    carry_forward_findings,
+    changed_line_maps,
+    prepare_incremental_review,
+)
+
+_GIT_ENV = {"GIT_COMMITTER_NAME": "a", "GIT_COMMITTER_EMAIL": "a@b.c"}
+
+
+def _commit_all(repo: Repo, message: str) -> str:
+    repo.git.add("-A")
+    repo.git.commit("-m", message, author="a <a@b.c>", env=_GIT_ENV)
+    return repo.head.commit.hexsha
+
+
+def _review(file_path: str, *lines: int) -> AgentReviewOutput:
+    return AgentReviewOutput(
+        agent_name="ValidationAgent-basic-1",
+        focus_areas=["basic-1"],
+        reviews=[
+            FileReview(
+                file_path=file_path,
+                structured_comments=[
+                    ReviewComment(
+                        line_number=line, comment=f"issue at {line}", severity="high", category="logic", agent_name="a"
+                    )
+                    for line in lines
+                ],
+                summary="summary",
+            )
+        ],
+        summary="summary",
+    )
+
+
+def _pull_request(head: str, base: str = "base") -> PullRequest:
+    return PullRequest(
+        number=7,
+        title="t",
+        base_commit_hash=base,
+        base_branch_name="main",
+        head_commit_hash=head,
+        head_branch_name="feature",
+    )
+
+
+def test_file_line_map_shifts_unchanged_lines():
+    # Lines 3-4 replaced by 1 line, 2 lines inserted after old line 10
+    line_map = FileLineMap(new_path="a.py", hunks=[(3, 2, 3, 1), (10, 0, 10, 2)])
+    assert line_map.map_line(1) == 1
+    assert line_map.map_line(3) is None
+    assert line_map.map_line(4) is None
+    assert line_map.map_line(5) == 4
+    assert line_map.map_line(10) == 9
+    assert line_map.map_line(11) == 12
+    assert FileLineMap(new_path=None).map_line(1) is None
+
+
+def test_review_state_store_roundtrip(tmp_path):
+    store = ReviewStateStore(tmp_path / "state" / "reviews.sqlite")
+    assert store.get("org/repo", 7) is None
+
+    store.save(ReviewState(repository="org/repo", pr_number=7, head_commit_hash="abc", reviews=[_review("a.py", 3)]))
+    store.save(ReviewState(repository="org/repo", pr_number=7, head_commit_hash="def", reviews=[_review("a.py", 4)]))
+
+    state = ReviewStateStore(tmp_path / "state" / "reviews.sqlite").get("org/repo", 7)
+    assert state is not None
+    assert state.head_commit_hash == "def"
+    assert state.reviews[0].reviews[0].structured_comments[0].line_number == 4
+    assert store.get("org/repo", 8) is None
+
+
+def test_review_state_store_closes_its_connections(tmp_path, monkeypatch):
+    connections: list[sqlite3.Connection] = []
+    connect = sqlite3.connect
+
+    def recording_connect(*args, **kwargs):
+        connections.append(connect(*args, **kwargs))
+        return connections[-1]
+
+    monkeypatch.setattr(sqlite3, "connect", recording_connect)
+    store = ReviewStateStore(tmp_path / "reviews.sqlite")
+    store.save(ReviewState(repository="org/repo", pr_number=7, head_commit_hash="abc", reviews=[]))
+    assert store.get("org/repo", 7) is not None
+
+    assert len(connections) == 3
+    for conn in connections:
+        with pytest.raises(sqlite3.ProgrammingError, match="closed"):
+            conn.execute("SELECT 1")
+
+
+def test_incremental_review_carries_forward_unchanged_lines(tmp_path):
+    """Only the delta is reviewed; findings on unchanged lines move with the code, others are dropped."""
+    repo = Repo.init(tmp_path)
+    (tmp_path / "a.py").write_text("".join(f"line {i}\n" for i in range(1, 21)))
+    (tmp_path / "old.py").write_text("x = 1\n")
+    (tmp_path / "gone.py").write_text("y = 1\n")
+    old_head = _commit_all(repo, "first")
+
+    lines = [f"line {i}\n" for i in range(1, 21)]
+    lines[4] = "line 5 changed\n"
+    lines.insert(0, "import os\n")
+    (tmp_path / "a.py").write_text("".join(lines))
+    repo.git.mv("old.py", "renamed.py")
+    (tmp_path / "gone.py").unlink()
+    new_head = _commit_all(repo, "second")
+
+    line_maps = changed_line_maps(old_head, new_head, str(tmp_path))
+    assert line_maps["old.py"].new_path == "renamed.py"
+    assert line_maps["gone.py"].new_path is None
+
+    state = ReviewState(
+        repository="org/repo",
+        pr_number=7,
+        head_commit_hash=old_head,
+        reviews=[_review("a.py", 2, 5, 10), _review("old.py", 1), _review("gone.py", 1), _review("other.py", 3)],
+    )
+    incremental = prepare_incremental_review(state, Repository(local_path=str(tmp_path)), _pull_request(new_head))
+
+    assert incremental is not None
+    delta_pull_request, carried = incremental
+    assert delta_pull_request.base_commit_hash == old_head
+    assert delta_pull_request.head_commit_hash == new_head
+    carried_lines = {
+        (file_review.file_path, comment.line_number)
+        for agent_review in carried
+        for file_review in agent_review.reviews
+        for comment in file_review.structured_comments
+    }
+    assert carried_lines == {("a.py", 3), ("a.py", 11), ("renamed.py", 1), ("other.py", 3)}
+
+
+def test_incremental_review_falls_back_to_full_review(tmp_path):
+    """No state or a rewritten history (force push) requires a full review."""
+    repo = Repo.init(tmp_path)
+    (tmp_path / "a.py").write_text("a\n")
+    first = _commit_all(repo, "first")
+    (tmp_path / "a.py").write_text("b\n")
+    repo.git.commit("--amend", "-a", "-m", "amended", author="a <a@b.c>", env=_GIT_ENV)
+    amended = repo.head.commit.hexsha
+    repository = Repository(local_path=str(tmp_path))
+
+    assert prepare_incremental_review(None, repository, _pull_request(amended)) is None
+    state = ReviewState(repository="r", pr_number=7, head_commit_hash=first, reviews=[_review("a.py", 1)])
+    assert prepare_incremental_review(state, repository, _pull_request(amended)) is None
+
+    same_head = prepare_incremental_review(state, repository, _pull_request(first))
+    assert same_head is not None
+    assert same_head[1] == state.reviews
+
+
+def test_carry_forward_keeps_untouched_files_as_is():
+    reviews = [_review("a.py", 1)]
+    assert carry_forward_findings(reviews, {}) == reviews
@@ -0,0 +1,128 @@
+"""Unit tests for deterministic near-duplicate clustering of review issues."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from lampe.review.workflows.pr_review.data_models import AgentReviewOutput, FileReview, IssueWithId, ReviewComment
+from lampe.review.workflows.pr_review.issue_clustering import (
+    cluster_issues,
+    duplicate_mute_reasons,
+    estimated_similarity,
+    minhash_signature,
+    shingles,
+)
+from lampe.review.workflows.pr_review.llm_aggregation_step import (
+    LLMAggregationCompleteEvent,
+    LLMAggregationStartEvent,
+    LLMAggregationWorkflow,
+)
+
+NULL_DEREF = "user.profile can be None here and is dereferenced without a check, raising AttributeError"
+
+
+def _issue(issue_id: str, file: str, line: int | str, comment: str, severity: str = "high") -> IssueWithId:
+    return IssueWithId(
+        issue_id=issue_id, agent="a", file=file, line=line, severity=severity, category="logic", comment=comment
+    )
+
+
+def test_minhash_similarity_is_deterministic_and_close_to_jaccard():
+    left = shingles(NULL_DEREF)
+    right = shingles(NULL_DEREF.replace("raising AttributeError", "which raises an AttributeError"))
+    jaccard = len(left & right) / len(left | right)
+
+    assert minhash_signature(left) == minhash_signature(set(left))
+    assert estimated_similarity(minhash_signature(left), minhash_signature(left)) == 1.0
+    assert abs(estimated_similarity(minhash_signature(left), minhash_signature(right)) - jaccard) < 0.2
+    assert shingles("Null check!") == {"null check"}
+
+
+def test_cluster_issues_merges_near_duplicates_in_line_window():
+    issues = [
+        _issue("0|0|s|0", "a.py", 10, NULL_DEREF, severity="medium"),
+        _issue("1|0|s|0", "a.py", 12, NULL_DEREF + " when the user is anonymous"),
+        _issue("2|0|s|0", "a.py", 30, NULL_DEREF),  # Outside the line window
+        _issue("3|0|s|0", "b.py", 10, NULL_DEREF),  # Other file
+        _issue("4|0|s|0", "a.py", 11, "SQL query is built by string concatenation of the request parameter"),
+        _issue("5|0|l|11", "a.py", "11", NULL_DEREF),
+    ]
+
+    clusters = cluster_issues(issues, line_window=3, similarity_threshold=0.6)
+
+    assert [c.representative.issue_id for c in clusters] == ["1|0|s|0", "2|0|s|0", "3|0|s|0", "4|0|s|0"]
+    assert [d.issue_id for d in clusters[0].duplicates] == ["0|0|s|0", "5|0|l|11"]
+    assert duplicate_mute_reasons(clusters) == {
+        "0|0|s|0": "duplicate of 1|0|s|0",
+        "5|0|l|11": "duplicate of 1|0|s|0",
+    }
+    # Input order does not change the clusters
+    assert duplicate_mute_reasons(cluster_issues(list(reversed(issues)), 3, 0.6)) == duplicate_mute_reasons(clusters)
+
+
+def test_cluster_issues_compares_issues_without_a_numeric_line():
+    issues = [
+        _issue("0|0|s|0", "a.py", "file-level", NULL_DEREF),
+        _issue("1|0|s|0", "a.py", "file-level", NULL_DEREF),
+        _issue("2|0|s|0", "a.py", "10-12", NULL_DEREF + " when the user is anonymous"),
+        _issue("3|0|s|0", "a.py", 11, NULL_DEREF),
+        _issue("4|0|s|0", "a.py", "30-32", NULL_DEREF),
+        _issue("5|0|s|0", "b.py", "file-level", NULL_DEREF),  # Other file
+        _issue("6|0|s|0", "a.py", "file-level", "SQL query is built by string concatenation of the request parameter"),
+    ]
+
+    clusters = cluster_issues(issues, line_window=3, similarity_threshold=0.6)
+
+    assert [c.representative.issue_id for c in clusters] == ["2|0|s|0", "5|0|s|0", "6|0|s|0"]
+    assert [d.issue_id for d in clusters[0].duplicates] == ["0|0|s|0", "1|0|s|0", "3|0|s|0", "4|0|s|0"]
+    assert duplicate_mute_reasons(cluster_issues(list(reversed(issues)), 3, 0.6)) == duplicate_mute_reasons(clusters)
+
+    # Ranges alone are located at their first line
+    ranges = cluster_issues([issues[2], issues[3], issues[4]], line_window=3, similarity_threshold=0.6)
+    assert [[d.issue_id for d in c.duplicates] for c in ranges] == [["3|0|s|0"], []]
+
+
+@pytest.mark.asyncio
+async def test_llm_aggregation_only_sends_cluster_representatives():
+    reviews = [
+        AgentReviewOutput(
+            agent_name=f"Agent{i}",
+            focus_areas=["logic"],
+            reviews=[
+                FileReview(
+                    file_path="a.py",
+                    structured_comments=[
+                        ReviewComment(
+                            line_number=10 + i, comment=NULL_DEREF, severity="high", category="logic", agent_name="a"
+                        )
+                    ],
+                    summary="s",
+                )
+            ],
+            summary="s",
+        )
+        for i in range(3)
+    ]
+    prompts: list[str] = []
+
+    async def mock_achat_with_tools(tools, chat_history):
+        prompts.append(chat_history[-1].content)
+        response = MagicMock()
+        response.message.content = "Muted 0 issues"
+        response.message.additional_kwargs = {}
+        return response
+
+    mock_llm = MagicMock()
+    mock_llm.achat_with_tools = AsyncMock(side_effect=mock_achat_with_tools)
+    mock_llm.get_tool_calls_from_response = MagicMock(return_value=[])
+    mock_llm.metadata.is_function_calling_model = True
+
+    workflow = LLMAggregationWorkflow(verbose=False, llm=mock_llm)
+    result = await workflow.run(start_event=LLMAggregationStartEvent(agent_reviews=reviews, files_changed="a.py"))
+
+    assert isinstance(result, LLMAggregationCompleteEvent)
+    assert "0|0|s|0" in prompts[0]
+    assert "1|0|s|0" not in prompts[0] and "2|0|s|0" not in prompts[0]
+    muted = [r.reviews[0].structured_comments[0] for r in result.aggregated_reviews]
+    assert [c.muted for c in muted] == [False, True, True]
+    assert muted[1].mute_reason == "duplicate of 0|0|s|0"
@@ -1,5 +1,6 @@
 """Unit tests for LLM aggregation workflow with mute_issue tool."""
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -19,6 +20,8 @@ from lampe.review.workflows.pr_review.llm_aggregation_step import (
     _apply_muted_flags,
     _build_issues_with_ids,
     _format_sources_for_display,
+    _merge_shard_mutes,
+    _shard_issues,
 )
 
 
@@ -228,3 +231,104 @@ async def test_llm_aggregation_fallback_on_error(sample_agent_reviews):
     assert len(result.aggregated_reviews) == 1
     # Original reviews returned (no muted flags applied)
     assert result.aggregated_reviews[0].reviews[0].structured_comments[0].muted is False
+
+
+def _issue(issue_id: str, file: str) -> IssueWithId:
+    return IssueWithId(issue_id=issue_id, agent="a", file=file, line=1, severity="high", category="logic", comment="c")
+
+
+def test_shard_issues_keeps_files_together_and_bounds_shards():
+    issues = [_issue(f"0|0|s|{i}", "src/b.py") for i in range(3)]
+    issues += [_issue("1|0|s|0", "src/a.py"), _issue("1|1|s|0", "docs/x.md")]
+    issues += [_issue(f"2|0|s|{i}", "big.py") for i in range(5)]
+
+    shards = _shard_issues(issues, max_issues_per_shard=4)
+
+    assert sorted(i.issue_id for shard in shards for i in shard) == sorted(i.issue_id for i in issues)
+    # A file never spans two shards, even when it alone exceeds the bound
+    assert [[i.file for i in shard] for shard in shards] == [
+        ["big.py"] * 5,
+        ["docs/x.md", "src/a.py"],
+        ["src/b.py"] * 3,
+    ]
+
+
+def test_merge_shard_mutes_ignores_ids_outside_the_shard():
+    shards = [[_issue("0|0|s|0", "a.py")], [_issue("1|0|s|0", "b.py")]]
+    merged = _merge_shard_mutes(shards, [{"0|0|s|0": "noisy", "1|0|s|0": "duplicate"}, {}])
+    assert merged == {"0|0|s|0": "noisy"}
+
+
+@pytest.mark.asyncio
+async def test_llm_aggregation_runs_shards_in_parallel(sample_agent_reviews):
+    """Each shard gets its own prompt and agent run, mutes of all shards are combined."""
+    # One issue per file, so that each file is a shard of its own
+    sample = sample_agent_reviews[0].reviews[0]
+    agent_reviews = [
+        sample_agent_reviews[0].model_copy(
+            update={
+                "reviews": [
+                    sample.model_copy(
+                        update={"line_comments": {}, "structured_comments": sample.structured_comments[:1]}
+                    ),
+                    sample.model_copy(
+                        update={
+                            "file_path": "src/session.py",
+                            "line_comments": {},
+                            "structured_comments": sample.structured_comments[1:],
+                        }
+                    ),
+                    sample.model_copy(update={"file_path": "src/tokens.py", "structured_comments": []}),
+                ]
+            }
+        )
+    ]
+    prompts: list[str] = []
+    in_flight = 0
+    max_in_flight = 0
+
+    async def mock_achat_with_tools(tools, chat_history):
+        nonlocal in_flight, max_in_flight
+        prompt = chat_history[-1].content
+        if prompt.startswith("Muted"):
+            response = MagicMock()
+            response.message.content = "done"
+            response.message.additional_kwargs = {}
+            return response
+        prompts.append(prompt)
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        response = MagicMock()
+        response.message.content = None
+        response.message.additional_kwargs = {"prompt": prompt}
+        return response
+
+    def mock_get_tool_calls(response, error_on_no_tool_call=False):
+        prompt = response.message.additional_kwargs.get("prompt")
+        if prompt and "0|1|s|0" in prompt:
+            return [
+                ToolSelection(
+                    tool_id="c1", tool_name="mute_issue", tool_kwargs={"issue_id": "0|1|s|0", "reason": "noisy"}
+                )
+            ]
+        return []
+
+    mock_llm = MagicMock()
+    mock_llm.achat_with_tools = AsyncMock(side_effect=mock_achat_with_tools)
+    mock_llm.get_tool_calls_from_response = mock_get_tool_calls
+    mock_llm.metadata.is_function_calling_model = True
+
+    workflow = LLMAggregationWorkflow(verbose=False, llm=mock_llm, max_issues_per_shard=1)
+    result = await workflow.run(
+        start_event=LLMAggregationStartEvent(
+            agent_reviews=agent_reviews, files_changed="src/auth.py src/session.py src/tokens.py"
+        )
+    )
+
+    assert len(prompts) == 3
+    assert max_in_flight == 3
+    file_reviews = result.aggregated_reviews[0].reviews
+    assert [c.muted for r in file_reviews for c in r.structured_comments] == [False, True]
+    assert file_reviews[1].structured_comments[0].mute_reason == "noisy"
@@ -0,0 +1,151 @@
+"""Unit tests for the rule-based pre-filter of the hallucination filter."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from llama_index.core.tools import ToolSelection
+
+from lampe.review.workflows.pr_review.data_models import AgentReviewOutput, FileReview, IssueWithId, ReviewComment
+from lampe.review.workflows.quick_review.hallucination_filter_step import (
+    HallucinationFilterCompleteEvent,
+    HallucinationFilterStartEvent,
+    HallucinationFilterWorkflow,
+)
+from lampe.review.workflows.quick_review.hallucination_rules import (
+    RuleDecision,
+    classify_comment,
+    prefilter_issues,
+)
+
+
+@pytest.mark.parametrize(
+    ("comment", "decision"),
+    [
+        ("Ensure that the token is refreshed before expiry.", RuleDecision.MUTE),
+        ("Consider checking whether the cache is invalidated on logout.", RuleDecision.MUTE),
+        ("Please verify the migration handles existing rows.", RuleDecision.MUTE),
+        ("You may want to double-check the retry count.", RuleDecision.MUTE),
+        ("Check whether the token is refreshed before expiry.", RuleDecision.MUTE),
+        ("Investigate if the cache invalidation handles concurrent writes.", RuleDecision.MUTE),
+        ("It would be good to look into whether retries are idempotent.", RuleDecision.MUTE),
+        ("Null dereference when user is None", RuleDecision.KEEP),
+        # No rule matched: the rules cannot tell, the LLM decides
+        ("Missing validation allows unauthenticated access to the admin endpoint", RuleDecision.AMBIGUOUS),
+        ("`parse()` raises KeyError because the header is optional", RuleDecision.KEEP),
+        ("Potential race between the two writers", RuleDecision.AMBIGUOUS),
+        ("Ensure `close()` is called: the handle leaks because the early return skips it", RuleDecision.KEEP),
+        ("Consider checking the retry loop, it never backs off", RuleDecision.AMBIGUOUS),
+    ],
+)
+def test_classify_comment(comment, decision):
+    assert classify_comment(comment).decision == decision
+
+
+def test_prefilter_issues_reports_hit_rates():
+    issues = [
+        IssueWithId(issue_id=f"0|0|s|{i}", agent="a", file="a.py", line=i, severity="high", category="c", comment=c)
+        for i, c in enumerate(["Ensure X is valid.", "Potential issue here", "Index overflows at line 3"])
+    ]
+
+    result = prefilter_issues(issues)
+
+    assert result.muted_reasons == {"0|0|s|0": "investigation_request"}
+    assert [i.issue_id for i in result.ambiguous] == ["0|0|s|1"]
+    assert result.decisions == {"mute": 1, "ambiguous": 1, "keep": 1}
+    assert result.rule_hits["ensure"] == 1
+    assert "ensure=1/3 (33%)" in result.format_hit_rates()
+
+
+def _reviews(*comments: str) -> list[AgentReviewOutput]:
+    return [
+        AgentReviewOutput(
+            agent_name="QuickReviewAgent",
+            focus_areas=["quick"],
+            reviews=[
+                FileReview(
+                    file_path="a.py",
+                    structured_comments=[
+                        ReviewComment(line_number=i + 1, comment=c, severity="high", category="logic", agent_name="a")
+                        for i, c in enumerate(comments)
+                    ],
+                    summary="s",
+                )
+            ],
+            summary="s",
+        )
+    ]
+
+
+def _mock_llm() -> MagicMock:
+    response = MagicMock()
+    response.message.content = "Muted 0 issues"
+    response.message.additional_kwargs = {}
+    mock_llm = MagicMock()
+    mock_llm.achat_with_tools = AsyncMock(return_value=response)
+    mock_llm.get_tool_calls_from_response = MagicMock(return_value=[])
+    mock_llm.metadata.is_function_calling_model = True
+    return mock_llm
+
+
+@pytest.mark.asyncio
+async def test_hallucination_filter_skips_llm_when_nothing_is_ambiguous():
+    mock_llm = _mock_llm()
+    workflow = HallucinationFilterWorkflow(llm=mock_llm)
+
+    result = await workflow.run(
+        start_event=HallucinationFilterStartEvent(
+            agent_reviews=_reviews("Ensure that X is set.", "Null dereference when user is None"), files_changed="a.py"
+        )
+    )
+
+    assert isinstance(result, HallucinationFilterCompleteEvent)
+    mock_llm.achat_with_tools.assert_not_called()
+    comments = result.filtered_reviews[0].reviews[0].structured_comments
+    assert [c.muted for c in comments] == [True, False]
+    assert comments[0].mute_reason == "investigation_request"
+    assert result.rule_hits["ensure"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hallucination_filter_sends_only_ambiguous_issues_to_llm():
+    mock_llm = _mock_llm()
+    workflow = HallucinationFilterWorkflow(llm=mock_llm)
+
+    result = await workflow.run(
+        start_event=HallucinationFilterStartEvent(
+            agent_reviews=_reviews("Ensure that X is set.", "Potential race between writers"), files_changed="a.py"
+        )
+    )
+
+    mock_llm.achat_with_tools.assert_called_once()
+    prompt = mock_llm.achat_with_tools.call_args.kwargs["chat_history"][-1].content
+    assert "0|0|s|1" in prompt
+    assert "0|0|s|0" not in prompt
+    assert [c.muted for c in result.filtered_reviews[0].reviews[0].structured_comments] == [True, False]
+
+
+@pytest.mark.asyncio
+async def test_hallucination_filter_ignores_llm_mutes_of_issues_it_was_not_given():
+    mock_llm = _mock_llm()
+    mock_llm.get_tool_calls_from_response = MagicMock(
+        side_effect=[
+            [
+                ToolSelection(
+                    tool_id=f"c{i}", tool_name="mute_issue", tool_kwargs={"issue_id": issue_id, "reason": "unverified"}
+                )
+                for i, issue_id in enumerate(["0|0|s|0", "0|0|s|1"])
+            ],
+            [],
+        ]
+    )
+    workflow = HallucinationFilterWorkflow(llm=mock_llm)
+
+    result = await workflow.run(
+        start_event=HallucinationFilterStartEvent(
+            agent_reviews=_reviews("Null dereference when user is None", "Potential race between writers"),
+            files_changed="a.py",
+        )
+    )
+
+    # The kept issue 0|0|s|0 was not in the prompt: only the ambiguous one is muted
+    assert [c.muted for c in result.filtered_reviews[0].reviews[0].structured_comments] == [False, True]
@@ -0,0 +1,136 @@
+"""Unit tests for sharded quick review."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from lampe.core.data_models import PullRequest, Repository
+from lampe.core.tools.repository.diff import FileDiffInfo
+from lampe.review.workflows.agentic_review.data_models import ValidationFinding, ValidationResult
+from lampe.review.workflows.agentic_review.validation.validation_agent import ValidationAgentComplete
+from lampe.review.workflows.pr_review.data_models import PRReviewInput
+from lampe.review.workflows.quick_review.quick_review_workflow import (
+    QuickReviewComplete,
+    QuickReviewStart,
+    QuickReviewWorkflow,
+)
+from lampe.review.workflows.quick_review.sharding import (
+    estimate_file_tokens,
+    format_changed_files,
+    merge_validation_results,
+    partition_changed_files,
+)
+
+
+def _file(path: str, changed_lines: int) -> FileDiffInfo:
+    return FileDiffInfo(file_path=path, status="M", additions=changed_lines, deletions=0, size_kb=1)
+
+
+def test_partition_keeps_small_prs_in_one_shard():
+    files = [_file("b.py", 10), _file("a.py", 10)]
+    assert partition_changed_files(files, max_shards=4, shard_token_budget=10_000) == [[files[1], files[0]]]
+    assert partition_changed_files([], max_shards=4, shard_token_budget=10_000) == []
+
+
+def test_partition_balances_tokens_and_keeps_directories_together():
+    files = [_file(f"api/{i}.py", 100) for i in range(4)]
+    files += [_file(f"db/{i}.py", 100) for i in range(4)]
+    files += [_file("core/huge.py", 800), _file("core/small.py", 10)]
+
+    shards = partition_changed_files(files, max_shards=3, shard_token_budget=5_000)
+
+    assert len(shards) == 3
+    assert sorted(f.file_path for shard in shards for f in shard) == sorted(f.file_path for f in files)
+    for directory in ("api", "db"):
+        assert sum(any(f.file_path.startswith(f"{directory}/") for f in shard) for shard in shards) == 1
+    # The oversized directory is split: its largest file alone bounds the heaviest shard
+    loads = [sum(estimate_file_tokens(f) for f in shard) for shard in shards]
+    assert max(loads) == estimate_file_tokens(files[8])
+    # Deterministic
+    assert partition_changed_files(list(reversed(files)), max_shards=3, shard_token_budget=5_000) == shards
+
+
+def test_merge_validation_results():
+    finding = ValidationFinding(
+        file_path="a.py", line_number=1, action="fix", problem_summary="bug", severity="high", category="logic"
+    )
+    merged = merge_validation_results(
+        [ValidationResult(task_id="a", findings=[finding], no_issue=False), ValidationResult(task_id="b")]
+    )
+    assert merged.task_id == "quick-review"
+    assert merged.findings == [finding]
+    assert merged.no_issue is False
+    assert merge_validation_results([ValidationResult(task_id="a")]).no_issue is True
+
+
+@pytest.mark.asyncio
+async def test_sharded_quick_review_runs_one_agent_per_shard():
+    files = [_file(f"api/{i}.py", 500) for i in range(3)] + [_file(f"db/{i}.py", 500) for i in range(3)]
+    inputs = []
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_agent_run(start_event):
+        nonlocal in_flight, max_in_flight
+        inputs.append(start_event.input)
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        first_file = start_event.input.files_changed.splitlines()[0].split(" ")[1]
+        finding = ValidationFinding(
+            file_path=first_file,
+            line_number=3,
+            action="fix",
+            problem_summary=f"Off-by-one in {first_file} loop bound",
+            severity="high",
+            category="logic",
+        )
+        return ValidationAgentComplete(
+            validation_result=ValidationResult(task_id="quick-review", findings=[finding], no_issue=False)
+        )
+
+    workflow = QuickReviewWorkflow(sharded=True, max_shards=2, shard_token_budget=5_000)
+    with (
+        patch(
+            "lampe.review.workflows.quick_review.quick_review_workflow.list_changed_files_as_objects",
+            return_value=files,
+        ),
+        patch.object(workflow.agent, "run", side_effect=fake_agent_run),
+        patch.object(workflow.hallucination_filter, "run") as filter_run,
+    ):
+        filter_run.side_effect = lambda start_event: _filter_complete(start_event.agent_reviews)
+        result = await workflow.run(
+            start_event=QuickReviewStart(
+                input=PRReviewInput(
+                    repository=Repository(local_path="/tmp/repo"),
+                    pull_request=PullRequest(
+                        number=1,
+                        title="t",
+                        base_commit_hash="base",
+                        base_branch_name="main",
+                        head_commit_hash="head",
+                        head_branch_name="feature",
+                    ),
+                )
+            )
+        )
+
+    assert isinstance(result, QuickReviewComplete)
+    assert len(inputs) == 2
+    assert max_in_flight == 2
+    assert {i.files_changed for i in inputs} == {
+        format_changed_files(files[:3]),
+        format_changed_files(files[3:]),
+    }
+    assert all("db/0.py" in i.other_files_changed for i in inputs if "api/0.py" in i.files_changed)
+    # Results of both shards are merged into a single filtered output
+    assert len(result.output) == 1
+    assert {r.file_path for r in result.output[0].reviews} == {"api/0.py", "db/0.py"}
+
+
+async def _filter_complete(agent_reviews):
+    from lampe.review.workflows.quick_review.hallucination_filter_step import HallucinationFilterCompleteEvent
+
+    return HallucinationFilterCompleteEvent(filtered_reviews=agent_reviews)
@@ -1,12 +1,14 @@
 from .envconfig import init_env
 from .langfuseconfig import init_langfuse
 from .loggingconfig import init_logging
+from .performanceconfig import init_performance
 
 
 def initialize():
     init_env()
     init_logging()
     init_langfuse()
+    init_performance()
 
 
 __all__ = ["initialize"]
@@ -1,4 +1,5 @@
 import logging
+from functools import cache
 
 import git
 from packaging import version
@@ -11,10 +12,13 @@ logger = logging.getLogger(name=LAMPE_LOGGER_NAME)
 MINIMUM_GIT_VERSION = "2.49.0"
 
 
+@cache
 def valid_git_version_available() -> bool:
     """
     Check if the installed Git version meets the minimum requirement.
 
+    The result is cached for the lifetime of the process, the installed Git does not change under it.
+
     Returns
     -------
     :
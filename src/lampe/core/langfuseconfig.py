@@ -1,15 +1,9 @@
 import logging
 import os
+import threading
 from functools import wraps
 from typing import Any, Callable
 
-from httpx import ConnectError
-from langfuse import Langfuse
-from langfuse.api import UnauthorizedError
-from llama_index_instrumentation import get_dispatcher
-from openinference.instrumentation.config import TraceConfig
-from openinference.instrumentation.llama_index import LlamaIndexInstrumentor
-
 from lampe.core.loggingconfig import LAMPE_LOGGER_NAME
 from lampe.core.maskingconfig import is_masking_enabled
 
@@ -17,6 +11,8 @@ DEFAULT_AUTH_VALUE = "optional"
 logger = logging.getLogger(LAMPE_LOGGER_NAME)
 langfuse_client = None
 dispatcher = None
+_setup_thread: threading.Thread | None = None
+_setup_lock = threading.Lock()
 
 
 def trace_with_function_name(func: Callable) -> Callable:
@@ -81,59 +77,118 @@ def is_telemetry_enabled():
     return os.getenv("TELEMETRY_ENABLED", "false").lower() == "true"
 
 
-def init_langfuse():
-    telemetry_enabled = is_telemetry_enabled()
+def init_langfuse() -> threading.Thread | None:
+    """Set up the Langfuse telemetry off the critical path.
+
+    With telemetry disabled nothing is imported nor created. Otherwise a background thread creates the
+    client, instruments LlamaIndex and checks the credentials while the run proceeds: spans are buffered
+    until the check succeeds, and dropped if it fails.
+
+    Returns
+    -------
+    :
+        Thread setting up the telemetry, None when telemetry is disabled
+    """
+    if not is_telemetry_enabled():
+        return None
+
+    global _setup_thread
+    with _setup_lock:
+        if _setup_thread is None:
+            _setup_thread = threading.Thread(target=_setup_langfuse, name="lampe-telemetry", daemon=True)
+            _setup_thread.start()
+    return _setup_thread
+
+
+def wait_for_telemetry(timeout: float | None = None) -> bool:
+    """Wait for the background telemetry setup.
+
+    Parameters
+    ----------
+    timeout
+        Seconds to wait, no limit by default
+
+    Returns
+    -------
+    :
+        True if the Langfuse client is authenticated and instrumentation is active
+    """
+    if _setup_thread is not None:
+        _setup_thread.join(timeout=timeout)
+    return langfuse_client is not None
+
+
+def _setup_langfuse() -> None:
+    from httpx import ConnectError
+    from langfuse import Langfuse
+    from langfuse.api import UnauthorizedError
+    from llama_index_instrumentation import get_dispatcher
+    from openinference.instrumentation.config import TraceConfig
+    from openinference.instrumentation.llama_index import LlamaIndexInstrumentor
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace import TracerProvider
+
+    from lampe.core.telemetrybuffer import AuthGatedSpanProcessor
+
+    global langfuse_client, dispatcher
+    gate = AuthGatedSpanProcessor()
+    tracer_provider = TracerProvider(active_span_processor=gate)
+    if isinstance(trace.get_tracer_provider(), trace.ProxyTracerProvider):
+        trace.set_tracer_provider(tracer_provider)
+    instrumentor = LlamaIndexInstrumentor()
+    langfuse = None
     try:
         # NOTE: We are forced to add default values for secret and public key otherwise auth check will fail
         langfuse = Langfuse(
             public_key=os.getenv("LANGFUSE_PUBLIC_KEY", DEFAULT_AUTH_VALUE),
             secret_key=os.getenv("LANGFUSE_SECRET_KEY", DEFAULT_AUTH_VALUE),
             host=os.getenv("LANGFUSE_HOST"),
-            tracing_enabled=telemetry_enabled,
+            tracing_enabled=True,
+            tracer_provider=tracer_provider,
         )
-        if telemetry_enabled and langfuse.auth_check():
-            logger.info(
-                "Langfuse client is authenticated and ready! Setting up LlamaIndex instrumentation with masking."
+        # Instrumented before the credentials check: spans of the run are buffered by the gate meanwhile
+        if is_masking_enabled():
+            logger.info("Masking is enabled sensitive data will be masked in telemetry.")
+            config = TraceConfig(
+                hide_llm_invocation_parameters=True,
+                hide_inputs=True,
+                hide_outputs=True,
+                hide_input_messages=True,
+                hide_output_messages=True,
+                hide_input_images=True,
+                hide_input_text=True,
+                hide_output_text=True,
+                hide_prompts=True,
             )
-            if is_masking_enabled():
-                logger.info("Masking is enabled sensitive data will be masked in telemetry.")
-                config = TraceConfig(
-                    hide_llm_invocation_parameters=True,
-                    hide_inputs=True,
-                    hide_outputs=True,
-                    hide_input_messages=True,
-                    hide_output_messages=True,
-                    hide_input_images=True,
-                    hide_input_text=True,
-                    hide_output_text=True,
-                    hide_prompts=True,
-                )
-                LlamaIndexInstrumentor().instrument(config=config)
-                global dispatcher
-                dispatcher = get_dispatcher(__name__)
-            else:
-                logger.warning(
-                    "Security Notice: Telemetry masking is DISABLED - sensitive data will be visible in telemetry"
-                )
-                LlamaIndexInstrumentor().instrument()
+            instrumentor.instrument(config=config, tracer_provider=tracer_provider)
+            dispatcher = get_dispatcher(__name__)
         else:
-            raise ValueError("Authentication failed. Please check your credentials and host.")
-
-        global langfuse_client
+            logger.warning(
+                "Security Notice: Telemetry masking is DISABLED - sensitive data will be visible in telemetry"
+            )
+            instrumentor.instrument(tracer_provider=tracer_provider)
         langfuse_client = langfuse
+
+        if not langfuse.auth_check():
+            raise ValueError("Authentication failed. Please check your credentials and host.")
+        logger.info("Langfuse client is authenticated and ready! Buffered spans are exported.")
+        gate.open()
+        return
     except (UnauthorizedError, ValueError, AttributeError) as e:
         error_type = "Authentication" if isinstance(e, UnauthorizedError) else "General"
-        if telemetry_enabled:
-            logger.warning(f"{error_type} error: {e}. No instrumentation will be done.")
-        return None
+        logger.warning(f"{error_type} error: {e}. No instrumentation will be done.")
     except ConnectError as e:
-        if telemetry_enabled:
-            logger.warning(f"Connection error: {e}. No instrumentation will be done.")
-        return None
+        logger.warning(f"Connection error: {e}. No instrumentation will be done.")
     except Exception as e:
-        if telemetry_enabled:
-            logger.exception(f"Unexpected error: {e}. No instrumentation will be done.")
-        return None
+        logger.exception(f"Unexpected error: {e}. No instrumentation will be done.")
+
+    gate.close()
+    langfuse_client = None
+    dispatcher = None
+    if instrumentor.is_instrumented_by_opentelemetry:
+        instrumentor.uninstrument()
+    if langfuse is not None:
+        langfuse.shutdown()
 
 
 def update_current_trace(metadata: dict | None = None, tags: list[str] | None = None):
@@ -0,0 +1,230 @@
+"""Token and LLM call budget of a single review or description run.
+
+A ``LLMBudget`` is created per run and threaded through its workflows and agents. Agents record the usage of
+every LLM call, and the workflows degrade gracefully as the budget runs out: agents get fewer iterations,
+low-priority validation tasks and optional LLM passes are skipped. Skipped work is listed in the run report.
+"""
+
+import logging
+import os
+from typing import Any, Protocol, runtime_checkable
+
+from pydantic import BaseModel, Field
+
+from lampe.core.loggingconfig import LAMPE_LOGGER_NAME
+from lampe.core.utils.token import count_token_string
+
+# NOTE: Share of a budget limit above which the budget is tight and optional LLM work is skipped, by default 0.8
+TIGHT_BUDGET_FRACTION = float(os.getenv("LAMPE_BUDGET_TIGHT_FRACTION", 0.8))
+# NOTE: LLM calls reserved per agent when deciding how many agents fit in the remaining budget, by default 3
+MIN_CALLS_PER_AGENT = int(os.getenv("LAMPE_BUDGET_MIN_CALLS_PER_AGENT", 3))
+
+
+class SkippedWork(BaseModel):
+    """Work left out of a run to stay within its budget."""
+
+    kind: str = Field(..., description="What was skipped, e.g. task, shard, filter, aggregation, agent_iterations")
+    name: str = Field(..., description="Identifier of the skipped work, e.g. the task id")
+    reason: str = Field(..., description="Why it was skipped")
+
+
+class BudgetReport(BaseModel):
+    """Limits, usage and skipped work of a run."""
+
+    max_input_tokens: int | None = None
+    max_output_tokens: int | None = None
+    max_llm_calls: int | None = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    llm_calls: int = 0
+    skipped: list[SkippedWork] = Field(default_factory=list)
+
+    def format_summary(self) -> str:
+        """One line per usage and skipped work, for logs."""
+        lines = [
+            f"LLM usage: {self.llm_calls} calls (limit {self.max_llm_calls}), "
+            f"{self.input_tokens} input tokens (limit {self.max_input_tokens}), "
+            f"{self.output_tokens} output tokens (limit {self.max_output_tokens})"
+        ]
+        lines.extend(f"Skipped {work.kind} {work.name}: {work.reason}" for work in self.skipped)
+        return "\n".join(lines)
+
+
+@runtime_checkable
+class SharedSpendLimit(Protocol):
+    """Spend shared by several runs, e.g. the global LLM cost of a batch of reviews."""
+
+    def used_fraction(self) -> float:
+        """Share of the shared limit already spent, by all the runs."""
+        ...
+
+
+class LLMBudget:
+    """Input tokens, output tokens and LLM calls a run may spend, and what it spent.
+
+    A budget without limits only records the usage. All methods are meant to be called from the event loop
+    running the workflows, concurrent agents share the budget.
+
+    Parameters
+    ----------
+    max_input_tokens
+        Maximum prompt tokens over all LLM calls, by default None (unlimited)
+    max_output_tokens
+        Maximum completion tokens over all LLM calls, by default None (unlimited)
+    max_llm_calls
+        Maximum number of LLM calls, by default None (unlimited)
+    tight_fraction
+        Share of a limit above which the budget is tight, by default TIGHT_BUDGET_FRACTION
+    shared_limit
+        Limit shared with other runs, read on every check: the run stops spending once it is reached,
+        by default None
+    """
+
+    def __init__(
+        self,
+        max_input_tokens: int | None = None,
+        max_output_tokens: int | None = None,
+        max_llm_calls: int | None = None,
+        tight_fraction: float = TIGHT_BUDGET_FRACTION,
+        shared_limit: SharedSpendLimit | None = None,
+    ) -> None:
+        self.max_input_tokens = max_input_tokens
+        self.max_output_tokens = max_output_tokens
+        self.max_llm_calls = max_llm_calls
+        self.tight_fraction = tight_fraction
+        self.shared_limit = shared_limit
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.llm_calls = 0
+        self.active_agents = 0
+        self.skipped: list[SkippedWork] = []
+        self.logger = logging.getLogger(LAMPE_LOGGER_NAME)
+
+    @property
+    def limited(self) -> bool:
+        limits = (self.max_input_tokens, self.max_output_tokens, self.max_llm_calls, self.shared_limit)
+        return any(limit is not None for limit in limits)
+
+    def record(self, input_tokens: int, output_tokens: int) -> None:
+        """Record one LLM call."""
+        self.llm_calls += 1
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+
+    def record_response(self, response: Any, prompt_tokens: int = 0) -> None:
+        """Record a LLM call from its ``ChatResponse``, estimating the usage the provider did not report.
+
+        Parameters
+        ----------
+        response
+            The chat response, LiteLLM reports the usage in its ``additional_kwargs``
+        prompt_tokens
+            Estimated prompt tokens, used when the response has no usage
+        """
+        usage = getattr(response, "additional_kwargs", None)
+        usage = usage if isinstance(usage, dict) else {}
+        input_tokens = usage.get("prompt_tokens") or prompt_tokens
+        output_tokens = usage.get("completion_tokens")
+        if not output_tokens:
+            message = getattr(response, "message", None)
+            output_tokens = count_token_string(str(getattr(message, "content", None) or ""))
+        self.record(input_tokens, output_tokens)
+
+    def record_estimate(self, prompt: str, output: Any) -> None:
+        """Record a LLM call whose response is not available (e.g. structured output programs).
+
+        Parameters
+        ----------
+        prompt
+            The prompt sent, or its template followed by the values it was formatted with
+        output
+            The parsed output, a pydantic model is counted as its JSON
+        """
+        output = output.model_dump_json() if isinstance(output, BaseModel) else str(output or "")
+        self.record(count_token_string(prompt), count_token_string(output))
+
+    def used_fraction(self) -> float:
+        """Largest share of a limit already spent, 0 without limits."""
+        fractions = [
+            used / limit if limit > 0 else 1.0
+            for used, limit in (
+                (self.input_tokens, self.max_input_tokens),
+                (self.output_tokens, self.max_output_tokens),
+                (self.llm_calls, self.max_llm_calls),
+            )
+            if limit is not None
+        ]
+        if self.shared_limit is not None:
+            fractions.append(self.shared_limit.used_fraction())
+        return max(fractions, default=0.0)
+
+    def is_tight(self) -> bool:
+        return self.used_fraction() >= self.tight_fraction
+
+    def is_exhausted(self) -> bool:
+        return self.used_fraction() >= 1.0
+
+    def remaining_input_tokens(self) -> int | None:
+        if self.max_input_tokens is None:
+            return None
+        return max(self.max_input_tokens - self.input_tokens, 0)
+
+    def remaining_calls(self) -> int | None:
+        """LLM calls left, token limits being converted with the average usage per call so far.
+
+        Returns
+        -------
+        :
+            Remaining calls, None when unlimited (or when only token limits are set and no call was made yet).
+            0 once the shared limit is reached
+        """
+        estimates = []
+        if self.max_llm_calls is not None:
+            estimates.append(self.max_llm_calls - self.llm_calls)
+        for used, limit in ((self.input_tokens, self.max_input_tokens), (self.output_tokens, self.max_output_tokens)):
+            if limit is not None and used > 0:
+                estimates.append(int((limit - used) / (used / self.llm_calls)))
+            elif limit is not None and limit <= 0:
+                estimates.append(0)
+        if self.shared_limit is not None and self.shared_limit.used_fraction() >= 1.0:
+            estimates.append(0)
+        return max(min(estimates), 0) if estimates else None
+
+    def calls_per_agent(self) -> int | None:
+        """Share of the remaining calls of each running agent, None when unlimited.
+
+        Rounded up, so that every running agent can still give its answer while calls are left.
+        """
+        remaining = self.remaining_calls()
+        if remaining is None:
+            return None
+        return -(-remaining // max(self.active_agents, 1))
+
+    def affordable_agents(self, count: int, calls_per_agent: int = MIN_CALLS_PER_AGENT) -> int:
+        """How many of ``count`` agents of ``calls_per_agent`` calls fit in the remaining budget."""
+        remaining = self.remaining_calls()
+        if remaining is None:
+            return count
+        return min(count, remaining // max(calls_per_agent, 1))
+
+    def agent_started(self) -> None:
+        self.active_agents += 1
+
+    def agent_finished(self) -> None:
+        self.active_agents = max(self.active_agents - 1, 0)
+
+    def skip(self, kind: str, name: str, reason: str) -> None:
+        """Record work skipped to stay within the budget."""
+        self.logger.warning(f"Budget: skipped {kind} {name}: {reason}")
+        self.skipped.append(SkippedWork(kind=kind, name=name, reason=reason))
+
+    def report(self) -> BudgetReport:
+        return BudgetReport(
+            max_input_tokens=self.max_input_tokens,
+            max_output_tokens=self.max_output_tokens,
+            max_llm_calls=self.max_llm_calls,
+            input_tokens=self.input_tokens,
+            output_tokens=self.output_tokens,
+            llm_calls=self.llm_calls,
+            skipped=list(self.skipped),
+        )
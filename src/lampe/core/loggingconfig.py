@@ -25,6 +25,10 @@ LOGGING = {
             "level": "DEBUG" if os.environ.get("LAMPE_SDK_DEBUG", "").lower() in ("1", "true", "yes") else "INFO",
             "propagate": False,
         },
+        # Performance events (lampe.core.performance), logged to the console with LAMPE_PERFORMANCE_LOG=true
+        "lampe_sdk.performance": {
+            "level": "DEBUG" if os.environ.get("LAMPE_PERFORMANCE_LOG", "").lower() == "true" else "WARNING",
+        },
     },
 }
 
@@ -0,0 +1,145 @@
+"""Structured timing and counter events on the ``lampe_sdk.performance`` logger.
+
+Every event is a dict with at least ``kind`` (step, tool, git, llm), ``name`` and ``duration_ms``, logged at
+DEBUG level as JSON with the dict attached to the record as ``perf_event``. Events are only built when the
+logger is enabled for DEBUG: set LAMPE_PERFORMANCE_LOG=true to log them, or collect them in a
+``PerformanceReport`` with ``performance_report``.
+"""
+
+import json
+import logging
+import statistics
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+from lampe.core.loggingconfig import LAMPE_PERFORMANCE_LOGGER_NAME
+
+perf_logger = logging.getLogger(LAMPE_PERFORMANCE_LOGGER_NAME)
+
+# Numeric fields summed per kind in the report
+SUMMED_FIELDS = ("input_tokens", "output_tokens", "output_bytes", "retries")
+
+
+def is_performance_enabled() -> bool:
+    return perf_logger.isEnabledFor(logging.DEBUG)
+
+
+def record_event(kind: str, name: str, duration_ms: float, **fields: Any) -> None:
+    """Log a performance event, a no-op unless the performance logger is enabled for DEBUG.
+
+    Parameters
+    ----------
+    kind
+        Event category: step, tool, git or llm
+    name
+        What was timed within the category (step, tool or model name, git subcommand)
+    duration_ms
+        Wall-clock duration in milliseconds
+    fields
+        Counters and attributes of the event, JSON serializable
+    """
+    if not is_performance_enabled():
+        return
+    event = {"kind": kind, "name": name, "duration_ms": round(duration_ms, 3), **fields}
+    perf_logger.debug(json.dumps(event, default=str), extra={"perf_event": event})
+
+
+@contextmanager
+def timed(kind: str, name: str, **fields: Any) -> Iterator[dict[str, Any]]:
+    """Time a block and record it as an event.
+
+    Yields the event fields so that the block can add counters. ``status`` is set to ``error`` when the block
+    raises, ``ok`` otherwise.
+    """
+    if not is_performance_enabled():
+        yield fields
+        return
+    start = time.perf_counter()
+    fields.setdefault("status", "ok")
+    try:
+        yield fields
+    except BaseException:
+        fields["status"] = "error"
+        raise
+    finally:
+        record_event(kind, name, (time.perf_counter() - start) * 1000, **fields)
+
+
+class PerformanceReport(logging.Handler):
+    """Logging handler collecting the performance events of a run into a JSON summary."""
+
+    def __init__(self) -> None:
+        super().__init__(level=logging.DEBUG)
+        self.events: list[dict[str, Any]] = []
+        self.started_at = time.time()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        event = getattr(record, "perf_event", None)
+        if event is not None:
+            self.events.append(event)
+
+    def summary(self) -> dict[str, Any]:
+        """Per kind totals, and per kind and name latency statistics, of the collected events."""
+        by_kind: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for event in self.events:
+            by_kind[event["kind"]].append(event)
+
+        kinds = {}
+        for kind, events in sorted(by_kind.items()):
+            by_name: dict[str, list[dict[str, Any]]] = defaultdict(list)
+            for event in events:
+                by_name[event["name"]].append(event)
+            kinds[kind] = {
+                **_aggregate(events),
+                "by_name": {name: _aggregate(named) for name, named in sorted(by_name.items())},
+            }
+        return {
+            "started_at": self.started_at,
+            "wall_time_ms": round((time.time() - self.started_at) * 1000, 3),
+            "events": len(self.events),
+            "kinds": kinds,
+        }
+
+    def write(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(self.summary(), indent=2))
+
+
+def _aggregate(events: list[dict[str, Any]]) -> dict[str, Any]:
+    durations = sorted(event["duration_ms"] for event in events)
+    aggregate: dict[str, Any] = {
+        "count": len(events),
+        "errors": sum(1 for event in events if event.get("status") == "error"),
+        "total_ms": round(sum(durations), 3),
+        "p50_ms": round(statistics.median(durations), 3),
+        "p95_ms": round(durations[min(len(durations) - 1, int(len(durations) * 0.95))], 3),
+        "max_ms": round(durations[-1], 3),
+    }
+    for field in SUMMED_FIELDS:
+        values = [event[field] for event in events if isinstance(event.get(field), (int, float))]
+        if values:
+            aggregate[field] = sum(values)
+    return aggregate
+
+
+@contextmanager
+def performance_report(path: str | Path | None) -> Iterator[PerformanceReport | None]:
+    """Collect the performance events of the block and write their summary to ``path``.
+
+    Installs the step, git and LLM instrumentation (see ``init_performance``). Does nothing when ``path`` is None.
+    """
+    if path is None:
+        yield None
+        return
+    from lampe.core.performanceconfig import init_performance
+
+    init_performance(force=True)
+    report = PerformanceReport()
+    perf_logger.addHandler(report)
+    try:
+        yield report
+    finally:
+        perf_logger.removeHandler(report)
+        report.write(path)
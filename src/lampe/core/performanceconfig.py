@@ -0,0 +1,153 @@
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Any
+
+from lampe.core.performance import perf_logger
+
+_install_lock = threading.Lock()
+_installed = False
+
+
+def is_performance_log_enabled() -> bool:
+    return os.getenv("LAMPE_PERFORMANCE_LOG", "false").lower() == "true"
+
+
+def init_performance(force: bool = False) -> None:
+    """Install the step, git and LLM instrumentation emitting events on the performance logger.
+
+    Parameters
+    ----------
+    force
+        Install even when LAMPE_PERFORMANCE_LOG is not set, e.g. to collect a report. The events are then
+        not propagated to the console
+    """
+    if not (force or is_performance_log_enabled()):
+        return
+    if not perf_logger.isEnabledFor(logging.DEBUG):
+        perf_logger.setLevel(logging.DEBUG)
+        perf_logger.propagate = is_performance_log_enabled()
+
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        _install_git_timing()
+        _install_step_timing()
+        _install_llm_timing()
+        _installed = True
+
+
+def git_subcommand(command: Any) -> str:
+    """Subcommand of a git argv, e.g. ``diff`` for ``git -c core.quotepath=off diff --numstat``."""
+    argv = command.split() if isinstance(command, str) else [str(arg) for arg in command]
+    args = iter(argv[1:] if argv and os.path.basename(argv[0]).startswith("git") else argv)
+    for arg in args:
+        if arg in ("-c", "-C", "--git-dir", "--work-tree"):
+            next(args, None)
+        elif not arg.startswith("-"):
+            return arg
+    return "git"
+
+
+def _install_git_timing() -> None:
+    from git import Repo
+    from git.cmd import Git
+
+    from lampe.core.performance import timed
+
+    class TimedGit(Git):
+        """Git command wrapper recording the duration of every git subprocess."""
+
+        def execute(self, command, *args, **kwargs):  # type: ignore[override]
+            with timed("git", git_subcommand(command)):
+                return super().execute(command, *args, **kwargs)
+
+    Repo.GitCommandWrapperType = TimedGit
+
+
+def _install_step_timing() -> None:
+    from llama_index_instrumentation import get_dispatcher
+    from llama_index_instrumentation.span import SimpleSpan
+    from llama_index_instrumentation.span_handlers import BaseSpanHandler
+    from workflows import Workflow
+
+    from lampe.core.performance import record_event
+
+    class StepTimingSpanHandler(BaseSpanHandler[SimpleSpan]):
+        """Records the workflow runs and their steps: the spans directly under a workflow ``run`` span."""
+
+        def new_span(self, id_, bound_args, instance=None, parent_span_id=None, tags=None, **kwargs):
+            if isinstance(instance, Workflow):
+                metadata = {"kind": "workflow", "name": type(instance).__name__}
+            else:
+                parent = self.open_spans.get(parent_span_id) if parent_span_id else None
+                if parent is None or parent.metadata["kind"] != "workflow":
+                    return None
+                # Span ids are "<Workflow>.<step>-<uuid4>"
+                metadata = {"kind": "step", "name": id_.rsplit("-", 5)[0], "workflow": parent.metadata["name"]}
+            return SimpleSpan(id_=id_, parent_id=parent_span_id, tags=tags or {}, metadata=metadata)
+
+        def prepare_to_exit_span(self, id_, bound_args, instance=None, result=None, **kwargs):
+            return self._record(id_, "ok")
+
+        def prepare_to_drop_span(self, id_, bound_args, instance=None, err=None, **kwargs):
+            return self._record(id_, "error")
+
+        def _record(self, id_: str, status: str) -> SimpleSpan | None:
+            span = self.open_spans.get(id_)
+            if span is None:
+                return None
+            metadata = dict(span.metadata)
+            duration_ms = (datetime.now() - span.start_time).total_seconds() * 1000
+            record_event(metadata.pop("kind"), metadata.pop("name"), duration_ms, status=status, **metadata)
+            return span
+
+    get_dispatcher().add_span_handler(StepTimingSpanHandler())
+
+
+def _install_llm_timing() -> None:
+    import litellm
+    from litellm.integrations.custom_logger import CustomLogger
+
+    from lampe.core.performance import record_event
+
+    class LLMTimingLogger(CustomLogger):
+        """Records every LiteLLM call, retries being the failed attempts logged with the same call id."""
+
+        def __init__(self) -> None:
+            super().__init__()
+            self.failed_attempts: dict[str, int] = {}
+
+        def log_success_event(self, kwargs, response_obj, start_time, end_time) -> None:
+            self._record(kwargs, start_time, end_time, "ok")
+
+        def log_failure_event(self, kwargs, response_obj, start_time, end_time) -> None:
+            self._record(kwargs, start_time, end_time, "error")
+
+        async def async_log_success_event(self, kwargs, response_obj, start_time, end_time) -> None:
+            self._record(kwargs, start_time, end_time, "ok")
+
+        async def async_log_failure_event(self, kwargs, response_obj, start_time, end_time) -> None:
+            self._record(kwargs, start_time, end_time, "error")
+
+        def _record(self, kwargs: dict, start_time, end_time, status: str) -> None:
+            payload = kwargs.get("standard_logging_object") or {}
+            call_id = kwargs.get("litellm_call_id") or payload.get("id") or ""
+            if status == "error":
+                self.failed_attempts[call_id] = self.failed_attempts.get(call_id, 0) + 1
+                retries = 0
+            else:
+                retries = self.failed_attempts.pop(call_id, 0)
+            record_event(
+                "llm",
+                payload.get("model") or kwargs.get("model") or "unknown",
+                (end_time - start_time).total_seconds() * 1000,
+                status=status,
+                input_tokens=payload.get("prompt_tokens") or 0,
+                output_tokens=payload.get("completion_tokens") or 0,
+                retries=retries,
+            )
+
+    litellm.callbacks.append(LLMTimingLogger())
@@ -0,0 +1,95 @@
+import logging
+import os
+import threading
+from enum import Enum
+
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SynchronousMultiSpanProcessor
+
+from lampe.core.loggingconfig import LAMPE_LOGGER_NAME
+
+logger = logging.getLogger(LAMPE_LOGGER_NAME)
+
+# NOTE: Spans held while the Langfuse credentials are checked, by default 2048 (the OpenTelemetry batch queue size)
+MAX_BUFFERED_SPANS = int(os.getenv("LAMPE_TELEMETRY_MAX_BUFFERED_SPANS", 2048))
+# NOTE: Seconds a flush or shutdown waits for the credentials check before dropping the buffered spans, by default 10
+TELEMETRY_AUTH_TIMEOUT = float(os.getenv("LAMPE_TELEMETRY_AUTH_TIMEOUT", 10))
+
+
+class GateState(Enum):
+    PENDING = "pending"
+    OPEN = "open"
+    CLOSED = "closed"
+
+
+class AuthGatedSpanProcessor(SynchronousMultiSpanProcessor):
+    """Span processors of the tracer provider, holding ended spans until the exporter credentials are checked.
+
+    Spans are recorded from the start of the run, while the credentials are checked in the background.
+    ``open`` forwards the buffered spans to the processors (and from there to the exporter), ``close``
+    drops them along with every later span.
+
+    Parameters
+    ----------
+    max_buffered_spans
+        Spans held while pending, later ones are dropped, by default MAX_BUFFERED_SPANS
+    auth_timeout
+        Seconds ``force_flush`` and ``shutdown`` wait for a pending check, by default TELEMETRY_AUTH_TIMEOUT
+    """
+
+    def __init__(self, max_buffered_spans: int = MAX_BUFFERED_SPANS, auth_timeout: float = TELEMETRY_AUTH_TIMEOUT):
+        super().__init__()
+        self.max_buffered_spans = max_buffered_spans
+        self.auth_timeout = auth_timeout
+        self.state = GateState.PENDING
+        self.dropped_spans = 0
+        self._buffer: list[ReadableSpan] = []
+        self._gate_lock = threading.Lock()
+        self._decided = threading.Event()
+
+    def on_start(self, span: Span, parent_context: Context | None = None) -> None:
+        if self.state is not GateState.CLOSED:
+            super().on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        with self._gate_lock:
+            if self.state is GateState.CLOSED:
+                return
+            if self.state is GateState.PENDING:
+                if len(self._buffer) < self.max_buffered_spans:
+                    self._buffer.append(span)
+                else:
+                    self.dropped_spans += 1
+                return
+        super().on_end(span)
+
+    def open(self) -> None:
+        """Forward the buffered spans, and every later span, to the processors."""
+        with self._gate_lock:
+            # Forwarded under the lock so that spans ending meanwhile keep their order
+            for span in self._buffer:
+                super().on_end(span)
+            self._buffer.clear()
+            self.state = GateState.OPEN
+        if self.dropped_spans:
+            logger.warning(f"{self.dropped_spans} spans were dropped while checking the telemetry credentials")
+        self._decided.set()
+
+    def close(self) -> None:
+        """Drop the buffered spans, and every later span."""
+        with self._gate_lock:
+            self._buffer.clear()
+            self.state = GateState.CLOSED
+        self._decided.set()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        self._decided.wait(timeout=min(self.auth_timeout, timeout_millis / 1000))
+        if self.state is not GateState.OPEN:
+            return self.state is GateState.CLOSED
+        return super().force_flush(timeout_millis)
+
+    def shutdown(self) -> None:
+        if not self._decided.wait(timeout=self.auth_timeout):
+            logger.warning("Telemetry credentials check did not complete, buffered spans are dropped")
+            self.close()
+        super().shutdown()
@@ -1,6 +1,7 @@
 from lampe.core.tools.llm_integration.tool_registery import (
+    copy_tools,
     git_tools_gpt_5_nano_agent_prompt,
     quick_review_tools,
 )
 
-__all__ = ["git_tools_gpt_5_nano_agent_prompt", "quick_review_tools"]
+__all__ = ["copy_tools", "git_tools_gpt_5_nano_agent_prompt", "quick_review_tools"]
@@ -26,6 +26,7 @@ Returns the unified diff (line-by-line code changes) between the current branch
 Parameters:
 - base_reference (string): The base branch or commit to compare against (e.g., a commit SHA provided by the user).
 - file_paths (list[string], optional): List of specific file paths to get diffs for. If not provided, returns diff for all changed files.
+- cursor (string, optional): Continuation cursor from a truncated previous call. Omit to get the first page.
 
 
 Returns:
@@ -34,6 +35,7 @@ Returns:
 Behavioral guidance:
 - For large PRs, use file_paths parameter to get diffs for specific files to avoid context window limitations.
 - If the diff is too large or unclear, consider requesting file contents or smaller diffs for specific files.
+- Outputs are paginated to a per-call token budget. A truncated page ends with a "[page truncated: ...]" footer giving the cursor of the next page: call again with the same arguments and that cursor only if you need the rest.
 """  # noqa: E501
 
 
@@ -62,12 +64,14 @@ Use this tool to access the raw content of a file as it existed at a specific po
 Parameters:
 - commit_reference (string): The commit reference (e.g., a commit SHA provided by the user).
 - file_path (string): Path to the file within the repository (relative to repository root).
+- cursor (string, optional): Continuation cursor from a truncated previous call. Omit to get the first page.
 
 Returns:
 - The complete file content as a string. Returns empty string if the file doesn't exist at the specified commit.
 
 Behavioral guidance:
 - Use this tool when you need to examine the exact content of a file at a specific commit.
+- Outputs are paginated to a per-call token budget. A truncated page ends with a "[page truncated: ...]" footer giving the cursor of the next page: call again with the same arguments and that cursor only if you need the rest.
 """  # noqa: E501
 
 
@@ -81,6 +85,7 @@ Parameters:
 - relative_dir_path (string): Directory path to search within (relative to repository root).
 - commit (string): The commit reference to search at (e.g., a commit SHA provided by the user).
 - include_line_numbers (bool, optional): Whether to include line numbers in search results. Defaults to False.
+- cursor (string, optional): Continuation cursor from a truncated previous call. Omit to get the first page.
 
 Returns:
 - Search results as a formatted string showing matching lines with line numbers. Returns "No matches found" if no matches exist.
@@ -88,6 +93,7 @@ Returns:
 Behavioral guidance:
 - Use this tool when you need to locate specific code patterns or text within files at a particular commit.
 - The search is performed using git grep which supports regular expressions for more advanced pattern matching.
+- Outputs are paginated to a per-call token budget. A truncated page ends with a "[page truncated: ...]" footer giving the cursor of the next page: call again with the same arguments and that cursor only if you need the rest.
 """  # noqa: E501
 
 
@@ -98,6 +104,7 @@ Parameters:
 - relative_dir_path (string): Directory path relative to repository root (e.g. "src/", "packages/", "." for root).
 - commit_hash (string): Commit reference to list at (e.g., branch name, commit SHA).
 - repo_path (string): Path to the git repository.
+- cursor (string, optional): Continuation cursor from a truncated previous call. Omit to get the first page.
 
 Returns:
 - Formatted listing of entries with type (blob=file, tree=dir), name, and full path.
@@ -105,6 +112,7 @@ Returns:
 Behavioral guidance:
 - Use to orient yourself in the codebase before fetching diffs or file contents.
 - List root (".") or parent dirs of files you are reviewing.
+- Outputs are paginated to a per-call token budget. A truncated page ends with a "[page truncated: ...]" footer giving the cursor of the next page: call again with the same arguments and that cursor only if you need the rest.
 """  # noqa: E501
 
 FIND_FILES_BY_PATTERN_DESCRIPTION = """
@@ -114,6 +122,7 @@ Use this tool to find files that match a specified pattern in the repository. He
 
 Parameters:
 - pattern (string): The pattern to match files against (e.g., '*.py', 'src/**/*.md').
+- cursor (string, optional): Continuation cursor from a truncated previous call. Omit to get the first page.
 
 Returns:
 - Formatted string containing paths of matching files. Returns "No files found" if no matches exist.
@@ -121,6 +130,7 @@ Returns:
 Behavioral guidance:
 - Use this tool when you need to locate files matching specific patterns or extensions.
 - The pattern matching uses git's pathspec syntax for flexible file path matching.
+- Outputs are paginated to a per-call token budget. A truncated page ends with a "[page truncated: ...]" footer giving the cursor of the next page: call again with the same arguments and that cursor only if you need the rest.
 """  # noqa: E501
 
 
@@ -133,10 +143,12 @@ Parameters:
 - relative_dir_path (string): Directory path relative to repo root (e.g. "src/", "packages/", "." for root)
 - commit_hash (string): Commit reference (head commit)
 - repo_path (string): Repo path (pre-filled)
+- cursor (string, optional): Continuation cursor from a truncated previous call. Omit to get the first page.
 
 Behavioral guidance:
 - Use to orient yourself in the codebase: list root or parent dirs of changed files.
 - Entries show type (blob=file, tree=dir), name, and full path.
+- Outputs are paginated to a per-call token budget. A truncated page ends with a "[page truncated: ...]" footer giving the cursor of the next page: call again with the same arguments and that cursor only if you need the rest.
 """  # noqa: E501
 
 QUICK_REVIEW_GET_DIFF_DESCRIPTION = """
@@ -147,12 +159,14 @@ Parameters:
 - head_reference (string): Head commit (pre-filled)
 - file_paths (list[string]): REQUIRED. List of exactly 1 file path. E.g. ["src/foo.py"]. Never pass empty or omit — picking one file at a time is essential.
 - repo_path (string): Repo path (pre-filled)
+- cursor (string, optional): Continuation cursor from a truncated previous call. Omit to get the first page.
 
 Behavioral guidance:
 - Use this to understand the NATURE of changes in a file. Essential for knowing what the change intends.
 - ONE file per call. Pick the most important file first (e.g. core logic, security-sensitive, config).
 - After reading a diff, use search_in_files or get_file_content_at_commit to investigate specific concerns.
 - Do NOT fetch diffs for all files. Be strategic: get enough to understand the PR purpose, then investigate.
+- Outputs are paginated to a per-call token budget. A truncated page ends with a "[page truncated: ...]" footer giving the cursor of the next page: call again with the same arguments and that cursor only if you need the rest.
 """  # noqa: E501
 
 QUICK_REVIEW_SEARCH_IN_FILES_DESCRIPTION = """
@@ -164,11 +178,13 @@ Parameters:
 - commit_reference (string): Commit to search at (head commit)
 - include_line_numbers (bool): True — use for quick review to get line numbers for targeted reads
 - repo_path (string): Repo path (pre-filled)
+- cursor (string, optional): Continuation cursor from a truncated previous call. Omit to get the first page.
 
 Behavioral guidance:
 - Use this FIRST to find relevant code before reading. Grep is lightweight.
 - Search in directories of changed files only.
 - Use line numbers from results to call get_file_content_at_commit with line_start/line_end.
+- Outputs are paginated to a per-call token budget. A truncated page ends with a "[page truncated: ...]" footer giving the cursor of the next page: call again with the same arguments and that cursor only if you need the rest.
 """  # noqa: E501
 
 QUICK_REVIEW_GET_FILE_CONTENT_DESCRIPTION = """
@@ -181,9 +197,11 @@ Parameters:
 - line_end (int, optional): 0-based end line — keep range small (~20-40 lines)
 - include_line_numbers (bool): True for readability
 - repo_path (string): Repo path (pre-filled)
+- cursor (string, optional): Continuation cursor from a truncated previous call. Omit to get the first page.
 
 Behavioral guidance:
 - ALWAYS use line_start and line_end. Never read full files.
 - Get line numbers from search_in_files first, then read a small window.
-- Large files without line range will return an error.
+- Large files without line range are paginated: prefer a narrower line range over reading the next page.
+- Outputs are paginated to a per-call token budget. A truncated page ends with a "[page truncated: ...]" footer giving the cursor of the next page: call again with the same arguments and that cursor only if you need the rest.
 """  # noqa: E501
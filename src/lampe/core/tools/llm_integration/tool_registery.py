@@ -1,3 +1,6 @@
+import copy
+from collections.abc import Callable
+
 from llama_index.core.tools import FunctionTool
 
 from lampe.core.tools.llm_integration.descriptions.repository_openai import (
@@ -19,54 +22,72 @@ from lampe.core.tools.repository import (
     search_in_files,
 )
 
+
+def _paginated_tool(fn: Callable[..., str], name: str, description: str) -> FunctionTool:
+    """Tool whose output token budget is a partial param bound by the agent.
+
+    Partial params are left out of the schema sent to the LLM: the LLM only sees ``cursor`` and cannot
+    lift the budget of a page.
+    """
+    return FunctionTool.from_defaults(
+        fn=fn, name=name, description=description, partial_params={"max_output_tokens": None}
+    )
+
+
 git_tools_gpt_5_nano_agent_prompt = [
-    FunctionTool.from_defaults(
-        fn=list_directory_at_commit,
-        name="list_directory_at_commit",
-        description=LIST_DIRECTORY_AT_COMMIT_DESCRIPTION,
-    ),
-    FunctionTool.from_defaults(
-        fn=get_diff_for_files,
-        name="get_diff_for_files",
-        description=GIT_DIFF_DESCRIPTION,
+    _paginated_tool(
+        fn=list_directory_at_commit, name="list_directory_at_commit", description=LIST_DIRECTORY_AT_COMMIT_DESCRIPTION
     ),
-    FunctionTool.from_defaults(
+    _paginated_tool(fn=get_diff_for_files, name="get_diff_for_files", description=GIT_DIFF_DESCRIPTION),
+    _paginated_tool(
         fn=get_file_content_at_commit,
         name="get_file_content_at_commit",
         description=GET_FILE_CONTENT_AT_COMMIT_DESCRIPTION,
     ),
-    FunctionTool.from_defaults(
-        fn=find_files_by_pattern,
-        name="find_files_by_pattern",
-        description=FIND_FILES_BY_PATTERN_DESCRIPTION,
-    ),
-    FunctionTool.from_defaults(
-        fn=search_in_files,
-        name="search_in_files",
-        description=SEARCH_IN_FILES_DESCRIPTION,
+    _paginated_tool(
+        fn=find_files_by_pattern, name="find_files_by_pattern", description=FIND_FILES_BY_PATTERN_DESCRIPTION
     ),
+    _paginated_tool(fn=search_in_files, name="search_in_files", description=SEARCH_IN_FILES_DESCRIPTION),
 ]
 
 # Quick review tools: ls + single-file diff + grep + targeted reads
 quick_review_tools = [
-    FunctionTool.from_defaults(
+    _paginated_tool(
         fn=list_directory_at_commit,
         name="list_directory_at_commit",
         description=QUICK_REVIEW_LIST_DIRECTORY_DESCRIPTION,
     ),
-    FunctionTool.from_defaults(
-        fn=get_diff_for_files,
-        name="get_diff_for_files",
-        description=QUICK_REVIEW_GET_DIFF_DESCRIPTION,
-    ),
-    FunctionTool.from_defaults(
-        fn=search_in_files,
-        name="search_in_files",
-        description=QUICK_REVIEW_SEARCH_IN_FILES_DESCRIPTION,
-    ),
-    FunctionTool.from_defaults(
+    _paginated_tool(fn=get_diff_for_files, name="get_diff_for_files", description=QUICK_REVIEW_GET_DIFF_DESCRIPTION),
+    _paginated_tool(fn=search_in_files, name="search_in_files", description=QUICK_REVIEW_SEARCH_IN_FILES_DESCRIPTION),
+    _paginated_tool(
         fn=get_file_content_at_commit,
         name="get_file_content_at_commit",
         description=QUICK_REVIEW_GET_FILE_CONTENT_DESCRIPTION,
     ),
 ]
+
+
+def copy_tools(tools: list[FunctionTool]) -> list[FunctionTool]:
+    """Copy tools so their ``partial_params`` can be bound without affecting other agents.
+
+    The registry lists above are shared module-level objects: binding a repository path or commit on them
+    directly would leak into every agent of the process. The copies share the wrapped functions and
+    metadata, only ``partial_params`` is owned by each copy.
+
+    Parameters
+    ----------
+    tools
+        Tools to copy, e.g. ``git_tools_gpt_5_nano_agent_prompt``
+
+    Returns
+    -------
+    :
+        Shallow copies of the tools, with their own ``partial_params`` dictionaries
+    """
+    copies = []
+    for tool in tools:
+        tool_copy = copy.copy(tool)
+        if hasattr(tool, "partial_params"):
+            tool_copy.partial_params = dict(tool.partial_params or {})
+        copies.append(tool_copy)
+    return copies
@@ -23,6 +23,7 @@ from lampe.core.tools.repository.management import (
     clone_repo,
     fetch_commit_ref,
     is_sparse_clone,
+    prefetch_blobs,
 )
 from lampe.core.tools.repository.search import (
     find_files_by_pattern,
@@ -46,6 +47,7 @@ __all__ = [
     "clone_repo",
     "fetch_commit_ref",
     "is_sparse_clone",
+    "prefetch_blobs",
     "DiffLineRangeNotFoundError",
     "GitFileNotFoundError",
 ]
@@ -4,7 +4,9 @@ from git import GitCommandError, Repo
 
 from lampe.core.loggingconfig import LAMPE_LOGGER_NAME
 from lampe.core.tools.repository.encoding import sanitize_utf8
+from lampe.core.tools.repository.exceptions import InvalidCursorError
 from lampe.core.tools.repository.management import LocalCommitsAvailability
+from lampe.core.tools.repository.pagination import paginate_output, with_footer
 
 logger = logging.getLogger(name=LAMPE_LOGGER_NAME)
 
@@ -52,6 +54,8 @@ def get_file_content_at_commit(
     line_end: int | None = None,
     include_line_numbers: bool = False,
     repo_path: str = "/tmp/",
+    cursor: str | None = None,
+    max_output_tokens: int | None = None,
 ) -> str:
     """Get file content from a specific commit.
 
@@ -69,6 +73,11 @@ def get_file_content_at_commit(
         Whether to prefix each line with its line number (default: False)
     repo_path
         Path to the git repository, by default "/tmp/"
+    cursor
+        Continuation cursor returned by a previous page, by default None (first page)
+    max_output_tokens
+        Token budget of a single page. When set, large files are paginated instead of rejected.
+        By default None (no pagination)
 
     Returns
     -------
@@ -81,8 +90,8 @@ def get_file_content_at_commit(
         If the file doesn't exist or any other git error occurs
     """
     try:
-        # Check file size if no line range is specified
-        if line_start is None and line_end is None:
+        # Check file size if no line range is specified and the output is not paginated
+        if line_start is None and line_end is None and max_output_tokens is None:
             file_size = get_file_size_at_commit(file_path, commit_hash, repo_path)
             if file_size > MAX_FILE_SIZE_CHARS:
                 error_msg = (
@@ -110,7 +119,10 @@ def get_file_content_at_commit(
                 numbered_lines.append(f"{line_number:>6}| {line}")
             blob = "\n".join(numbered_lines)
 
-        return blob
+        page, footer = paginate_output(blob, max_output_tokens=max_output_tokens, cursor=cursor)
+        return with_footer(page, footer)
+    except InvalidCursorError as e:
+        return f"Error: {e}"
     except GitCommandError as e:
         logger.exception(f"Error getting file content: {e}")
         raise
@@ -120,6 +132,8 @@ def list_directory_at_commit(
     relative_dir_path: str,
     commit_hash: str = "HEAD",
     repo_path: str = "/tmp/",
+    cursor: str | None = None,
+    max_output_tokens: int | None = None,
 ) -> str:
     """List directory contents at a specific commit (like ls).
 
@@ -131,6 +145,10 @@ def list_directory_at_commit(
         Commit reference to list at (e.g., "main", commit hash). Defaults to "HEAD"
     repo_path
         Path to the git repository, by default "/tmp/"
+    cursor
+        Continuation cursor returned by a previous page, by default None (first page)
+    max_output_tokens
+        Token budget of a single page, by default None (no pagination)
 
     Returns
     -------
@@ -158,7 +176,10 @@ def list_directory_at_commit(
                 lines.append(f"{obj_type}\t{name}\t{full_path}")
             else:
                 lines.append(line)
-        return "```\n" + "\n".join(lines) + "\n```"
+        page, footer = paginate_output("\n".join(lines), max_output_tokens=max_output_tokens, cursor=cursor)
+        return with_footer("```\n" + page + "\n```", footer)
+    except InvalidCursorError as e:
+        return f"Error: {e}"
     except GitCommandError as e:
         if e.status == 128:
             return f"Error: Path not found or not a directory at {commit_hash}"
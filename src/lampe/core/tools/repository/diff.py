@@ -8,8 +8,9 @@ from pydantic import BaseModel, Field
 from lampe.core.loggingconfig import LAMPE_LOGGER_NAME
 from lampe.core.tools.repository.content import get_file_size_at_commit
 from lampe.core.tools.repository.encoding import sanitize_utf8
-from lampe.core.tools.repository.exceptions import DiffNotFoundError
+from lampe.core.tools.repository.exceptions import DiffNotFoundError, InvalidCursorError
 from lampe.core.tools.repository.management import LocalCommitsAvailability
+from lampe.core.tools.repository.pagination import paginate_output, with_footer
 
 logger = logging.getLogger(name=LAMPE_LOGGER_NAME)
 
@@ -173,6 +174,8 @@ def get_diff_for_files(
     head_reference: str = "HEAD",
     repo_path: str = "/tmp/",
     batch_size: int = 50,
+    cursor: str | None = None,
+    max_output_tokens: int | None = None,
 ) -> str:
     """Get the diff between two commits, optionally for specific files.
 
@@ -188,12 +191,31 @@ def get_diff_for_files(
         Path to git repository, by default "/tmp/"
     batch_size
         Number of files to process in each batch.
+    cursor
+        Continuation cursor returned by a previous page, by default None (first page)
+    max_output_tokens
+        Token budget of a single page, by default None (no pagination)
 
     Returns
     -------
     str
         Formatted string containing diffs for specified files or all changed files
     """
+    diff = _get_diff_for_files(base_reference, file_paths, head_reference, repo_path, batch_size)
+    try:
+        page, footer = paginate_output(diff, max_output_tokens=max_output_tokens, cursor=cursor)
+    except InvalidCursorError as e:
+        return f"Error: {e}"
+    return with_footer(page, footer)
+
+
+def _get_diff_for_files(
+    base_reference: str,
+    file_paths: list[str] | None,
+    head_reference: str,
+    repo_path: str,
+    batch_size: int,
+) -> str:
     repo = Repo(path=repo_path)
     with LocalCommitsAvailability(repo_path, [base_reference, head_reference]):
         if file_paths:
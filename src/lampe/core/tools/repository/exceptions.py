@@ -16,3 +16,7 @@ class DiffNotFoundError(Exception):
 
 class UnableToDeleteError(Exception):
     pass
+
+
+class InvalidCursorError(ValueError):
+    pass
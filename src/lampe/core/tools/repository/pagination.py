@@ -0,0 +1,102 @@
+"""Token-budgeted pagination of repository tool outputs.
+
+Tool outputs (diffs, grep hits, file contents) are sent verbatim to the LLM. When a tool is called with
+``max_output_tokens``, only the first page that fits the budget is returned, followed by a continuation
+cursor the agent can pass back to the same tool (with the same arguments) to read the next page.
+"""
+
+import os
+
+from lampe.core.tools.repository.exceptions import InvalidCursorError
+from lampe.core.utils.token import encoder, truncate_to_token_limit
+
+# NOTE: Default per-call token budget for agent-facing repository tools, by default 10k tokens
+DEFAULT_TOOL_OUTPUT_TOKEN_BUDGET = int(os.getenv("LAMPE_TOOL_OUTPUT_TOKEN_BUDGET", 10_000))
+
+PAGE_FOOTER_TEMPLATE = (
+    "[page truncated: output exceeds {max_output_tokens} tokens. Showing lines {start}-{end} of {total}. "
+    'Call the same tool again with the same arguments and cursor="{cursor}" to read the next page.]'
+)
+LINE_TRUNCATED_FOOTER_TEMPLATE = (
+    "[line {line} truncated: it alone exceeds {max_output_tokens} tokens, the rest of the line is not shown.]"
+)
+
+
+def _parse_cursor(cursor: str | None, total_lines: int) -> int:
+    if cursor is None or cursor == "":
+        return 0
+    try:
+        start = int(cursor)
+    except (TypeError, ValueError) as e:
+        raise InvalidCursorError(
+            f"Invalid cursor {cursor!r}: use the cursor value returned by the previous page"
+        ) from e
+    if start < 0 or start >= max(total_lines, 1):
+        raise InvalidCursorError(f"Invalid cursor {cursor!r}: output only has {total_lines} lines")
+    return start
+
+
+def paginate_output(output: str, max_output_tokens: int | None = None, cursor: str | None = None) -> tuple[str, str]:
+    """Return the page of ``output`` starting at ``cursor`` that fits in ``max_output_tokens``.
+
+    Pages are split on line boundaries so a diff hunk or a grep hit is never cut in the middle. A single
+    line larger than the budget (minified code, lockfiles, one-line JSON) is cut to the budget and returned
+    on its own page, so that the budget is a real ceiling.
+
+    Parameters
+    ----------
+    output
+        Full tool output
+    max_output_tokens
+        Token budget for a single page. When None, the whole output is returned
+    cursor
+        Continuation cursor returned with the previous page. When None, the first page is returned
+
+    Returns
+    -------
+    :
+        Tuple of (page content, page footer). The footer is empty when the page is the last one and is
+        not truncated.
+
+    Raises
+    ------
+    InvalidCursorError
+        If the cursor is not one returned by a previous page of this output
+    """
+    if max_output_tokens is None and not cursor:
+        return output, ""
+
+    lines = output.splitlines()
+    start = _parse_cursor(cursor, len(lines))
+    if max_output_tokens is None:
+        return "\n".join(lines[start:]), ""
+
+    used_tokens = 0
+    end = start
+    truncated_line = None
+    while end < len(lines):
+        line_tokens = len(encoder.encode(lines[end], disallowed_special=())) + 1
+        if used_tokens + line_tokens > max_output_tokens:
+            if end == start:
+                truncated_line = truncate_to_token_limit(lines[start], max_output_tokens)
+                end += 1
+            break
+        used_tokens += line_tokens
+        end += 1
+
+    page = "\n".join(lines[start:end]) if truncated_line is None else truncated_line
+    footers = []
+    if truncated_line is not None:
+        footers.append(LINE_TRUNCATED_FOOTER_TEMPLATE.format(line=start + 1, max_output_tokens=max_output_tokens))
+    if end < len(lines):
+        footers.append(
+            PAGE_FOOTER_TEMPLATE.format(
+                max_output_tokens=max_output_tokens, start=start + 1, end=end, total=len(lines), cursor=end
+            )
+        )
+    return page, "\n".join(footers)
+
+
+def with_footer(content: str, footer: str) -> str:
+    """Append a pagination footer to a (possibly fenced) tool output."""
+    return f"{content}\n{footer}" if footer else content
@@ -4,6 +4,8 @@ from git import GitCommandError, Repo
 
 from lampe.core.loggingconfig import LAMPE_LOGGER_NAME
 from lampe.core.tools.repository.encoding import sanitize_utf8
+from lampe.core.tools.repository.exceptions import InvalidCursorError
+from lampe.core.tools.repository.pagination import paginate_output, with_footer
 
 logger = logging.getLogger(name=LAMPE_LOGGER_NAME)
 
@@ -14,6 +16,8 @@ def search_in_files(
     commit_reference: str,
     include_line_numbers: bool = False,
     repo_path: str = "/tmp/",
+    cursor: str | None = None,
+    max_output_tokens: int | None = None,
 ) -> str:
     """Search for a pattern in files within a directory at a specific commit.
 
@@ -29,6 +33,10 @@ def search_in_files(
         Whether to include line numbers in search results (default: False)
     repo_path
         Path to the git repository, by default "/tmp/"
+    cursor
+        Continuation cursor returned by a previous page, by default None (first page)
+    max_output_tokens
+        Token budget of a single page, by default None (no pagination)
 
     Returns
     -------
@@ -45,8 +53,11 @@ def search_in_files(
             grep_output = repo.git.grep(pattern, commit_reference_path)
         if grep_output:
             grep_output = sanitize_utf8(grep_output)
-            return f"```grep\n{grep_output}\n```"
+            page, footer = paginate_output(grep_output, max_output_tokens=max_output_tokens, cursor=cursor)
+            return with_footer(f"```grep\n{page}\n```", footer)
         return "No matches found"
+    except InvalidCursorError as e:
+        return f"Error: {e}"
     except GitCommandError as e:
         # Exit 1 = no match (git grep documented behavior)
         if e.status == 1:
@@ -55,7 +66,12 @@ def search_in_files(
         return f"Error executing git grep: {str(e)}"
 
 
-def find_files_by_pattern(pattern: str, repo_path: str = "/tmp/") -> str:
+def find_files_by_pattern(
+    pattern: str,
+    repo_path: str = "/tmp/",
+    cursor: str | None = None,
+    max_output_tokens: int | None = None,
+) -> str:
     """Search for files using git ls-files and pattern matching.
 
     Parameters
@@ -64,6 +80,10 @@ def find_files_by_pattern(pattern: str, repo_path: str = "/tmp/") -> str:
         Pattern to search for (e.g. "*.py", "src/**/*.md")
     repo_path
         Path to git repository
+    cursor
+        Continuation cursor returned by a previous page, by default None (first page)
+    max_output_tokens
+        Token budget of a single page, by default None (no pagination)
 
     Returns
     -------
@@ -80,8 +100,11 @@ def find_files_by_pattern(pattern: str, repo_path: str = "/tmp/") -> str:
         if not matching:
             return "No files found"
 
-        return f"```shell\n{'\n'.join(matching)}\n```"
+        page, footer = paginate_output("\n".join(matching), max_output_tokens=max_output_tokens, cursor=cursor)
+        return with_footer(f"```shell\n{page}\n```", footer)
 
+    except InvalidCursorError as e:
+        return f"Error: {e}"
     except GitCommandError as e:
         logger.exception(f"Error finding files: {e}")
         return f"Error: {str(e)}"
@@ -9,7 +9,8 @@ logger = logging.getLogger(__name__)
 
 
 def count_token_string(content: str) -> int:
-    return len(encoder.encode(content))
+    # Special tokens such as `<|endoftext|>` in a diff or a PR body are counted as plain text
+    return len(encoder.encode(content, disallowed_special=()))
 
 
 def safe_truncate(text: str, limit: int) -> str:
@@ -1,4 +1,6 @@
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Any
 
 from llama_index.core.llms import ChatMessage
@@ -10,8 +12,26 @@ from llama_index.llms.litellm import LiteLLM
 from pydantic import BaseModel
 from workflows.events import StopEvent
 
+from lampe.core.llmbudget import LLMBudget
 from lampe.core.llmconfig import MODELS
 from lampe.core.loggingconfig import LAMPE_LOGGER_NAME
+from lampe.core.performance import is_performance_enabled, timed
+from lampe.core.tools.llm_integration.tool_registery import copy_tools
+from lampe.core.tools.repository.pagination import DEFAULT_TOOL_OUTPUT_TOKEN_BUDGET
+from lampe.core.utils.token import count_token_string
+from lampe.core.workflows.memory_compaction import (
+    DEFAULT_MAX_INPUT_TOKENS,
+    count_message_tokens,
+    digest_consumed_tool_outputs,
+    enforce_input_token_ceiling,
+    fit_to_input_token_ceiling,
+)
+
+# Sent instead of another tool round when the agent has a single LLM call left in the budget
+BUDGET_WRAP_UP_MESSAGE = (
+    "The review budget is almost spent: do not call more tools. "
+    "Give your final answer now, based on what you gathered so far, in the required output format."
+)
 
 
 class UserInputEvent(Event):
@@ -39,6 +59,7 @@ class ToolSource(BaseModel):
 class AgentCompleteEvent(Event):
     output: str | None
     sources: list[ToolSource]
+    prompt_token_counts: list[int] = []
 
 
 class FunctionCallingAgent(Workflow):
@@ -49,12 +70,17 @@ class FunctionCallingAgent(Workflow):
         tools: list[FunctionTool] | None = None,
         system_prompt: str | None = None,
         max_iterations: int = 50,
+        max_input_tokens: int | None = DEFAULT_MAX_INPUT_TOKENS,
+        compact_tool_outputs: bool = True,
+        tool_output_token_budget: int | None = DEFAULT_TOOL_OUTPUT_TOKEN_BUDGET,
+        budget: LLMBudget | None = None,
         **kwargs: Any,
     ) -> None:
         self.logger = logging.getLogger(name=LAMPE_LOGGER_NAME)
         self.logger.info(f"Initializing FunctionCallingAgent with args: {args}, kwargs: {kwargs}")
         super().__init__(*args, **kwargs)
-        self.tools = tools or []
+        # Each agent owns copies of its tools: binding params never leaks into other agents
+        self.tools = copy_tools(tools or [])
         self.llm = llm or LiteLLM(
             model=MODELS.GPT_5_NANO_2025_08_07, temperature=1.0, reasoning_effort="low"
         )  # Default to OpenAI LLM
@@ -62,38 +88,99 @@ class FunctionCallingAgent(Workflow):
         # Store system prompt
         self.system_prompt = system_prompt
         self.max_iterations = max_iterations
+        # Context compaction: consumed tool outputs are digested, full outputs stay in sources
+        self.max_input_tokens = max_input_tokens
+        self.compact_tool_outputs = compact_tool_outputs
+        # Per-call token budget of paginated tools (tools exposing max_output_tokens/cursor)
+        self.tool_output_token_budget = tool_output_token_budget
+        # Budget of the run the agent is part of: records its LLM calls and caps its iterations
+        self.budget = budget or LLMBudget()
+
+    def _tool_params(self, partial_params: dict[str, Any] | None) -> dict[str, Any]:
+        if self.tool_output_token_budget is not None:
+            return {"max_output_tokens": self.tool_output_token_budget, **(partial_params or {})}
+        return dict(partial_params or {})
+
+    @staticmethod
+    def _supported_params(tool: FunctionTool, partial_params: dict[str, Any]) -> dict[str, Any]:
+        if getattr(getattr(tool, "metadata", None), "fn_schema", None) is None:
+            return {}
+        # Params hidden from the LLM, such as max_output_tokens, are partial params absent from the schema
+        supported = set(getattr(tool.metadata.fn_schema, "model_fields", {})) | set(
+            getattr(tool, "partial_params", None) or {}
+        )
+        return {k: v for k, v in partial_params.items() if k in supported}
+
+    @staticmethod
+    def _call_kwargs(tool: FunctionTool, bound_params: dict[str, Any], tool_kwargs: dict[str, Any]) -> dict[str, Any]:
+        """Arguments of a tool call: the LLM arguments over the bound params, within the bound output budget.
+
+        The LLM may ask for smaller pages, never for larger ones or for no budget at all.
+        """
+        kwargs = {**bound_params, **tool_kwargs}
+        budget = bound_params.get(
+            "max_output_tokens", (getattr(tool, "partial_params", None) or {}).get("max_output_tokens")
+        )
+        if budget is not None:
+            requested = tool_kwargs.get("max_output_tokens")
+            valid_request = isinstance(requested, int) and not isinstance(requested, bool) and requested > 0
+            kwargs["max_output_tokens"] = min(requested, budget) if valid_request else budget
+        return kwargs
 
     def update_tools(self, partial_params: dict[str, Any] | None = None) -> None:
         """
         Update tool partial parameters safely: only include params present in fn_schema.model_fields,
         and merge with any existing partial_params dictionary.
+        The agent tool output token budget is injected into tools supporting pagination.
+        The params apply to every run of this agent, use ``bind_tools`` for params of a single run.
         """
+        partial_params = self._tool_params(partial_params)
         for tool in self.tools:
-            if (
-                not hasattr(tool, "partial_params")
-                or not hasattr(tool, "metadata")
-                or getattr(tool.metadata, "fn_schema", None) is None
-            ):
+            if not hasattr(tool, "partial_params"):
                 continue
-
-            final_params = dict(getattr(tool, "partial_params", {}) or {})
-            model_fields = getattr(tool.metadata.fn_schema, "model_fields", {})
-
-            if partial_params:
-                for k, v in partial_params.items():
-                    if k in model_fields:
-                        final_params[k] = v
-
+            final_params = {**(tool.partial_params or {}), **self._supported_params(tool, partial_params)}
             # Only update the tool's partial_params if there is at least one valid param
             if final_params:
                 tool.partial_params = final_params
 
+    async def bind_tools(self, ctx: Context, partial_params: dict[str, Any] | None = None) -> None:
+        """Bind tool partial parameters to the current run only.
+
+        The params are stored in the run context and override the tools' own ``partial_params`` on each
+        call, so concurrent runs of the same agent (e.g. on different commits) cannot clobber each other.
+
+        Parameters
+        ----------
+        ctx
+            Context of the current run
+        partial_params
+            Params pre-filled on every tool accepting them, e.g. ``repo_path`` and commit hashes
+        """
+        await ctx.store.set("tool_params", self._tool_params(partial_params))
+
+    async def _agent_finished(self, ctx: Context) -> None:
+        """Count the run as finished in the budget, once, however it ends."""
+        if await ctx.store.get("agent_running", default=False):
+            await ctx.store.set("agent_running", False)
+            self.budget.agent_finished()
+
+    @asynccontextmanager
+    async def _finished_on_error(self, ctx: Context) -> AsyncIterator[None]:
+        """Count the run as finished when a step raises or is cancelled, e.g. on an LLM error or a timeout."""
+        try:
+            yield
+        except BaseException:
+            await self._agent_finished(ctx)
+            raise
+
     @step
     async def prepare_chat_history(self, ctx: Context, ev: UserInputEvent) -> InputEvent:
         # Clear sources
         await ctx.store.set("sources", [])
         # Initialize iteration counter
         await ctx.store.set("iteration_count", 0)
+        await ctx.store.set("prompt_token_counts", [])
+        await ctx.store.set("final_answer", False)
 
         # Check if memory is setup
         memory = await ctx.store.get("memory", default=None)
@@ -115,26 +202,47 @@ class FunctionCallingAgent(Workflow):
 
         # Update context
         await ctx.store.set("memory", memory)
+        # Paired with _agent_finished, called whether the run completes, stops early or fails
+        await ctx.store.set("agent_running", True)
+        self.budget.agent_started()
 
         return InputEvent(input=chat_history)
 
     @step
     async def handle_llm_input(self, ctx: Context, ev: InputEvent) -> ToolCallEvent | AgentCompleteEvent:
-        chat_history = ev.input
-
-        # stream the response
-        response = await self.llm.achat_with_tools(self.tools, chat_history=chat_history)
-
-        # save the final response, which should have all content
-        memory = await ctx.store.get("memory")
-        memory.put(response.message)
-        await ctx.store.set("memory", memory)
-        tool_calls = self.llm.get_tool_calls_from_response(response, error_on_no_tool_call=False)
-        if not tool_calls:
-            sources = await ctx.store.get("sources", default=[])
-            return AgentCompleteEvent(output=response.message.content, sources=sources)
-        else:
-            return ToolCallEvent(tool_calls=tool_calls)
+        async with self._finished_on_error(ctx):
+            chat_history = ev.input
+            if self.max_input_tokens is not None:
+                chat_history = fit_to_input_token_ceiling(chat_history, self.max_input_tokens)
+            prompt_token_counts = await ctx.store.get("prompt_token_counts", default=[])
+            prompt_tokens = count_message_tokens(chat_history)
+            prompt_token_counts.append(prompt_tokens)
+            await ctx.store.set("prompt_token_counts", prompt_token_counts)
+            self.logger.info(f"Iteration {len(prompt_token_counts)} prompt tokens: {prompt_tokens}")
+
+            # The last call allowed by the budget gets no tools, so that the agent answers
+            final_answer = await ctx.store.get("final_answer", default=False)
+            if final_answer:
+                response = await self.llm.achat(chat_history)
+            else:
+                response = await self.llm.achat_with_tools(self.tools, chat_history=chat_history)
+            self.budget.record_response(response, prompt_tokens=prompt_tokens)
+
+            # save the final response, which should have all content
+            memory = await ctx.store.get("memory")
+            memory.put(response.message)
+            await ctx.store.set("memory", memory)
+            tool_calls = (
+                [] if final_answer else self.llm.get_tool_calls_from_response(response, error_on_no_tool_call=False)
+            )
+            if not tool_calls:
+                await self._agent_finished(ctx)
+                sources = await ctx.store.get("sources", default=[])
+                return AgentCompleteEvent(
+                    output=response.message.content, sources=sources, prompt_token_counts=prompt_token_counts
+                )
+            else:
+                return ToolCallEvent(tool_calls=tool_calls)
 
     @step
     async def handle_agent_completion(self, ctx: Context, ev: AgentCompleteEvent) -> StopEvent:
@@ -142,72 +250,115 @@ class FunctionCallingAgent(Workflow):
 
     @step
     async def handle_tool_calls(self, ctx: Context, ev: ToolCallEvent) -> InputEvent | AgentCompleteEvent:
-        # Increment iteration counter
-        iteration_count = await ctx.store.get("iteration_count", default=0)
-        iteration_count += 1
-        await ctx.store.set("iteration_count", iteration_count)
-
-        # Check if max iterations exceeded
-        if iteration_count > self.max_iterations:
-            self.logger.warning(
-                f"Max iterations ({self.max_iterations}) exceeded. Stopping agent to prevent infinite loop."
-            )
-            sources = await ctx.store.get("sources", default=[])
-            error_msg = (
-                f"Agent stopped: Maximum number of iterations ({self.max_iterations}) exceeded. "
-                "This may indicate an infinite loop in tool calling."
-            )
-            return AgentCompleteEvent(output=error_msg, sources=sources)
-
-        tool_calls = ev.tool_calls
-        tools_by_name = {tool.metadata.get_name(): tool for tool in self.tools}
-        tool_msgs = []
-        sources = await ctx.store.get("sources", default=[])
-        for tool_call in tool_calls:
-            tool_output = ""
-            tool = tools_by_name.get(tool_call.tool_name)
-            additional_kwargs = {
-                "tool_call_id": tool_call.tool_id,
-                "name": tool.metadata.get_name() if tool else tool_call.tool_name,
-            }
-            if not tool:
-                tool_msgs.append(
-                    ChatMessage(
-                        role="tool",
-                        content=f"Tool {tool_call.tool_name} does not exist",
-                        additional_kwargs=additional_kwargs,
-                    )
+        async with self._finished_on_error(ctx):
+            # Increment iteration counter
+            iteration_count = await ctx.store.get("iteration_count", default=0)
+            iteration_count += 1
+            await ctx.store.set("iteration_count", iteration_count)
+
+            # Check if max iterations exceeded
+            if iteration_count > self.max_iterations:
+                self.logger.warning(
+                    f"Max iterations ({self.max_iterations}) exceeded. Stopping agent to prevent infinite loop."
                 )
-                continue
-            try:
-                for key, value in tool_call.tool_kwargs.items():
-                    if key in tool.partial_params:
-                        self.logger.info(f"Tool {tool_call.tool_name} partial param {key} value {value}")
-
-                ctx_param_name = getattr(tool, "ctx_param_name", None)
-                if getattr(tool, "requires_context", False) and ctx_param_name is not None:
-                    tool_call.tool_kwargs[ctx_param_name] = ctx
-                self.logger.info(f"-------------- {tool_call.tool_name} ------------------")
-                self.logger.info(f"kwargs {tool_call.tool_kwargs}")
-                result = await tool.acall(**tool_call.tool_kwargs)
-                tool_output = result.content if hasattr(result, "content") else str(result)
-                self.logger.info(f"Tool output:\n {tool_output}")
-                self.logger.info("--------------------------------")
-
-                tool_msgs.append(ChatMessage(role="tool", content=tool_output, additional_kwargs=additional_kwargs))
-            except Exception as e:
-                tool_output = f"Encountered error in tool call: \n{e}"
-                tool_msgs.append(ChatMessage(role="tool", content=tool_output, additional_kwargs=additional_kwargs))
-            finally:
-                sources.append(
-                    ToolSource(
-                        tool_name=tool_call.tool_name, tool_kwargs=tool_call.tool_kwargs, tool_output=tool_output
+                sources = await ctx.store.get("sources", default=[])
+                error_msg = (
+                    f"Agent stopped: Maximum number of iterations ({self.max_iterations}) exceeded. "
+                    "This may indicate an infinite loop in tool calling."
+                )
+                prompt_token_counts = await ctx.store.get("prompt_token_counts", default=[])
+                await self._agent_finished(ctx)
+                return AgentCompleteEvent(output=error_msg, sources=sources, prompt_token_counts=prompt_token_counts)
+
+            # Iterations are capped dynamically by the calls left in the budget, shared by the running agents
+            calls_left = self.budget.calls_per_agent()
+            if calls_left is not None and calls_left < 1:
+                self.budget.skip(
+                    "agent_iterations", type(self).__name__, f"stopped after {iteration_count - 1} iterations"
+                )
+                await self._agent_finished(ctx)
+                sources = await ctx.store.get("sources", default=[])
+                prompt_token_counts = await ctx.store.get("prompt_token_counts", default=[])
+                return AgentCompleteEvent(
+                    output="Agent stopped: the review budget is exhausted.",
+                    sources=sources,
+                    prompt_token_counts=prompt_token_counts,
+                )
+
+            tool_calls = ev.tool_calls
+            tools_by_name = {tool.metadata.get_name(): tool for tool in self.tools}
+            tool_msgs = []
+            sources = await ctx.store.get("sources", default=[])
+            run_params = await ctx.store.get("tool_params", default={})
+            for tool_call in tool_calls:
+                tool_output = ""
+                tool = tools_by_name.get(tool_call.tool_name)
+                additional_kwargs = {
+                    "tool_call_id": tool_call.tool_id,
+                    "name": tool.metadata.get_name() if tool else tool_call.tool_name,
+                }
+                if not tool:
+                    tool_msgs.append(
+                        ChatMessage(
+                            role="tool",
+                            content=f"Tool {tool_call.tool_name} does not exist",
+                            additional_kwargs=additional_kwargs,
+                        )
                     )
+                    continue
+                # Timed around the error handling: counting the output cannot turn a tool call into a failed one
+                with timed("tool", tool_call.tool_name, agent=type(self).__name__) as perf:
+                    try:
+                        bound_params = self._supported_params(tool, run_params)
+                        for key, value in tool_call.tool_kwargs.items():
+                            if key in tool.partial_params or key in bound_params:
+                                self.logger.info(f"Tool {tool_call.tool_name} partial param {key} value {value}")
+
+                        ctx_param_name = getattr(tool, "ctx_param_name", None)
+                        if getattr(tool, "requires_context", False) and ctx_param_name is not None:
+                            tool_call.tool_kwargs[ctx_param_name] = ctx
+                        self.logger.info(f"-------------- {tool_call.tool_name} ------------------")
+                        self.logger.info(f"kwargs {tool_call.tool_kwargs}")
+                        result = await tool.acall(**self._call_kwargs(tool, bound_params, tool_call.tool_kwargs))
+                        tool_output = result.content if hasattr(result, "content") else str(result)
+                        self.logger.info(f"Tool output:\n {tool_output}")
+                        self.logger.info("--------------------------------")
+
+                        tool_msgs.append(
+                            ChatMessage(role="tool", content=tool_output, additional_kwargs=additional_kwargs)
+                        )
+                    except Exception as e:
+                        perf["status"] = "error"
+                        tool_output = f"Encountered error in tool call: \n{e}"
+                        tool_msgs.append(
+                            ChatMessage(role="tool", content=tool_output, additional_kwargs=additional_kwargs)
+                        )
+                    finally:
+                        sources.append(
+                            ToolSource(
+                                tool_name=tool_call.tool_name,
+                                tool_kwargs=tool_call.tool_kwargs,
+                                tool_output=tool_output,
+                            )
+                        )
+                    if is_performance_enabled():
+                        perf["output_bytes"] = len(tool_output.encode())
+                        perf["output_tokens"] = count_token_string(tool_output)
+            memory = await ctx.store.get("memory")
+            if self.compact_tool_outputs:
+                # Every tool output already in memory has been sent to the LLM at least once
+                memory.set(digest_consumed_tool_outputs(memory.get_all()))
+            if self.max_input_tokens is not None:
+                tool_msgs = enforce_input_token_ceiling(memory.get_all(), tool_msgs, self.max_input_tokens)
+            if calls_left == 1:
+                self.budget.skip(
+                    "agent_iterations", type(self).__name__, f"capped at {iteration_count} iterations, answering now"
                 )
-        memory = await ctx.store.get("memory")
-        for msg in tool_msgs:
-            memory.put(msg)
-        await ctx.store.set("sources", sources)
-        await ctx.store.set("memory", memory)
-        chat_history = memory.get()
-        return InputEvent(input=chat_history)
+                await ctx.store.set("final_answer", True)
+                tool_msgs.append(ChatMessage(role="user", content=BUDGET_WRAP_UP_MESSAGE))
+            for msg in tool_msgs:
+                memory.put(msg)
+            await ctx.store.set("sources", sources)
+            await ctx.store.set("memory", memory)
+            chat_history = memory.get()
+            return InputEvent(input=chat_history)
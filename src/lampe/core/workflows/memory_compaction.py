@@ -0,0 +1,219 @@
+"""Token-aware compaction of the chat history resent by function calling agents.
+
+Every iteration of a function calling agent resends the whole conversation. Tool outputs (diffs, file
+contents, grep hits) dominate that history, so once the LLM has consumed an output we replace it by a
+short digest. The full output is still available to callers through the agent ``sources``.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from llama_index.core.llms import ChatMessage, MessageRole
+
+from lampe.core.loggingconfig import LAMPE_LOGGER_NAME
+from lampe.core.utils.token import encoder, truncate_to_token_limit
+
+logger = logging.getLogger(name=LAMPE_LOGGER_NAME)
+
+# NOTE: Ceiling on the prompt sent at each agent iteration, by default 120k tokens
+DEFAULT_MAX_INPUT_TOKENS = int(os.getenv("LAMPE_AGENT_MAX_INPUT_TOKENS", 120_000))
+TOOL_OUTPUT_DIGEST_PREVIEW_CHARS = 300
+MIN_TOOL_OUTPUT_TOKENS = 256
+COMPACTED_TOOL_OUTPUT_PREFIX = "[compacted tool output]"
+TRUNCATED_TOOL_OUTPUT_SUFFIX = (
+    "\n[truncated: output exceeded the per-iteration input token ceiling. "
+    "Request a narrower range (specific files, line_start/line_end, a more precise pattern).]"
+)
+TRUNCATED_MESSAGE_SUFFIX = "\n[truncated: the prompt exceeded the per-iteration input token ceiling.]"
+# Token counts of recent contents, keyed by content digest and length so that the contents are not retained
+TOKEN_COUNT_CACHE_SIZE = 4096
+_token_counts: OrderedDict[tuple[bytes, int], int] = OrderedDict()
+_token_counts_lock = threading.Lock()
+
+
+def _count_content_tokens(content: str) -> int:
+    key = (hashlib.blake2b(content.encode(errors="surrogatepass"), digest_size=16).digest(), len(content))
+    with _token_counts_lock:
+        if (count := _token_counts.get(key)) is not None:
+            _token_counts.move_to_end(key)
+            return count
+    count = len(encoder.encode(content, disallowed_special=()))
+    with _token_counts_lock:
+        _token_counts[key] = count
+        if len(_token_counts) > TOKEN_COUNT_CACHE_SIZE:
+            _token_counts.popitem(last=False)
+    return count
+
+
+def count_message_tokens(messages: list[ChatMessage]) -> int:
+    """Count the tokens of the textual content of a list of chat messages.
+
+    Parameters
+    ----------
+    messages
+        Chat messages to count
+
+    Returns
+    -------
+    :
+        Total number of tokens of the messages content
+    """
+    return sum(_count_content_tokens(msg.content or "") for msg in messages)
+
+
+def is_compacted(message: ChatMessage) -> bool:
+    """Return True if the message is a tool output that was already replaced by its digest."""
+    return (message.content or "").startswith(COMPACTED_TOOL_OUTPUT_PREFIX)
+
+
+def digest_tool_message(message: ChatMessage) -> ChatMessage:
+    """Replace a consumed tool output by a short digest.
+
+    The digest keeps the tool name, the original size and a short preview so the LLM can still
+    reason about what it already looked at.
+
+    Parameters
+    ----------
+    message
+        Tool message to digest
+
+    Returns
+    -------
+    :
+        New tool message with the same tool call metadata and a digested content
+    """
+    content = message.content or ""
+    tool_name = message.additional_kwargs.get("name", "tool")
+    preview = content[:TOOL_OUTPUT_DIGEST_PREVIEW_CHARS]
+    if len(content) > TOOL_OUTPUT_DIGEST_PREVIEW_CHARS:
+        preview += "..."
+    digest = (
+        f"{COMPACTED_TOOL_OUTPUT_PREFIX} {tool_name} returned {_count_content_tokens(content)} tokens "
+        f"(already read, call the tool again if you need the full output). Preview:\n{preview}"
+    )
+    return ChatMessage(role=MessageRole.TOOL, content=digest, additional_kwargs=message.additional_kwargs)
+
+
+def digest_consumed_tool_outputs(messages: list[ChatMessage]) -> list[ChatMessage]:
+    """Digest every tool output of the history.
+
+    Must be called before new tool outputs are appended: every tool message already in the history
+    has been sent to the LLM at least once.
+
+    Parameters
+    ----------
+    messages
+        Full chat history
+
+    Returns
+    -------
+    :
+        Chat history with tool outputs replaced by digests
+    """
+    compacted = []
+    for message in messages:
+        if message.role == MessageRole.TOOL and not is_compacted(message):
+            compacted.append(digest_tool_message(message))
+        else:
+            compacted.append(message)
+    return compacted
+
+
+def enforce_input_token_ceiling(
+    messages: list[ChatMessage], new_tool_messages: list[ChatMessage], max_input_tokens: int
+) -> list[ChatMessage]:
+    """Truncate fresh tool outputs so that the next prompt stays under the token ceiling.
+
+    The token budget left by the rest of the history is split evenly between the fresh tool outputs.
+    When there is not even room for ``MIN_TOOL_OUTPUT_TOKENS`` per output, the outputs are digested.
+
+    Parameters
+    ----------
+    messages
+        Chat history, without the new tool messages
+    new_tool_messages
+        Tool messages produced during the current iteration, not yet seen by the LLM
+    max_input_tokens
+        Hard ceiling on the prompt size
+
+    Returns
+    -------
+    :
+        The new tool messages, truncated if needed
+    """
+    if not new_tool_messages:
+        return new_tool_messages
+    history_tokens = count_message_tokens(messages)
+    new_tokens = count_message_tokens(new_tool_messages)
+    if history_tokens + new_tokens <= max_input_tokens:
+        return new_tool_messages
+
+    per_message_budget = (max_input_tokens - history_tokens) // len(new_tool_messages)
+    logger.warning(
+        f"Tool outputs ({new_tokens} tokens) exceed the input token ceiling ({max_input_tokens}, "
+        f"{history_tokens} already used). Truncating to {max(per_message_budget, 0)} tokens per output."
+    )
+    if per_message_budget < MIN_TOOL_OUTPUT_TOKENS:
+        return [digest_tool_message(msg) for msg in new_tool_messages]
+
+    truncated = []
+    for msg in new_tool_messages:
+        content = msg.content or ""
+        if _count_content_tokens(content) <= per_message_budget:
+            truncated.append(msg)
+            continue
+        content = truncate_to_token_limit(content, per_message_budget) + TRUNCATED_TOOL_OUTPUT_SUFFIX
+        truncated.append(ChatMessage(role=MessageRole.TOOL, content=content, additional_kwargs=msg.additional_kwargs))
+    return truncated
+
+
+def fit_to_input_token_ceiling(messages: list[ChatMessage], max_input_tokens: int) -> list[ChatMessage]:
+    """Compact a prompt until it fits under the token ceiling.
+
+    Tool outputs are digested oldest first. If the prompt is still too long (e.g. a huge user prompt), the
+    longest messages other than the system prompt are truncated.
+
+    Parameters
+    ----------
+    messages
+        Prompt about to be sent
+    max_input_tokens
+        Ceiling on the prompt size
+
+    Returns
+    -------
+    :
+        The prompt, compacted if needed
+    """
+    total = count_message_tokens(messages)
+    if total <= max_input_tokens:
+        return messages
+    logger.warning(f"Prompt ({total} tokens) exceeds the input token ceiling ({max_input_tokens}), compacting it")
+
+    fitted = list(messages)
+    for index, message in enumerate(fitted):
+        if total <= max_input_tokens:
+            return fitted
+        if message.role == MessageRole.TOOL and not is_compacted(message):
+            digested = digest_tool_message(message)
+            total += _count_content_tokens(digested.content) - _count_content_tokens(message.content or "")
+            fitted[index] = digested
+
+    candidates = sorted(
+        (index for index, message in enumerate(fitted) if message.role != MessageRole.SYSTEM),
+        key=lambda index: _count_content_tokens(fitted[index].content or ""),
+        reverse=True,
+    )
+    for index in candidates:
+        if total <= max_input_tokens:
+            break
+        message = fitted[index]
+        tokens = _count_content_tokens(message.content or "")
+        keep = max(tokens - (total - max_input_tokens) - _count_content_tokens(TRUNCATED_MESSAGE_SUFFIX), 0)
+        content = (truncate_to_token_limit(message.content or "", keep) if keep > 0 else "") + TRUNCATED_MESSAGE_SUFFIX
+        total += _count_content_tokens(content) - tokens
+        fitted[index] = ChatMessage(role=message.role, content=content, additional_kwargs=message.additional_kwargs)
+    return fitted
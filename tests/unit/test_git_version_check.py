@@ -1,8 +1,18 @@
 from unittest.mock import patch
 
+import pytest
+
 from lampe.core.gitconfig import MINIMUM_GIT_VERSION, valid_git_version_available
 
 
+@pytest.fixture(autouse=True)
+def clear_git_version_cache():
+    """Each test checks its own patched Git version."""
+    valid_git_version_available.cache_clear()
+    yield
+    valid_git_version_available.cache_clear()
+
+
 def test_git_version_meets_requirement():
     with patch("lampe.core.gitconfig.git.Git") as mock_git:
         mock_git.return_value.version.return_value = "git version 2.50.0"
@@ -12,6 +22,15 @@ def test_git_version_meets_requirement():
         mock_git.return_value.version.assert_called_once()
 
 
+def test_git_version_is_checked_once():
+    with patch("lampe.core.gitconfig.git.Git") as mock_git:
+        mock_git.return_value.version.return_value = "git version 2.50.0"
+
+        assert valid_git_version_available() is True
+        assert valid_git_version_available() is True
+        mock_git.return_value.version.assert_called_once()
+
+
 def test_git_version_below_requirement():
     with patch("lampe.core.gitconfig.git.Git") as mock_git:
         mock_git.return_value.version.return_value = "git version 2.30.0"
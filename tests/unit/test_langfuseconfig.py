@@ -0,0 +1,103 @@
+"""Tests for lampe.core.langfuseconfig and lampe.core.telemetrybuffer."""
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from lampe.core import langfuseconfig
+from lampe.core.telemetrybuffer import AuthGatedSpanProcessor, GateState
+
+
+def _gated_tracer(gate: AuthGatedSpanProcessor) -> tuple[TracerProvider, InMemorySpanExporter]:
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider(active_span_processor=gate)
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return provider, exporter
+
+
+def _names(exporter: InMemorySpanExporter) -> list[str]:
+    return [span.name for span in exporter.get_finished_spans()]
+
+
+def test_gate_buffers_spans_until_opened() -> None:
+    gate = AuthGatedSpanProcessor(max_buffered_spans=2)
+    provider, exporter = _gated_tracer(gate)
+    tracer = provider.get_tracer(__name__)
+    for name in ("clone", "diff", "overflow"):
+        with tracer.start_as_current_span(name):
+            pass
+    assert _names(exporter) == []
+
+    gate.open()
+    with tracer.start_as_current_span("review"):
+        pass
+
+    assert _names(exporter) == ["clone", "diff", "review"]
+    assert gate.dropped_spans == 1
+    assert provider.force_flush()
+
+
+def test_gate_drops_spans_when_closed() -> None:
+    gate = AuthGatedSpanProcessor()
+    provider, exporter = _gated_tracer(gate)
+    tracer = provider.get_tracer(__name__)
+    with tracer.start_as_current_span("before"):
+        pass
+    gate.close()
+    with tracer.start_as_current_span("after"):
+        pass
+
+    assert _names(exporter) == []
+    assert gate.state is GateState.CLOSED
+
+
+def test_gate_flush_gives_up_on_a_pending_check() -> None:
+    gate = AuthGatedSpanProcessor(auth_timeout=0.01)
+    assert gate.force_flush() is False
+    gate.shutdown()
+    assert gate.state is GateState.CLOSED
+
+
+@pytest.fixture
+def fresh_setup(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(langfuseconfig, "_setup_thread", None)
+    monkeypatch.setattr(langfuseconfig, "langfuse_client", None)
+    monkeypatch.setattr(langfuseconfig, "dispatcher", None)
+
+
+def test_init_langfuse_does_nothing_when_disabled(monkeypatch: pytest.MonkeyPatch, fresh_setup: None) -> None:
+    monkeypatch.setenv("TELEMETRY_ENABLED", "false")
+    assert langfuseconfig.init_langfuse() is None
+    assert langfuseconfig._setup_thread is None
+    assert langfuseconfig.wait_for_telemetry() is False
+
+
+def test_init_langfuse_checks_credentials_in_background(monkeypatch: pytest.MonkeyPatch, fresh_setup: None) -> None:
+    import langfuse
+    import openinference.instrumentation.llama_index as instrumentation
+    from opentelemetry import trace
+
+    release_auth = threading.Event()
+    client = MagicMock()
+    client.auth_check.side_effect = lambda: release_auth.wait(timeout=5) and False
+    instrumentor = MagicMock(is_instrumented_by_opentelemetry=True)
+    monkeypatch.setattr(langfuse, "Langfuse", MagicMock(return_value=client))
+    monkeypatch.setattr(instrumentation, "LlamaIndexInstrumentor", MagicMock(return_value=instrumentor))
+    monkeypatch.setattr(trace, "set_tracer_provider", MagicMock())
+    monkeypatch.setenv("TELEMETRY_ENABLED", "true")
+
+    setup = langfuseconfig.init_langfuse()
+    # The credentials check does not block initialization
+    assert setup is not None and setup.is_alive()
+    assert langfuseconfig.init_langfuse() is setup
+
+    release_auth.set()
+    assert langfuseconfig.wait_for_telemetry(timeout=5) is False
+    # Rejected credentials undo the instrumentation and stop the client
+    instrumentor.instrument.assert_called_once()
+    instrumentor.uninstrument.assert_called_once()
+    client.shutdown.assert_called_once()
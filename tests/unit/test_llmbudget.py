@@ -0,0 +1,100 @@
+"""Tests for lampe.core.llmbudget."""
+
+from unittest.mock import MagicMock
+
+from llama_index.core.llms import ChatMessage
+from pydantic import BaseModel
+
+from lampe.core.llmbudget import LLMBudget
+
+
+def test_unlimited_budget_only_records_usage() -> None:
+    budget = LLMBudget()
+    budget.record(1000, 100)
+
+    assert not budget.limited
+    assert budget.remaining_calls() is None and budget.calls_per_agent() is None
+    assert budget.affordable_agents(7) == 7
+    assert not budget.is_tight()
+    assert budget.report().llm_calls == 1
+
+
+def test_record_response_prefers_reported_usage() -> None:
+    budget = LLMBudget()
+    response = MagicMock()
+    response.additional_kwargs = {"prompt_tokens": 1200, "completion_tokens": 80}
+    budget.record_response(response, prompt_tokens=10)
+
+    estimated = MagicMock()
+    estimated.additional_kwargs = {}
+    estimated.message = ChatMessage(role="assistant", content="hello world")
+    budget.record_response(estimated, prompt_tokens=10)
+
+    assert budget.llm_calls == 2
+    assert budget.input_tokens == 1210
+    assert 80 < budget.output_tokens < 90
+
+
+def test_record_estimate_counts_pydantic_output_as_json() -> None:
+    class Plan(BaseModel):
+        summary: str
+
+    budget = LLMBudget()
+    budget.record_estimate("prompt", Plan(summary="a " * 50))
+
+    assert budget.output_tokens > 50
+
+
+def test_call_limit_is_shared_by_running_agents() -> None:
+    budget = LLMBudget(max_llm_calls=10)
+    budget.record(100, 10)
+    budget.record(100, 10)
+
+    assert budget.remaining_calls() == 8
+    assert budget.affordable_agents(5) == 2
+    budget.agent_started()
+    budget.agent_started()
+    budget.agent_started()
+    assert budget.calls_per_agent() == 3
+    budget.agent_finished()
+    assert budget.calls_per_agent() == 4
+
+
+def test_token_limits_are_converted_to_calls_with_the_average_usage() -> None:
+    budget = LLMBudget(max_input_tokens=10_000, tight_fraction=0.5)
+    assert budget.remaining_calls() is None
+
+    budget.record(2000, 10)
+    budget.record(2000, 10)
+
+    assert budget.remaining_calls() == 3
+    assert budget.remaining_input_tokens() == 6000
+    assert not budget.is_tight()
+    budget.record(2000, 10)
+    assert budget.is_tight() and not budget.is_exhausted()
+
+
+def test_skipped_work_is_reported() -> None:
+    budget = LLMBudget(max_output_tokens=100)
+    budget.record(10, 120)
+    budget.skip("task", "style-check", "low priority task dropped")
+
+    report = budget.report()
+
+    assert budget.is_exhausted() and budget.remaining_calls() == 0
+    assert [(work.kind, work.name) for work in report.skipped] == [("task", "style-check")]
+    assert "Skipped task style-check" in report.format_summary()
+
+
+def test_shared_limit_stops_the_run_once_reached() -> None:
+    shared = MagicMock()
+    shared.used_fraction.return_value = 0.5
+    budget = LLMBudget(shared_limit=shared, tight_fraction=0.8)
+
+    assert budget.limited
+    assert budget.remaining_calls() is None and not budget.is_tight()
+    shared.used_fraction.return_value = 0.9
+    assert budget.is_tight()
+    # Spent by the other runs as well: the running agents get no more calls
+    shared.used_fraction.return_value = 1.0
+    assert budget.is_exhausted() and budget.remaining_calls() == 0 and budget.calls_per_agent() == 0
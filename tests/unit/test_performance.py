@@ -0,0 +1,131 @@
+"""Tests for lampe.core.performance and lampe.core.performanceconfig."""
+
+import json
+import logging
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from git import Repo
+from llama_index.core.llms import ChatMessage
+from llama_index.core.tools import FunctionTool, ToolSelection
+from llama_index.core.workflow import StartEvent, StopEvent, Workflow, step
+
+from lampe.core.performance import PerformanceReport, perf_logger, performance_report, record_event, timed
+from lampe.core.performanceconfig import git_subcommand
+from lampe.core.workflows.function_calling_agent import FunctionCallingAgent, UserInputEvent
+
+
+@pytest.fixture(autouse=True)
+def restore_perf_logger():
+    level, propagate = perf_logger.level, perf_logger.propagate
+    yield
+    perf_logger.setLevel(level)
+    perf_logger.propagate = propagate
+
+
+@pytest.fixture
+def report():
+    perf_logger.setLevel(logging.DEBUG)
+    perf_logger.propagate = False
+    report = PerformanceReport()
+    perf_logger.addHandler(report)
+    yield report
+    perf_logger.removeHandler(report)
+
+
+def test_events_are_not_built_when_disabled() -> None:
+    perf_logger.setLevel(logging.WARNING)
+    report = PerformanceReport()
+    perf_logger.addHandler(report)
+    try:
+        record_event("git", "diff", 1.0)
+        with timed("tool", "get_diff") as fields:
+            fields["output_bytes"] = 10
+    finally:
+        perf_logger.removeHandler(report)
+    assert report.events == []
+
+
+def test_report_summarizes_events_per_kind_and_name(report: PerformanceReport) -> None:
+    record_event("llm", "gpt-5", 100.0, input_tokens=1000, output_tokens=50, retries=1)
+    record_event("llm", "gpt-5", 300.0, input_tokens=2000, output_tokens=70, retries=0)
+    with timed("tool", "get_diff") as fields:
+        fields["output_bytes"] = 10
+    with pytest.raises(ValueError), timed("tool", "search"):
+        raise ValueError("boom")
+
+    summary = report.summary()
+
+    llm = summary["kinds"]["llm"]
+    assert (llm["count"], llm["total_ms"], llm["max_ms"]) == (2, 400.0, 300.0)
+    assert (llm["input_tokens"], llm["output_tokens"], llm["retries"]) == (3000, 120, 1)
+    tools = summary["kinds"]["tool"]
+    assert tools["count"] == 2 and tools["errors"] == 1
+    assert tools["by_name"]["get_diff"]["output_bytes"] == 10
+    assert summary["events"] == 4
+
+
+@pytest.mark.parametrize(
+    ("command", "expected"),
+    [
+        (["git", "diff", "base", "--numstat"], "diff"),
+        (["git", "-c", "core.quotepath=off", "cat-file", "-e", "x"], "cat-file"),
+        ("git --no-pager log -1", "log"),
+        (["git"], "git"),
+    ],
+)
+def test_git_subcommand(command, expected) -> None:
+    assert git_subcommand(command) == expected
+
+
+class OneStepWorkflow(Workflow):
+    @step
+    async def first(self, ev: StartEvent) -> StopEvent:
+        return StopEvent(result="done")
+
+
+@pytest.mark.asyncio
+async def test_performance_report_records_steps_and_git(tmp_path) -> None:
+    repo = Repo.init(tmp_path / "repo")
+    report_path = tmp_path / "perf.json"
+
+    with performance_report(report_path):
+        Repo(repo.working_dir).git.status("--porcelain")
+        assert await OneStepWorkflow().run() == "done"
+
+    summary = json.loads(report_path.read_text())
+    assert summary["kinds"]["git"]["by_name"]["status"]["count"] == 1
+    assert summary["kinds"]["step"]["by_name"]["OneStepWorkflow.first"]["count"] == 1
+    assert summary["kinds"]["workflow"]["by_name"]["OneStepWorkflow"]["errors"] == 0
+
+
+class SpecialTokenAgent(FunctionCallingAgent):
+    @step
+    async def setup(self, ev: StartEvent) -> UserInputEvent:
+        return UserInputEvent(input="read the file")
+
+
+@pytest.mark.asyncio
+async def test_tool_output_with_special_tokens_is_counted(report: PerformanceReport) -> None:
+    def read_file() -> str:
+        """Read the file."""
+        return "prefix <|endoftext|> suffix"
+
+    def response(content: str) -> MagicMock:
+        result = MagicMock()
+        result.message = ChatMessage(role="assistant", content=content)
+        return result
+
+    llm = MagicMock()
+    llm.achat_with_tools = AsyncMock(side_effect=[response(""), response("done")])
+    llm.get_tool_calls_from_response = MagicMock(
+        side_effect=[[ToolSelection(tool_id="call_1", tool_name="read_file", tool_kwargs={})], []]
+    )
+    llm.metadata.is_function_calling_model = True
+    agent = SpecialTokenAgent(llm=llm, tools=[FunctionTool.from_defaults(fn=read_file)])
+
+    result = await agent.run(start_event=StartEvent())
+
+    assert result.sources[0].tool_output == "prefix <|endoftext|> suffix"
+    tool_events = [event for event in report.events if event["kind"] == "tool"]
+    assert tool_events[0]["status"] == "ok" and tool_events[0]["output_tokens"] > 0
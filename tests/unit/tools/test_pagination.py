@@ -0,0 +1,99 @@
+from unittest.mock import MagicMock
+
+import pytest
+from git import Repo
+
+from lampe.core.tools.repository.content import get_file_content_at_commit
+from lampe.core.tools.repository.exceptions import InvalidCursorError
+from lampe.core.tools.repository.pagination import paginate_output, with_footer
+from lampe.core.utils.token import encoder
+
+
+@pytest.fixture
+def mock_commits_availability():
+    mock_context = MagicMock()
+    mock_context.__enter__ = MagicMock(return_value=mock_context)
+    mock_context.__exit__ = MagicMock(return_value=None)
+    return mock_context
+
+
+def test_paginate_output_without_budget_returns_everything():
+    """No budget means the legacy, unpaginated output"""
+    output = "a\nb\nc"
+    assert paginate_output(output) == (output, "")
+
+
+def test_paginate_output_walks_all_pages_with_cursors():
+    """Following the cursors returns every line exactly once, in order"""
+    lines = [f"line number {i}" for i in range(200)]
+    output = "\n".join(lines)
+
+    seen: list[str] = []
+    cursor = None
+    pages = 0
+    while True:
+        page, footer = paginate_output(output, max_output_tokens=50, cursor=cursor)
+        seen.extend(page.splitlines())
+        pages += 1
+        if not footer:
+            break
+        assert "page truncated" in footer
+        cursor = footer.split('cursor="')[1].split('"')[0]
+
+    assert seen == lines
+    assert pages > 1
+
+
+def test_paginate_output_oversized_line_gets_its_own_truncated_page():
+    """A single line larger than the budget is cut to the budget, the next page starts at the next line"""
+    output = "word " * 500 + "\nnext"
+    page, footer = paginate_output(output, max_output_tokens=10)
+    assert len(encoder.encode(page)) <= 10
+    assert ("word " * 500).startswith(page)
+    assert "line 1 truncated" in footer
+    assert 'cursor="1"' in footer
+
+
+def test_paginate_output_truncates_a_single_line_output():
+    """One-line outputs such as minified code are truncated too, with a footer saying so"""
+    output = '{"key": "value"}, ' * 200
+    page, footer = paginate_output(output, max_output_tokens=20)
+    assert len(encoder.encode(page)) <= 20
+    assert "line 1 truncated" in footer
+    assert "cursor=" not in footer
+
+
+@pytest.mark.parametrize("cursor", ["abc", "-1", "99"])
+def test_paginate_output_invalid_cursor(cursor):
+    """Cursors that were not returned by a previous page are rejected"""
+    with pytest.raises(InvalidCursorError):
+        paginate_output("a\nb", max_output_tokens=10, cursor=cursor)
+
+
+def test_with_footer():
+    assert with_footer("content", "") == "content"
+    assert with_footer("content", "footer") == "content\nfooter"
+
+
+def test_get_file_content_paginates_large_files(mocker, mock_commits_availability):
+    """Large files are paginated instead of rejected when a token budget is set"""
+    mock_repo = MagicMock(spec=Repo)
+    mock_repo.git.show.return_value = "\n".join(f"line {i}" for i in range(5000))
+    mocker.patch("lampe.core.tools.repository.content.get_file_size_at_commit", return_value=10_000_000)
+    mocker.patch("lampe.core.tools.repository.content.LocalCommitsAvailability", return_value=mock_commits_availability)
+    mocker.patch("lampe.core.tools.repository.content.Repo", return_value=mock_repo)
+
+    first_page = get_file_content_at_commit("main", "big.py", repo_path="/tmp/fake_repo", max_output_tokens=100)
+    assert first_page.startswith("line 0\n")
+    assert "page truncated" in first_page
+
+    cursor = first_page.split('cursor="')[1].split('"')[0]
+    second_page = get_file_content_at_commit(
+        "main", "big.py", repo_path="/tmp/fake_repo", cursor=cursor, max_output_tokens=100
+    )
+    assert second_page.startswith(f"line {cursor}\n")
+
+    invalid = get_file_content_at_commit(
+        "main", "big.py", repo_path="/tmp/fake_repo", cursor="x", max_output_tokens=100
+    )
+    assert invalid.startswith("Error: Invalid cursor")
@@ -0,0 +1,65 @@
+from git import Repo
+
+from lampe.core.tools.repository.management import prefetch_blobs
+
+
+def _missing_blobs(repo: Repo) -> list[str]:
+    output = repo.git.rev_list("--objects", "--missing=print", "HEAD")
+    return [line[1:] for line in output.splitlines() if line.startswith("?")]
+
+
+def test_prefetch_blobs_fetches_missing_blobs_of_a_partial_clone(tmp_path):
+    """Blobs under the requested paths are fetched in one batch, other blobs stay lazy"""
+    origin = Repo.init(tmp_path / "origin")
+    (tmp_path / "origin" / "src").mkdir()
+    for i in range(3):
+        (tmp_path / "origin" / "src" / f"f{i}.py").write_text(f"x = {i}\n")
+    (tmp_path / "origin" / "README.md").write_text("readme\n")
+    origin.git.add(".")
+    origin.git.commit("-m", "init", author="a <a@b.c>", env={"GIT_COMMITTER_NAME": "a", "GIT_COMMITTER_EMAIL": "a@b.c"})
+    origin.git.config("uploadpack.allowFilter", "true")
+    origin.git.config("uploadpack.allowAnySHA1InWant", "true")
+
+    clone = Repo.clone_from(
+        f"file://{tmp_path / 'origin'}", tmp_path / "clone", multi_options=["--filter=blob:none", "--no-checkout"]
+    )
+    assert len(_missing_blobs(clone)) == 4
+
+    assert prefetch_blobs(str(tmp_path / "clone"), "HEAD", ["src"]) == 3
+    assert len(_missing_blobs(clone)) == 1
+    # Already local: nothing to fetch
+    assert prefetch_blobs(str(tmp_path / "clone"), "HEAD", ["src"]) == 0
+
+
+def test_prefetch_blobs_only_fetches_the_blobs_of_the_commit(tmp_path):
+    """Past versions of the files are not fetched, only the blobs of the commit tree"""
+    origin = Repo.init(tmp_path / "origin")
+    (tmp_path / "origin" / "src").mkdir()
+    for version in range(3):
+        (tmp_path / "origin" / "src" / "a.py").write_text(f"version = {version}\n")
+        origin.git.add(".")
+        origin.git.commit(
+            "-m", f"v{version}", author="a <a@b.c>", env={"GIT_COMMITTER_NAME": "a", "GIT_COMMITTER_EMAIL": "a@b.c"}
+        )
+    origin.git.config("uploadpack.allowFilter", "true")
+    origin.git.config("uploadpack.allowAnySHA1InWant", "true")
+    clone = Repo.clone_from(
+        f"file://{tmp_path / 'origin'}", tmp_path / "clone", multi_options=["--filter=blob:none", "--no-checkout"]
+    )
+    head_blob = clone.git.rev_parse("HEAD:src/a.py")
+
+    assert prefetch_blobs(str(tmp_path / "clone"), "HEAD", ["src"]) == 1
+    assert head_blob not in _missing_blobs(clone)
+    # The two older versions are still lazy
+    all_versions = clone.git.rev_list("--objects", "--missing=print", "--all")
+    assert len([line for line in all_versions.splitlines() if line.startswith("?")]) == 2
+
+
+def test_prefetch_blobs_is_noop_on_full_clone(tmp_path):
+    repo = Repo.init(tmp_path)
+    (tmp_path / "a.py").write_text("a = 1\n")
+    repo.git.add(".")
+    repo.git.commit("-m", "init", author="a <a@b.c>", env={"GIT_COMMITTER_NAME": "a", "GIT_COMMITTER_EMAIL": "a@b.c"})
+
+    assert prefetch_blobs(str(tmp_path), "HEAD", ["a.py"]) == 0
+    assert prefetch_blobs(str(tmp_path), "HEAD", []) == 0
@@ -135,3 +135,23 @@ def test_search_in_files_sanitizes_utf8_output(mocker):
 
     assert "valid text" in result
     assert "```grep" in result
+
+
+def test_search_in_files_paginates_within_fence(mocker):
+    """Test that a token budget keeps the grep fence closed and appends a continuation cursor."""
+    mock_repo = mocker.patch("lampe.core.tools.repository.search.Repo")
+    mock_repo.return_value.git.grep.return_value = "\n".join(f"src/foo.py:{i}:match" for i in range(500))
+
+    result = search_in_files(
+        pattern="match",
+        relative_dir_path="src",
+        commit_reference="abc123",
+        repo_path="/tmp/repo",
+        max_output_tokens=50,
+    )
+
+    body, footer = result.rsplit("\n", 1)
+    assert body.startswith("```grep\nsrc/foo.py:0:match")
+    assert body.endswith("\n```")
+    assert "page truncated" in footer
+    assert 'cursor="' in footer
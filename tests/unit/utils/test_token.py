@@ -2,7 +2,7 @@ from unittest.mock import patch
 
 import pytest
 
-from lampe.core.utils.token import CHARACTER_TRUNCATION_THRESHOLD, truncate_to_token_limit
+from lampe.core.utils.token import CHARACTER_TRUNCATION_THRESHOLD, count_token_string, truncate_to_token_limit
 
 
 def test_truncate_to_token_limit_basic():
@@ -17,6 +17,10 @@ def test_truncate_to_token_limit_negative():
         truncate_to_token_limit(content, -1)
 
 
+def test_count_token_string_counts_special_tokens_as_text():
+    assert count_token_string("<|endoftext|>") > 1
+
+
 def test_truncate_to_token_limit_character_limit():
     content = "a" * 250000
     total_tokens = 2
@@ -0,0 +1,118 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from llama_index.core.llms import ChatMessage
+from llama_index.core.tools import FunctionTool, ToolSelection
+from llama_index.core.workflow import Context, StartEvent, StopEvent, step
+from llama_index.core.workflow.errors import WorkflowTimeoutError
+
+from lampe.core.llmbudget import LLMBudget
+from lampe.core.workflows.function_calling_agent import (
+    BUDGET_WRAP_UP_MESSAGE,
+    AgentCompleteEvent,
+    FunctionCallingAgent,
+    UserInputEvent,
+)
+
+
+class LoopingAgent(FunctionCallingAgent):
+    @step
+    async def setup(self, ctx: Context, ev: StartEvent) -> UserInputEvent:
+        return UserInputEvent(input="review")
+
+    @step
+    async def handle_agent_completion(self, ev: AgentCompleteEvent) -> StopEvent:
+        return StopEvent(result=ev)
+
+
+def _looping_llm() -> MagicMock:
+    """LLM that always calls ``lookup`` when given tools, and answers otherwise."""
+
+    def response(content: str) -> MagicMock:
+        result = MagicMock()
+        result.message = ChatMessage(role="assistant", content=content)
+        result.additional_kwargs = {"prompt_tokens": 100, "completion_tokens": 10}
+        return result
+
+    async def mock_achat_with_tools(tools, chat_history):
+        return response("")
+
+    async def mock_achat(chat_history):
+        return response("final answer")
+
+    mock_llm = MagicMock()
+    mock_llm.achat_with_tools = AsyncMock(side_effect=mock_achat_with_tools)
+    mock_llm.achat = AsyncMock(side_effect=mock_achat)
+    mock_llm.get_tool_calls_from_response = MagicMock(
+        return_value=[ToolSelection(tool_id="call_1", tool_name="lookup", tool_kwargs={})]
+    )
+    mock_llm.metadata.is_function_calling_model = True
+    mock_llm.metadata.context_window = 1_000_000
+    return mock_llm
+
+
+def _lookup_tool() -> FunctionTool:
+    def lookup() -> str:
+        """Look something up."""
+        return "found"
+
+    return FunctionTool.from_defaults(fn=lookup)
+
+
+@pytest.mark.asyncio
+async def test_agent_wraps_up_with_its_last_affordable_call():
+    llm = _looping_llm()
+    budget = LLMBudget(max_llm_calls=3)
+    agent = LoopingAgent(llm=llm, tools=[_lookup_tool()], max_iterations=50, budget=budget)
+
+    result = await agent.run(start_event=StartEvent())
+
+    assert result.output == "final answer"
+    assert llm.achat_with_tools.await_count == 2 and llm.achat.await_count == 1
+    assert llm.achat.await_args.args[0][-1].content == BUDGET_WRAP_UP_MESSAGE
+    assert budget.llm_calls == 3 and budget.input_tokens == 300
+    assert [work.kind for work in budget.report().skipped] == ["agent_iterations"]
+    assert budget.active_agents == 0
+
+
+@pytest.mark.asyncio
+async def test_agent_without_budget_left_stops():
+    llm = _looping_llm()
+    budget = LLMBudget(max_llm_calls=1)
+    agent = LoopingAgent(llm=llm, tools=[_lookup_tool()], max_iterations=50, budget=budget)
+
+    result = await agent.run(start_event=StartEvent())
+
+    assert result.output == "Agent stopped: the review budget is exhausted."
+    assert budget.llm_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_agent_failing_run_is_counted_as_finished():
+    llm = _looping_llm()
+    llm.achat_with_tools = AsyncMock(side_effect=RuntimeError("rate limited"))
+    budget = LLMBudget(max_llm_calls=10)
+    agent = LoopingAgent(llm=llm, tools=[_lookup_tool()], budget=budget)
+
+    with pytest.raises(RuntimeError, match="rate limited"):
+        await agent.run(start_event=StartEvent())
+
+    assert budget.active_agents == 0
+
+
+@pytest.mark.asyncio
+async def test_agent_timed_out_run_is_counted_as_finished():
+    llm = _looping_llm()
+
+    async def hang(tools, chat_history):
+        await asyncio.sleep(10)
+
+    llm.achat_with_tools = AsyncMock(side_effect=hang)
+    budget = LLMBudget(max_llm_calls=10)
+    agent = LoopingAgent(llm=llm, tools=[_lookup_tool()], budget=budget, timeout=0.1)
+
+    with pytest.raises(WorkflowTimeoutError):
+        await agent.run(start_event=StartEvent())
+
+    assert budget.active_agents == 0
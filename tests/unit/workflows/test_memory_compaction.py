@@ -0,0 +1,170 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from llama_index.core.llms import ChatMessage
+from llama_index.core.tools import FunctionTool, ToolSelection
+from llama_index.core.workflow import StartEvent, StopEvent, step
+
+from lampe.core.workflows import memory_compaction
+from lampe.core.workflows.function_calling_agent import AgentCompleteEvent, FunctionCallingAgent, UserInputEvent
+from lampe.core.workflows.memory_compaction import (
+    COMPACTED_TOOL_OUTPUT_PREFIX,
+    TRUNCATED_MESSAGE_SUFFIX,
+    TRUNCATED_TOOL_OUTPUT_SUFFIX,
+    count_message_tokens,
+    digest_consumed_tool_outputs,
+    enforce_input_token_ceiling,
+    fit_to_input_token_ceiling,
+    is_compacted,
+)
+
+
+class QueryStart(StartEvent):
+    query: str
+
+
+class DummyAgent(FunctionCallingAgent):
+    @step
+    async def setup(self, ev: QueryStart) -> UserInputEvent:
+        return UserInputEvent(input=ev.query)
+
+    @step
+    async def handle_agent_completion(self, ev: AgentCompleteEvent) -> StopEvent:
+        return StopEvent(result=ev)
+
+
+def _tool_message(content: str, name: str = "get_diff_for_files") -> ChatMessage:
+    return ChatMessage(role="tool", content=content, additional_kwargs={"tool_call_id": "call_1", "name": name})
+
+
+def test_digest_consumed_tool_outputs_only_touches_tool_messages():
+    """User/system messages are kept, tool outputs are replaced by a digest with the tool metadata."""
+    big_output = "diff --git a/x b/x\n" + "+ added line\n" * 2000
+    messages = [
+        ChatMessage(role="system", content="system prompt"),
+        ChatMessage(role="user", content="review this"),
+        _tool_message(big_output),
+    ]
+
+    compacted = digest_consumed_tool_outputs(messages)
+
+    assert compacted[0].content == "system prompt"
+    assert compacted[1].content == "review this"
+    assert is_compacted(compacted[2])
+    assert "get_diff_for_files" in compacted[2].content
+    assert compacted[2].additional_kwargs["tool_call_id"] == "call_1"
+    assert count_message_tokens(compacted) < count_message_tokens(messages)
+    # Digesting twice is a no-op
+    assert digest_consumed_tool_outputs(compacted)[2].content == compacted[2].content
+
+
+def test_enforce_input_token_ceiling_keeps_outputs_under_budget():
+    """Outputs that fit are untouched."""
+    new_messages = [_tool_message("small output")]
+    assert enforce_input_token_ceiling([], new_messages, max_input_tokens=1000) == new_messages
+
+
+def test_enforce_input_token_ceiling_truncates_fresh_outputs():
+    """Fresh outputs are truncated to share the remaining budget."""
+    history = [ChatMessage(role="user", content="review this")]
+    new_messages = [_tool_message("word " * 5000), _tool_message("other " * 5000)]
+
+    result = enforce_input_token_ceiling(history, new_messages, max_input_tokens=2000)
+
+    assert len(result) == 2
+    for msg in result:
+        assert msg.content.endswith(TRUNCATED_TOOL_OUTPUT_SUFFIX)
+    assert count_message_tokens(history + result) < 2200
+
+
+def test_enforce_input_token_ceiling_digests_when_no_room_left():
+    """When the history already fills the budget, fresh outputs are digested."""
+    history = [ChatMessage(role="user", content="word " * 1000)]
+    result = enforce_input_token_ceiling(history, [_tool_message("other " * 1000)], max_input_tokens=1000)
+    assert result[0].content.startswith(COMPACTED_TOOL_OUTPUT_PREFIX)
+
+
+def test_fit_to_input_token_ceiling_digests_tool_outputs_oldest_first():
+    """Tool outputs are digested oldest first, until the prompt fits."""
+    messages = [
+        ChatMessage(role="system", content="system prompt"),
+        ChatMessage(role="user", content="review this"),
+        _tool_message("first " * 1000),
+        _tool_message("second " * 1000),
+    ]
+
+    fitted = fit_to_input_token_ceiling(messages, max_input_tokens=1500)
+
+    assert is_compacted(fitted[2]) and fitted[3] is messages[3]
+    assert count_message_tokens(fitted) <= 1500
+    assert fit_to_input_token_ceiling(messages, max_input_tokens=10_000) is messages
+
+
+def test_fit_to_input_token_ceiling_truncates_the_longest_message():
+    """A prompt too long without tool outputs has its longest non-system message truncated."""
+    messages = [ChatMessage(role="system", content="system prompt"), ChatMessage(role="user", content="word " * 3000)]
+
+    fitted = fit_to_input_token_ceiling(messages, max_input_tokens=500)
+
+    assert fitted[0].content == "system prompt"
+    assert fitted[1].content.endswith(TRUNCATED_MESSAGE_SUFFIX)
+    assert count_message_tokens(fitted) <= 500
+
+
+def test_token_count_cache_does_not_retain_contents(monkeypatch):
+    """The token count cache is bounded and keyed by digest, not by the (possibly huge) contents."""
+    monkeypatch.setattr(memory_compaction, "TOKEN_COUNT_CACHE_SIZE", 2)
+    monkeypatch.setattr(memory_compaction, "_token_counts", type(memory_compaction._token_counts)())
+    contents = ["alpha " * 100, "beta " * 100, "gamma " * 100]
+
+    counts = [count_message_tokens([_tool_message(content)]) for content in contents]
+
+    assert counts == [count_message_tokens([_tool_message(content)]) for content in contents]
+    assert len(memory_compaction._token_counts) == 2
+    assert not any(isinstance(part, str) for key in memory_compaction._token_counts for part in key)
+
+
+@pytest.mark.asyncio
+async def test_function_calling_agent_compacts_consumed_tool_outputs():
+    """Second iteration only sees a digest of the first tool output, sources keep the full output."""
+    big_output = "line of file content\n" * 3000
+
+    def read_file(file_path: str) -> str:
+        """Read a file."""
+        return big_output
+
+    tool_calls = [
+        [ToolSelection(tool_id="call_1", tool_name="read_file", tool_kwargs={"file_path": "a.py"})],
+        [ToolSelection(tool_id="call_2", tool_name="read_file", tool_kwargs={"file_path": "b.py"})],
+        [],
+    ]
+    histories: list[list[ChatMessage]] = []
+
+    async def mock_achat_with_tools(tools, chat_history):
+        histories.append(list(chat_history))
+        response = MagicMock()
+        response.message = ChatMessage(role="assistant", content="done" if len(histories) == 3 else "")
+        return response
+
+    def mock_get_tool_calls(response, error_on_no_tool_call=False):
+        return tool_calls[len(histories) - 1]
+
+    mock_llm = MagicMock()
+    mock_llm.achat_with_tools = AsyncMock(side_effect=mock_achat_with_tools)
+    mock_llm.get_tool_calls_from_response = mock_get_tool_calls
+    mock_llm.metadata.is_function_calling_model = True
+    mock_llm.metadata.context_window = 1_000_000
+
+    agent = DummyAgent(llm=mock_llm, tools=[FunctionTool.from_defaults(fn=read_file)])
+    result = await agent.run(start_event=QueryStart(query="review"))
+
+    assert isinstance(result, AgentCompleteEvent)
+    last_tool_messages = [m for m in histories[2] if m.role == "tool"]
+    assert len(last_tool_messages) == 2
+    assert is_compacted(last_tool_messages[0])
+    assert last_tool_messages[1].content == big_output
+    assert [s.tool_output for s in result.sources] == [big_output, big_output]
+    assert len(result.prompt_token_counts) == 3
+    assert result.prompt_token_counts[2] < result.prompt_token_counts[1] + count_message_tokens(
+        [_tool_message(big_output)]
+    )
@@ -0,0 +1,111 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from llama_index.core.llms import ChatMessage
+from llama_index.core.tools import FunctionTool, ToolSelection
+from llama_index.core.workflow import Context, StartEvent, StopEvent, step
+
+from lampe.core.tools.llm_integration import copy_tools, git_tools_gpt_5_nano_agent_prompt
+from lampe.core.tools.repository.pagination import paginate_output, with_footer
+from lampe.core.workflows.function_calling_agent import AgentCompleteEvent, FunctionCallingAgent, UserInputEvent
+
+
+class RepoStart(StartEvent):
+    repo_path: str
+
+
+class BindingAgent(FunctionCallingAgent):
+    @step
+    async def setup(self, ctx: Context, ev: RepoStart) -> UserInputEvent:
+        await self.bind_tools(ctx, partial_params={"repo_path": ev.repo_path})
+        return UserInputEvent(input="review")
+
+    @step
+    async def handle_agent_completion(self, ev: AgentCompleteEvent) -> StopEvent:
+        return StopEvent(result=ev)
+
+
+def _mock_llm() -> MagicMock:
+    """LLM calling ``which_repo`` once, then answering."""
+
+    async def mock_achat_with_tools(tools, chat_history):
+        response = MagicMock()
+        response.message = ChatMessage(role="assistant", content="done" if chat_history[-1].role == "tool" else "")
+        return response
+
+    def mock_get_tool_calls(response, error_on_no_tool_call=False):
+        if response.message.content:
+            return []
+        return [ToolSelection(tool_id="call_1", tool_name="which_repo", tool_kwargs={"file_path": "a.py"})]
+
+    mock_llm = MagicMock()
+    mock_llm.achat_with_tools = AsyncMock(side_effect=mock_achat_with_tools)
+    mock_llm.get_tool_calls_from_response = mock_get_tool_calls
+    mock_llm.metadata.is_function_calling_model = True
+    mock_llm.metadata.context_window = 1_000_000
+    return mock_llm
+
+
+@pytest.mark.asyncio
+async def test_concurrent_runs_of_one_agent_keep_their_own_tool_params():
+    async def which_repo(file_path: str, repo_path: str = "/unbound") -> str:
+        """Return the repository the file is read from."""
+        await asyncio.sleep(0)
+        return f"{repo_path}/{file_path}"
+
+    agent = BindingAgent(llm=_mock_llm(), tools=[FunctionTool.from_defaults(async_fn=which_repo)])
+    results = await asyncio.gather(*(agent.run(start_event=RepoStart(repo_path=f"/repo{i}")) for i in range(5)))
+
+    assert [result.sources[0].tool_output for result in results] == [f"/repo{i}/a.py" for i in range(5)]
+    assert all(tool.partial_params == {} for tool in agent.tools)
+
+
+def test_update_tools_only_affects_the_agent_copies():
+    mock_llm = _mock_llm()
+    first = BindingAgent(llm=mock_llm, tools=git_tools_gpt_5_nano_agent_prompt)
+    second = BindingAgent(llm=mock_llm, tools=git_tools_gpt_5_nano_agent_prompt)
+
+    first.update_tools(partial_params={"repo_path": "/first", "head_reference": "abc"})
+
+    assert all(tool.partial_params.get("repo_path") == "/first" for tool in first.tools)
+    assert all("repo_path" not in tool.partial_params for tool in second.tools)
+    assert all("repo_path" not in tool.partial_params for tool in git_tools_gpt_5_nano_agent_prompt)
+
+
+def test_copy_tools_shares_functions_but_not_partial_params():
+    copies = copy_tools(git_tools_gpt_5_nano_agent_prompt)
+
+    for original, tool_copy in zip(git_tools_gpt_5_nano_agent_prompt, copies):
+        assert tool_copy is not original
+        assert tool_copy.metadata is original.metadata
+        assert tool_copy.partial_params is not original.partial_params
+
+
+def test_output_budget_is_hidden_from_the_llm_schema():
+    for tool in git_tools_gpt_5_nano_agent_prompt:
+        fields = tool.metadata.fn_schema.model_fields
+        assert "max_output_tokens" not in fields and "cursor" in fields
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("requested", [None, 1_000_000])
+async def test_llm_cannot_lift_the_output_budget(requested):
+    output = "\n".join(f"line number {i}" for i in range(500))
+
+    def read_output(cursor: str | None = None, max_output_tokens: int | None = None) -> str:
+        """Read the output."""
+        return with_footer(*paginate_output(output, max_output_tokens=max_output_tokens, cursor=cursor))
+
+    llm = _mock_llm()
+    llm.get_tool_calls_from_response = lambda response, error_on_no_tool_call=False: (
+        []
+        if response.message.content
+        else [ToolSelection(tool_id="call_1", tool_name="read_output", tool_kwargs={"max_output_tokens": requested})]
+    )
+    tool = FunctionTool.from_defaults(fn=read_output, partial_params={"max_output_tokens": None})
+    agent = BindingAgent(llm=llm, tools=[tool], tool_output_token_budget=50)
+
+    result = await agent.run(start_event=RepoStart(repo_path="/repo"))
+
+    assert "page truncated: output exceeds 50 tokens" in result.sources[0].tool_output